@@ -6,9 +6,13 @@ Supports both SQLite (development) and PostgreSQL (production).
 
 import os
 import json
+import base64
 import sqlite3
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 import logging
 
@@ -22,9 +26,167 @@ from api.schemas import (
     ContextType,
     AgentType,
 )
+from api.sqlite_pool import SQLiteConnectionPool
+from api.write_behind import WriteBehindBuffer
 
 logger = logging.getLogger(__name__)
 
+# Project row with its settings, agents, assets and stages. Child rows come
+# back as JSON arrays so the whole project is one statement.
+_PROJECT_DETAILS_QUERY = """
+    SELECT
+        p.*,
+        s.mode,
+        s.settings_json,
+        (SELECT json_group_array(agent_type)
+         FROM project_agents WHERE project_id = :project_id) AS agents_json,
+        (SELECT json_group_array(json_object(
+            'asset_id', asset_id, 'project_id', project_id, 'asset_type', asset_type,
+            'filename', filename, 'file_size', file_size, 'preview_url', preview_url,
+            'etag', etag, 'created_at', created_at))
+         FROM generated_assets WHERE project_id = :project_id) AS assets_json,
+        (SELECT json_group_array(json_object(
+            'stage_id', stage_id, 'stage_name', stage_name, 'status', status,
+            'progress', progress, 'message', message,
+            'started_at', started_at, 'completed_at', completed_at))
+         FROM generation_stages WHERE project_id = :project_id) AS stages_json
+    FROM projects p
+    LEFT JOIN project_settings s ON s.project_id = p.project_id
+    WHERE p.project_id = :project_id
+"""
+
+# One page of projects with asset counts and the first preview asset
+# (render or preview, oldest first) picked by ROW_NUMBER(). Portable between
+# SQLite and PostgreSQL; {filters} and {limit} take the dialect's placeholders.
+_PROJECT_PAGE_QUERY = """
+    WITH page AS (
+        SELECT project_id, prompt, status, created_at, completed_at
+        FROM projects
+        WHERE {filters}
+        ORDER BY created_at DESC, project_id DESC
+        LIMIT {limit}
+    ),
+    ranked_assets AS (
+        SELECT
+            a.project_id,
+            a.filename,
+            a.asset_type,
+            COUNT(*) OVER (PARTITION BY a.project_id) AS asset_count,
+            ROW_NUMBER() OVER (
+                PARTITION BY a.project_id
+                ORDER BY a.asset_type IN ('render', 'preview') DESC, a.created_at, a.asset_id
+            ) AS preview_rank
+        FROM generated_assets a
+        JOIN page ON page.project_id = a.project_id
+    )
+    SELECT
+        page.*,
+        COALESCE(r.asset_count, 0) AS asset_count,
+        CASE WHEN r.asset_type IN ('render', 'preview') THEN r.filename END AS preview_filename
+    FROM page
+    LEFT JOIN ranked_assets r ON r.project_id = page.project_id AND r.preview_rank = 1
+    ORDER BY page.created_at DESC, page.project_id DESC
+"""
+
+
+def _project_name(prompt: str) -> str:
+    """Display name for a project, derived from its prompt."""
+    return prompt if len(prompt) <= 60 else prompt[:57].rstrip() + "..."
+
+
+def _asset_from_row(row) -> GeneratedAsset:
+    """Build a GeneratedAsset from a generated_assets row."""
+    return GeneratedAsset(
+        asset_id=row["asset_id"],
+        name=row["filename"],
+        type=row["asset_type"],
+        format=Path(row["filename"]).suffix.lstrip("."),
+        size=row["file_size"],
+        url=f"/api/projects/{row['project_id']}/assets/{row['filename']}",
+        thumbnail_url=row["preview_url"],
+        etag=row["etag"],
+    )
+
+
+def _project_details_from_row(row) -> ProjectDetails:
+    """Build ProjectDetails from a project row with JSON-aggregated children."""
+    project = dict(row)
+    agents = sorted(json.loads(project["agents_json"]))
+    asset_rows = sorted(json.loads(project["assets_json"]), key=lambda a: (a["created_at"], a["asset_id"]))
+    stage_rows = sorted(json.loads(project["stages_json"]), key=lambda stage: stage["stage_id"])
+    stages = [
+        GenerationStageUpdate(
+            stage=stage["stage_name"],
+            stage_number=number,
+            total_stages=len(stage_rows),
+            status=stage["status"],
+            progress=stage["progress"],
+            message=stage["message"],
+            started_at=stage["started_at"],
+            completed_at=stage["completed_at"],
+        )
+        for number, stage in enumerate(stage_rows, 1)
+    ]
+    settings = json.loads(project["settings_json"]) if project["settings_json"] else {}
+
+    return ProjectDetails(
+        project_id=project["project_id"],
+        name=_project_name(project["prompt"]),
+        prompt=project["prompt"],
+        mode=project["mode"] or "automatic",
+        settings=settings,
+        agents_used=agents,
+        stages=stages,
+        assets=[_asset_from_row(asset) for asset in asset_rows],
+        status=ProjectStatus(project["status"]),
+        error_message=project["error_message"],
+        created_at=project["created_at"],
+        updated_at=project["updated_at"],
+        completed_at=project["completed_at"],
+    )
+
+
+def _project_page_from_rows(rows, limit: int) -> Tuple[List[ProjectSummary], Optional[str]]:
+    """Build a page of summaries from up to limit + 1 page-query rows."""
+    projects = [
+        ProjectSummary(
+            project_id=row["project_id"],
+            name=_project_name(row["prompt"]),
+            prompt=row["prompt"][:200],
+            thumbnail_url=(
+                f"/api/projects/{row['project_id']}/assets/{row['preview_filename']}"
+                if row["preview_filename"]
+                else None
+            ),
+            status=ProjectStatus(row["status"]),
+            created_at=row["created_at"],
+            completed_at=row["completed_at"],
+            asset_count=row["asset_count"],
+        )
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor(last["created_at"], last["project_id"])
+    return projects, next_cursor
+
+
+def _encode_cursor(created_at: str, project_id: str) -> str:
+    """Encode a keyset position as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([created_at, project_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        created_at, project_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+    return str(created_at), str(project_id)
+
+
 
 class DatabaseManager:
     """
@@ -32,13 +194,24 @@ class DatabaseManager:
     Provides a simple interface for CRUD operations on users, projects, and assets.
     """
 
-    def __init__(self, db_path: str = "data/voxel.db", db_type: str = "sqlite"):
+    def __init__(
+        self,
+        db_path: str = "data/voxel.db",
+        db_type: str = "sqlite",
+        pool_size: int = 5,
+        busy_timeout: float = 5.0,
+        write_behind_interval: Optional[float] = 0.25,
+    ):
         """
         Initialize database manager.
 
         Args:
             db_path: Path to SQLite database file (for SQLite backend)
             db_type: Database type ('sqlite' or 'postgresql')
+            pool_size: Maximum number of pooled connections
+            busy_timeout: Seconds a query waits for a lock held by another connection
+            write_behind_interval: Seconds stage and status updates are buffered
+                before being written together (None writes each one immediately)
         """
         self.db_path = db_path
         self.db_type = db_type
@@ -47,17 +220,29 @@ class DatabaseManager:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
         if db_type == "sqlite":
+            self.pool = SQLiteConnectionPool(db_path, size=pool_size, busy_timeout=busy_timeout)
             self._init_sqlite()
         else:
-            raise NotImplementedError(f"Database type {db_type} not yet implemented")
+            raise NotImplementedError(
+                f"DatabaseManager is the SQLite backend; use create_database() with a URL for {db_type}"
+            )
+
+        self.write_buffer = (
+            WriteBehindBuffer(self._transaction, flush_interval=write_behind_interval)
+            if write_behind_interval
+            else None
+        )
 
         logger.info(f"DatabaseManager initialized with {db_type} at {db_path}")
 
     def _init_sqlite(self):
         """Initialize SQLite database with schema."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.transaction() as conn:
+            self._create_schema(conn.cursor())
+        logger.info("SQLite database schema initialized")
 
+    def _create_schema(self, cursor):
+        """Create tables and indexes if they do not exist."""
         # Users table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -126,9 +311,13 @@ class DatabaseManager:
                 file_size INTEGER NOT NULL,
                 preview_url TEXT,
                 created_at TEXT NOT NULL,
+                etag TEXT,
                 FOREIGN KEY (project_id) REFERENCES projects (project_id) ON DELETE CASCADE
             )
         """)
+        asset_columns = {row[1] for row in cursor.execute("PRAGMA table_info(generated_assets)")}
+        if "etag" not in asset_columns:
+            cursor.execute("ALTER TABLE generated_assets ADD COLUMN etag TEXT")
 
         # Generation stages table (for progress tracking)
         cursor.execute("""
@@ -156,23 +345,53 @@ class DatabaseManager:
         """)
 
         # Create indexes for faster queries
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects (user_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_context_files_project ON context_files (project_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_assets_project ON generated_assets (project_id)")
-
-        conn.commit()
-        conn.close()
-        logger.info("SQLite database schema initialized")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stages_project ON generation_stages (project_id, stage_id)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_stages_project_name ON generation_stages (project_id, stage_name)"
+        )
 
-    def _get_connection(self):
-        """Get database connection."""
-        if self.db_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable column access by name
-            return conn
-        else:
-            raise NotImplementedError(f"Database type {self.db_type} not supported")
+        # Covering indexes for keyset project pages and per-project asset lookups
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_projects_user_created "
+            "ON projects (user_id, created_at, project_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_projects_user_status_created "
+            "ON projects (user_id, status, created_at, project_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_assets_project_created "
+            "ON generated_assets (project_id, created_at, asset_id, asset_type, filename)"
+        )
+        # Superseded by the indexes above
+        cursor.execute("DROP INDEX IF EXISTS idx_projects_user_id")
+        cursor.execute("DROP INDEX IF EXISTS idx_assets_project")
+
+    def _connection(self):
+        """Borrow a pooled connection for reads."""
+        return self.pool.connection()
+
+    def _transaction(self):
+        """Borrow a pooled connection inside a write transaction."""
+        return self.pool.transaction()
+
+    def flush(self):
+        """Write buffered stage and status updates now."""
+        if self.write_buffer:
+            self.write_buffer.flush()
+
+    def _flush_pending(self, project_id: Optional[str] = None):
+        """Flush buffered updates before a read that could see them."""
+        if self.write_buffer and self.write_buffer.has_pending(project_id):
+            self.write_buffer.flush()
+
+    def close(self):
+        """Flush buffered updates and close pooled connections."""
+        if self.write_buffer:
+            self.write_buffer.close()
+        self.pool.close()
 
     # ==================== USER OPERATIONS ====================
 
@@ -198,19 +417,16 @@ class DatabaseManager:
             True if successful, False otherwise
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                INSERT INTO users (user_id, email, username, password_hash, created_at, subscription_tier)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (user_id, email, username, password_hash, datetime.utcnow().isoformat(), subscription_tier),
-            )
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                cursor.execute(
+                    """
+                    INSERT INTO users (user_id, email, username, password_hash, created_at, subscription_tier)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (user_id, email, username, password_hash, datetime.utcnow().isoformat(), subscription_tier),
+                )
             logger.info(f"Created user: {username} ({email})")
             return True
         except sqlite3.IntegrityError as e:
@@ -219,12 +435,11 @@ class DatabaseManager:
 
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email address."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
+            row = cursor.fetchone()
 
         if row:
             return dict(row)
@@ -232,12 +447,11 @@ class DatabaseManager:
 
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """Get user by username."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+            row = cursor.fetchone()
 
         if row:
             return dict(row)
@@ -245,12 +459,11 @@ class DatabaseManager:
 
     def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
 
         if row:
             return dict(row)
@@ -274,21 +487,18 @@ class DatabaseManager:
 
     def update_user_stats(self, user_id: str, generations: int = 0, downloads: int = 0):
         """Update user statistics."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            UPDATE users
-            SET total_generations = total_generations + ?,
-                total_downloads = total_downloads + ?
-            WHERE user_id = ?
-        """,
-            (generations, downloads, user_id),
-        )
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            cursor.execute(
+                """
+                UPDATE users
+                SET total_generations = total_generations + ?,
+                    total_downloads = total_downloads + ?
+                WHERE user_id = ?
+            """,
+                (generations, downloads, user_id),
+            )
 
     # ==================== PROJECT OPERATIONS ====================
 
@@ -314,37 +524,34 @@ class DatabaseManager:
             True if successful
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            now = datetime.utcnow().isoformat()
-
-            # Create project
-            cursor.execute(
-                """
-                INSERT INTO projects (
-                    project_id, user_id, prompt, status, progress,
-                    created_at, updated_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (project_id, user_id, prompt, "pending", 0.0, now, now),
-            )
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+                now = datetime.utcnow().isoformat()
 
-            # Add selected agents
-            for agent in agents:
+                # Create project
                 cursor.execute(
-                    "INSERT INTO project_agents (project_id, agent_type) VALUES (?, ?)",
-                    (project_id, agent),
+                    """
+                    INSERT INTO projects (
+                        project_id, user_id, prompt, status, progress,
+                        created_at, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (project_id, user_id, prompt, "pending", 0.0, now, now),
                 )
 
-            # Store settings
-            cursor.execute(
-                "INSERT INTO project_settings (project_id, mode, settings_json) VALUES (?, ?, ?)",
-                (project_id, settings.get("mode", "automatic"), json.dumps(settings)),
-            )
+                # Add selected agents
+                for agent in agents:
+                    cursor.execute(
+                        "INSERT INTO project_agents (project_id, agent_type) VALUES (?, ?)",
+                        (project_id, agent),
+                    )
 
-            conn.commit()
-            conn.close()
+                # Store settings
+                cursor.execute(
+                    "INSERT INTO project_settings (project_id, mode, settings_json) VALUES (?, ?, ?)",
+                    (project_id, settings.get("mode", "automatic"), json.dumps(settings)),
+                )
             logger.info(f"Created project {project_id} for user {user_id}")
             return True
         except Exception as e:
@@ -353,7 +560,7 @@ class DatabaseManager:
 
     def get_project(self, project_id: str) -> Optional[ProjectDetails]:
         """
-        Get complete project details.
+        Get complete project details in a single query.
 
         Args:
             project_id: Project identifier
@@ -361,146 +568,78 @@ class DatabaseManager:
         Returns:
             ProjectDetails object or None
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Get project
-        cursor.execute("SELECT * FROM projects WHERE project_id = ?", (project_id,))
-        project_row = cursor.fetchone()
+        self._flush_pending(project_id)
+        with self._connection() as conn:
+            row = conn.execute(_PROJECT_DETAILS_QUERY, {"project_id": project_id}).fetchone()
 
-        if not project_row:
-            conn.close()
+        if not row:
             return None
 
-        project = dict(project_row)
-
-        # Get agents
-        cursor.execute("SELECT agent_type FROM project_agents WHERE project_id = ?", (project_id,))
-        agents = [row["agent_type"] for row in cursor.fetchall()]
-
-        # Get assets
-        cursor.execute("SELECT * FROM generated_assets WHERE project_id = ?", (project_id,))
-        asset_rows = cursor.fetchall()
-        assets = [
-            GeneratedAsset(
-                asset_type=row["asset_type"],
-                filename=row["filename"],
-                url=f"/api/projects/{project_id}/assets/{row['filename']}",
-                file_size=row["file_size"],
-                preview_url=row["preview_url"],
-                created_at=row["created_at"],
-            )
-            for row in asset_rows
-        ]
-
-        # Get generation stages
-        cursor.execute(
-            "SELECT * FROM generation_stages WHERE project_id = ? ORDER BY stage_id",
-            (project_id,),
-        )
-        stage_rows = cursor.fetchall()
-        stages = [
-            GenerationStageUpdate(
-                stage=row["stage_name"],
-                status=row["status"],
-                progress=row["progress"],
-                message=row["message"],
-            )
-            for row in stage_rows
-        ]
-
-        # Get settings
-        cursor.execute("SELECT settings_json FROM project_settings WHERE project_id = ?", (project_id,))
-        settings_row = cursor.fetchone()
-        settings = json.loads(settings_row["settings_json"]) if settings_row else {}
-
-        conn.close()
-
-        return ProjectDetails(
-            project_id=project["project_id"],
-            prompt=project["prompt"],
-            agents=agents,
-            settings=settings,
-            status=ProjectStatus(project["status"]),
-            progress=project["progress"],
-            current_stage=project["current_stage"],
-            assets=assets,
-            stages=stages,
-            created_at=project["created_at"],
-            updated_at=project["updated_at"],
-            completed_at=project["completed_at"],
-            estimated_time=project["estimated_time"],
-            error_message=project["error_message"],
-        )
+        return _project_details_from_row(row)
 
     def list_projects(
         self,
         user_id: str,
-        skip: int = 0,
         limit: int = 20,
         status: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[ProjectSummary]:
         """
-        List user projects with pagination.
+        List user projects, newest first.
 
         Args:
             user_id: User identifier
-            skip: Number of records to skip
             limit: Maximum number of records
             status: Filter by status (optional)
+            cursor: Position to continue from, as returned by list_projects_page
 
         Returns:
             List of ProjectSummary objects
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return self.list_projects_page(user_id, limit=limit, status=status, cursor=cursor)[0]
 
-        query = "SELECT * FROM projects WHERE user_id = ?"
-        params = [user_id]
+    def list_projects_page(
+        self,
+        user_id: str,
+        limit: int = 20,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ProjectSummary], Optional[str]]:
+        """
+        List a page of user projects with keyset pagination.
 
-        if status:
-            query += " AND status = ?"
-            params.append(status)
+        Pages continue from the (created_at, project_id) of the previous
+        page's last row, so deep pages cost the same as the first one. The
+        page, each project's asset count and its first preview asset come
+        from a single query.
 
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, skip])
+        Args:
+            user_id: User identifier
+            limit: Maximum number of records
+            status: Filter by status (optional)
+            cursor: Cursor from the previous page (None for the first page)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        Returns:
+            (projects, next_cursor); next_cursor is None on the last page
+        """
+        filters = ["user_id = :user_id"]
+        params: Dict[str, Any] = {"user_id": user_id, "limit": limit + 1}
 
-        projects = []
-        for row in rows:
-            project = dict(row)
+        if status:
+            filters.append("status = :status")
+            params["status"] = status
 
-            # Get preview asset (first image)
-            cursor.execute(
-                """
-                SELECT filename FROM generated_assets
-                WHERE project_id = ? AND asset_type IN ('render', 'preview')
-                LIMIT 1
-            """,
-                (project["project_id"],),
-            )
-            preview_row = cursor.fetchone()
-            preview_url = (
-                f"/api/projects/{project['project_id']}/assets/{preview_row['filename']}"
-                if preview_row
-                else None
-            )
+        if cursor:
+            params["cursor_created_at"], params["cursor_project_id"] = _decode_cursor(cursor)
+            filters.append("(created_at, project_id) < (:cursor_created_at, :cursor_project_id)")
 
-            projects.append(
-                ProjectSummary(
-                    project_id=project["project_id"],
-                    prompt=project["prompt"],
-                    status=ProjectStatus(project["status"]),
-                    preview_url=preview_url,
-                    created_at=project["created_at"],
-                    completed_at=project["completed_at"],
-                )
-            )
+        self._flush_pending()
+        with self._connection() as conn:
+            rows = conn.execute(
+                _PROJECT_PAGE_QUERY.format(filters=" AND ".join(filters), limit=":limit"), params
+            ).fetchall()
 
-        conn.close()
-        return projects
+        return _project_page_from_rows(rows, limit)
 
     def update_project_status(
         self,
@@ -510,46 +649,51 @@ class DatabaseManager:
         current_stage: Optional[str] = None,
         error_message: Optional[str] = None,
     ):
-        """Update project status and progress."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """
+        Update project status and progress.
+
+        With write-behind enabled the update is buffered and merged with
+        later ones; terminal statuses are written before this returns.
+        """
+        if self.write_buffer:
+            self.write_buffer.update_project_status(project_id, status, progress, current_stage, error_message)
+            return
 
-        updates = ["status = ?", "updated_at = ?"]
-        params = [status, datetime.utcnow().isoformat()]
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        if progress is not None:
-            updates.append("progress = ?")
-            params.append(progress)
+            updates = ["status = ?", "updated_at = ?"]
+            params = [status, datetime.utcnow().isoformat()]
 
-        if current_stage is not None:
-            updates.append("current_stage = ?")
-            params.append(current_stage)
+            if progress is not None:
+                updates.append("progress = ?")
+                params.append(progress)
 
-        if error_message is not None:
-            updates.append("error_message = ?")
-            params.append(error_message)
+            if current_stage is not None:
+                updates.append("current_stage = ?")
+                params.append(current_stage)
 
-        if status == "completed":
-            updates.append("completed_at = ?")
-            params.append(datetime.utcnow().isoformat())
+            if error_message is not None:
+                updates.append("error_message = ?")
+                params.append(error_message)
 
-        params.append(project_id)
+            if status == "completed":
+                updates.append("completed_at = ?")
+                params.append(datetime.utcnow().isoformat())
 
-        cursor.execute(f"UPDATE projects SET {', '.join(updates)} WHERE project_id = ?", params)
+            params.append(project_id)
 
-        conn.commit()
-        conn.close()
+            cursor.execute(f"UPDATE projects SET {', '.join(updates)} WHERE project_id = ?", params)
 
     def delete_project(self, project_id: str) -> bool:
         """Delete a project and all associated data."""
+        if self.write_buffer:
+            self.write_buffer.discard(project_id)
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                cursor.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
             logger.info(f"Deleted project {project_id}")
             return True
         except Exception as e:
@@ -558,19 +702,19 @@ class DatabaseManager:
 
     def count_projects(self, user_id: str, status: Optional[str] = None) -> int:
         """Count user projects."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        self._flush_pending()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        query = "SELECT COUNT(*) as count FROM projects WHERE user_id = ?"
-        params = [user_id]
+            query = "SELECT COUNT(*) as count FROM projects WHERE user_id = ?"
+            params = [user_id]
 
-        if status:
-            query += " AND status = ?"
-            params.append(status)
+            if status:
+                query += " AND status = ?"
+                params.append(status)
 
-        cursor.execute(query, params)
-        count = cursor.fetchone()["count"]
-        conn.close()
+            cursor.execute(query, params)
+            count = cursor.fetchone()["count"]
 
         return count
 
@@ -588,31 +732,28 @@ class DatabaseManager:
     ) -> bool:
         """Save context file metadata."""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                INSERT INTO context_files (
-                    file_id, project_id, agent_type, filename, file_path,
-                    context_type, file_size, uploaded_at
+                cursor.execute(
+                    """
+                    INSERT INTO context_files (
+                        file_id, project_id, agent_type, filename, file_path,
+                        context_type, file_size, uploaded_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        file_id,
+                        project_id,
+                        agent_type,
+                        filename,
+                        file_path,
+                        context_type,
+                        file_size,
+                        datetime.utcnow().isoformat(),
+                    ),
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    file_id,
-                    project_id,
-                    agent_type,
-                    filename,
-                    file_path,
-                    context_type,
-                    file_size,
-                    datetime.utcnow().isoformat(),
-                ),
-            )
-
-            conn.commit()
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"Context file save failed: {e}")
@@ -620,12 +761,11 @@ class DatabaseManager:
 
     def get_context_file(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get context file metadata."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM context_files WHERE file_id = ?", (file_id,))
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute("SELECT * FROM context_files WHERE file_id = ?", (file_id,))
+            row = cursor.fetchone()
 
         if row:
             return dict(row)
@@ -633,12 +773,11 @@ class DatabaseManager:
 
     def list_context_files(self, project_id: str) -> List[Dict[str, Any]]:
         """List all context files for a project."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM context_files WHERE project_id = ?", (project_id,))
-        rows = cursor.fetchall()
-        conn.close()
+            cursor.execute("SELECT * FROM context_files WHERE project_id = ?", (project_id,))
+            rows = cursor.fetchall()
 
         return [dict(row) for row in rows]
 
@@ -653,34 +792,33 @@ class DatabaseManager:
         file_path: str,
         file_size: int,
         preview_url: Optional[str] = None,
+        etag: Optional[str] = None,
     ) -> bool:
-        """Add a generated asset to a project."""
+        """Add a generated asset to a project, with its content ETag if known."""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                INSERT INTO generated_assets (
-                    asset_id, project_id, asset_type, filename, file_path,
-                    file_size, preview_url, created_at
+                cursor.execute(
+                    """
+                    INSERT INTO generated_assets (
+                        asset_id, project_id, asset_type, filename, file_path,
+                        file_size, preview_url, created_at, etag
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        asset_id,
+                        project_id,
+                        asset_type,
+                        filename,
+                        file_path,
+                        file_size,
+                        preview_url,
+                        datetime.utcnow().isoformat(),
+                        etag,
+                    ),
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    asset_id,
-                    project_id,
-                    asset_type,
-                    filename,
-                    file_path,
-                    file_size,
-                    preview_url,
-                    datetime.utcnow().isoformat(),
-                ),
-            )
-
-            conn.commit()
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"Asset save failed: {e}")
@@ -688,15 +826,14 @@ class DatabaseManager:
 
     def get_asset(self, project_id: str, filename: str) -> Optional[Dict[str, Any]]:
         """Get asset metadata."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT * FROM generated_assets WHERE project_id = ? AND filename = ?",
-            (project_id, filename),
-        )
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute(
+                "SELECT * FROM generated_assets WHERE project_id = ? AND filename = ?",
+                (project_id, filename),
+            )
+            row = cursor.fetchone()
 
         if row:
             return dict(row)
@@ -712,23 +849,24 @@ class DatabaseManager:
         progress: float = 0.0,
         message: Optional[str] = None,
     ) -> bool:
-        """Add a generation stage for progress tracking."""
+        """Add a generation stage for progress tracking (buffered with write-behind)."""
+        if self.write_buffer:
+            self.write_buffer.add_generation_stage(project_id, stage_name, status, progress, message)
+            return True
+
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                INSERT INTO generation_stages (
-                    project_id, stage_name, status, progress, message, started_at
+                cursor.execute(
+                    """
+                    INSERT INTO generation_stages (
+                        project_id, stage_name, status, progress, message, started_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (project_id, stage_name, status, progress, message, datetime.utcnow().isoformat()),
                 )
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (project_id, stage_name, status, progress, message, datetime.utcnow().isoformat()),
-            )
-
-            conn.commit()
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"Stage add failed: {e}")
@@ -742,58 +880,58 @@ class DatabaseManager:
         progress: float,
         message: Optional[str] = None,
     ):
-        """Update a generation stage."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """Update a generation stage (buffered with write-behind)."""
+        if self.write_buffer:
+            self.write_buffer.update_generation_stage(project_id, stage_name, status, progress, message)
+            return
 
-        updates = ["status = ?", "progress = ?"]
-        params = [status, progress]
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        if message:
-            updates.append("message = ?")
-            params.append(message)
+            updates = ["status = ?", "progress = ?"]
+            params = [status, progress]
 
-        if status == "completed":
-            updates.append("completed_at = ?")
-            params.append(datetime.utcnow().isoformat())
+            if message:
+                updates.append("message = ?")
+                params.append(message)
 
-        params.extend([project_id, stage_name])
+            if status == "completed":
+                updates.append("completed_at = ?")
+                params.append(datetime.utcnow().isoformat())
 
-        cursor.execute(
-            f"UPDATE generation_stages SET {', '.join(updates)} WHERE project_id = ? AND stage_name = ?",
-            params,
-        )
+            params.extend([project_id, stage_name])
 
-        conn.commit()
-        conn.close()
+            cursor.execute(
+                f"UPDATE generation_stages SET {', '.join(updates)} WHERE project_id = ? AND stage_name = ?",
+                params,
+            )
 
     # ==================== STATISTICS ====================
 
     def get_user_statistics(self, user_id: str) -> Dict[str, Any]:
         """Get user statistics."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # User info
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        user = dict(cursor.fetchone())
+        self._flush_pending()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        # Project counts
-        cursor.execute(
-            """
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as processing,
-                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed
-            FROM projects
-            WHERE user_id = ?
-        """,
-            (user_id,),
-        )
-        stats = dict(cursor.fetchone())
+            # User info
+            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+            user = dict(cursor.fetchone())
 
-        conn.close()
+            # Project counts
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
+                    SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as processing,
+                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed
+                FROM projects
+                WHERE user_id = ?
+            """,
+                (user_id,),
+            )
+            stats = dict(cursor.fetchone())
 
         return {
             "user_id": user_id,
@@ -808,6 +946,85 @@ class DatabaseManager:
         }
 
 
+class AsyncDatabaseManager:
+    """
+    Async facade over DatabaseManager for use from async request handlers.
+
+    Every public DatabaseManager method is available as a coroutine that runs
+    on a dedicated thread pool sized to the connection pool, so queries never
+    block the event loop and never queue behind unrelated executor work.
+    """
+
+    def __init__(
+        self,
+        manager: Optional[DatabaseManager] = None,
+        max_workers: Optional[int] = None,
+        **manager_kwargs,
+    ):
+        """
+        Initialize async database facade.
+
+        Args:
+            manager: DatabaseManager to wrap (created from manager_kwargs if omitted)
+            max_workers: Query threads (defaults to the connection pool size)
+            **manager_kwargs: Arguments for a new DatabaseManager
+        """
+        self.manager = manager or DatabaseManager(**manager_kwargs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.manager.pool.size,
+            thread_name_prefix="voxel-db",
+        )
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name == "manager":
+            raise AttributeError(name)
+        method = getattr(self.manager, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def run_in_executor(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, run_in_executor)
+        return run_in_executor
+
+    async def close(self):
+        """Wait for running queries, then close the executor and connections."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.manager.close()
+
+
+def create_database(url: Optional[str] = None, **kwargs):
+    """
+    Create the async database backend for a database URL.
+
+    Args:
+        url: ``postgresql://...`` for PostgreSQL; ``sqlite:///path`` or a
+            plain path for SQLite. Defaults to the DATABASE_URL environment
+            variable, then to SQLite at data/voxel.db.
+        **kwargs: Backend options (pool sizes, timeouts, ...)
+
+    Returns:
+        PostgresDatabaseManager or AsyncDatabaseManager; both expose the
+        DatabaseManager methods as coroutines
+    """
+    url = url or os.getenv("DATABASE_URL") or "data/voxel.db"
+
+    if url.startswith(("postgres://", "postgresql://")):
+        from api.postgres_database import PostgresDatabaseManager
+
+        return PostgresDatabaseManager(url, **kwargs)
+
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    elif "://" in url:
+        raise ValueError(f"Unsupported database URL: {url}")
+    return AsyncDatabaseManager(db_path=url, **kwargs)
+
 # ==================== EXAMPLE USAGE ====================
 
 if __name__ == "__main__":
@@ -0,0 +1,290 @@
+"""
+File Downloads for Voxel API
+Content-hash ETags and HTTP range / conditional request handling for
+streaming asset downloads. Framework-independent; the ASGI response that
+sends the bytes lives in api.responses.
+"""
+
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+ETAG_CHUNK_SIZE = 1024 * 1024
+
+# Types mimetypes does not know, or guesses differently per platform
+ASSET_MEDIA_TYPES = {
+    ".blend": "application/x-blender",
+    ".glb": "model/gltf-binary",
+    ".gltf": "model/gltf+json",
+    ".fbx": "application/octet-stream",
+    ".py": "text/x-python",
+}
+
+# Authenticated content: clients may keep a copy but must revalidate it
+CACHE_CONTROL = "private, no-cache"
+
+
+def new_etag_hasher():
+    """Hasher for content ETags, for callers that see the bytes as they are written."""
+    return hashlib.sha256()
+
+
+def etag_from_hasher(hasher) -> str:
+    """Strong ETag for the bytes fed to a new_etag_hasher()."""
+    return f'"{hasher.hexdigest()}"'
+
+
+def compute_etag(path, chunk_size: int = ETAG_CHUNK_SIZE) -> str:
+    """
+    Compute a strong ETag from file content.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read at a time
+
+    Returns:
+        Quoted ETag string
+    """
+    hasher = new_etag_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return etag_from_hasher(hasher)
+
+
+def guess_media_type(filename: str) -> str:
+    """Media type for a download, covering 3D formats mimetypes does not know."""
+    suffix = Path(filename).suffix.lower()
+    if suffix in ASSET_MEDIA_TYPES:
+        return ASSET_MEDIA_TYPES[suffix]
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    """Compare an If-None-Match / If-Range value against an ETag."""
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _parse_http_date(value: str) -> Optional[float]:
+    """Parse an HTTP date into a timestamp (None if invalid)."""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        header: Range header value, e.g. ``bytes=0-499`` or ``bytes=-500``
+        size: Size of the file in bytes
+
+    Returns:
+        (offset, length) of the requested bytes, or None if the header
+        should be ignored (malformed, another unit, or several ranges)
+
+    Raises:
+        ValueError: If the range cannot be satisfied for this size
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = min(int(last), size)
+        if length == 0:
+            raise ValueError(f"Range {header!r} not satisfiable for {size} bytes")
+        return size - length, length
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"Range {header!r} not satisfiable for {size} bytes")
+    return start, end - start + 1
+
+
+@dataclass
+class DownloadPlan:
+    """Status, headers and byte span to send for one request."""
+
+    status: int
+    headers: Dict[str, str]
+    offset: int = 0
+    length: int = 0
+
+
+@dataclass
+class FileDownload:
+    """A file to serve, with the validators used for conditional requests."""
+
+    path: Path
+    size: int
+    mtime: float
+    etag: str
+    filename: Optional[str] = None
+    media_type: str = "application/octet-stream"
+    last_modified: str = field(init=False)
+
+    def __post_init__(self):
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+
+    @classmethod
+    def from_path(
+        cls,
+        path,
+        etag: Optional[str] = None,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ) -> "FileDownload":
+        """
+        Describe a file on disk.
+
+        Args:
+            path: File to serve
+            etag: Precomputed ETag (computed from content if omitted)
+            filename: Download filename for Content-Disposition
+            media_type: Content type (guessed from the filename if omitted)
+            stat_result: os.stat() of the file, if already known
+
+        Returns:
+            FileDownload for the file
+        """
+        path = Path(path)
+        stat_result = stat_result or path.stat()
+        return cls(
+            path=path,
+            size=stat_result.st_size,
+            mtime=stat_result.st_mtime,
+            etag=etag or compute_etag(path),
+            filename=filename,
+            media_type=media_type or guess_media_type(filename or path.name),
+        )
+
+    def _validator_headers(self) -> Dict[str, str]:
+        return {
+            "etag": self.etag,
+            "last-modified": self.last_modified,
+            "cache-control": CACHE_CONTROL,
+        }
+
+    def _not_modified(self, headers: Mapping[str, str]) -> bool:
+        """Evaluate If-None-Match, or If-Modified-Since when it is absent."""
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, self.etag, weak=True)
+
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is not None:
+            since = _parse_http_date(if_modified_since)
+            return since is not None and int(self.mtime) <= since
+        return False
+
+    def _range_applies(self, headers: Mapping[str, str]) -> bool:
+        """Evaluate If-Range: ranges only apply to the version the client has."""
+        if_range = headers.get("if-range")
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', "W/")):
+            return _etag_matches(if_range, self.etag, weak=False)
+        return if_range == self.last_modified
+
+    def plan(self, method: str, headers: Mapping[str, str]) -> DownloadPlan:
+        """
+        Decide how to answer a request for this file.
+
+        Handles If-None-Match / If-Modified-Since (304), single byte ranges
+        with If-Range (206), and unsatisfiable ranges (416). Multiple ranges
+        and malformed Range headers are ignored and the whole file is sent.
+
+        Args:
+            method: HTTP method
+            headers: Request headers with lower-case names
+
+        Returns:
+            DownloadPlan; HEAD requests get the GET headers with no body
+        """
+        method = method.upper()
+        validators = self._validator_headers()
+
+        if method in ("GET", "HEAD") and self._not_modified(headers):
+            return DownloadPlan(304, validators)
+
+        response_headers = {
+            **validators,
+            "accept-ranges": "bytes",
+            "content-type": self.media_type,
+        }
+        if self.filename:
+            response_headers["content-disposition"] = _content_disposition(self.filename)
+
+        span = None
+        range_header = headers.get("range")
+        if method == "GET" and range_header and self._range_applies(headers):
+            try:
+                span = parse_range(range_header, self.size)
+            except ValueError:
+                return DownloadPlan(
+                    416, {**validators, "content-range": f"bytes */{self.size}", "content-length": "0"}
+                )
+
+        if span is None:
+            response_headers["content-length"] = str(self.size)
+            return DownloadPlan(200, response_headers, 0, self.size)
+
+        offset, length = span
+        response_headers["content-length"] = str(length)
+        response_headers["content-range"] = f"bytes {offset}-{offset + length - 1}/{self.size}"
+        return DownloadPlan(206, response_headers, offset, length)
+
+
+def _content_disposition(filename: str) -> str:
+    """Attachment header, RFC 5987-encoded when the name is not plain ASCII."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def recorded_before(file_mtime: float, recorded_at: Optional[str]) -> bool:
+    """Whether a file was last modified no later than an ISO UTC timestamp."""
+    if not recorded_at:
+        return False
+    try:
+        recorded = datetime.fromisoformat(recorded_at)
+    except ValueError:
+        return False
+    if recorded.tzinfo is None:
+        recorded = recorded.replace(tzinfo=timezone.utc)
+    return file_mtime <= recorded.timestamp()
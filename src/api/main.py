@@ -8,22 +8,26 @@ Provides RESTful endpoints and WebSocket support for real-time updates.
 
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import asyncio
+import threading
+from collections import OrderedDict
 from pathlib import Path
 import uuid
 from datetime import datetime, timedelta
 import json
 
 from api.schemas import *
-from api.database import DatabaseManager
+from api.database import create_database
 from api.auth import AuthManager
 from api.storage import StorageManager
+from api.responses import FileDownloadResponse
 from api.websocket_manager import WebSocketManager
 from orchestrator.async_scene_orchestrator import AsyncSceneOrchestrator
 from utils.logger import get_logger, setup_logging
+from voxel.core.shared import shared_component
 from voxel.validation import BlenderScriptValidator
 
 # Initialize logging
@@ -54,12 +58,19 @@ app.add_middleware(
 )
 
 # Initialize managers
-db = DatabaseManager()
+db = create_database()
 auth = AuthManager()
 storage = StorageManager()
 ws_manager = WebSocketManager()
 security = HTTPBearer()
-script_validator = BlenderScriptValidator()
+script_validator = shared_component("script_validator", BlenderScriptValidator)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush buffered database writes and close connections."""
+    await db.close()
+
 
 # ============================================================================
 # DEPENDENCIES
@@ -336,16 +347,8 @@ async def download_file(
             detail="File not found"
         )
 
-    file_path = Path(file_info["file_path"])
-
-    if not file_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found on storage"
-        )
-
-    return FileResponse(
-        path=file_path,
+    return await file_download(
+        Path(file_info["file_path"]),
         filename=file_info["filename"],
         media_type="application/octet-stream"
     )
@@ -513,38 +516,49 @@ async def run_generation(
 
 
 async def collect_assets(project_id: str, result: Dict[str, Any]) -> List[GeneratedAsset]:
-    """Collect generated assets from result."""
+    """Collect generated assets from result and record them with their ETags."""
     assets = []
 
     output_path = result.get("output_path")
     if output_path and Path(output_path).exists():
-        file_path = Path(output_path)
-        assets.append(GeneratedAsset(
-            asset_id=str(uuid.uuid4()),
-            name=file_path.name,
-            type="scene",
-            format=file_path.suffix.lstrip("."),
-            size=file_path.stat().st_size,
-            url=f"/api/projects/{project_id}/assets/{file_path.name}",
-            thumbnail_url=None
-        ))
+        assets.append(await record_asset(project_id, Path(output_path), "scene", thumbnail=False))
 
     render_path = result.get("render_path")
     if render_path and Path(render_path).exists():
-        file_path = Path(render_path)
-        assets.append(GeneratedAsset(
-            asset_id=str(uuid.uuid4()),
-            name=file_path.name,
-            type="render",
-            format=file_path.suffix.lstrip("."),
-            size=file_path.stat().st_size,
-            url=f"/api/projects/{project_id}/assets/{file_path.name}",
-            thumbnail_url=f"/api/projects/{project_id}/assets/{file_path.name}"
-        ))
+        assets.append(await record_asset(project_id, Path(render_path), "render", thumbnail=True))
 
     return assets
 
 
+async def record_asset(project_id: str, file_path: Path, asset_type: str, thumbnail: bool) -> GeneratedAsset:
+    """Describe a generated file and store it with its content ETag."""
+    url = f"/api/projects/{project_id}/assets/{file_path.name}"
+    asset = GeneratedAsset(
+        asset_id=str(uuid.uuid4()),
+        name=file_path.name,
+        type=asset_type,
+        format=file_path.suffix.lstrip("."),
+        size=file_path.stat().st_size,
+        url=url,
+        thumbnail_url=url if thumbnail else None,
+        etag=await asyncio.to_thread(storage.get_etag, str(file_path))
+    )
+
+    # Downloads on any worker or after a restart reuse the stored ETag
+    # instead of hashing the file again
+    await db.add_generated_asset(
+        asset.asset_id,
+        project_id,
+        asset_type,
+        asset.name,
+        str(file_path),
+        asset.size,
+        preview_url=asset.thumbnail_url,
+        etag=asset.etag
+    )
+    return asset
+
+
 # ============================================================================
 # WEBSOCKET
 # ============================================================================
@@ -652,6 +666,74 @@ async def delete_project(
 # DOWNLOADS
 # ============================================================================
 
+# Validated combined scripts: (path, mtime_ns, size) -> file to serve,
+# least recently used first
+VALIDATED_SCRIPT_CACHE_SIZE = 1024
+_validated_scripts: "OrderedDict[Tuple[str, int, int], Path]" = OrderedDict()
+_validated_scripts_lock = threading.Lock()
+
+
+async def file_download(
+    path: Path,
+    filename: Optional[str] = None,
+    media_type: Optional[str] = None,
+    asset: Optional[Dict] = None,
+) -> FileDownloadResponse:
+    """Stream a file with Range, ETag and Last-Modified support."""
+    download = await asyncio.to_thread(
+        storage.get_download,
+        str(path),
+        filename,
+        media_type,
+        asset.get("etag") if asset else None,
+        asset.get("created_at") if asset else None,
+    )
+    if download is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on storage")
+    return FileDownloadResponse(download)
+
+
+def validated_script(script_path: Path) -> Path:
+    """
+    Validate a combined script once per version and return the file to serve.
+
+    The fixed version is written next to the script when validation changes
+    it; unchanged scripts are served without being read again.
+    """
+    stat_result = script_path.stat()
+    key = (str(script_path), stat_result.st_mtime_ns, stat_result.st_size)
+    with _validated_scripts_lock:
+        served = _validated_scripts.get(key)
+        if served is not None:
+            _validated_scripts.move_to_end(key)
+    if served is not None and served.exists():
+        return served
+
+    validation_result = script_validator.validate_script(script_path.read_text())
+
+    if validation_result.errors:
+        logger.error(f"Final script validation failed for {script_path}:")
+        for error in validation_result.errors:
+            logger.error(f"  - {error}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Script validation failed. Please try regenerating."
+        )
+
+    served = script_path
+    if validation_result.fixed_script:
+        served = script_path.with_suffix('.py.fixed')
+        if not served.exists() or served.read_text() != validation_result.fixed_script:
+            served.write_text(validation_result.fixed_script)
+            logger.info(f"Fixed script saved to {served}")
+
+    with _validated_scripts_lock:
+        _validated_scripts[key] = served
+        while len(_validated_scripts) > VALIDATED_SCRIPT_CACHE_SIZE:
+            _validated_scripts.popitem(last=False)
+    return served
+
+
 @app.post("/api/download", response_model=DownloadResponse, tags=["Downloads"])
 async def create_download(
     request: DownloadRequest,
@@ -718,34 +800,11 @@ async def download_asset(
                 combined_scripts = list(scripts_dir.glob('combined_*.py'))
                 if combined_scripts:
                     latest_combined = max(combined_scripts, key=lambda x: x.stat().st_mtime)
-                    
-                    # Final validation before serving
-                    script_content = latest_combined.read_text()
-                    validation_result = script_validator.validate_script(script_content)
-                    
-                    if validation_result.errors:
-                        logger.error(f"Final script validation failed for {latest_combined}:")
-                        for error in validation_result.errors:
-                            logger.error(f"  - {error}")
-                        raise HTTPException(
-                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail="Script validation failed. Please try regenerating."
-                        )
-                    
-                    # Use fixed script if available
-                    if validation_result.fixed_script:
-                        # Save the fixed version
-                        fixed_path = latest_combined.with_suffix('.py.fixed')
-                        fixed_path.write_text(validation_result.fixed_script)
-                        logger.info(f"Fixed script saved to {fixed_path}")
-                        return FileResponse(
-                            path=fixed_path,
-                            filename=f"voxel_complete_script_{project_id}.py",
-                            media_type="text/plain"
-                        )
-                    
-                    return FileResponse(
-                        path=latest_combined,
+
+                    # Final validation before serving (fixed version if needed)
+                    served_script = await asyncio.to_thread(validated_script, latest_combined)
+                    return await file_download(
+                        served_script,
                         filename=f"voxel_complete_script_{project_id}.py",
                         media_type="text/plain"
                     )
@@ -756,8 +815,8 @@ async def download_asset(
                 
                 if complete_scripts:
                     latest_complete = max(complete_scripts, key=lambda x: x.stat().st_mtime)
-                    return FileResponse(
-                        path=latest_complete,
+                    return await file_download(
+                        latest_complete,
                         filename=f"voxel_complete_script_{project_id}.py",
                         media_type="text/plain"
                     )
@@ -767,11 +826,9 @@ async def download_asset(
                 detail="Complete compiled script not found"
             )
 
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="application/octet-stream"
-    )
+    # ETag recorded when the asset was created, if it is in the database
+    asset = await db.get_asset(project_id, filename)
+    return await file_download(file_path, filename=filename, asset=asset)
 
 
 @app.get("/api/projects/{project_id}/complete-script", tags=["Downloads"])
@@ -794,8 +851,8 @@ async def download_complete_script(
     combined_scripts = list(scripts_dir.glob('combined_*.py'))
     if combined_scripts:
         latest_combined = max(combined_scripts, key=lambda x: x.stat().st_mtime)
-        return FileResponse(
-            path=latest_combined,
+        return await file_download(
+            latest_combined,
             filename=f"voxel_complete_script_{project_id}.py",
             media_type="text/plain"
         )
@@ -807,8 +864,8 @@ async def download_complete_script(
     
     if complete_scripts:
         latest_complete = max(complete_scripts, key=lambda x: x.stat().st_mtime)
-        return FileResponse(
-            path=latest_complete,
+        return await file_download(
+            latest_complete,
             filename=f"voxel_complete_script_{project_id}.py",
             media_type="text/plain"
         )
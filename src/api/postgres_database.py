@@ -0,0 +1,563 @@
+"""
+PostgreSQL Database Backend for Voxel API
+Async implementation of the DatabaseManager interface on an asyncpg pool,
+so several API replicas can share one database.
+"""
+
+import json
+import asyncio
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+from api.schemas import ProjectDetails, ProjectSummary
+from api.database import (
+    _PROJECT_PAGE_QUERY,
+    _decode_cursor,
+    _project_details_from_row,
+    _project_page_from_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+# Serializes schema creation between replicas starting at the same time
+_SCHEMA_LOCK_ID = 0x766F78656C
+
+# Timestamps stay ISO-8601 TEXT, as on SQLite, so rows, cursors and API
+# responses are identical on both backends.
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id TEXT PRIMARY KEY,
+        email TEXT UNIQUE NOT NULL,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        subscription_tier TEXT DEFAULT 'free',
+        total_generations INTEGER DEFAULT 0,
+        total_downloads INTEGER DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS projects (
+        project_id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+        prompt TEXT NOT NULL,
+        status TEXT NOT NULL,
+        progress DOUBLE PRECISION DEFAULT 0.0,
+        current_stage TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        completed_at TEXT,
+        estimated_time DOUBLE PRECISION,
+        error_message TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS project_agents (
+        project_id TEXT NOT NULL REFERENCES projects (project_id) ON DELETE CASCADE,
+        agent_type TEXT NOT NULL,
+        PRIMARY KEY (project_id, agent_type)
+    );
+
+    CREATE TABLE IF NOT EXISTS context_files (
+        file_id TEXT PRIMARY KEY,
+        project_id TEXT NOT NULL REFERENCES projects (project_id) ON DELETE CASCADE,
+        agent_type TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        context_type TEXT NOT NULL,
+        file_size BIGINT NOT NULL,
+        uploaded_at TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS generated_assets (
+        asset_id TEXT PRIMARY KEY,
+        project_id TEXT NOT NULL REFERENCES projects (project_id) ON DELETE CASCADE,
+        asset_type TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        file_size BIGINT NOT NULL,
+        preview_url TEXT,
+        created_at TEXT NOT NULL,
+        etag TEXT
+    );
+    ALTER TABLE generated_assets ADD COLUMN IF NOT EXISTS etag TEXT;
+
+    CREATE TABLE IF NOT EXISTS generation_stages (
+        stage_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        project_id TEXT NOT NULL REFERENCES projects (project_id) ON DELETE CASCADE,
+        stage_name TEXT NOT NULL,
+        status TEXT NOT NULL,
+        progress DOUBLE PRECISION DEFAULT 0.0,
+        message TEXT,
+        started_at TEXT,
+        completed_at TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS project_settings (
+        project_id TEXT PRIMARY KEY REFERENCES projects (project_id) ON DELETE CASCADE,
+        mode TEXT NOT NULL,
+        settings_json TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status);
+    CREATE INDEX IF NOT EXISTS idx_context_files_project ON context_files (project_id);
+    CREATE INDEX IF NOT EXISTS idx_stages_project ON generation_stages (project_id, stage_id);
+    CREATE INDEX IF NOT EXISTS idx_stages_project_name ON generation_stages (project_id, stage_name);
+    CREATE INDEX IF NOT EXISTS idx_projects_user_created ON projects (user_id, created_at, project_id);
+    CREATE INDEX IF NOT EXISTS idx_projects_user_status_created
+        ON projects (user_id, status, created_at, project_id);
+    CREATE INDEX IF NOT EXISTS idx_assets_project_created
+        ON generated_assets (project_id, created_at, asset_id, asset_type, filename);
+"""
+
+# Same shape as the SQLite details query, with json_agg for the child rows
+_PROJECT_DETAILS_QUERY = """
+    SELECT
+        p.*,
+        s.mode,
+        s.settings_json,
+        (SELECT COALESCE(json_agg(agent_type), '[]')
+         FROM project_agents WHERE project_id = $1)::text AS agents_json,
+        (SELECT COALESCE(json_agg(json_build_object(
+            'asset_id', asset_id, 'project_id', project_id, 'asset_type', asset_type,
+            'filename', filename, 'file_size', file_size, 'preview_url', preview_url,
+            'etag', etag, 'created_at', created_at)), '[]')
+         FROM generated_assets WHERE project_id = $1)::text AS assets_json,
+        (SELECT COALESCE(json_agg(json_build_object(
+            'stage_id', stage_id, 'stage_name', stage_name, 'status', status,
+            'progress', progress, 'message', message,
+            'started_at', started_at, 'completed_at', completed_at)), '[]')
+         FROM generation_stages WHERE project_id = $1)::text AS stages_json
+    FROM projects p
+    LEFT JOIN project_settings s ON s.project_id = p.project_id
+    WHERE p.project_id = $1
+"""
+
+
+class PostgresDatabaseManager:
+    """
+    PostgreSQL backend with the same methods as DatabaseManager, as coroutines.
+
+    It is a drop-in replacement for AsyncDatabaseManager. Connections come
+    from an asyncpg pool, and asyncpg prepares each statement on the server
+    the first time a connection runs it, then reuses it from the
+    connection's statement cache. Writes go straight to the database:
+    PostgreSQL handles concurrent writers itself, so there is no
+    write-behind buffer and ``flush()`` does nothing.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        statement_cache_size: int = 256,
+        command_timeout: Optional[float] = 30.0,
+        **pool_kwargs,
+    ):
+        """
+        Initialize PostgreSQL database manager.
+
+        The pool is created, and the schema checked, on first use.
+
+        Args:
+            dsn: PostgreSQL connection URL
+            min_size: Connections kept open in the pool
+            max_size: Maximum number of pooled connections
+            statement_cache_size: Prepared statements cached per connection
+            command_timeout: Seconds before a query is cancelled
+            **pool_kwargs: Extra arguments for asyncpg.create_pool
+        """
+        if asyncpg is None:
+            raise ImportError(
+                "asyncpg is required for the PostgreSQL backend: pip install 'voxel[postgres]'"
+            )
+
+        self.dsn = dsn
+        self.db_type = "postgresql"
+        self._pool_options = {
+            "min_size": min_size,
+            "max_size": max_size,
+            "statement_cache_size": statement_cache_size,
+            "command_timeout": command_timeout,
+            **pool_kwargs,
+        }
+        self.pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        """Create the connection pool and schema on first use."""
+        if self.pool is None:
+            async with self._pool_lock:
+                if self.pool is None:
+                    pool = await asyncpg.create_pool(self.dsn, **self._pool_options)
+                    async with pool.acquire() as conn:
+                        async with conn.transaction():
+                            await conn.execute("SELECT pg_advisory_xact_lock($1)", _SCHEMA_LOCK_ID)
+                            await conn.execute(_SCHEMA)
+                    self.pool = pool
+                    logger.info("PostgreSQL connection pool initialized")
+        return self.pool
+
+    async def flush(self):
+        """Writes are not buffered on PostgreSQL; kept for interface parity."""
+
+    async def close(self):
+        """Close pooled connections."""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def _fetchrow(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        """Run a query and return its first row as a dict."""
+        pool = await self._get_pool()
+        row = await pool.fetchrow(query, *args)
+        return dict(row) if row else None
+
+    async def _execute(self, query: str, *args):
+        """Run a statement on a pooled connection."""
+        pool = await self._get_pool()
+        return await pool.execute(query, *args)
+
+    # ==================== USER OPERATIONS ====================
+
+    async def create_user(
+        self,
+        user_id: str,
+        email: str,
+        username: str,
+        password_hash: str,
+        subscription_tier: str = "free",
+    ) -> bool:
+        """Create a new user; False if the email or username is taken."""
+        try:
+            await self._execute(
+                """
+                INSERT INTO users (user_id, email, username, password_hash, created_at, subscription_tier)
+                VALUES ($1, $2, $3, $4, $5, $6)
+            """,
+                user_id, email, username, password_hash, datetime.utcnow().isoformat(), subscription_tier,
+            )
+            logger.info(f"Created user: {username} ({email})")
+            return True
+        except asyncpg.UniqueViolationError as e:
+            logger.error(f"User creation failed: {e}")
+            return False
+
+    async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get user by email address."""
+        return await self._fetchrow("SELECT * FROM users WHERE email = $1", email)
+
+    async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """Get user by username."""
+        return await self._fetchrow("SELECT * FROM users WHERE username = $1", username)
+
+    async def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get user by ID."""
+        return await self._fetchrow("SELECT * FROM users WHERE user_id = $1", user_id)
+
+    async def verify_credentials(self, email: str, password_hash: str) -> Optional[Dict[str, Any]]:
+        """Verify user credentials; returns the user if they match."""
+        user = await self.get_user_by_email(email)
+        if user and user["password_hash"] == password_hash:
+            return user
+        return None
+
+    async def update_user_stats(self, user_id: str, generations: int = 0, downloads: int = 0):
+        """Update user statistics."""
+        await self._execute(
+            """
+            UPDATE users
+            SET total_generations = total_generations + $1,
+                total_downloads = total_downloads + $2
+            WHERE user_id = $3
+        """,
+            generations, downloads, user_id,
+        )
+
+    # ==================== PROJECT OPERATIONS ====================
+
+    async def create_project(
+        self,
+        project_id: str,
+        user_id: str,
+        prompt: str,
+        agents: List[str],
+        settings: Dict[str, Any],
+    ) -> bool:
+        """Create a new project with its agents and settings."""
+        try:
+            pool = await self._get_pool()
+            now = datetime.utcnow().isoformat()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(
+                        """
+                        INSERT INTO projects (
+                            project_id, user_id, prompt, status, progress,
+                            created_at, updated_at
+                        )
+                        VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    """,
+                        project_id, user_id, prompt, "pending", 0.0, now, now,
+                    )
+                    await conn.executemany(
+                        "INSERT INTO project_agents (project_id, agent_type) VALUES ($1, $2)",
+                        [(project_id, agent) for agent in agents],
+                    )
+                    await conn.execute(
+                        "INSERT INTO project_settings (project_id, mode, settings_json) VALUES ($1, $2, $3)",
+                        project_id, settings.get("mode", "automatic"), json.dumps(settings),
+                    )
+            logger.info(f"Created project {project_id} for user {user_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Project creation failed: {e}")
+            return False
+
+    async def get_project(self, project_id: str) -> Optional[ProjectDetails]:
+        """Get complete project details in a single query."""
+        row = await self._fetchrow(_PROJECT_DETAILS_QUERY, project_id)
+        return _project_details_from_row(row) if row else None
+
+    async def list_projects(
+        self,
+        user_id: str,
+        limit: int = 20,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> List[ProjectSummary]:
+        """List user projects, newest first."""
+        return (await self.list_projects_page(user_id, limit=limit, status=status, cursor=cursor))[0]
+
+    async def list_projects_page(
+        self,
+        user_id: str,
+        limit: int = 20,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ProjectSummary], Optional[str]]:
+        """List a page of user projects with keyset pagination; see DatabaseManager."""
+        params: List[Any] = [user_id]
+        filters = ["user_id = $1"]
+
+        if status:
+            params.append(status)
+            filters.append(f"status = ${len(params)}")
+
+        if cursor:
+            params.extend(_decode_cursor(cursor))
+            filters.append(f"(created_at, project_id) < (${len(params) - 1}, ${len(params)})")
+
+        params.append(limit + 1)
+        query = _PROJECT_PAGE_QUERY.format(filters=" AND ".join(filters), limit=f"${len(params)}")
+
+        pool = await self._get_pool()
+        rows = await pool.fetch(query, *params)
+        return _project_page_from_rows(rows, limit)
+
+    async def update_project_status(
+        self,
+        project_id: str,
+        status: str,
+        progress: Optional[float] = None,
+        current_stage: Optional[str] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Update project status and progress."""
+        status = getattr(status, "value", status)
+        now = datetime.utcnow().isoformat()
+        values: Dict[str, Any] = {"status": status, "updated_at": now}
+        if progress is not None:
+            values["progress"] = progress
+        if current_stage is not None:
+            values["current_stage"] = current_stage
+        if error_message is not None:
+            values["error_message"] = error_message
+        if status == "completed":
+            values["completed_at"] = now
+
+        columns = ", ".join(f"{column} = ${n}" for n, column in enumerate(values, 1))
+        await self._execute(
+            f"UPDATE projects SET {columns} WHERE project_id = ${len(values) + 1}",
+            *values.values(), project_id,
+        )
+
+    async def delete_project(self, project_id: str) -> bool:
+        """Delete a project and all associated data."""
+        try:
+            await self._execute("DELETE FROM projects WHERE project_id = $1", project_id)
+            logger.info(f"Deleted project {project_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Project deletion failed: {e}")
+            return False
+
+    async def count_projects(self, user_id: str, status: Optional[str] = None) -> int:
+        """Count user projects."""
+        pool = await self._get_pool()
+        if status:
+            return await pool.fetchval(
+                "SELECT COUNT(*) FROM projects WHERE user_id = $1 AND status = $2", user_id, status
+            )
+        return await pool.fetchval("SELECT COUNT(*) FROM projects WHERE user_id = $1", user_id)
+
+    # ==================== CONTEXT FILE OPERATIONS ====================
+
+    async def save_context_file(
+        self,
+        file_id: str,
+        project_id: str,
+        agent_type: str,
+        filename: str,
+        file_path: str,
+        context_type: str,
+        file_size: int,
+    ) -> bool:
+        """Save context file metadata."""
+        try:
+            await self._execute(
+                """
+                INSERT INTO context_files (
+                    file_id, project_id, agent_type, filename, file_path,
+                    context_type, file_size, uploaded_at
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            """,
+                file_id, project_id, agent_type, filename, file_path,
+                context_type, file_size, datetime.utcnow().isoformat(),
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Context file save failed: {e}")
+            return False
+
+    async def get_context_file(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Get context file metadata."""
+        return await self._fetchrow("SELECT * FROM context_files WHERE file_id = $1", file_id)
+
+    async def list_context_files(self, project_id: str) -> List[Dict[str, Any]]:
+        """List all context files for a project."""
+        pool = await self._get_pool()
+        rows = await pool.fetch("SELECT * FROM context_files WHERE project_id = $1", project_id)
+        return [dict(row) for row in rows]
+
+    # ==================== ASSET OPERATIONS ====================
+
+    async def add_generated_asset(
+        self,
+        asset_id: str,
+        project_id: str,
+        asset_type: str,
+        filename: str,
+        file_path: str,
+        file_size: int,
+        preview_url: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> bool:
+        """Add a generated asset to a project, with its content ETag if known."""
+        try:
+            await self._execute(
+                """
+                INSERT INTO generated_assets (
+                    asset_id, project_id, asset_type, filename, file_path,
+                    file_size, preview_url, created_at, etag
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            """,
+                asset_id, project_id, asset_type, filename, file_path,
+                file_size, preview_url, datetime.utcnow().isoformat(), etag,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Asset save failed: {e}")
+            return False
+
+    async def get_asset(self, project_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Get asset metadata."""
+        return await self._fetchrow(
+            "SELECT * FROM generated_assets WHERE project_id = $1 AND filename = $2",
+            project_id, filename,
+        )
+
+    # ==================== STAGE OPERATIONS ====================
+
+    async def add_generation_stage(
+        self,
+        project_id: str,
+        stage_name: str,
+        status: str = "pending",
+        progress: float = 0.0,
+        message: Optional[str] = None,
+    ) -> bool:
+        """Add a generation stage for progress tracking."""
+        try:
+            await self._execute(
+                """
+                INSERT INTO generation_stages (
+                    project_id, stage_name, status, progress, message, started_at
+                )
+                VALUES ($1, $2, $3, $4, $5, $6)
+            """,
+                project_id, stage_name, status, progress, message, datetime.utcnow().isoformat(),
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Stage add failed: {e}")
+            return False
+
+    async def update_generation_stage(
+        self,
+        project_id: str,
+        stage_name: str,
+        status: str,
+        progress: float,
+        message: Optional[str] = None,
+    ):
+        """Update a generation stage."""
+        values: Dict[str, Any] = {"status": status, "progress": progress}
+        if message:
+            values["message"] = message
+        if status == "completed":
+            values["completed_at"] = datetime.utcnow().isoformat()
+
+        columns = ", ".join(f"{column} = ${n}" for n, column in enumerate(values, 1))
+        await self._execute(
+            f"UPDATE generation_stages SET {columns} "
+            f"WHERE project_id = ${len(values) + 1} AND stage_name = ${len(values) + 2}",
+            *values.values(), project_id, stage_name,
+        )
+
+    # ==================== STATISTICS ====================
+
+    async def get_user_statistics(self, user_id: str) -> Dict[str, Any]:
+        """Get user statistics."""
+        user = await self.get_user_by_id(user_id)
+        stats = await self._fetchrow(
+            """
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
+                SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as processing,
+                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed
+            FROM projects
+            WHERE user_id = $1
+        """,
+            user_id,
+        )
+
+        return {
+            "user_id": user_id,
+            "total_projects": stats["total"],
+            "completed_projects": stats["completed"] or 0,
+            "processing_projects": stats["processing"] or 0,
+            "failed_projects": stats["failed"] or 0,
+            "total_generations": user["total_generations"],
+            "total_downloads": user["total_downloads"],
+            "subscription_tier": user["subscription_tier"],
+            "member_since": user["created_at"],
+        }
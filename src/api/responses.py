@@ -0,0 +1,126 @@
+"""
+Streaming File Responses for Voxel API
+ASGI response that serves a FileDownload with range and conditional request
+support, handing the transfer to the server's sendfile when it offers one.
+"""
+
+import os
+from typing import Mapping, Optional
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from api.downloads import FileDownload
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+PATH_SEND_EXTENSION = "http.response.pathsend"
+
+
+class FileDownloadResponse(Response):
+    """
+    Response streaming (part of) a file without loading it into memory.
+
+    Status and headers come from FileDownload.plan(): 304 when the client's
+    copy is current, 206 for a satisfiable Range, 416 otherwise. The body is
+    sent with the best transfer the server supports:
+
+    - ``http.response.zerocopysend``: the server sendfile()s the span
+    - ``http.response.pathsend``: the server sends the whole file by path
+    - otherwise: ``chunk_size`` reads with os.pread in a worker thread
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        download: FileDownload,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        """
+        Initialize file download response.
+
+        Args:
+            download: File to serve
+            headers: Extra response headers
+            background: Task to run after the response is sent
+        """
+        self.download = download
+        self.status_code = 200
+        self.media_type = None  # set per request from the plan
+        self.background = background
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+        method = scope.get("method", "GET").upper()
+        plan = self.download.plan(method, request_headers)
+        self.status_code = plan.status
+
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1")) for name, value in plan.headers.items()
+        ]
+        await send({"type": "http.response.start", "status": plan.status, "headers": headers + self.raw_headers})
+
+        if method == "HEAD" or not plan.length:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            spec_version = tuple(map(int, scope.get("asgi", {}).get("spec_version", "2.0").split(".")))
+            if spec_version >= (2, 4):
+                # Servers report disconnects by raising from send()
+                await self._send_body(scope, send, plan.offset, plan.length)
+            else:
+                await self._send_body_until_disconnect(scope, receive, send, plan.offset, plan.length)
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_body_until_disconnect(self, scope: Scope, receive: Receive, send: Send, offset: int, length: int):
+        """Send the body, stopping early if the client goes away."""
+        async with anyio.create_task_group() as task_group:
+
+            async def stream():
+                await self._send_body(scope, send, offset, length)
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(stream)
+            while True:
+                if (await receive())["type"] == "http.disconnect":
+                    task_group.cancel_scope.cancel()
+                    break
+
+    async def _send_body(self, scope: Scope, send: Send, offset: int, length: int):
+        """Send length bytes of the file starting at offset."""
+        extensions = scope.get("extensions") or {}
+        path = self.download.path
+
+        if ZERO_COPY_EXTENSION in extensions:
+            file = await anyio.to_thread.run_sync(open, path, "rb")
+            try:
+                await send({"type": ZERO_COPY_EXTENSION, "file": file, "offset": offset, "count": length})
+            finally:
+                file.close()
+            return
+
+        if PATH_SEND_EXTENSION in extensions and offset == 0 and length == self.download.size:
+            await send({"type": PATH_SEND_EXTENSION, "path": str(path)})
+            return
+
+        fd = await anyio.to_thread.run_sync(os.open, path, os.O_RDONLY)
+        try:
+            position, end = offset, offset + length
+            while position < end:
+                chunk = await anyio.to_thread.run_sync(os.pread, fd, min(self.chunk_size, end - position), position)
+                if not chunk:
+                    break  # File shrank since it was planned
+                position += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": position < end})
+            if position < end:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            os.close(fd)
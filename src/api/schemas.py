@@ -218,6 +218,7 @@ class GeneratedAsset(BaseModel):
     size: int = Field(..., description="File size in bytes")
     url: str = Field(..., description="Download URL")
     thumbnail_url: Optional[str] = Field(None, description="Thumbnail preview URL")
+    etag: Optional[str] = Field(None, description="Content ETag recorded when the asset was created")
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -0,0 +1,178 @@
+"""
+SQLite Connection Pool for Voxel API
+Keeps a bounded set of configured SQLite connections so queries reuse open
+connections (and their prepared-statement caches) instead of reconnecting.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when a connection is requested from a closed pool."""
+
+
+class SQLiteConnectionPool:
+    """
+    Bounded pool of SQLite connections in WAL mode.
+
+    Connections are opened lazily up to ``size`` and handed out one caller at
+    a time. They run in autocommit mode: reads need no transaction, and
+    ``transaction()`` starts writes with ``BEGIN IMMEDIATE`` so a writer takes
+    the write lock up front and waits for it (up to ``busy_timeout``) instead
+    of failing when it upgrades a read lock.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 5,
+        busy_timeout: float = 5.0,
+        cached_statements: int = 256,
+        acquire_timeout: Optional[float] = 30.0,
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_path: Path to SQLite database file
+            size: Maximum number of open connections
+            busy_timeout: Seconds to wait for a lock held by another connection
+            cached_statements: Prepared statements kept per connection
+            acquire_timeout: Seconds to wait for a free connection (None waits forever)
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.db_path = db_path
+        self.size = size
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        self.stats = {"connections_opened": 0, "acquired": 0, "waited": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Take a connection from the pool, opening one if under the limit.
+
+        Returns:
+            An open connection; give it back with release()
+
+        Raises:
+            PoolClosedError: If the pool has been closed
+            TimeoutError: If no connection frees up within acquire_timeout
+        """
+        if self._closed:
+            raise PoolClosedError("Connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+                with self._lock:
+                    self.stats["connections_opened"] += 1
+            else:
+                with self._lock:
+                    self.stats["waited"] += 1
+                try:
+                    conn = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No database connection available after {self.acquire_timeout}s"
+                    ) from None
+
+        with self._lock:
+            self.stats["acquired"] += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, rolling back any open transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for reads (autocommit)."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection inside a write transaction, committed on success."""
+        conn = self.acquire()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close idle connections; borrowed ones are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                **self.stats,
+                "open": self._opened,
+                "idle": self._idle.qsize(),
+                "size": self.size,
+            }
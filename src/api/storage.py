@@ -6,12 +6,22 @@ Handles file uploads, downloads, and temporary URL generation.
 import os
 import secrets
 import shutil
+import threading
 import mimetypes
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, BinaryIO
+from typing import Optional, Dict, Any, BinaryIO, Tuple
 import logging
 
+from api.downloads import (
+    FileDownload,
+    compute_etag,
+    etag_from_hasher,
+    new_etag_hasher,
+    recorded_before,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +36,7 @@ class StorageManager:
         base_storage_path: str = "data/storage",
         temp_url_expire_minutes: int = 60,
         max_file_size_mb: int = 500,
+        etag_cache_size: int = 4096,
     ):
         """
         Initialize storage manager.
@@ -34,6 +45,7 @@ class StorageManager:
             base_storage_path: Base directory for file storage
             temp_url_expire_minutes: Expiration time for temporary download URLs
             max_file_size_mb: Maximum allowed file size in megabytes
+            etag_cache_size: Number of file versions whose ETags are kept
         """
         self.base_storage_path = Path(base_storage_path)
         self.temp_url_expire_minutes = temp_url_expire_minutes
@@ -50,6 +62,12 @@ class StorageManager:
         # Temporary URL storage (in-memory for simplicity, use Redis in production)
         self.temp_urls: Dict[str, Dict[str, Any]] = {}
 
+        # Content ETags keyed by (path, mtime_ns, size), so a file is hashed
+        # once per version; files written here are hashed as they are written
+        self.etag_cache_size = etag_cache_size
+        self._etags: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+
         logger.info(f"StorageManager initialized at {self.base_storage_path}")
 
     # ==================== FILE UPLOAD OPERATIONS ====================
@@ -92,6 +110,7 @@ class StorageManager:
 
         # Save file with size check
         file_size = 0
+        hasher = new_etag_hasher()
         with open(file_path, "wb") as f:
             while True:
                 chunk = file_data.read(8192)  # Read in 8KB chunks
@@ -108,6 +127,9 @@ class StorageManager:
                     )
 
                 f.write(chunk)
+                hasher.update(chunk)
+
+        etag = self._remember_etag(file_path, etag_from_hasher(hasher))
 
         # Detect MIME type
         mime_type, _ = mimetypes.guess_type(safe_filename)
@@ -119,6 +141,7 @@ class StorageManager:
             "file_path": str(file_path),
             "file_size": file_size,
             "mime_type": mime_type,
+            "etag": etag,
             "user_id": user_id,
             "project_id": project_id,
             "uploaded_at": datetime.utcnow().isoformat(),
@@ -168,6 +191,7 @@ class StorageManager:
 
         with open(file_path, "wb") as f:
             f.write(content)
+        etag = self._remember_etag(file_path, self._content_etag(content))
 
         # Detect MIME type
         mime_type, _ = mimetypes.guess_type(safe_filename)
@@ -179,6 +203,7 @@ class StorageManager:
             "file_path": str(file_path),
             "file_size": len(content),
             "mime_type": mime_type,
+            "etag": etag,
             "user_id": user_id,
             "project_id": project_id,
             "uploaded_at": datetime.utcnow().isoformat(),
@@ -218,6 +243,7 @@ class StorageManager:
         # Save file
         with open(file_path, "wb") as f:
             f.write(content)
+        etag = self._remember_etag(file_path, self._content_etag(content))
 
         # Detect MIME type
         mime_type, _ = mimetypes.guess_type(safe_filename)
@@ -227,6 +253,7 @@ class StorageManager:
             "file_path": str(file_path),
             "file_size": len(content),
             "mime_type": mime_type,
+            "etag": etag,
             "asset_type": asset_type,
             "project_id": project_id,
             "created_at": datetime.utcnow().isoformat(),
@@ -277,6 +304,7 @@ class StorageManager:
             "file_path": str(dest_path),
             "file_size": file_size,
             "mime_type": mime_type,
+            "etag": self.get_etag(str(dest_path)),
             "asset_type": asset_type,
             "project_id": project_id,
             "created_at": datetime.utcnow().isoformat(),
@@ -304,7 +332,9 @@ class StorageManager:
 
     def read_file(self, file_path: str) -> Optional[bytes]:
         """
-        Read file content.
+        Read file content into memory.
+
+        Use get_download() to serve files; it streams them instead.
 
         Args:
             file_path: File path string
@@ -318,6 +348,98 @@ class StorageManager:
                 return f.read()
         return None
 
+    def get_etag(
+        self,
+        file_path: str,
+        recorded_etag: Optional[str] = None,
+        recorded_at: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ) -> Optional[str]:
+        """
+        Get the content ETag of a file, hashing it only once per version.
+
+        Args:
+            file_path: File path string
+            recorded_etag: ETag stored when the file was created (e.g. in the
+                database), trusted if the file is unchanged since recorded_at
+            recorded_at: ISO UTC timestamp the ETag was recorded at
+            stat_result: os.stat() of the file, if already known
+
+        Returns:
+            Quoted ETag, or None if the file does not exist
+        """
+        path = Path(file_path)
+        try:
+            stat_result = stat_result or path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = (str(path), stat_result.st_mtime_ns, stat_result.st_size)
+        with self._etag_lock:
+            etag = self._etags.get(key)
+            if etag is not None:
+                self._etags.move_to_end(key)
+                return etag
+
+        if recorded_etag and recorded_before(stat_result.st_mtime, recorded_at):
+            etag = recorded_etag
+        else:
+            etag = compute_etag(path)
+        return self._remember_etag(path, etag, stat_result)
+
+    def get_download(
+        self,
+        file_path: str,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+        recorded_etag: Optional[str] = None,
+        recorded_at: Optional[str] = None,
+    ) -> Optional[FileDownload]:
+        """
+        Describe a file for a streaming download.
+
+        Hashes the file on first use if no ETag is known for this version;
+        call it off the event loop.
+
+        Args:
+            file_path: File path string
+            filename: Download filename (defaults to the file's name)
+            media_type: Content type (guessed from the filename if omitted)
+            recorded_etag: ETag stored when the file was created
+            recorded_at: ISO UTC timestamp the ETag was recorded at
+
+        Returns:
+            FileDownload, or None if the file does not exist
+        """
+        path = self.get_file_path(file_path)
+        if not path:
+            return None
+
+        stat_result = path.stat()
+        return FileDownload.from_path(
+            path,
+            etag=self.get_etag(str(path), recorded_etag, recorded_at, stat_result),
+            filename=filename or path.name,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+
+    def _remember_etag(self, path: Path, etag: str, stat_result: Optional[os.stat_result] = None) -> str:
+        """Cache the ETag of the current version of a file."""
+        stat_result = stat_result or path.stat()
+        with self._etag_lock:
+            self._etags[(str(path), stat_result.st_mtime_ns, stat_result.st_size)] = etag
+            while len(self._etags) > self.etag_cache_size:
+                self._etags.popitem(last=False)
+        return etag
+
+    @staticmethod
+    def _content_etag(content: bytes) -> str:
+        """ETag for in-memory content."""
+        hasher = new_etag_hasher()
+        hasher.update(content)
+        return etag_from_hasher(hasher)
+
     def get_project_asset(
         self,
         project_id: str,
@@ -239,6 +239,30 @@ class WebSocketManager:
 
         await self.broadcast_to_project(project_id, update)
 
+    async def send_agent_output(
+        self,
+        project_id: str,
+        agent: str,
+        delta: str,
+    ):
+        """
+        Forward a chunk of streamed agent output (e.g. partial script text).
+
+        Args:
+            project_id: Project identifier
+            agent: Agent role producing the output
+            delta: Newly generated text
+        """
+        update = {
+            "type": "agent_output",
+            "project_id": project_id,
+            "agent": agent,
+            "delta": delta,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+        await self.broadcast_to_project(project_id, update)
+
     async def send_asset_generated(
         self,
         project_id: str,
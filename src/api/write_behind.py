@@ -0,0 +1,305 @@
+"""
+Write-Behind Buffer for Voxel API
+Coalesces the stream of stage and progress updates a generation emits and
+writes them in one transaction per flush instead of one per update.
+"""
+
+import atexit
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Project statuses after which no more progress updates are expected
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
+class _PendingProject:
+    """Buffered writes for one project."""
+
+    __slots__ = ("project", "stage_inserts", "stage_updates")
+
+    def __init__(self):
+        # Column values for the projects row, merged across updates
+        self.project: Dict[str, Any] = {}
+        # New generation_stages rows for this project (shared with the
+        # buffer's ordered insert list, so updates reach them)
+        self.stage_inserts: List[Dict[str, Any]] = []
+        # Column values per stage name for rows already in the database
+        self.stage_updates: Dict[str, Dict[str, Any]] = {}
+
+
+class WriteBehindBuffer:
+    """
+    Coalescing write-behind buffer for project status and generation stages.
+
+    Updates are merged per project as they arrive: repeated status or
+    progress updates collapse into one UPDATE, and updates to a stage that is
+    still buffered are folded into its INSERT. A background thread flushes
+    everything pending in a single transaction every ``flush_interval``
+    seconds; terminal project statuses, ``flush()`` and ``close()`` flush
+    immediately. The buffer also flushes at interpreter exit. If the
+    transaction fails, the batch is put back ahead of newer updates and
+    the error is raised (or logged by the background flusher).
+
+    Applying the merged writes gives the same rows as applying every update
+    in order, so readers that flush first see no difference.
+    """
+
+    def __init__(self, transaction, flush_interval: float = 0.25):
+        """
+        Initialize write-behind buffer.
+
+        Args:
+            transaction: Callable returning a context manager that yields a
+                connection inside a write transaction
+            flush_interval: Seconds between background flushes
+        """
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+
+        self._transaction = transaction
+        self.flush_interval = flush_interval
+
+        self._pending: Dict[str, _PendingProject] = {}
+        # New stage rows across all projects, in the order they were added
+        self._inserts: List[Dict[str, Any]] = []
+        # Projects in the batch a flush is currently writing
+        self._in_flight: frozenset = frozenset()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"updates": 0, "flushes": 0, "rows_written": 0, "failed_flushes": 0}
+
+        atexit.register(self.close)
+
+    # ==================== BUFFERING ====================
+
+    def update_project_status(
+        self,
+        project_id: str,
+        status: str,
+        progress: Optional[float] = None,
+        current_stage: Optional[str] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Buffer a project status update; terminal statuses flush immediately."""
+        status = getattr(status, "value", status)
+        now = datetime.utcnow().isoformat()
+        values: Dict[str, Any] = {"status": status, "updated_at": now}
+        if progress is not None:
+            values["progress"] = progress
+        if current_stage is not None:
+            values["current_stage"] = current_stage
+        if error_message is not None:
+            values["error_message"] = error_message
+        if status == "completed":
+            values["completed_at"] = now
+
+        with self._lock:
+            self._project(project_id).project.update(values)
+            self._queued()
+
+        if status in TERMINAL_STATUSES:
+            self.flush()
+
+    def add_generation_stage(
+        self,
+        project_id: str,
+        stage_name: str,
+        status: str = "pending",
+        progress: float = 0.0,
+        message: Optional[str] = None,
+    ):
+        """Buffer a new generation stage row."""
+        row = {
+            "project_id": project_id,
+            "stage_name": stage_name,
+            "status": status,
+            "progress": progress,
+            "message": message,
+            "started_at": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self._project(project_id).stage_inserts.append(row)
+            self._inserts.append(row)
+            self._queued()
+
+    def update_generation_stage(
+        self,
+        project_id: str,
+        stage_name: str,
+        status: str,
+        progress: float,
+        message: Optional[str] = None,
+    ):
+        """Buffer an update to every stage of the project with this name."""
+        values: Dict[str, Any] = {"status": status, "progress": progress}
+        if message:
+            values["message"] = message
+        if status == "completed":
+            values["completed_at"] = datetime.utcnow().isoformat()
+
+        with self._lock:
+            pending = self._project(project_id)
+            # Stored rows and rows still waiting to be inserted both match
+            pending.stage_updates.setdefault(stage_name, {}).update(values)
+            for row in pending.stage_inserts:
+                if row["stage_name"] == stage_name:
+                    row.update(values)
+            self._queued()
+
+    def discard(self, project_id: str):
+        """Drop buffered writes for a project (e.g. before deleting it)."""
+        # Wait out an in-flight flush so a failed batch cannot bring them back
+        with self._flush_lock, self._lock:
+            pending = self._pending.pop(project_id, None)
+            if pending and pending.stage_inserts:
+                self._inserts = [row for row in self._inserts if row["project_id"] != project_id]
+
+    def has_pending(self, project_id: Optional[str] = None) -> bool:
+        """Whether writes for a project (or any project) are buffered or being flushed."""
+        with self._lock:
+            if project_id:
+                return project_id in self._pending or project_id in self._in_flight
+            return bool(self._pending or self._in_flight)
+
+    def _project(self, project_id: str) -> _PendingProject:
+        """Pending writes for a project (caller holds the lock)."""
+        pending = self._pending.get(project_id)
+        if pending is None:
+            pending = self._pending[project_id] = _PendingProject()
+        return pending
+
+    def _queued(self):
+        """Count an update and make sure the flusher runs (caller holds the lock)."""
+        self.stats["updates"] += 1
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(
+                target=self._run, name="voxel-db-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    # ==================== FLUSHING ====================
+
+    def flush(self) -> int:
+        """
+        Write everything pending in one transaction.
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        # Serialize flushes so batches commit in the order they were taken
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                inserts, self._inserts = self._inserts, []
+                self._in_flight = frozenset(pending)
+            if not pending:
+                return 0
+
+            rows = 0
+            try:
+                with self._transaction() as conn:
+                    cursor = conn.cursor()
+                    for project_id, writes in pending.items():
+                        rows += self._write_updates(cursor, project_id, writes)
+                    # Updates went first so they only touched rows stored before
+                    # this batch; buffered rows already carry them
+                    for row in inserts:
+                        cursor.execute(
+                            f"INSERT INTO generation_stages ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                            list(row.values()),
+                        )
+                    rows += len(inserts)
+            except Exception:
+                with self._lock:
+                    self._requeue(pending, inserts)
+                    self.stats["failed_flushes"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight = frozenset()
+
+            with self._lock:
+                self.stats["flushes"] += 1
+                self.stats["rows_written"] += rows
+            return rows
+
+    def _requeue(self, pending: Dict[str, _PendingProject], inserts: List[Dict[str, Any]]):
+        """
+        Put back a batch whose transaction failed (caller holds the lock).
+
+        The batch is older than anything buffered since it was taken, so
+        newer values are merged over it and its rows are inserted first.
+        """
+        for project_id, newer in self._pending.items():
+            older = pending.get(project_id)
+            if older is None:
+                pending[project_id] = newer
+                continue
+            older.project.update(newer.project)
+            for stage_name, values in newer.stage_updates.items():
+                older.stage_updates.setdefault(stage_name, {}).update(values)
+                # Newer updates also apply to the batch's unwritten rows
+                for row in older.stage_inserts:
+                    if row["stage_name"] == stage_name:
+                        row.update(values)
+            older.stage_inserts.extend(newer.stage_inserts)
+        self._pending = pending
+        self._inserts = inserts + self._inserts
+
+    @staticmethod
+    def _write_updates(cursor, project_id: str, writes: _PendingProject) -> int:
+        """Apply one project's merged updates to stored rows."""
+        rows = 0
+        if writes.project:
+            columns = ", ".join(f"{column} = ?" for column in writes.project)
+            cursor.execute(
+                f"UPDATE projects SET {columns} WHERE project_id = ?",
+                [*writes.project.values(), project_id],
+            )
+            rows += 1
+
+        for stage_name, values in writes.stage_updates.items():
+            columns = ", ".join(f"{column} = ?" for column in values)
+            cursor.execute(
+                f"UPDATE generation_stages SET {columns} WHERE project_id = ? AND stage_name = ?",
+                [*values.values(), project_id, stage_name],
+            )
+            rows += 1
+        return rows
+
+    def _run(self):
+        """Background loop flushing pending writes every flush_interval."""
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                self._wakeup.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+
+    def close(self):
+        """Stop the background flusher and flush what is left."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        atexit.unregister(self.close)
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer statistics."""
+        with self._lock:
+            return {**self.stats, "pending_projects": len(self._pending)}
@@ -10,7 +10,8 @@ import asyncio
 from typing import Dict, Any, Optional
 from enum import Enum
 from orchestrator.agent_framework import AgentInterface, AgentResult
-from src.utils.logger import get_logger
+from utils.logger import get_logger
+from voxel.voxelweaver.context_alignment import ContextAligner
 
 # Import subsystems - temporarily disabled for missing modules
 # from src.subsystems.prompt_interpreter import PromptInterpreter
@@ -41,9 +42,25 @@ class LightingAI:
 
 class SpatialValidator:
     def __init__(self, config=None):
-        pass
+        tolerance = (config or {}).get("collision_tolerance", 0.01)
+        self.aligner = ContextAligner(collision_tolerance=tolerance)
     def validate(self, data):
-        return {"valid": True}
+        return {"valid": self.check(data)["status"] == "pass"}
+    def check(self, scene_data):
+        overlaps = self.aligner.find_overlaps(scene_data.get("objects", []))
+        return {
+            "status": "fail" if overlaps else "pass",
+            "report": {"total_issues": len(overlaps), "overlaps": overlaps},
+        }
+    def apply(self, scene_data):
+        objects = scene_data.get("objects", [])
+        aligned = self.aligner.align_objects(objects)["objects"]
+        return {
+            **scene_data,
+            "objects": [
+                {**obj, "position": a["position"]} for obj, a in zip(objects, aligned, strict=True)
+            ],
+        }
 
 class RenderDirector:
     def __init__(self, config=None):
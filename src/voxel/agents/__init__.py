@@ -15,7 +15,11 @@ from voxel.agents.scene_analyzer import SceneAnalyzerAgent
 from voxel.agents.importer import ImporterAgent
 
 # New enhancement agents
-from voxel.agents.rigging import RiggingAgent
+try:
+    from voxel.agents.rigging import RiggingAgent
+except ImportError:
+    # Rigging agent is optional and may not be installed
+    RiggingAgent = None
 from voxel.agents.compositing import CompositingAgent
 from voxel.agents.sequence import SequenceAgent
 
@@ -6,6 +6,46 @@ from typing import Any, Optional
 from voxel.core.agent import Agent, AgentConfig
 from voxel.core.models import AgentResponse, AgentRole, ReviewFeedback
 
+# Pipeline stages the reviewer can attribute feedback to
+REVIEW_STAGES = ["concept", "builder", "texture", "hdr", "render", "animation"]
+
+# Keywords that tie a piece of feedback to the stage that produces it
+STAGE_KEYWORDS = {
+    "concept": ["concept", "theme", "story", "overall idea", "prompt alignment", "match the prompt"],
+    "builder": [
+        "geometry", "object", "mesh", "model", "shape", "proportion", "scale", "size",
+        "position", "placement", "modifier", "missing", "detail",
+    ],
+    "texture": [
+        "material", "texture", "shader", "color", "colour", "roughness", "metallic",
+        "surface", "reflect",
+    ],
+    "hdr": ["hdr", "hdri", "sky", "environment", "world", "background", "atmosphere", "fog"],
+    "render": [
+        "lighting", "light", "camera", "angle", "composition", "framing", "shadow",
+        "exposure", "render", "samples", "denois", "lens", "focal",
+    ],
+    "animation": ["animation", "animate", "keyframe", "motion", "movement", "frame range", "easing"],
+}
+
+
+def classify_feedback_stages(feedback_text: str) -> list[str]:
+    """
+    Map free-form review feedback to the pipeline stages it criticises.
+
+    Args:
+        feedback_text: Improvement items and recommendations from a review
+
+    Returns:
+        Matching stages in pipeline order (empty if nothing matched)
+    """
+    text = feedback_text.lower()
+    return [
+        stage
+        for stage in REVIEW_STAGES
+        if any(keyword in text for keyword in STAGE_KEYWORDS[stage])
+    ]
+
 
 class ReviewerAgent(Agent):
     """Agent responsible for reviewing generated scenes and providing feedback."""
@@ -49,6 +89,8 @@ constructive feedback on how well they match the original prompt and overall qua
 **Recommendations:**
 [Detailed paragraph about what should be changed and why]
 
+**Affected Stages:** [comma-separated list from: concept, builder, texture, hdr, render, animation]
+
 **Should Refine:** [YES/NO]
 ```
 
@@ -71,6 +113,11 @@ constructive feedback on how well they match the original prompt and overall qua
 - Are materials varied and interesting?
 - Is the camera angle effective?
 
+**Affected Stages** should name only the stages whose output must change: concept
+(overall scene idea), builder (geometry), texture (materials), hdr (world and sky),
+render (camera, lights, render settings) or animation. Fixing only the lighting
+should list just render and/or hdr.
+
 Provide actionable feedback that other agents can use to improve the scene.
 """
 
@@ -112,6 +159,19 @@ Provide actionable feedback that other agents can use to improve the scene.
         )
         recommendations = rec_match.group(1).strip() if rec_match else ""
 
+        # Extract the stages the feedback applies to, falling back to keywords
+        affected_stages = []
+        stages_match = re.search(r"\*\*Affected Stages:\*\*\s*(.+)", response_text)
+        if stages_match:
+            affected_stages = [
+                stage for stage in REVIEW_STAGES
+                if re.search(rf"\b{stage}\b", stages_match.group(1).lower())
+            ]
+        if not affected_stages:
+            affected_stages = classify_feedback_stages(
+                "\n".join(improvements) + "\n" + recommendations
+            )
+
         # Extract should refine
         refine_match = re.search(r"\*\*Should Refine:\*\*\s*(YES|NO)", response_text)
         should_refine = (
@@ -125,6 +185,7 @@ Provide actionable feedback that other agents can use to improve the scene.
             improvements=improvements,
             suggestions=recommendations,
             should_refine=should_refine,
+            affected_stages=affected_stages,
         )
 
         return AgentResponse(
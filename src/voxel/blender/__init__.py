@@ -1,6 +1,7 @@
 """Blender integration layer for executing scripts and managing renders."""
 
+from voxel.blender.artifact_store import ArtifactKey, ArtifactStore
 from voxel.blender.executor import BlenderExecutor
 from voxel.blender.script_manager import ScriptManager
 
-__all__ = ["BlenderExecutor", "ScriptManager"]
+__all__ = ["ArtifactKey", "ArtifactStore", "BlenderExecutor", "ScriptManager"]
@@ -0,0 +1,158 @@
+"""Content-addressed store for reusing .blend files and renders across sessions."""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArtifactKey:
+    """Everything that determines the output of a Blender build and render."""
+    script_hash: str
+    engine: str
+    samples: int
+    resolution_percentage: int = 100
+
+    def digest(self) -> str:
+        """Get a filesystem-safe digest of the key."""
+        key_string = f"{self.script_hash}|{self.engine}|{self.samples}|{self.resolution_percentage}"
+        return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(source: Path, destination: Path) -> bool:
+    """
+    Hardlink source to destination, copying if linking is not possible.
+
+    Returns:
+        True if a hardlink was created
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+        return True
+    except OSError:
+        shutil.copy2(source, destination)
+        return False
+
+
+class ArtifactStore:
+    """
+    Reuses the .blend file and render of byte-identical Blender jobs.
+
+    Entries are directories named by the digest of an ArtifactKey holding
+    ``scene.blend`` and ``render.png``. Both are hardlinked in and out, so
+    a reused job costs two directory entries rather than a Blender run or a
+    file copy; the store should therefore live on the same filesystem as the
+    session output directory. Entries are written to a temporary directory
+    and renamed into place, so readers never see a partial entry.
+    """
+
+    BLEND_NAME = "scene.blend"
+    IMAGE_NAME = "render.png"
+
+    def __init__(self, root: Path):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding stored artifacts
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.bytes_reused = 0
+
+    def _entry_dir(self, key: ArtifactKey) -> Path:
+        """Get the directory for a key."""
+        digest = key.digest()
+        return self.root / digest[:2] / digest
+
+    def fetch(self, key: ArtifactKey, blend_file: Path, image_file: Path) -> bool:
+        """
+        Link stored artifacts for a key into a session, if present.
+
+        Args:
+            key: Job key
+            blend_file: Where the .blend file should appear
+            image_file: Where the render should appear
+
+        Returns:
+            True on a hit (both files are in place)
+        """
+        entry = self._entry_dir(key)
+        stored_blend = entry / self.BLEND_NAME
+        stored_image = entry / self.IMAGE_NAME
+
+        if not (stored_blend.exists() and stored_image.exists()):
+            with self._lock:
+                self.misses += 1
+            return False
+
+        try:
+            _link_or_copy(stored_blend, blend_file)
+            _link_or_copy(stored_image, image_file)
+        except OSError as e:
+            logger.warning(f"Could not reuse stored artifacts {entry.name[:12]}: {e}")
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_reused += stored_blend.stat().st_size + stored_image.stat().st_size
+        logger.info(f"Reused stored Blender artifacts {entry.name[:12]}")
+        return True
+
+    def store(self, key: ArtifactKey, blend_file: Path, image_file: Path) -> None:
+        """
+        Add the artifacts of a finished job to the store.
+
+        Args:
+            key: Job key
+            blend_file: The job's .blend file
+            image_file: The job's render
+        """
+        entry = self._entry_dir(key)
+        if entry.exists() or not (blend_file.exists() and image_file.exists()):
+            return
+
+        staging = self.root / f".tmp-{uuid.uuid4().hex}"
+        try:
+            _link_or_copy(blend_file, staging / self.BLEND_NAME)
+            _link_or_copy(image_file, staging / self.IMAGE_NAME)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(staging, entry)
+        except OSError as e:
+            # Another session stored the same key first, or the copy failed
+            logger.debug(f"Artifact store skipped {entry.name[:12]}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        with self._lock:
+            self.stores += 1
+        logger.debug(f"Stored Blender artifacts {entry.name[:12]}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "root": str(self.root),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "bytes_reused": self.bytes_reused,
+            }
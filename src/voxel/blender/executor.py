@@ -2,15 +2,20 @@
 
 import logging
 import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
+from voxel.blender.worker_pool import BlenderWorkerPool
 from voxel.core.config import Config
 from voxel.core.models import BlenderScriptResult
 
 logger = logging.getLogger(__name__)
 
+# Blender stdout lines worth forwarding while a render runs
+RENDER_PROGRESS_PREFIXES = ("Fra:", "Saved:", "Render complete", "✅ Scene saved")
+
 
 class BlenderExecutor:
     """Executes Python scripts in Blender."""
@@ -28,6 +33,15 @@ class BlenderExecutor:
         if not self.blender_path.exists():
             raise FileNotFoundError(f"Blender not found at {self.blender_path}")
 
+        # Keep Blender processes warm instead of paying startup on every call
+        self.worker_pool: Optional[BlenderWorkerPool] = None
+        if getattr(config, "blender_worker_pool", False):
+            self.worker_pool = BlenderWorkerPool(
+                [str(self.blender_path)],
+                size=config.blender_pool_size,
+                max_jobs_per_worker=config.blender_worker_max_jobs,
+            )
+
     def execute_script(
         self,
         script_path: Path,
@@ -45,6 +59,10 @@ class BlenderExecutor:
         Returns:
             BlenderScriptResult with execution details
         """
+        if background and self.worker_pool is not None:
+            logger.info(f"Executing Blender script in worker pool: {script_path}")
+            return self.worker_pool.run_job(script_path, timeout=timeout)
+
         start_time = time.time()
 
         try:
@@ -127,6 +145,17 @@ class BlenderExecutor:
         Returns:
             BlenderScriptResult with execution details
         """
+        if background and self.worker_pool is not None:
+            logger.info(f"Executing Blender script in worker pool and saving .blend file: {script_path}")
+            result = self.worker_pool.run_job(
+                script_path, save_as=output_blend_path, timeout=timeout
+            )
+            if result.success:
+                logger.info(f"Blend file saved to: {output_blend_path}")
+            else:
+                logger.error(f"Script execution or .blend file creation failed: {result.stderr}")
+            return result
+
         start_time = time.time()
 
         try:
@@ -139,16 +168,7 @@ class BlenderExecutor:
                 cmd.extend(["--python", str(script_path)])
 
             # Add command to save the blend file after script execution
-            save_script = f"""
-import bpy
-
-# Save the current scene as a .blend file
-try:
-    bpy.ops.wm.save_as_mainfile(filepath="{output_blend_path}", check_existing=False)
-    print("✅ Scene saved as .blend file")
-except Exception as e:
-    print(f"❌ Failed to save .blend file: {{e}}")
-"""
+            save_script = self._save_blend_script(output_blend_path)
             
             # Create a temporary script that runs the original script and saves the blend file
             temp_script_path = script_path.parent / f"temp_exec_{script_path.name}"
@@ -254,30 +274,28 @@ except Exception as e:
 
         return results
 
-    def render_scene(
-        self,
-        blend_file: Path,
+    @staticmethod
+    def _save_blend_script(output_blend_path: Path) -> str:
+        """Build the script snippet that saves the current scene as a .blend file."""
+        return f"""
+import bpy
+
+# Save the current scene as a .blend file
+try:
+    bpy.ops.wm.save_as_mainfile(filepath="{output_blend_path}", check_existing=False)
+    print("✅ Scene saved as .blend file")
+except Exception as e:
+    print(f"❌ Failed to save .blend file: {{e}}")
+"""
+
+    @staticmethod
+    def _render_script(
         output_path: Path,
         samples: Optional[int] = None,
         engine: Optional[str] = None,
-        timeout: int = 600,
-    ) -> BlenderScriptResult:
-        """
-        Render a Blender scene to an image.
-
-        Args:
-            blend_file: Path to the .blend file
-            output_path: Where to save the render
-            samples: Number of render samples (overrides file settings)
-            engine: Render engine ('CYCLES' or 'EEVEE')
-            timeout: Maximum render time in seconds
-
-        Returns:
-            BlenderScriptResult with render details
-        """
-        # Create a temporary script for rendering
-        render_script = blend_file.parent / "temp_render.py"
-
+        resolution_percentage: Optional[int] = None,
+    ) -> str:
+        """Build the script snippet that configures and renders the current scene."""
         script_content = f"""
 import bpy
 
@@ -289,21 +307,255 @@ scene.render.image_settings.file_format = 'PNG'
 """
 
         if samples is not None:
-            script_content += f"scene.cycles.samples = {samples}\n"
+            if engine == "EEVEE":
+                script_content += f"scene.eevee.taa_render_samples = {samples}\n"
+            else:
+                script_content += f"scene.cycles.samples = {samples}\n"
 
-        if engine is not None:
+        if engine == "EEVEE":
+            # Blender 4.2 renamed the EEVEE engine identifier
+            script_content += """
+try:
+    scene.render.engine = 'BLENDER_EEVEE_NEXT'
+except TypeError:
+    scene.render.engine = 'BLENDER_EEVEE'
+"""
+        elif engine is not None:
             script_content += f"scene.render.engine = '{engine}'\n"
 
+        if resolution_percentage is not None:
+            script_content += f"scene.render.resolution_percentage = {resolution_percentage}\n"
+
         script_content += """
 # Render
 bpy.ops.render.render(write_still=True)
 print(f"Render complete: {scene.render.filepath}")
 """
+        return script_content
+
+    def _run_process(
+        self,
+        cmd: list[str],
+        cwd: Optional[Path],
+        timeout: float,
+        on_progress: Optional[Callable[[str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> tuple[Optional[int], str, str]:
+        """
+        Run a Blender command that can forward progress lines and be cancelled.
+
+        Args:
+            cmd: Command line to run
+            cwd: Working directory
+            timeout: Maximum run time in seconds
+            on_progress: Optional callback for render progress lines as they are printed
+            cancel_event: Optional event that kills the process when set
+
+        Returns:
+            (return code or None if timed out or cancelled, stdout, stderr)
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+        )
+        stdout_lines: list[str] = []
+        stderr_chunks: list[str] = []
+
+        def read_stdout():
+            for line in process.stdout:
+                stdout_lines.append(line)
+                if on_progress is not None and line.startswith(RENDER_PROGRESS_PREFIXES):
+                    try:
+                        on_progress(line.rstrip())
+                    except Exception as e:
+                        logger.warning(f"Render progress callback error: {e}")
+
+        readers = [
+            threading.Thread(target=read_stdout, daemon=True),
+            threading.Thread(
+                target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+
+        returncode: Optional[int] = None
+        deadline = time.monotonic() + timeout
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info("Cancelling Blender process")
+                stderr_chunks.append("Render cancelled\n")
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                stderr_chunks.append(f"Execution timed out after {timeout} seconds\n")
+                break
+            try:
+                returncode = process.wait(timeout=min(remaining, 0.2))
+                break
+            except subprocess.TimeoutExpired:
+                continue
+
+        if returncode is None:
+            process.kill()
+            process.wait()
+
+        for reader in readers:
+            reader.join(timeout=5)
+        return returncode, "".join(stdout_lines), "".join(stderr_chunks)
+
+    def execute_build_and_render(
+        self,
+        script_path: Path,
+        output_blend_path: Path,
+        output_path: Path,
+        samples: Optional[int] = None,
+        engine: Optional[str] = None,
+        timeout: int = 900,
+        on_progress: Optional[Callable[[str], None]] = None,
+        resolution_percentage: Optional[int] = None,
+    ) -> BlenderScriptResult:
+        """
+        Build a scene, save it as a .blend file and render it in one Blender process.
+
+        This avoids the second Blender startup and .blend reload of calling
+        execute_script_and_save_blend followed by render_scene, which remain
+        available for debugging the steps separately.
+
+        Args:
+            script_path: Path to the scene-building Python script
+            output_blend_path: Path where to save the .blend file
+            output_path: Where to save the render
+            samples: Number of render samples (overrides script settings)
+            engine: Render engine ('CYCLES' or 'EEVEE')
+            timeout: Maximum time for build and render in seconds
+            on_progress: Optional callback receiving render progress lines as
+                Blender prints them (runs a dedicated process instead of a
+                pooled worker, since workers only report output at the end)
+            resolution_percentage: Optional render resolution scale (e.g. 25 for previews)
+
+        Returns:
+            BlenderScriptResult with execution details; success requires both
+            the .blend file and the render to exist
+        """
+        # Build the scene, save it, then render in the same session
+        pass_script = script_path.parent / f"temp_pass_{script_path.name}"
+        pass_script.write_text(
+            script_path.read_text()
+            + "\n\n"
+            + self._save_blend_script(output_blend_path)
+            + self._render_script(output_path, samples, engine, resolution_percentage)
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"Building, saving and rendering in one Blender pass: {script_path}")
+        start_time = time.time()
+
+        try:
+            if self.worker_pool is not None and on_progress is None:
+                result = self.worker_pool.run_job(pass_script, timeout=timeout)
+                stdout, stderr, ran = result.stdout, result.stderr, result.success
+            else:
+                cmd = [str(self.blender_path), "--background", "--python", str(pass_script)]
+                if on_progress is not None:
+                    returncode, stdout, stderr = self._run_process(
+                        cmd, script_path.parent, timeout, on_progress
+                    )
+                else:
+                    try:
+                        completed = subprocess.run(
+                            cmd,
+                            capture_output=True,
+                            text=True,
+                            timeout=timeout,
+                            cwd=script_path.parent,
+                        )
+                        returncode, stdout, stderr = (
+                            completed.returncode, completed.stdout, completed.stderr
+                        )
+                    except subprocess.TimeoutExpired:
+                        returncode, stdout = None, ""
+                        stderr = f"Execution timed out after {timeout} seconds"
+                ran = returncode == 0
+
+            success = ran and output_blend_path.exists() and output_path.exists()
+            execution_time = time.time() - start_time
+
+            if success:
+                logger.info(f"Build, save and render completed in {execution_time:.2f}s")
+            else:
+                logger.error(f"Single-pass build and render failed: {stderr}")
+
+            return BlenderScriptResult(
+                success=success,
+                stdout=stdout,
+                stderr=stderr,
+                execution_time=execution_time,
+                script_path=script_path,
+            )
+
+        except Exception as e:
+            execution_time = time.time() - start_time
+            logger.error(f"Error in single-pass build and render: {e}")
+            return BlenderScriptResult(
+                success=False,
+                stdout="",
+                stderr=str(e),
+                execution_time=execution_time,
+                script_path=script_path,
+            )
+
+        finally:
+            if pass_script.exists():
+                pass_script.unlink()
+
+    def render_scene(
+        self,
+        blend_file: Path,
+        output_path: Path,
+        samples: Optional[int] = None,
+        engine: Optional[str] = None,
+        timeout: int = 600,
+        resolution_percentage: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> BlenderScriptResult:
+        """
+        Render a Blender scene to an image.
+
+        Args:
+            blend_file: Path to the .blend file
+            output_path: Where to save the render
+            samples: Number of render samples (overrides file settings)
+            engine: Render engine ('CYCLES' or 'EEVEE')
+            timeout: Maximum render time in seconds
+            resolution_percentage: Optional render resolution scale (e.g. 25 for previews)
+            cancel_event: Optional event that aborts the render when set (runs a
+                dedicated process instead of a pooled worker so it can be killed)
+
+        Returns:
+            BlenderScriptResult with render details
+        """
+        # Create a temporary script for rendering
+        render_script = blend_file.parent / f"temp_render_{output_path.stem}.py"
 
         # Write temporary script
-        render_script.write_text(script_content)
+        render_script.write_text(
+            self._render_script(output_path, samples, engine, resolution_percentage)
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
+            if self.worker_pool is not None and cancel_event is None:
+                result = self.worker_pool.run_job(
+                    render_script, open_blend=blend_file, timeout=timeout
+                )
+                result.success = result.success and output_path.exists()
+                return result
+
             # Execute render
             cmd = [
                 str(self.blender_path),
@@ -314,17 +566,23 @@ print(f"Render complete: {scene.render.filepath}")
             ]
 
             start_time = time.time()
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=timeout
-            )
+            if cancel_event is not None:
+                returncode, stdout, stderr = self._run_process(
+                    cmd, None, timeout, cancel_event=cancel_event
+                )
+            else:
+                result = subprocess.run(
+                    cmd, capture_output=True, text=True, timeout=timeout
+                )
+                returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
             execution_time = time.time() - start_time
 
-            success = result.returncode == 0 and output_path.exists()
+            success = returncode == 0 and output_path.exists()
 
             return BlenderScriptResult(
                 success=success,
-                stdout=result.stdout,
-                stderr=result.stderr,
+                stdout=stdout,
+                stderr=stderr,
                 execution_time=execution_time,
                 script_path=render_script,
             )
@@ -333,3 +591,12 @@ print(f"Render complete: {scene.render.filepath}")
             # Clean up temporary script
             if render_script.exists():
                 render_script.unlink()
+
+    def get_pool_stats(self) -> dict:
+        """Get worker pool statistics (empty when the pool is disabled)."""
+        return self.worker_pool.get_stats() if self.worker_pool is not None else {}
+
+    def shutdown(self) -> None:
+        """Stop any warm Blender worker processes."""
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
@@ -1,14 +1,20 @@
 """Manages Blender Python scripts generated by agents."""
 
+import hashlib
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from voxel.core.shared import shared_component
 from voxel.validation import BlenderScriptValidator, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+# Lines combine_scripts adds that vary between runs without changing behaviour
+_VOLATILE_LINE = re.compile(r"^# (Generated: |Content hash: |===== Script \d+: .* =====$)")
+
 
 class ScriptManager:
     """Manages the lifecycle of generated Blender scripts."""
@@ -22,7 +28,7 @@ class ScriptManager:
         """
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.validator = BlenderScriptValidator()
+        self.validator = shared_component("script_validator", BlenderScriptValidator)
 
     def create_session_dir(self, session_name: Optional[str] = None) -> Path:
         """
@@ -140,6 +146,8 @@ class ScriptManager:
         combined_content.append("from pathlib import Path")
         combined_content.append("\n# ===== Agent Scripts =====\n")
 
+        # Index in combined_content -> source script, for per-fragment validation
+        fragment_sources = {}
         for i, script_path in enumerate(script_paths, 1):
             if script_path is not None and script_path.exists():
                 script_content = script_path.read_text()
@@ -148,14 +156,19 @@ class ScriptManager:
                 cleaned_content = self._clean_script_content(script_content, i == 1)
                 
                 combined_content.append(f"\n# ===== Script {i}: {script_path.name} =====\n")
+                fragment_sources[len(combined_content)] = script_path.name
                 combined_content.append(cleaned_content)
                 combined_content.append("\n")
 
         final_script = "\n".join(combined_content)
         
-        # Validate the combined script
+        # Validate the combined script; fragments unchanged since an earlier
+        # combine (a refinement iteration, say) are not re-analysed
         if validate_combined:
-            validation_result = self.validator.validate_script(final_script)
+            validation_result = self.validator.validate_fragments([
+                (fragment_sources.get(index, "combined script header"), content)
+                for index, content in enumerate(combined_content)
+            ])
             
             if validation_result.errors:
                 logger.error(f"Combined script validation failed:")
@@ -176,11 +189,51 @@ class ScriptManager:
                 if validation_result.fixes_applied:
                     logger.info(f"Applied fixes to combined script: {', '.join(validation_result.fixes_applied)}")
 
+        # Record a hash of the executable content so identical jobs can be deduplicated
+        content_hash = self.compute_content_hash(final_script)
+        final_script = final_script.replace(
+            "\n", f"\n# Content hash: {content_hash}\n", 1
+        )
+
         combined_path.write_text(final_script)
-        logger.info(f"Combined {len(script_paths)} scripts into {combined_path}")
+        logger.info(f"Combined {len(script_paths)} scripts into {combined_path} ({content_hash[:12]})")
 
         return combined_path
 
+    @staticmethod
+    def compute_content_hash(script_content: str) -> str:
+        """
+        Hash a script, ignoring the timestamp and per-session headers added by combine_scripts.
+
+        Args:
+            script_content: Script text
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        for line in script_content.splitlines():
+            if not _VOLATILE_LINE.match(line):
+                digest.update(line.encode("utf-8"))
+                digest.update(b"\n")
+        return digest.hexdigest()
+
+    def get_content_hash(self, script_path: Path) -> str:
+        """
+        Get the content hash of a script produced by combine_scripts.
+
+        Args:
+            script_path: Path to the script
+
+        Returns:
+            Hex SHA-256 digest (read from the header when present)
+        """
+        content = script_path.read_text()
+        for line in content.splitlines()[:5]:
+            if line.startswith("# Content hash: "):
+                return line[len("# Content hash: "):].strip()
+        return self.compute_content_hash(content)
+
     def _clean_script_content(self, content: str, is_first_script: bool = False) -> str:
         """
         Clean up script content by removing duplicate imports and comments.
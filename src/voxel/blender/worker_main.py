@@ -0,0 +1,114 @@
+"""
+Long-lived Blender worker process.
+
+Runs inside Blender (``blender --background --python worker_main.py -- HOST PORT TOKEN``)
+and executes scripts sent by BlenderWorkerPool over a local socket, so the
+Blender startup cost is paid once per worker instead of once per script.
+
+This module runs under Blender's bundled Python and must only use the
+standard library and ``bpy``.
+"""
+
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+_HEADER = struct.Struct("!I")
+
+
+def _send_message(sock, message):
+    """Send a length-prefixed JSON message."""
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    """Read exactly size bytes, or None if the connection closed."""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_message(sock):
+    """Receive a length-prefixed JSON message, or None on EOF."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload.decode("utf-8"))
+
+
+def _reset_scene(bpy):
+    """Return Blender to factory state so jobs cannot leak into each other."""
+    bpy.ops.wm.read_factory_settings(use_empty=False)
+
+
+def _run_job(bpy, job):
+    """Execute a single job and capture its output."""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    success = True
+
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            if job.get("open_blend"):
+                bpy.ops.wm.open_mainfile(filepath=job["open_blend"])
+
+            script_path = job["script_path"]
+            os.chdir(job.get("cwd") or os.path.dirname(script_path))
+            with open(script_path, encoding="utf-8") as f:
+                code = compile(f.read(), script_path, "exec")
+            exec(code, {"__name__": "__main__", "__file__": script_path})
+
+            if job.get("save_as"):
+                bpy.ops.wm.save_as_mainfile(filepath=job["save_as"], check_existing=False)
+    except SystemExit as e:
+        success = e.code in (None, 0)
+    except BaseException:
+        traceback.print_exc(file=stderr)
+        success = False
+
+    return {"success": success, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def main():
+    """Connect to the pool and serve jobs until told to stop."""
+    import bpy
+
+    args = sys.argv[sys.argv.index("--") + 1:]
+    host, port, token = args[0], int(args[1]), args[2]
+
+    sock = socket.create_connection((host, port))
+    _send_message(sock, {"token": token, "pid": os.getpid()})
+
+    while True:
+        job = _recv_message(sock)
+        if job is None or job.get("op") == "shutdown":
+            break
+
+        _send_message(sock, _run_job(bpy, job))
+
+        # Reset after replying so the next job does not wait on it
+        try:
+            _reset_scene(bpy)
+        except Exception:
+            traceback.print_exc()
+            break
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""Pool of warm Blender worker processes."""
+
+import json
+import logging
+import queue
+import secrets
+import socket
+import struct
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from voxel.core.models import BlenderScriptResult
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("worker_main.py")
+
+_HEADER = struct.Struct("!I")
+
+
+class BlenderWorkerError(RuntimeError):
+    """Raised when a Blender worker cannot be started or dies mid-job."""
+
+
+def _send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Send a length-prefixed JSON message."""
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes from the socket."""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise BlenderWorkerError("Blender worker exited unexpectedly")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_message(sock: socket.socket) -> Dict[str, Any]:
+    """Receive a length-prefixed JSON message."""
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+@dataclass
+class PoolMetrics:
+    """Usage statistics for the worker pool."""
+    jobs: int = 0
+    failed_jobs: int = 0
+    workers_started: int = 0
+    workers_recycled: int = 0
+    workers_crashed: int = 0
+    total_startup_time: float = 0.0
+
+    def average_startup_time(self) -> float:
+        """Average seconds spent launching a worker."""
+        return self.total_startup_time / self.workers_started if self.workers_started else 0.0
+
+
+class BlenderWorker:
+    """A single long-lived Blender process connected to the pool."""
+
+    def __init__(self, process: subprocess.Popen, conn: socket.socket, pid: int):
+        self.process = process
+        self.conn = conn
+        self.pid = pid
+        self.jobs_run = 0
+
+    def is_alive(self) -> bool:
+        """Check whether the Blender process is still running."""
+        return self.process.poll() is None
+
+    def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a job and wait for its result."""
+        self.conn.settimeout(timeout)
+        _send_message(self.conn, job)
+        reply = _recv_message(self.conn)
+        self.jobs_run += 1
+        return reply
+
+    def stop(self, graceful: bool = True) -> None:
+        """Stop the worker process."""
+        if graceful and self.is_alive():
+            try:
+                self.conn.settimeout(1.0)
+                _send_message(self.conn, {"op": "shutdown"})
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        if self.is_alive():
+            self.process.kill()
+            self.process.wait()
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+
+class BlenderWorkerPool:
+    """
+    Keeps Blender processes warm and dispatches scripts to them.
+
+    Workers are started lazily up to ``size``, reset to factory settings
+    between jobs, and replaced after ``max_jobs_per_worker`` jobs, on crash
+    or on timeout.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        size: int = 2,
+        max_jobs_per_worker: int = 20,
+        startup_timeout: float = 60.0,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            command: Command that launches Blender (usually just the executable)
+            size: Maximum number of concurrent worker processes
+            max_jobs_per_worker: Jobs a worker runs before it is recycled
+            startup_timeout: Seconds to wait for a new worker to connect
+        """
+        self.command = command
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.startup_timeout = startup_timeout
+        self.metrics = PoolMetrics()
+
+        self._idle: "queue.LifoQueue[Optional[BlenderWorker]]" = queue.LifoQueue()
+        self._live = 0
+        self._lock = threading.Lock()
+        self._spawn_lock = threading.Lock()
+        self._server: Optional[socket.socket] = None
+        self._closed = False
+
+    def run_job(
+        self,
+        script_path: Path,
+        open_blend: Optional[Path] = None,
+        save_as: Optional[Path] = None,
+        timeout: float = 300,
+    ) -> BlenderScriptResult:
+        """
+        Execute a script in a warm Blender worker.
+
+        Args:
+            script_path: Path to the Python script
+            open_blend: Optional .blend file to load before running the script
+            save_as: Optional path to save the resulting scene to
+            timeout: Maximum execution time in seconds
+
+        Returns:
+            BlenderScriptResult with execution details
+        """
+        start_time = time.time()
+        job = {
+            "op": "run",
+            "script_path": str(script_path),
+            "cwd": str(script_path.parent),
+            "open_blend": str(open_blend) if open_blend else None,
+            "save_as": str(save_as) if save_as else None,
+        }
+
+        try:
+            worker = self._acquire()
+        except BlenderWorkerError as e:
+            logger.error(f"Could not start Blender worker: {e}")
+            return BlenderScriptResult(
+                success=False,
+                stderr=str(e),
+                execution_time=time.time() - start_time,
+                script_path=script_path,
+            )
+
+        healthy = False
+        try:
+            reply = worker.run(job, timeout)
+            healthy = True
+            success = bool(reply.get("success"))
+            stdout = reply.get("stdout", "")
+            stderr = reply.get("stderr", "")
+        except TimeoutError:
+            logger.error(f"Blender worker {worker.pid} timed out after {timeout}s")
+            success, stdout, stderr = False, "", f"Execution timed out after {timeout} seconds"
+        except (BlenderWorkerError, OSError) as e:
+            logger.error(f"Blender worker {worker.pid} crashed: {e}")
+            self.metrics.workers_crashed += 1
+            success, stdout, stderr = False, "", str(e)
+        finally:
+            self._release(worker, healthy)
+
+        if save_as is not None and success and not save_as.exists():
+            success = False
+            stderr += f"\n.blend file not created at: {save_as}"
+
+        self.metrics.jobs += 1
+        if not success:
+            self.metrics.failed_jobs += 1
+
+        return BlenderScriptResult(
+            success=success,
+            stdout=stdout,
+            stderr=stderr,
+            execution_time=time.time() - start_time,
+            script_path=script_path,
+        )
+
+    def _acquire(self) -> BlenderWorker:
+        """Get an idle worker, starting a new one if the pool has room."""
+        if self._closed:
+            raise BlenderWorkerError("Blender worker pool is shut down")
+
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = None
+                with self._lock:
+                    can_spawn = self._live < self.size
+                    if can_spawn:
+                        self._live += 1
+                if can_spawn:
+                    try:
+                        return self._spawn_worker()
+                    except Exception:
+                        with self._lock:
+                            self._live -= 1
+                        raise
+                worker = self._idle.get()
+
+            # None is a wake-up marker left behind by a discarded worker
+            if worker is None:
+                continue
+            if worker.is_alive():
+                return worker
+            self.metrics.workers_crashed += 1
+            self._discard(worker, graceful=False)
+
+    def _release(self, worker: BlenderWorker, healthy: bool) -> None:
+        """Return a worker to the pool or replace it."""
+        if not healthy:
+            # Timed out or crashed mid-job, so there is nothing to shut down politely
+            self._discard(worker, graceful=False)
+        elif not worker.is_alive():
+            self.metrics.workers_crashed += 1
+            self._discard(worker, graceful=False)
+        elif self._closed:
+            self._discard(worker)
+        elif worker.jobs_run >= self.max_jobs_per_worker:
+            logger.info(f"Recycling Blender worker {worker.pid} after {worker.jobs_run} jobs")
+            self.metrics.workers_recycled += 1
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: BlenderWorker, graceful: bool = True) -> None:
+        """Stop a worker and free its slot."""
+        worker.stop(graceful=graceful)
+        with self._lock:
+            self._live -= 1
+        self._idle.put(None)
+
+    def _listen(self) -> socket.socket:
+        """Get the local socket that workers connect back to."""
+        if self._server is None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            self._server = server
+        return self._server
+
+    def _spawn_worker(self) -> BlenderWorker:
+        """Launch a Blender process and wait for it to connect."""
+        with self._spawn_lock:
+            start_time = time.time()
+            server = self._listen()
+            host, port = server.getsockname()
+            token = secrets.token_hex(16)
+
+            cmd = list(self.command) + [
+                "--background",
+                "--factory-startup",
+                "--python",
+                str(WORKER_SCRIPT),
+                "--",
+                host,
+                str(port),
+                token,
+            ]
+            logger.debug(f"Starting Blender worker: {' '.join(cmd)}")
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+            deadline = start_time + self.startup_timeout
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0 or process.poll() is not None:
+                    if process.poll() is None:
+                        process.kill()
+                    process.wait()
+                    raise BlenderWorkerError(
+                        f"Blender worker did not connect within {self.startup_timeout}s"
+                    )
+
+                server.settimeout(min(remaining, 0.5))
+                try:
+                    conn, _ = server.accept()
+                except TimeoutError:
+                    continue
+
+                try:
+                    conn.settimeout(remaining)
+                    hello = _recv_message(conn)
+                except (BlenderWorkerError, OSError):
+                    conn.close()
+                    continue
+
+                # Ignore stragglers from workers that previously timed out
+                if hello.get("token") != token:
+                    conn.close()
+                    continue
+                break
+
+            startup_time = time.time() - start_time
+            self.metrics.workers_started += 1
+            self.metrics.total_startup_time += startup_time
+            logger.info(f"Blender worker {hello.get('pid')} ready in {startup_time:.2f}s")
+            return BlenderWorker(process, conn, hello.get("pid", process.pid))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "size": self.size,
+            "live_workers": self._live,
+            "jobs": self.metrics.jobs,
+            "failed_jobs": self.metrics.failed_jobs,
+            "workers_started": self.metrics.workers_started,
+            "workers_recycled": self.metrics.workers_recycled,
+            "workers_crashed": self.metrics.workers_crashed,
+            "average_startup_time": self.metrics.average_startup_time(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop all idle workers and close the listening socket."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+                with self._lock:
+                    self._live -= 1
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        logger.info("Blender worker pool shutdown")
@@ -418,6 +418,71 @@ def create_project(
         raise typer.Exit(1)
 
 
+# Response cache commands
+@app.command()
+def cache_stats() -> None:
+    """Show LLM response cache statistics."""
+    try:
+        from voxel.core.response_cache import ResponseCache
+
+        config = Config()
+        cache = ResponseCache(
+            config.response_cache_path,
+            max_bytes=config.response_cache_max_mb * 1024 * 1024,
+        )
+        cache_info = cache.get_stats()
+        cache.close()
+
+        console.print(f"[bold]Response Cache[/bold] ({cache_info['path']})")
+        console.print(f"Entries: [cyan]{cache_info['entries']}[/cyan]")
+        console.print(
+            f"Size: [cyan]{cache_info['total_bytes'] / 1024 / 1024:.2f} MB[/cyan] "
+            f"of {cache_info['max_bytes'] / 1024 / 1024:.0f} MB"
+        )
+        console.print(f"Hits: [green]{cache_info['hits']}[/green]  Misses: [yellow]{cache_info['misses']}[/yellow]")
+        console.print(f"Hit rate: [blue]{cache_info['hit_rate'] * 100:.1f}%[/blue]")
+        console.print(f"Bytes saved: [magenta]{cache_info['bytes_saved']}[/magenta]")
+        console.print(f"Output tokens saved: [magenta]{cache_info['tokens_saved']}[/magenta]")
+
+        if cache_info["entries_by_role"]:
+            table = Table(title="Entries by Agent")
+            table.add_column("Agent", style="cyan")
+            table.add_column("Entries", style="green")
+            for role, count in sorted(cache_info["entries_by_role"].items()):
+                table.add_row(role, str(count))
+            console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+
+@app.command()
+def cache_purge(
+    expired: bool = typer.Option(False, "--expired", help="Only remove expired entries"),
+    older_than_days: Optional[float] = typer.Option(
+        None, "--older-than-days", help="Only remove entries unused for this many days"
+    ),
+) -> None:
+    """Remove entries from the LLM response cache."""
+    try:
+        from voxel.core.response_cache import ResponseCache
+
+        config = Config()
+        cache = ResponseCache(config.response_cache_path)
+        removed = cache.purge(
+            expired_only=expired,
+            older_than=older_than_days * 86400 if older_than_days is not None else None,
+        )
+        cache.close()
+
+        console.print(f"[green]✓[/green] Removed {removed} cached responses")
+
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+
 def main() -> None:
     """Main entry point."""
     app()
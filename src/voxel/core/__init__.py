@@ -4,5 +4,6 @@ from voxel.core.agent import Agent, AgentConfig
 from voxel.core.models import Message, SceneResult, AgentResponse
 from voxel.core.config import Config
 from voxel.core.rate_limiter import TokenRateLimiter, get_rate_limiter, initialize_rate_limiter
+from voxel.core.shared import SharedRegistry, get_shared_registry, shared_component
 
-__all__ = ["Agent", "AgentConfig", "Message", "SceneResult", "AgentResponse", "Config", "TokenRateLimiter", "get_rate_limiter", "initialize_rate_limiter"]
+__all__ = ["Agent", "AgentConfig", "Message", "SceneResult", "AgentResponse", "Config", "TokenRateLimiter", "get_rate_limiter", "initialize_rate_limiter", "SharedRegistry", "get_shared_registry", "shared_component"]
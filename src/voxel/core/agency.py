@@ -1,6 +1,7 @@
 """Main Voxel class for high-level API."""
 
 import logging
+from pathlib import Path
 from typing import Optional, List, Dict, Any, Callable
 
 from voxel.core.config import Config
@@ -79,6 +80,24 @@ class Voxel:
         self.progress_callback = callback
         self.orchestrator.progress_callback = callback
 
+    def set_preview_callback(self, callback: Callable[[Path, int], None]) -> None:
+        """
+        Set a callback that receives fast preview renders before the final render.
+
+        Args:
+            callback: Function that takes (preview image path, iteration)
+        """
+        self.orchestrator.preview_callback = callback
+
+    def cancel_render(self) -> bool:
+        """
+        Cancel the in-flight final render, e.g. after the user rejects its preview.
+
+        Returns:
+            True if a final render was pending
+        """
+        return self.orchestrator.cancel_final_render()
+
     def create_scene(
         self,
         prompt: str,
@@ -1,14 +1,17 @@
 """Base agent class for all AI agents in the system."""
 
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Dict, List, Callable
+from typing import Any, AsyncIterator, Optional, Dict, List, Callable
 from datetime import datetime
 
 from pydantic import BaseModel, Field
 
 from voxel.core.models import AgentResponse, AgentRole, Message
 from voxel.core.agent_context import AgentContext, ContextType
+from voxel.core.shared import fingerprint, shared_component
 
 logger = logging.getLogger(__name__)
 
@@ -39,18 +42,48 @@ class Agent(ABC):
         self.config = config
         self.context = context or AgentContext()
         self.conversation_history: list[Message] = []
+        self.async_client = None
+        self.last_response: Optional[AgentResponse] = None
+        self._last_usage: Optional[dict[str, int]] = None
         self._setup_client()
 
     def _setup_client(self) -> None:
-        """Set up the AI client based on provider."""
+        """
+        Set up the AI client based on provider.
+
+        Clients are thread-safe and expensive to build (each loads the TLS
+        trust store and opens its own connection pool), so agents with the
+        same provider and API key share one per process.
+        """
         if self.config.provider == "anthropic":
             from anthropic import Anthropic
 
-            self.client = Anthropic(api_key=self.config.api_key)
+            client_class = Anthropic
         elif self.config.provider == "openai":
             from openai import OpenAI
 
-            self.client = OpenAI(api_key=self.config.api_key)
+            client_class = OpenAI
+        else:
+            raise ValueError(f"Unsupported AI provider: {self.config.provider}")
+
+        api_key = self.config.api_key
+        self.client = shared_component(
+            ("api_client", client_class, fingerprint(api_key)),
+            lambda: client_class(api_key=api_key),
+        )
+
+    def _setup_async_client(self) -> None:
+        """Set up the async AI client on first use."""
+        if self.async_client is not None:
+            return
+        if self.config.provider == "anthropic":
+            from anthropic import AsyncAnthropic
+
+            self.async_client = AsyncAnthropic(api_key=self.config.api_key)
+        elif self.config.provider == "openai":
+            from openai import AsyncOpenAI
+
+            self.async_client = AsyncOpenAI(api_key=self.config.api_key)
         else:
             raise ValueError(f"Unsupported AI provider: {self.config.provider}")
 
@@ -77,6 +110,9 @@ class Agent(ABC):
             system=self.get_system_prompt(),
             messages=messages,
         )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self._set_usage(getattr(usage, "input_tokens", None), getattr(usage, "output_tokens", None))
         return response.content[0].text
 
     def _call_openai(self, messages: list[dict[str, str]]) -> str:
@@ -90,8 +126,221 @@ class Agent(ABC):
             temperature=self.config.temperature,
             messages=all_messages,
         )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self._set_usage(getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
         return response.choices[0].message.content or ""
 
+    async def _stream_anthropic(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        """Stream text deltas from the Anthropic API."""
+        async with self.async_client.messages.stream(
+            model=self.config.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            system=self.get_system_prompt(),
+            messages=messages,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+            final_message = await stream.get_final_message()
+            self._set_usage(final_message.usage.input_tokens, final_message.usage.output_tokens)
+
+    async def _stream_openai(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        """Stream text deltas from the OpenAI API."""
+        system_msg = {"role": "system", "content": self.get_system_prompt()}
+        all_messages = [system_msg] + messages
+
+        stream = await self.async_client.chat.completions.create(
+            model=self.config.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=all_messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if getattr(chunk, "usage", None) is not None:
+                self._set_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+
+    def _set_usage(self, input_tokens: Any, output_tokens: Any) -> None:
+        """Remember the token usage the API reported for the current call."""
+        if isinstance(input_tokens, int) and isinstance(output_tokens, int):
+            self._last_usage = {"input_tokens": input_tokens, "output_tokens": output_tokens}
+
+    def _start_request(self, user_message: str) -> list[dict[str, str]]:
+        """Add the user message to history and build the API message list."""
+        msg = Message(role="user", content=user_message)
+        self.add_message(msg)
+
+        return [
+            {"role": m.role.value, "content": m.content}
+            for m in self.conversation_history
+            if m.role.value != "system"
+        ]
+
+    def _estimate_input_tokens(self, api_messages: list[dict[str, str]]) -> int:
+        """Estimate prompt tokens (about four characters per token)."""
+        chars = len(self.get_system_prompt()) + sum(len(m["content"]) for m in api_messages)
+        return chars // 4 + 1
+
+    def _rate_limited(self) -> bool:
+        """Check if rate limiting is enabled (default: True)."""
+        return getattr(self.config, 'enable_rate_limiting', True)
+
+    def _try_reserve(self, api_messages: list[dict[str, str]]) -> tuple:
+        """
+        Try to reserve rate-limit capacity for a request.
+
+        Returns:
+            (reservation or None, estimated input tokens, seconds to wait)
+        """
+        from voxel.core.rate_limiter import get_rate_limiter
+
+        input_tokens = self._estimate_input_tokens(api_messages)
+        reservation, wait_time = get_rate_limiter().try_acquire(
+            self.config.provider,
+            self.config.model,
+            input_tokens,
+            self.config.max_tokens,
+            agent_name=self.role.value,
+        )
+        if reservation is None:
+            agent_name = self.role.value
+            logger.info(f"Rate limiting: {agent_name} needs to wait {wait_time:.1f} seconds")
+
+            # Update progress callback if available
+            if hasattr(self, 'progress_callback') and self.progress_callback:
+                self.progress_callback('rate_limiting', agent_name, f"Waiting {wait_time:.1f}s for rate limit...")
+        return reservation, input_tokens, wait_time
+
+    def _reserve(self, api_messages: list[dict[str, str]]) -> Optional[Any]:
+        """Reserve rate-limit capacity, sleeping the calling thread if needed."""
+        if not self._rate_limited():
+            return None
+
+        reservation, input_tokens, _ = self._try_reserve(api_messages)
+        if reservation is None:
+            from voxel.core.rate_limiter import get_rate_limiter
+            reservation = get_rate_limiter().acquire_blocking(
+                self.config.provider,
+                self.config.model,
+                input_tokens,
+                self.config.max_tokens,
+                agent_name=self.role.value,
+            )
+        return reservation
+
+    async def _areserve(self, api_messages: list[dict[str, str]]) -> Optional[Any]:
+        """Reserve rate-limit capacity without blocking the event loop."""
+        if not self._rate_limited():
+            return None
+
+        reservation, input_tokens, _ = self._try_reserve(api_messages)
+        if reservation is None:
+            from voxel.core.rate_limiter import get_rate_limiter
+            reservation = await get_rate_limiter().acquire(
+                self.config.provider,
+                self.config.model,
+                input_tokens,
+                self.config.max_tokens,
+                agent_name=self.role.value,
+            )
+        return reservation
+
+    def _settle_reservation(self, reservation: Optional[Any], response_text: str) -> None:
+        """Charge the rate limiter with the usage the API reported."""
+        if reservation is None:
+            return
+
+        from voxel.core.rate_limiter import get_rate_limiter
+
+        if self._last_usage is not None:
+            input_tokens = self._last_usage["input_tokens"]
+            output_tokens = self._last_usage["output_tokens"]
+        else:
+            # Provider did not report usage; fall back to estimates
+            input_tokens = reservation.input_tokens
+            output_tokens = min(self.config.max_tokens, len(response_text) // 4 + 1)
+        get_rate_limiter().record_usage(reservation, input_tokens, output_tokens)
+
+    def _cache_lookup(self, api_messages: list[dict[str, str]]) -> tuple:
+        """
+        Look up this request in the response cache.
+
+        Returns:
+            (cache key or None when caching is disabled, cached text or None)
+        """
+        from voxel.core.response_cache import get_response_cache, make_cache_key
+
+        cache = get_response_cache()
+        if cache is None:
+            return None, None
+
+        cache_key = make_cache_key(
+            self.config.provider,
+            self.config.model,
+            self.role.value,
+            self.get_system_prompt(),
+            api_messages,
+            self.config.temperature,
+            self.config.max_tokens,
+        )
+        cached = cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+
+        logger.info(f"Using cached response for {self.role.value}")
+        self._last_usage = cached["usage"]
+        return cache_key, cached["response"]
+
+    def _cache_store(self, cache_key: str, response_text: str) -> None:
+        """Store a fresh response in the response cache."""
+        from voxel.core.response_cache import get_response_cache
+
+        cache = get_response_cache()
+        if cache is not None and response_text:
+            cache.set(
+                cache_key,
+                response_text,
+                agent_role=self.role.value,
+                model=self.config.model,
+                usage=self._last_usage,
+            )
+
+    def _release_reservation(self, reservation: Optional[Any]) -> None:
+        """Return a failed request's reserved tokens to the rate limiter."""
+        if reservation is not None:
+            from voxel.core.rate_limiter import get_rate_limiter
+            get_rate_limiter().record_usage(reservation, 0, 0)
+
+    def _finish_request(
+        self,
+        response_text: str,
+        context: Optional[dict[str, Any]],
+        metadata: dict[str, Any],
+        reservation: Optional[Any] = None,
+        cache_key: Optional[str] = None,
+    ) -> AgentResponse:
+        """Record usage, cache and store the reply in history, and parse it."""
+        self._settle_reservation(reservation, response_text)
+        if cache_key is not None:
+            self._cache_store(cache_key, response_text)
+
+        # Add response to history
+        assistant_msg = Message(role="assistant", content=response_text)
+        self.add_message(assistant_msg)
+
+        # Parse response
+        response = self._parse_response(response_text, context)
+        response.metadata.update(metadata)
+        if self._last_usage is not None:
+            response.metadata["usage"] = dict(self._last_usage)
+        self.last_response = response
+        return response
+
     def generate_response(self, user_message: str, context: Optional[dict[str, Any]] = None) -> AgentResponse:
         """
         Generate a response to a user message.
@@ -103,67 +352,143 @@ class Agent(ABC):
         Returns:
             AgentResponse with the agent's reply
         """
-        # Add user message to history
-        msg = Message(role="user", content=user_message)
-        self.add_message(msg)
-
-        # Prepare messages for API
-        api_messages = [
-            {"role": m.role.value, "content": m.content}
-            for m in self.conversation_history
-            if m.role.value != "system"
-        ]
+        api_messages = self._start_request(user_message)
+        self._last_usage = None
+
+        # Identical requests are served from the response cache
+        cache_key, cached_text = self._cache_lookup(api_messages)
+        if cached_text is not None:
+            return self._finish_request(
+                cached_text,
+                context,
+                {"time_to_first_token": 0.0, "generation_time": 0.0, "cached": True},
+            )
 
         # Handle rate limiting
-        agent_name = self.role.value
-        estimated_tokens = self.config.max_tokens
-        
-        # Check if rate limiting is enabled (default: True)
-        enable_rate_limiting = getattr(self.config, 'enable_rate_limiting', True)
-        
-        if enable_rate_limiting:
-            from voxel.core.rate_limiter import get_rate_limiter
-            rate_limiter = get_rate_limiter()
-            
-            # Check if we can make the request now
-            if not rate_limiter.can_make_request(agent_name, estimated_tokens):
-                wait_time = rate_limiter.get_wait_time(agent_name, estimated_tokens)
-                logger.info(f"Rate limiting: {agent_name} needs to wait {wait_time:.1f} seconds")
-                
-                # Wait for the required time
-                import time
-                time.sleep(wait_time)
-                
-                # Update progress callback if available
-                if hasattr(self, 'progress_callback') and self.progress_callback:
-                    self.progress_callback('rate_limiting', agent_name, f"Waiting {wait_time:.1f}s for rate limit...")
+        reservation = self._reserve(api_messages)
 
         # Call appropriate API
         try:
+            start_time = time.perf_counter()
             if self.config.provider == "anthropic":
                 response_text = self._call_anthropic(api_messages)
             elif self.config.provider == "openai":
                 response_text = self._call_openai(api_messages)
             else:
                 raise ValueError(f"Unsupported provider: {self.config.provider}")
+            elapsed = time.perf_counter() - start_time
+
+            return self._finish_request(
+                response_text,
+                context,
+                {"time_to_first_token": elapsed, "generation_time": elapsed},
+                reservation,
+                cache_key,
+            )
 
-            # Record token usage for rate limiting
-            if enable_rate_limiting:
-                # Estimate actual tokens used (rough approximation)
-                actual_tokens = min(estimated_tokens, len(response_text.split()) * 1.3)  # Rough token estimation
-                rate_limiter.record_request(agent_name, int(actual_tokens))
+        except Exception as e:
+            logger.error(f"Error generating response: {e}")
+            self._release_reservation(reservation)
+            raise
 
-            # Add response to history
-            assistant_msg = Message(role="assistant", content=response_text)
-            self.add_message(assistant_msg)
+    async def stream_response(
+        self, user_message: str, context: Optional[dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response to a user message as text deltas.
 
-            # Parse response
-            return self._parse_response(response_text, context)
+        Uses the provider's async client, so the event loop is never blocked.
+        Once the stream is exhausted the parsed AgentResponse is available as
+        ``last_response``, with ``time_to_first_token`` and ``generation_time``
+        in its metadata.
 
+        Args:
+            user_message: The user's message
+            context: Optional context information
+
+        Yields:
+            Chunks of response text as they arrive
+        """
+        self._setup_async_client()
+        api_messages = self._start_request(user_message)
+        self._last_usage = None
+
+        # Identical requests are served from the response cache
+        cache_key, cached_text = self._cache_lookup(api_messages)
+        if cached_text is not None:
+            yield cached_text
+            self._finish_request(
+                cached_text,
+                context,
+                {"time_to_first_token": 0.0, "generation_time": 0.0, "cached": True},
+            )
+            return
+
+        # Handle rate limiting without blocking the event loop
+        reservation = await self._areserve(api_messages)
+
+        if self.config.provider == "anthropic":
+            stream = self._stream_anthropic(api_messages)
+        elif self.config.provider == "openai":
+            stream = self._stream_openai(api_messages)
+        else:
+            raise ValueError(f"Unsupported provider: {self.config.provider}")
+
+        chunks: list[str] = []
+        start_time = time.perf_counter()
+        time_to_first_token: Optional[float] = None
+        try:
+            async for delta in stream:
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start_time
+                chunks.append(delta)
+                yield delta
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
+            logger.error(f"Error streaming response: {e}")
+            self._release_reservation(reservation)
             raise
 
+        elapsed = time.perf_counter() - start_time
+        logger.debug(
+            f"{self.role.value} streamed response: first token "
+            f"{(time_to_first_token or elapsed):.2f}s, total {elapsed:.2f}s"
+        )
+        self._finish_request(
+            "".join(chunks),
+            context,
+            {
+                "time_to_first_token": time_to_first_token if time_to_first_token is not None else elapsed,
+                "generation_time": elapsed,
+            },
+            reservation,
+            cache_key,
+        )
+
+    async def agenerate_response(
+        self,
+        user_message: str,
+        context: Optional[dict[str, Any]] = None,
+        on_delta: Optional[Callable[[str], Any]] = None,
+    ) -> AgentResponse:
+        """
+        Generate a response asynchronously, streaming it from the provider.
+
+        Args:
+            user_message: The user's message
+            context: Optional context information
+            on_delta: Optional callback (sync or async) invoked with each text chunk,
+                e.g. to forward partial scripts to WebSocket clients
+
+        Returns:
+            AgentResponse with the agent's reply
+        """
+        async for delta in self.stream_response(user_message, context):
+            if on_delta is not None:
+                result = on_delta(delta)
+                if asyncio.iscoroutine(result):
+                    await result
+        return self.last_response
+
     @abstractmethod
     def _parse_response(
         self, response_text: str, context: Optional[dict[str, Any]] = None
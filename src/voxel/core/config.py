@@ -1,7 +1,7 @@
 """Configuration management for Voxel."""
 
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,6 +32,22 @@ class Config(BaseSettings):
         default=Path("/Applications/Blender.app/Contents/MacOS/Blender"),
         description="Path to Blender executable",
     )
+    blender_worker_pool: bool = Field(
+        default=True, description="Reuse warm Blender processes instead of launching one per script"
+    )
+    blender_pool_size: int = Field(
+        default=2, description="Maximum number of warm Blender worker processes", ge=1
+    )
+    blender_worker_max_jobs: int = Field(
+        default=20, description="Jobs a Blender worker runs before it is restarted", ge=1
+    )
+    blender_single_pass: bool = Field(
+        default=True,
+        description="Build, save and render each iteration in one Blender process",
+    )
+    stream_render_progress: bool = Field(
+        default=False, description="Forward Blender render progress lines to progress callbacks"
+    )
 
     # Output Configuration
     output_dir: Path = Field(default=Path("./output"), description="Output directory")
@@ -39,6 +55,27 @@ class Config(BaseSettings):
     render_engine: Literal["CYCLES", "EEVEE"] = Field(
         default="CYCLES", description="Render engine"
     )
+    preview_render: bool = Field(
+        default=True,
+        description="Send a fast EEVEE preview to preview listeners before the final render",
+    )
+    preview_samples: int = Field(default=16, description="Preview render samples", ge=1)
+    preview_resolution_percentage: int = Field(
+        default=25, description="Preview resolution as a percentage of the final", ge=1, le=100
+    )
+    artifact_store: bool = Field(
+        default=True,
+        description="Reuse the .blend file and render of identical Blender jobs across sessions",
+    )
+    artifact_store_dir: Optional[Path] = Field(
+        default=None, description="Artifact store directory (defaults to <output_dir>/.artifacts)"
+    )
+    voxelweaver_cache_size: int = Field(
+        default=128, description="VoxelWeaver stage outputs memoized in memory (0 disables)", ge=0
+    )
+    voxelweaver_cache_dir: Optional[Path] = Field(
+        default=None, description="Directory persisting VoxelWeaver stage outputs (None for memory only)"
+    )
 
     # Agent Configuration
     max_iterations: int = Field(
@@ -47,6 +84,13 @@ class Config(BaseSettings):
     enable_reviewer: bool = Field(default=True, description="Enable reviewer agent")
     enable_animation: bool = Field(default=True, description="Enable animation generation")
     auto_refine: bool = Field(default=True, description="Auto-refine based on reviews")
+    parallel_agents: bool = Field(
+        default=True, description="Run agents without mutual dependencies concurrently"
+    )
+    incremental_refinement: bool = Field(
+        default=True,
+        description="Only regenerate the stages criticised by the reviewer when refining",
+    )
     agent_temperature: float = Field(
         default=0.7, description="Temperature for AI agents", ge=0.0, le=2.0
     )
@@ -61,8 +105,25 @@ class Config(BaseSettings):
     tokens_per_minute_limit: int = Field(
         default=4000, description="Maximum output tokens per minute for rate limiting"
     )
-    agent_delay_seconds: int = Field(
-        default=60, description="Delay between agent calls to respect rate limits"
+    input_tokens_per_minute_limit: int = Field(
+        default=40000, description="Maximum input tokens per minute for rate limiting"
+    )
+    requests_per_minute_limit: int = Field(
+        default=50, description="Maximum API requests per minute for rate limiting"
+    )
+
+    # Response Cache Configuration
+    enable_response_cache: bool = Field(
+        default=True, description="Reuse stored responses for identical agent requests"
+    )
+    response_cache_path: Path = Field(
+        default=Path("./cache/responses.db"), description="Response cache database file"
+    )
+    response_cache_max_mb: int = Field(
+        default=256, description="Maximum response cache size in megabytes", ge=1
+    )
+    response_cache_ttl_hours: int = Field(
+        default=168, description="Hours before a cached response expires", ge=1
     )
 
     # Animation Configuration
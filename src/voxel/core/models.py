@@ -71,10 +71,14 @@ class SceneResult(BaseModel):
     prompt: str
     concept: Optional[str] = None
     output_path: Optional[Path] = None
+    preview_path: Optional[Path] = None  # Latest low-sample preview render
+    render_cancelled: bool = False  # Final render aborted after the preview was rejected
     session_dir: Optional[Path] = None  # Session directory for file downloads
     scripts: list[Path] = Field(default_factory=list)
     render_time: float = 0.0
     iterations: int = 0
+    node_timings: dict[str, float] = Field(default_factory=dict)  # Wall time per workflow node
+    iteration_stats: list[dict[str, Any]] = Field(default_factory=list)  # Per-iteration rerun/reuse savings
     messages: list[Message] = Field(default_factory=list)
     agent_responses: list[AgentResponse] = Field(default_factory=list)
     error: Optional[str] = None
@@ -92,3 +96,4 @@ class ReviewFeedback(BaseModel):
     improvements: list[str] = Field(default_factory=list)
     suggestions: str = ""
     should_refine: bool = False
+    affected_stages: list[str] = Field(default_factory=list)  # Stages the feedback criticises
@@ -4,12 +4,13 @@ import asyncio
 import hashlib
 import json
 import logging
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable, Tuple
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -19,20 +20,19 @@ class CacheEntry:
     """A cache entry with metadata."""
     key: str
     value: Any
-    created_at: datetime
-    expires_at: Optional[datetime] = None
+    created_at: float
+    expires_at: Optional[float] = None
     access_count: int = 0
-    last_accessed: Optional[datetime] = None
-    
-    def is_expired(self) -> bool:
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if the cache entry has expired."""
         if self.expires_at is None:
             return False
-        return datetime.now() > self.expires_at
-    
-    def is_valid(self) -> bool:
+        return (now if now is not None else time.monotonic()) >= self.expires_at
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
         """Check if the cache entry is still valid."""
-        return not self.is_expired()
+        return not self.is_expired(now)
 
 
 @dataclass
@@ -50,22 +50,51 @@ class PerformanceMetrics:
         return self.cache_hits / total if total > 0 else 0.0
 
 
+class _CacheShard:
+    """One independently locked LRU segment of a PerformanceCache."""
+
+    __slots__ = ("entries", "lock", "max_size", "hits", "misses", "evictions", "expirations")
+
+    def __init__(self, max_size: int):
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
 class PerformanceCache:
-    """High-performance caching system for the Voxel system."""
+    """
+    High-performance caching system for the Voxel system.
+
+    Entries live in ordered dicts kept in least- to most-recently used
+    order, so lookups, inserts and LRU eviction are all O(1). Expiry is
+    checked lazily when an entry is read. Large caches are split into
+    shards with their own locks so concurrent threads rarely contend.
+    The sync methods are the primary API; the async ones are thin
+    wrappers for coroutine callers and never block the event loop.
+    """
+
+    # Entries per shard below which a single shard (exact LRU) is used
+    SHARD_MIN_SIZE = 1024
+    MAX_SHARDS = 16
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 3600):
+    def __init__(self, max_size: int = 1000, default_ttl: Optional[int] = 3600):
         """
         Initialize the cache.
         
         Args:
             max_size: Maximum number of cache entries
-            default_ttl: Default time-to-live in seconds
+            default_ttl: Default time-to-live in seconds (None for no expiry)
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self.cache: Dict[str, CacheEntry] = {}
-        self.metrics = PerformanceMetrics()
-        self._lock = asyncio.Lock()
+
+        shard_count = max(1, min(self.MAX_SHARDS, max_size // self.SHARD_MIN_SIZE))
+        shard_size = -(-max_size // shard_count)
+        self._shards = [_CacheShard(shard_size) for _ in range(shard_count)]
     
     def _generate_key(self, *args, **kwargs) -> str:
         """Generate a cache key from arguments."""
@@ -76,81 +105,114 @@ class PerformanceCache:
         }
         key_string = json.dumps(key_data, sort_keys=True, default=str)
         return hashlib.md5(key_string.encode()).hexdigest()
-    
-    async def get(self, key: str) -> Optional[Any]:
+
+    def _shard_for(self, key: str) -> _CacheShard:
+        """Get the shard that owns a key."""
+        if len(self._shards) == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get_sync(self, key: str) -> Optional[Any]:
         """Get a value from the cache."""
-        async with self._lock:
-            if key in self.cache:
-                entry = self.cache[key]
-                
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
                 if entry.is_valid():
-                    # Update access statistics
+                    # Mark as most recently used
+                    shard.entries.move_to_end(key)
                     entry.access_count += 1
-                    entry.last_accessed = datetime.now()
-                    self.metrics.cache_hits += 1
-                    logger.debug(f"Cache hit for key: {key}")
+                    shard.hits += 1
                     return entry.value
-                else:
-                    # Remove expired entry
-                    del self.cache[key]
-                    logger.debug(f"Cache entry expired for key: {key}")
-            
-            self.metrics.cache_misses += 1
-            logger.debug(f"Cache miss for key: {key}")
+
+                # Remove expired entry
+                del shard.entries[key]
+                shard.expirations += 1
+                logger.debug(f"Cache entry expired for key: {key}")
+
+            shard.misses += 1
             return None
+
+    def set_sync(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set a value in the cache, evicting the least recently used entry if full."""
+        now = time.monotonic()
+        ttl = ttl if ttl is not None else self.default_ttl
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            created_at=now,
+            expires_at=now + ttl if ttl is not None else None,
+        )
+
+        shard = self._shard_for(key)
+        with shard.lock:
+            if key in shard.entries:
+                shard.entries.move_to_end(key)
+            elif len(shard.entries) >= shard.max_size:
+                evicted_key, _ = shard.entries.popitem(last=False)
+                shard.evictions += 1
+                logger.debug(f"Evicted cache entry: {evicted_key}")
+            shard.entries[key] = entry
+
+    def delete_sync(self, key: str) -> bool:
+        """Remove a key from the cache, returning whether it was present."""
+        shard = self._shard_for(key)
+        with shard.lock:
+            return shard.entries.pop(key, None) is not None
+
+    def clear_sync(self) -> None:
+        """Clear all cache entries."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+        logger.info("Cache cleared")
+
+    def keys(self, limit: Optional[int] = None) -> List[str]:
+        """Get up to limit cached keys, least recently used first within each shard."""
+        keys: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                for key in shard.entries:
+                    if limit is not None and len(keys) >= limit:
+                        return keys
+                    keys.append(key)
+        return keys
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        return sum(len(shard.entries) for shard in self._shards)
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value from the cache."""
+        return self.get_sync(key)
     
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set a value in the cache."""
-        async with self._lock:
-            # Remove oldest entries if cache is full
-            if len(self.cache) >= self.max_size:
-                await self._evict_oldest()
-            
-            ttl = ttl or self.default_ttl
-            expires_at = datetime.now() + timedelta(seconds=ttl)
-            
-            entry = CacheEntry(
-                key=key,
-                value=value,
-                created_at=datetime.now(),
-                expires_at=expires_at
-            )
-            
-            self.cache[key] = entry
-            logger.debug(f"Cached value for key: {key}")
-    
-    async def _evict_oldest(self) -> None:
-        """Evict the oldest cache entry."""
-        if not self.cache:
-            return
-        
-        # Find the least recently accessed entry
-        oldest_key = min(
-            self.cache.keys(),
-            key=lambda k: self.cache[k].last_accessed or self.cache[k].created_at
-        )
-        
-        del self.cache[oldest_key]
-        logger.debug(f"Evicted cache entry: {oldest_key}")
+        self.set_sync(key, value, ttl)
     
     async def clear(self) -> None:
         """Clear all cache entries."""
-        async with self._lock:
-            self.cache.clear()
-            logger.info("Cache cleared")
+        self.clear_sync()
     
     def get_metrics(self) -> PerformanceMetrics:
         """Get performance metrics."""
-        return self.metrics
+        return PerformanceMetrics(
+            cache_hits=sum(shard.hits for shard in self._shards),
+            cache_misses=sum(shard.misses for shard in self._shards),
+        )
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        metrics = self.get_metrics()
         return {
-            "size": len(self.cache),
+            "size": len(self),
             "max_size": self.max_size,
-            "hit_rate": self.metrics.hit_rate(),
-            "cache_hits": self.metrics.cache_hits,
-            "cache_misses": self.metrics.cache_misses
+            "shards": len(self._shards),
+            "hit_rate": metrics.hit_rate(),
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+            "evictions": sum(shard.evictions for shard in self._shards),
+            "expirations": sum(shard.expirations for shard in self._shards),
         }
 
 
@@ -207,6 +269,21 @@ class ParallelProcessor:
         logger.info(f"Executed {len(tasks)} tasks in parallel in {execution_time:.2f}s")
         return results
     
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Submit a single task to the worker pool.
+
+        Args:
+            func: Callable to execute
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Future resolving to the callable's result
+        """
+        self.metrics.parallel_tasks += 1
+        return self.executor.submit(func, *args, **kwargs)
+
     async def execute_async(self, tasks: List[Tuple[Callable, tuple, dict]]) -> List[Any]:
         """
         Execute multiple tasks asynchronously.
@@ -251,17 +328,27 @@ class ParallelProcessor:
 class PerformanceOptimizer:
     """Main performance optimization system."""
     
-    def __init__(self, cache_size: int = 1000, max_workers: int = 4):
+    def __init__(
+        self,
+        cache_size: int = 1000,
+        max_workers: int = 4,
+        script_cache_size: int = 500,
+        parallel_processor: Optional[ParallelProcessor] = None,
+    ):
         """
         Initialize the performance optimizer.
         
         Args:
             cache_size: Maximum cache size
             max_workers: Maximum number of parallel workers
+            script_cache_size: Maximum number of cached scripts
+            parallel_processor: Existing (e.g. process-wide) processor to use
+                instead of creating one; it is not shut down with the optimizer
         """
         self.cache = PerformanceCache(max_size=cache_size)
-        self.parallel_processor = ParallelProcessor(max_workers=max_workers)
-        self.script_cache: Dict[str, str] = {}
+        self._owns_processor = parallel_processor is None
+        self.parallel_processor = parallel_processor or ParallelProcessor(max_workers=max_workers)
+        self.script_cache = PerformanceCache(max_size=script_cache_size, default_ttl=None)
         self.pattern_cache: Dict[str, List[Any]] = {}
     
     async def cached_agent_call(self, agent, method: str, *args, **kwargs) -> Any:
@@ -296,13 +383,13 @@ class PerformanceOptimizer:
     def cache_script(self, prompt: str, script: str) -> None:
         """Cache a generated script."""
         script_hash = hashlib.md5(prompt.encode()).hexdigest()
-        self.script_cache[script_hash] = script
+        self.script_cache.set_sync(script_hash, script)
         logger.debug(f"Cached script for prompt: {prompt[:50]}...")
     
     def get_cached_script(self, prompt: str) -> Optional[str]:
         """Get a cached script."""
         script_hash = hashlib.md5(prompt.encode()).hexdigest()
-        return self.script_cache.get(script_hash)
+        return self.script_cache.get_sync(script_hash)
     
     def cache_patterns(self, context_type: str, patterns: List[Any]) -> None:
         """Cache patterns for a context type."""
@@ -322,12 +409,17 @@ class PerformanceOptimizer:
         """Execute the same method on multiple agents asynchronously."""
         tasks = [(getattr(agent, method), args, kwargs) for agent in agents]
         return await self.parallel_processor.execute_async(tasks)
+
+    def create_scheduler(self, parallel: bool = True):
+        """Create a dependency-graph scheduler backed by this optimizer's worker pool."""
+        from voxel.core.scheduler import DependencyScheduler
+        return DependencyScheduler(self.parallel_processor, parallel=parallel)
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
         cache_stats = self.cache.get_cache_stats()
-        metrics = self.cache.get_metrics()
-        
+        script_cache_stats = self.script_cache.get_cache_stats()
+
         return {
             "cache": cache_stats,
             "parallel_processing": {
@@ -336,8 +428,9 @@ class PerformanceOptimizer:
                 "average_response_time": self.parallel_processor.metrics.average_response_time
             },
             "script_cache": {
-                "size": len(self.script_cache),
-                "keys": list(self.script_cache.keys())[:5]  # Show first 5 keys
+                "size": script_cache_stats["size"],
+                "hit_rate": script_cache_stats["hit_rate"],
+                "keys": self.script_cache.keys(limit=5)
             },
             "pattern_cache": {
                 "size": len(self.pattern_cache),
@@ -347,12 +440,13 @@ class PerformanceOptimizer:
     
     def clear_all_caches(self) -> None:
         """Clear all caches."""
-        asyncio.create_task(self.cache.clear())
-        self.script_cache.clear()
+        self.cache.clear_sync()
+        self.script_cache.clear_sync()
         self.pattern_cache.clear()
         logger.info("All caches cleared")
     
     def shutdown(self) -> None:
         """Shutdown the performance optimizer."""
-        self.parallel_processor.shutdown()
+        if self._owns_processor:
+            self.parallel_processor.shutdown()
         logger.info("Performance optimizer shutdown")
@@ -1,151 +1,271 @@
 """Rate limiter for managing API token usage and preventing rate limit errors."""
 
-import time
+import asyncio
 import logging
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class RateLimits:
+    """Per-minute limits for a provider or model."""
+    requests_per_minute: int = 50
+    input_tokens_per_minute: int = 40000
+    output_tokens_per_minute: int = 4000
+
+
+class TokenBucket:
+    """A continuously refilling token bucket."""
+
+    def __init__(self, capacity: float, period_seconds: float = 60.0):
+        """
+        Initialize the bucket.
+
+        Args:
+            capacity: Maximum tokens the bucket holds (the per-period budget)
+            period_seconds: Time for an empty bucket to refill completely
+        """
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / period_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        if now <= self.updated:
+            return
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until the bucket can cover amount (capped at its capacity)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_rate
+
+    def consume(self, amount: float, now: float) -> None:
+        """Take tokens out of the bucket; the level may go negative as debt."""
+        self._refill(now)
+        self.level -= amount
+
+    def refund(self, amount: float, now: float) -> None:
+        """Return unused tokens to the bucket."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Reservation:
+    """Capacity held for an in-flight request until its real usage is known."""
+    scopes: List[str]
+    agent_name: str
+    input_tokens: int
+    output_tokens: int
+
+
 class TokenRateLimiter:
-    """Rate limiter that tracks token usage and enforces delays between API calls."""
-    
-    def __init__(self, tokens_per_minute_limit: int = 4000):
+    """
+    Token-bucket rate limiter with request, input-token and output-token budgets.
+
+    Each request draws from a bucket set for its model and, when limits are
+    configured for it, from a shared bucket set for its provider. Callers
+    reserve their estimated usage up front with ``acquire`` (async) or
+    ``acquire_blocking`` (threads), then settle it with the real ``usage``
+    reported by the API via ``record_usage``, which refunds or charges the
+    difference.
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute_limit: int = 4000,
+        requests_per_minute: int = 50,
+        input_tokens_per_minute: int = 40000,
+        provider_limits: Optional[Dict[str, RateLimits]] = None,
+        model_limits: Optional[Dict[str, RateLimits]] = None,
+    ):
         """
         Initialize the rate limiter.
-        
+
         Args:
-            tokens_per_minute_limit: Maximum tokens allowed per minute
+            tokens_per_minute_limit: Default output tokens allowed per minute
+            requests_per_minute: Default requests allowed per minute
+            input_tokens_per_minute: Default input tokens allowed per minute
+            provider_limits: Shared limits per provider (e.g. ``{"anthropic": ...}``)
+            model_limits: Limits per model, keyed ``"provider/model"``
         """
         self.tokens_per_minute_limit = tokens_per_minute_limit
-        self.token_usage: Dict[str, int] = {}  # minute_timestamp -> tokens_used
-        self.last_call_times: Dict[str, datetime] = {}  # agent_name -> last_call_time
-        self.min_delay_seconds = 60  # Minimum delay between agent calls
-        
-    def can_make_request(self, agent_name: str, estimated_tokens: int = 4000) -> bool:
+        self.default_limits = RateLimits(
+            requests_per_minute=requests_per_minute,
+            input_tokens_per_minute=input_tokens_per_minute,
+            output_tokens_per_minute=tokens_per_minute_limit,
+        )
+        self.provider_limits = provider_limits or {}
+        self.model_limits = model_limits or {}
+        self._buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        self._lock = threading.Lock()
+        self.agent_usage: Dict[str, Dict[str, int]] = {}
+
+    def _scopes(self, provider: str, model: str) -> List[str]:
+        """Get the bucket scopes a request draws from."""
+        scopes = [f"{provider}/{model}"]
+        if provider in self.provider_limits:
+            scopes.append(provider)
+        return scopes
+
+    def _limits_for(self, scope: str) -> RateLimits:
+        """Get the limits for a bucket scope."""
+        if scope in self.provider_limits:
+            return self.provider_limits[scope]
+        return self.model_limits.get(scope, self.default_limits)
+
+    def _buckets_for(self, scope: str) -> Dict[str, TokenBucket]:
+        """Get (creating on first use) the buckets for a scope."""
+        buckets = self._buckets.get(scope)
+        if buckets is None:
+            limits = self._limits_for(scope)
+            buckets = {
+                "requests": TokenBucket(limits.requests_per_minute),
+                "input_tokens": TokenBucket(limits.input_tokens_per_minute),
+                "output_tokens": TokenBucket(limits.output_tokens_per_minute),
+            }
+            self._buckets[scope] = buckets
+        return buckets
+
+    def try_acquire(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        agent_name: str = "",
+    ) -> Tuple[Optional[Reservation], float]:
         """
-        Check if a request can be made without exceeding rate limits.
-        
+        Reserve capacity for a request if it is available right now.
+
         Args:
-            agent_name: Name of the agent making the request
-            estimated_tokens: Estimated tokens this request will use
-            
+            provider: AI provider name
+            model: Model name
+            input_tokens: Estimated prompt tokens
+            output_tokens: Output tokens to reserve (usually max_tokens)
+            agent_name: Name of the agent making the request (for stats)
+
         Returns:
-            True if request can be made, False if should wait
-        """
-        current_minute = self._get_current_minute()
-        
-        # Check if this minute's usage would exceed limit
-        current_usage = self.token_usage.get(current_minute, 0)
-        if current_usage + estimated_tokens > self.tokens_per_minute_limit:
-            logger.info(f"Rate limit would be exceeded. Current: {current_usage}, Request: {estimated_tokens}, Limit: {self.tokens_per_minute_limit}")
-            return False
-            
-        # Check minimum delay between agent calls
-        last_call = self.last_call_times.get(agent_name)
-        if last_call:
-            time_since_last = datetime.now() - last_call
-            if time_since_last.total_seconds() < self.min_delay_seconds:
-                remaining_delay = self.min_delay_seconds - time_since_last.total_seconds()
-                logger.info(f"Agent {agent_name} needs to wait {remaining_delay:.1f} more seconds")
-                return False
-                
-        return True
-    
-    def record_request(self, agent_name: str, actual_tokens: int) -> None:
+            (reservation, 0.0) on success, or (None, seconds to wait)
         """
-        Record a completed request and its token usage.
-        
-        Args:
-            agent_name: Name of the agent that made the request
-            actual_tokens: Actual tokens used in the request
-        """
-        current_minute = self._get_current_minute()
-        
-        # Update token usage for this minute
-        if current_minute not in self.token_usage:
-            self.token_usage[current_minute] = 0
-        self.token_usage[current_minute] += actual_tokens
-        
-        # Update last call time
-        self.last_call_times[agent_name] = datetime.now()
-        
-        # Clean up old usage data (keep only last 2 minutes)
-        self._cleanup_old_usage()
-        
-        logger.info(f"Recorded {actual_tokens} tokens for {agent_name}. Current minute usage: {self.token_usage[current_minute]}")
-    
-    def get_wait_time(self, agent_name: str, estimated_tokens: int = 4000) -> float:
+        amounts = {"requests": 1, "input_tokens": input_tokens, "output_tokens": output_tokens}
+        scopes = self._scopes(provider, model)
+
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            for scope in scopes:
+                for kind, bucket in self._buckets_for(scope).items():
+                    wait = max(wait, bucket.wait_time(amounts[kind], now))
+            if wait > 0:
+                return None, wait
+
+            for scope in scopes:
+                for kind, bucket in self._buckets_for(scope).items():
+                    bucket.consume(amounts[kind], now)
+
+        return Reservation(scopes, agent_name, input_tokens, output_tokens), 0.0
+
+    def acquire_blocking(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        agent_name: str = "",
+    ) -> Reservation:
+        """Reserve capacity, sleeping the calling thread until it is available."""
+        while True:
+            reservation, wait = self.try_acquire(
+                provider, model, input_tokens, output_tokens, agent_name
+            )
+            if reservation is not None:
+                return reservation
+            time.sleep(wait)
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        agent_name: str = "",
+    ) -> Reservation:
+        """Reserve capacity, awaiting (without blocking the event loop) until it is available."""
+        while True:
+            reservation, wait = self.try_acquire(
+                provider, model, input_tokens, output_tokens, agent_name
+            )
+            if reservation is not None:
+                return reservation
+            await asyncio.sleep(wait)
+
+    def record_usage(self, reservation: Reservation, input_tokens: int, output_tokens: int) -> None:
         """
-        Get the time to wait before making a request.
-        
+        Settle a reservation against the usage the API actually reported.
+
         Args:
-            agent_name: Name of the agent making the request
-            estimated_tokens: Estimated tokens this request will use
-            
-        Returns:
-            Seconds to wait before making the request
+            reservation: Reservation returned by acquire
+            input_tokens: Real prompt tokens used
+            output_tokens: Real output tokens used
         """
-        wait_times = []
-        
-        # Check rate limit wait time
-        current_minute = self._get_current_minute()
-        current_usage = self.token_usage.get(current_minute, 0)
-        
-        if current_usage + estimated_tokens > self.tokens_per_minute_limit:
-            # Wait until next minute
-            now = datetime.now()
-            next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
-            rate_limit_wait = (next_minute - now).total_seconds()
-            wait_times.append(rate_limit_wait)
-            logger.info(f"Rate limit wait: {rate_limit_wait:.1f} seconds")
-        
-        # Check minimum delay wait time
-        last_call = self.last_call_times.get(agent_name)
-        if last_call:
-            time_since_last = datetime.now() - last_call
-            if time_since_last.total_seconds() < self.min_delay_seconds:
-                delay_wait = self.min_delay_seconds - time_since_last.total_seconds()
-                wait_times.append(delay_wait)
-                logger.info(f"Agent delay wait: {delay_wait:.1f} seconds")
-        
-        return max(wait_times) if wait_times else 0.0
-    
-    def _get_current_minute(self) -> str:
-        """Get current minute timestamp as string."""
-        now = datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M")
-    
-    def _cleanup_old_usage(self) -> None:
-        """Remove token usage data older than 2 minutes."""
-        current_minute = self._get_current_minute()
-        current_time = datetime.strptime(current_minute, "%Y-%m-%d %H:%M")
-        
-        # Remove entries older than 2 minutes
-        to_remove = []
-        for minute_str in self.token_usage.keys():
-            minute_time = datetime.strptime(minute_str, "%Y-%m-%d %H:%M")
-            if (current_time - minute_time).total_seconds() > 120:  # 2 minutes
-                to_remove.append(minute_str)
-        
-        for minute_str in to_remove:
-            del self.token_usage[minute_str]
-    
-    def get_status(self) -> Dict[str, any]:
-        """Get current rate limiter status."""
-        current_minute = self._get_current_minute()
-        current_usage = self.token_usage.get(current_minute, 0)
-        
-        return {
-            "current_minute": current_minute,
-            "tokens_used_this_minute": current_usage,
-            "tokens_remaining_this_minute": self.tokens_per_minute_limit - current_usage,
-            "tokens_per_minute_limit": self.tokens_per_minute_limit,
-            "active_agents": list(self.last_call_times.keys()),
-            "usage_history": dict(self.token_usage)
+        deltas = {
+            "input_tokens": input_tokens - reservation.input_tokens,
+            "output_tokens": output_tokens - reservation.output_tokens,
         }
 
+        with self._lock:
+            now = time.monotonic()
+            for scope in reservation.scopes:
+                buckets = self._buckets_for(scope)
+                for kind, delta in deltas.items():
+                    if delta > 0:
+                        buckets[kind].consume(delta, now)
+                    elif delta < 0:
+                        buckets[kind].refund(-delta, now)
+
+            usage = self.agent_usage.setdefault(
+                reservation.agent_name, {"requests": 0, "input_tokens": 0, "output_tokens": 0}
+            )
+            usage["requests"] += 1
+            usage["input_tokens"] += input_tokens
+            usage["output_tokens"] += output_tokens
+
+        logger.debug(
+            f"Recorded {input_tokens} input / {output_tokens} output tokens "
+            f"for {reservation.agent_name or 'request'}"
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get current rate limiter status."""
+        with self._lock:
+            now = time.monotonic()
+            buckets = {}
+            for scope, scope_buckets in self._buckets.items():
+                buckets[scope] = {}
+                for kind, bucket in scope_buckets.items():
+                    bucket._refill(now)
+                    buckets[scope][kind] = {
+                        "available": bucket.level,
+                        "limit_per_minute": bucket.capacity,
+                    }
+
+            return {
+                "tokens_per_minute_limit": self.tokens_per_minute_limit,
+                "buckets": buckets,
+                "agent_usage": {agent: dict(usage) for agent, usage in self.agent_usage.items()},
+            }
+
 
 # Global rate limiter instance
 _rate_limiter: Optional[TokenRateLimiter] = None
@@ -159,8 +279,19 @@ def get_rate_limiter() -> TokenRateLimiter:
     return _rate_limiter
 
 
-def initialize_rate_limiter(tokens_per_minute_limit: int = 4000) -> None:
+def initialize_rate_limiter(
+    tokens_per_minute_limit: int = 4000,
+    requests_per_minute: int = 50,
+    input_tokens_per_minute: int = 40000,
+) -> None:
     """Initialize the global rate limiter."""
     global _rate_limiter
-    _rate_limiter = TokenRateLimiter(tokens_per_minute_limit)
-    logger.info(f"Initialized rate limiter with {tokens_per_minute_limit} tokens per minute limit")
+    _rate_limiter = TokenRateLimiter(
+        tokens_per_minute_limit,
+        requests_per_minute=requests_per_minute,
+        input_tokens_per_minute=input_tokens_per_minute,
+    )
+    logger.info(
+        f"Initialized rate limiter: {requests_per_minute} requests, "
+        f"{input_tokens_per_minute} input and {tokens_per_minute_limit} output tokens per minute"
+    )
@@ -0,0 +1,317 @@
+"""Persistent, content-addressed cache for LLM responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    agent_role TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    usage TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses(last_accessed);
+CREATE INDEX IF NOT EXISTS idx_responses_expires_at ON responses(expires_at);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (name, value) VALUES
+    ('total_bytes', 0), ('hits', 0), ('misses', 0), ('bytes_saved', 0), ('tokens_saved', 0);
+"""
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so trivially reformatted prompts share a key."""
+    return " ".join(text.split())
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    agent_role: str,
+    system_prompt: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """
+    Build a content hash covering everything that determines a response.
+
+    Args:
+        provider: AI provider name
+        model: Model name
+        agent_role: Role of the calling agent
+        system_prompt: System prompt sent with the request
+        messages: Full conversation history sent with the request
+        temperature: Sampling temperature
+        max_tokens: Output token limit
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    key_data = {
+        "provider": provider,
+        "model": model,
+        "agent_role": agent_role,
+        "system": _normalize(system_prompt),
+        "messages": [[m["role"], _normalize(m["content"])] for m in messages],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    key_string = json.dumps(key_data, sort_keys=True)
+    return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed LLM response cache with LRU and TTL eviction.
+
+    Lookups and inserts are primary-key operations; eviction walks the
+    last_accessed index from the oldest entry, so neither grows with the
+    number of cached responses. Total size is tracked incrementally and
+    capped at ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: Optional[int] = 7 * 24 * 3600,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Maximum total size of cached responses in bytes
+            default_ttl: Default time-to-live in seconds (None for no expiry)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _bump(self, **deltas: int) -> None:
+        """Increment persistent counters (caller holds the lock)."""
+        for name, delta in deltas.items():
+            if delta:
+                self._conn.execute(
+                    "UPDATE stats SET value = value + ? WHERE name = ?", (delta, name)
+                )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Dict with ``response`` text and ``usage`` (or None on a miss)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, usage, size, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is not None and row[3] is not None and row[3] <= now:
+                self._delete(key, row[2])
+                row = None
+
+            if row is None:
+                self._bump(misses=1)
+                return None
+
+            response, usage_json, size, _ = row
+            usage = json.loads(usage_json) if usage_json else None
+            self._conn.execute(
+                "UPDATE responses SET last_accessed = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            self._bump(
+                hits=1,
+                bytes_saved=size,
+                tokens_saved=(usage or {}).get("output_tokens", 0),
+            )
+
+        logger.debug(f"Response cache hit: {key[:12]}")
+        return {"response": response, "usage": usage}
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        agent_role: str,
+        model: str,
+        usage: Optional[Dict[str, int]] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Store a response, evicting least recently used entries if over the size cap.
+
+        Args:
+            key: Cache key from make_cache_key
+            response: Raw response text
+            agent_role: Role of the agent that produced it
+            model: Model that produced it
+            usage: Token usage reported by the API
+            ttl: Time-to-live in seconds (defaults to default_ttl)
+        """
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock, self._conn:
+            existing = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if existing is not None:
+                self._delete(key, existing[0])
+
+            self._conn.execute(
+                "INSERT INTO responses (key, agent_role, model, response, usage, size, "
+                "created_at, expires_at, last_accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, agent_role, model, response,
+                    json.dumps(usage) if usage else None,
+                    size, now, expires_at, now,
+                ),
+            )
+            self._bump(total_bytes=size)
+            self._evict_to_fit()
+
+    def _delete(self, key: str, size: int) -> None:
+        """Delete one entry (caller holds the lock)."""
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._bump(total_bytes=-size)
+
+    def _total_bytes(self) -> int:
+        """Get the tracked total size (caller holds the lock)."""
+        return self._conn.execute(
+            "SELECT value FROM stats WHERE name = 'total_bytes'"
+        ).fetchone()[0]
+
+    def _evict_to_fit(self) -> None:
+        """Evict least recently used entries until under max_bytes (caller holds the lock)."""
+        while self._total_bytes() > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_accessed LIMIT 16"
+            ).fetchall()
+            if not victims:
+                break
+            for key, size in victims:
+                self._delete(key, size)
+                if self._total_bytes() <= self.max_bytes:
+                    break
+
+    def purge(self, expired_only: bool = False, older_than: Optional[float] = None) -> int:
+        """
+        Remove cached responses.
+
+        Args:
+            expired_only: Only remove entries past their TTL
+            older_than: Only remove entries not accessed in this many seconds
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        conditions = []
+        params: List[Any] = []
+        if expired_only:
+            conditions.append("expires_at IS NOT NULL AND expires_at <= ?")
+            params.append(now)
+        if older_than is not None:
+            conditions.append("last_accessed <= ?")
+            params.append(now - older_than)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock, self._conn:
+            removed_bytes = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM responses{where}", params
+            ).fetchone()[0]
+            removed = self._conn.execute(f"DELETE FROM responses{where}", params).rowcount
+            self._bump(total_bytes=-removed_bytes)
+
+        logger.info(f"Purged {removed} cached responses")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            by_role = dict(self._conn.execute(
+                "SELECT agent_role, COUNT(*) FROM responses GROUP BY agent_role"
+            ).fetchall())
+
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "total_bytes": counters["total_bytes"],
+            "max_bytes": self.max_bytes,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "bytes_saved": counters["bytes_saved"],
+            "tokens_saved": counters["tokens_saved"],
+            "entries_by_role": by_role,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global response cache instance (None until initialized)
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the global response cache, if one has been initialized."""
+    return _response_cache
+
+
+def initialize_response_cache(
+    path: Path,
+    max_bytes: int = 256 * 1024 * 1024,
+    default_ttl: Optional[int] = 7 * 24 * 3600,
+) -> ResponseCache:
+    """Initialize the global response cache."""
+    global _response_cache
+    if _response_cache is not None and _response_cache.path == Path(path):
+        _response_cache.max_bytes = max_bytes
+        _response_cache.default_ttl = default_ttl
+        return _response_cache
+    _response_cache = ResponseCache(path, max_bytes=max_bytes, default_ttl=default_ttl)
+    logger.info(f"Initialized response cache at {path}")
+    return _response_cache
@@ -0,0 +1,118 @@
+"""Process-wide registry of shared, build-once components."""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def fingerprint(secret: str) -> str:
+    """Get a short, non-reversible digest of a secret for use in registry keys."""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+class SharedRegistry:
+    """
+    Application-scoped registry of components that are expensive to build
+    and safe to share between requests.
+
+    Components are identified by a hashable key and built at most once per
+    process by the factory passed to ``get_or_create``. Concurrent first
+    requests for the same key wait for a single build instead of racing;
+    builds of different keys do not block each other. Only register
+    components that are immutable or internally thread-safe (API clients,
+    catalogs, compiled tables, thread pools); per-request state belongs on
+    the agents that use them.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._components: Dict[Hashable, Any] = {}
+        self._build_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "hits": 0, "build_time": 0.0}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Get a shared component, building it on first use.
+
+        Args:
+            key: Hashable identity of the component, including every setting
+                that affects how it is built
+            factory: Zero-argument callable that builds the component
+
+        Returns:
+            The shared component
+        """
+        with self._lock:
+            if key in self._components:
+                self.stats["hits"] += 1
+                return self._components[key]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                if key in self._components:
+                    self.stats["hits"] += 1
+                    return self._components[key]
+
+            start = time.perf_counter()
+            component = factory()
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._components[key] = component
+                self._build_locks.pop(key, None)
+                self.stats["builds"] += 1
+                self.stats["build_time"] += elapsed
+        logger.debug(f"Built shared component {key!r} in {elapsed * 1000:.1f}ms")
+        return component
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a shared component if it has been built."""
+        with self._lock:
+            return self._components.get(key)
+
+    def discard(self, key: Hashable) -> Optional[Any]:
+        """Remove a component so the next request rebuilds it."""
+        with self._lock:
+            return self._components.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        """Get the keys of all built components."""
+        with self._lock:
+            return list(self._components)
+
+    def clear(self) -> None:
+        """Drop every shared component."""
+        with self._lock:
+            self._components.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["components"] = len(self._components)
+        return stats
+
+
+# Global shared registry instance
+_shared_registry: Optional[SharedRegistry] = None
+
+
+def get_shared_registry() -> SharedRegistry:
+    """Get the global shared component registry."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = SharedRegistry()
+    return _shared_registry
+
+
+def shared_component(key: Hashable, factory: Callable[[], T]) -> T:
+    """Get a component from the global registry, building it on first use."""
+    return get_shared_registry().get_or_create(key, factory)
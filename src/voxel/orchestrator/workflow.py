@@ -1,8 +1,10 @@
 """Workflow orchestrator for coordinating agents."""
 
 import logging
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 
 from voxel.agents import (
     AnimationAgent,
@@ -21,13 +23,15 @@ try:
     from voxel.agents.texture import TextureAgent
 except ImportError:
     TextureAgent = None
-from voxel.blender import BlenderExecutor, ScriptManager
+from voxel.blender import ArtifactKey, ArtifactStore, BlenderExecutor, ScriptManager
 from voxel.core.agent import AgentConfig
 from voxel.core.config import Config
-from voxel.core.models import ReviewFeedback, SceneResult, AgentRole
+from voxel.core.models import AgentResponse, ReviewFeedback, SceneResult, AgentRole
 from voxel.core.agent_context import AgentContext, ContextType
 from voxel.core.error_recovery import ErrorRecoverySystem, ErrorContext, ErrorType
-from voxel.core.performance import PerformanceOptimizer
+from voxel.core.performance import ParallelProcessor, PerformanceOptimizer
+from voxel.core.scheduler import GraphResult
+from voxel.core.shared import shared_component
 from voxel.voxelweaver import VoxelWeaverCore, VoxelWeaverConfig
 
 logger = logging.getLogger(__name__)
@@ -36,6 +40,20 @@ logger = logging.getLogger(__name__)
 class WorkflowOrchestrator:
     """Orchestrates the multi-agent workflow for scene generation."""
 
+    # Script-producing stages in the order their scripts are combined
+    SCRIPT_STAGES = ["builder", "texture", "hdr", "render", "animation"]
+
+    # Agent graph nodes and the nodes whose outputs they consume
+    GRAPH_DEPENDENCIES = {
+        "concept": (),
+        "voxelweaver": ("concept",),
+        "builder": ("concept", "voxelweaver"),
+        "texture": ("concept", "voxelweaver", "builder"),
+        "hdr": ("concept",),
+        "render": ("concept", "voxelweaver"),
+        "animation": ("concept", "builder"),
+    }
+
     def __init__(self, config: Config):
         """
         Initialize the workflow orchestrator.
@@ -47,6 +65,13 @@ class WorkflowOrchestrator:
         self.script_manager = ScriptManager(config.output_dir)
         self.blender_executor = BlenderExecutor(config)
 
+        # Reuse outputs of byte-identical Blender jobs from earlier sessions
+        self.artifact_store: Optional[ArtifactStore] = None
+        if getattr(config, "artifact_store", False):
+            self.artifact_store = ArtifactStore(
+                config.artifact_store_dir or config.output_dir / ".artifacts"
+            )
+
         # Create shared context for agent collaboration
         self.shared_context = AgentContext()
 
@@ -54,19 +79,39 @@ class WorkflowOrchestrator:
         self.error_recovery = ErrorRecoverySystem()
         self._setup_error_recovery()
 
-        # Initialize performance optimizer
+        # Initialize performance optimizer on the process-wide thread pool
         self.performance_optimizer = PerformanceOptimizer(
             cache_size=1000,
-            max_workers=4
+            parallel_processor=shared_component(
+                ("parallel_processor", 4), lambda: ParallelProcessor(max_workers=4)
+            ),
         )
 
         # Progress callback
         self.progress_callback = None
 
+        # Preview callback, called with (preview image path, iteration) before
+        # the final render starts; previews are only rendered when it is set
+        self.preview_callback: Optional[Callable[[Path, int], None]] = None
+        self._render_cancel: Optional[threading.Event] = None
+
         # Initialize rate limiter if enabled
         if config.enable_rate_limiting:
             from voxel.core.rate_limiter import initialize_rate_limiter
-            initialize_rate_limiter(config.tokens_per_minute_limit)
+            initialize_rate_limiter(
+                config.tokens_per_minute_limit,
+                requests_per_minute=config.requests_per_minute_limit,
+                input_tokens_per_minute=config.input_tokens_per_minute_limit,
+            )
+
+        # Initialize persistent response cache if enabled
+        if config.enable_response_cache:
+            from voxel.core.response_cache import initialize_response_cache
+            initialize_response_cache(
+                config.response_cache_path,
+                max_bytes=config.response_cache_max_mb * 1024 * 1024,
+                default_ttl=config.response_cache_ttl_hours * 3600,
+            )
 
         # Initialize agents with shared context
         agent_config = AgentConfig(
@@ -90,7 +135,7 @@ class WorkflowOrchestrator:
         self.reviewer_agent = ReviewerAgent(agent_config, self.shared_context) if config.enable_reviewer else None
 
         # New enhancement agents
-        self.rigging_agent = RiggingAgent(agent_config, self.shared_context)
+        self.rigging_agent = RiggingAgent(agent_config, self.shared_context) if RiggingAgent else None
         self.compositing_agent = CompositingAgent(agent_config, self.shared_context)
         self.sequence_agent = SequenceAgent(agent_config, self.shared_context)
 
@@ -101,9 +146,17 @@ class WorkflowOrchestrator:
             search_references=True,
             use_procedural=True,
             validate_scene=True,
-            max_references=50
+            max_references=50,
+            stage_cache_size=getattr(config, "voxelweaver_cache_size", 128),
+            stage_cache_dir=getattr(config, "voxelweaver_cache_dir", None)
+        )
+        # One core per configuration serves every request and shares its
+        # cached stages; the subsystems' own caches (stage outputs, reference
+        # searches, concept features) are all size-bounded LRUs, so sharing
+        # the core for the life of the process keeps memory bounded
+        self.voxelweaver = shared_component(
+            ("voxelweaver", repr(voxel_config)), lambda: VoxelWeaverCore(voxel_config)
         )
-        self.voxelweaver = VoxelWeaverCore(voxel_config)
         logger.info("VoxelWeaver initialized for scene coherence")
 
         # Enable real-time updates for all agents
@@ -183,240 +236,103 @@ class WorkflowOrchestrator:
             iteration = 0
             max_iterations = self.config.max_iterations if self.config.auto_refine else 1
 
+            # Outputs of the previous iteration and the nodes to regenerate
+            # in this one (None regenerates everything)
+            previous_graph: Optional[GraphResult] = None
+            rerun_nodes: Optional[set] = None
+            feedback_note = ""
+            node_costs: Dict[str, float] = {}
+            previous_scripts: Optional[List[Path]] = None
+
             while iteration < max_iterations:
                 iteration += 1
                 logger.info(f"Starting iteration {iteration}/{max_iterations}")
 
-                # Step 1: Generate concept with collaboration (always required)
-                concept_response = self._generate_concept(prompt + context_description, iteration)
-                result.concept = concept_response.content
-                result.agent_responses.append(concept_response)
-                
-                # Share concept insights with other agents
-                self.concept_agent.add_context(
-                    ContextType.FEEDBACK,
-                    f"Scene concept: {concept_response.content[:200]}...",
-                    metadata={"iteration": iteration, "type": "concept"}
-                )
-
-                # Save concept
-                self.script_manager.save_concept(concept_response.content, session_dir)
-
-                # Process concept through VoxelWeaver for coherence
-                logger.info("Processing concept through VoxelWeaver...")
-                voxelweaver_data = self.voxelweaver.process_scene_concept(
-                    concept=concept_response.content,
-                    prompt=prompt
+                # Steps 1-6: Run the agents as a dependency graph so that
+                # independent LLM calls overlap instead of running back to back
+                graph = self._run_agent_graph(
+                    prompt,
+                    context_description + feedback_note,
+                    selected_agents,
+                    iteration,
+                    session_dir,
+                    previous=previous_graph,
+                    rerun=rerun_nodes,
                 )
-                logger.info(f"VoxelWeaver coherence score: {voxelweaver_data.get('coherence_score', 0):.2f}")
-
-                # Save VoxelWeaver analysis
-                import json
-                voxelweaver_path = session_dir / "voxelweaver_analysis.json"
-                with open(voxelweaver_path, 'w') as f:
-                    json.dump(voxelweaver_data, f, indent=2, default=str)
-
-                # Initialize script paths
-                builder_script_path = None
-                texture_script_path = None
-                render_script_path = None
-                animation_script_path = None
-
-                # Step 2: Generate builder script with collaboration (if selected)
-                if "builder" in selected_agents:
-                    # Enrich builder prompt with VoxelWeaver guidance
-                    voxel_enriched_concept = self.voxelweaver.enrich_agent_prompt(
-                        agent_role="builder",
-                        base_prompt=concept_response.content + context_description,
-                        scene_data=voxelweaver_data
-                    )
-                    enhanced_concept = self._enhance_agent_prompts_with_context(
-                        self.builder_agent, voxel_enriched_concept, ContextType.GEOMETRY
-                    )
-                    builder_response = self._generate_builder_script(enhanced_concept)
-                    result.agent_responses.append(builder_response)
-                    
-                    # Share builder insights
-                    if builder_response.script:
-                        self.builder_agent.add_context(
-                            ContextType.GEOMETRY,
-                            f"Created geometry: {self._extract_geometry_info(builder_response.script)}",
-                            metadata={"iteration": iteration, "script_length": len(builder_response.script)}
-                        )
-
-                    if builder_response.script:
-                        builder_script_path = self.script_manager.save_script(
-                            builder_response.script,
-                            f"01_builder_iter{iteration}",
-                            session_dir,
-                        )
-                        result.scripts.append(builder_script_path)
-                else:
-                    # Create empty builder response if not selected
-                    from voxel.core.models import AgentResponse
-                    builder_response = AgentResponse(
-                        content="Builder agent skipped - not selected",
-                        agent_role=AgentRole.BUILDER,
-                        script="",
-                        metadata={"skipped": True, "reason": "not_selected"}
-                    )
-
-                # Step 3: Generate texture script (if selected)
-                if "texture" in selected_agents:
-                    # Enrich texture prompt with VoxelWeaver material guidance
-                    voxel_enriched_texture = self.voxelweaver.enrich_agent_prompt(
-                        agent_role="texture",
-                        base_prompt=concept_response.content + context_description,
-                        scene_data=voxelweaver_data
-                    )
-                    texture_response = self._generate_texture_script(
-                        voxel_enriched_texture, builder_response.script or ""
+                ran_nodes = set(graph.nodes) if rerun_nodes is None else set(rerun_nodes)
+                for node_name, wall_time in graph.node_timings().items():
+                    if node_name in ran_nodes:
+                        node_costs[node_name] = wall_time
+                    result.node_timings[node_name] = (
+                        result.node_timings.get(node_name, 0.0) + wall_time
                     )
-                    result.agent_responses.append(texture_response)
 
-                    if texture_response.script:
-                        texture_script_path = self.script_manager.save_script(
-                            texture_response.script,
-                            f"02_texture_iter{iteration}",
-                            session_dir,
-                        )
-                        result.scripts.append(texture_script_path)
-                else:
-                    # Create empty texture response if not selected
-                    from voxel.core.models import AgentResponse
-                    texture_response = AgentResponse(
-                        content="Texture agent skipped - not selected",
-                        agent_role=AgentRole.TEXTURE,
-                        script="",
-                        metadata={"skipped": True, "reason": "not_selected"}
-                    )
-
-                # Step 4: Generate HDR environment script (if selected)
-                if "hdr" in selected_agents:
-                    hdr_response = self._generate_hdr_script(concept_response.content + context_description)
-                    result.agent_responses.append(hdr_response)
-
-                    if hdr_response.script:
-                        hdr_script_path = self.script_manager.save_script(
-                            hdr_response.script,
-                            f"03_hdr_iter{iteration}",
-                            session_dir,
-                        )
-                        result.scripts.append(hdr_script_path)
-                else:
-                    # Create empty HDR response if not selected
-                    from voxel.core.models import AgentResponse
-                    hdr_response = AgentResponse(
-                        content="HDR agent skipped - not selected",
-                        agent_role=AgentRole.HDR,
-                        script="",
-                        metadata={"skipped": True, "reason": "not_selected"}
-                    )
-
-                # Step 5: Generate render script (if selected)
-                if "render" in selected_agents:
-                    # Enrich render prompt with VoxelWeaver lighting guidance
-                    voxel_enriched_render = self.voxelweaver.enrich_agent_prompt(
-                        agent_role="render",
-                        base_prompt=concept_response.content + context_description,
-                        scene_data=voxelweaver_data
-                    )
-                    render_response = self._generate_render_script(voxel_enriched_render)
-                    result.agent_responses.append(render_response)
-
-                    if render_response.script:
-                        render_script_path = self.script_manager.save_script(
-                            render_response.script,
-                            f"04_render_iter{iteration}",
-                            session_dir,
-                        )
-                        result.scripts.append(render_script_path)
-                else:
-                    # Create empty render response if not selected
-                    from voxel.core.models import AgentResponse
-                    render_response = AgentResponse(
-                        content="Render agent skipped - not selected",
-                        agent_role=AgentRole.RENDER,
-                        script="",
-                        metadata={"skipped": True, "reason": "not_selected"}
-                    )
-
-                # Step 6: Generate animation script (if selected)
-                if "animation" in selected_agents:
-                    animation_response = self._generate_animation_script(
-                        concept_response.content + context_description, builder_response.script or ""
-                    )
-                    result.agent_responses.append(animation_response)
-
-                    animation_script_path = None
-                    if animation_response.script:
-                        animation_script_path = self.script_manager.save_script(
-                            animation_response.script,
-                            f"05_animation_iter{iteration}",
-                            session_dir,
-                        )
-                        result.scripts.append(animation_script_path)
-                else:
-                    # Create empty animation response if not selected
-                    from voxel.core.models import AgentResponse
-                    animation_response = AgentResponse(
-                        content="Animation agent skipped - not selected",
-                        agent_role=AgentRole.ANIMATION,
-                        script="",
-                        metadata={"skipped": True, "reason": "not_selected"}
-                    )
-                    animation_script_path = None
+                concept_response = graph.value("concept")
+                result.concept = concept_response.content
+                if "concept" in ran_nodes:
+                    result.agent_responses.append(concept_response)
+
+                stage_responses = []
+                scripts_to_combine = []
+                for stage in self.SCRIPT_STAGES:
+                    stage_response, script_path = graph.value(stage)
+                    stage_responses.append(stage_response)
+                    if stage in ran_nodes:
+                        if stage in selected_agents:
+                            result.agent_responses.append(stage_response)
+                        if script_path:
+                            result.scripts.append(script_path)
+                    if script_path:
+                        scripts_to_combine.append(script_path)
 
                 # Step 7: Combine and execute scripts
-                scripts_to_combine = [builder_script_path, texture_script_path, hdr_script_path, render_script_path]
-                if animation_script_path:
-                    scripts_to_combine.append(animation_script_path)
-
                 combined_script = self.script_manager.combine_scripts(
                     scripts_to_combine,
                     f"combined_iter{iteration}",
                     session_dir,
                 )
 
-                # Execute the combined script and save as .blend file
-                blend_file = session_dir / "scene.blend"
-                self._emit_progress("blender_execution", "BlenderExecutor", "Executing script in Blender and creating .blend file...")
-                exec_result = self.blender_executor.execute_script_and_save_blend(
-                    combined_script, blend_file
+                iteration_stats = self._iteration_stats(
+                    iteration, graph, ran_nodes, selected_agents, node_costs
                 )
-
-                if not exec_result.success:
-                    result.error = f"Script execution failed: {exec_result.stderr}"
-                    logger.error(result.error)
-                    break
-
-                # Step 8: Render the scene (optional)
-                output_image = session_dir / "renders" / f"render_iter{iteration}.png"
-                if blend_file.exists():
-                    render_result = self.blender_executor.render_scene(
-                        blend_file,
-                        output_image,
-                        samples=self.config.render_samples,
-                        engine=self.config.render_engine,
-                    )
-
-                    result.render_time += render_result.execution_time
-
-                    if render_result.success:
-                        result.output_path = output_image
-                        logger.info(f"Render saved to: {output_image}")
+                result.iteration_stats.append(iteration_stats)
+
+                # Reused stages keep their saved script files, so an identical
+                # list means the previous .blend and render still apply
+                final_render = None
+                artifact_key = None
+                if scripts_to_combine == previous_scripts and result.output_path is not None:
+                    logger.info("Combined script unchanged; reusing previous Blender output")
+                    iteration_stats["blender_runs"] = 0
+                else:
+                    previous_scripts = scripts_to_combine
+
+                    # Steps 7-8: Execute the combined script, save the .blend
+                    # file and render the scene, unless an identical job has
+                    # already been run in any session
+                    artifact_key = self._artifact_key(combined_script)
+                    if self._fetch_artifacts(artifact_key, session_dir, iteration, result):
+                        iteration_stats["artifacts_reused"] = True
+                    elif self._previews_enabled():
+                        final_render = self._execute_with_preview(
+                            combined_script, session_dir, iteration, result, iteration_stats
+                        )
+                        if final_render is None:
+                            break
+                    elif self._execute_and_render(
+                        combined_script, session_dir, iteration, result, iteration_stats
+                    ):
+                        self._store_artifacts(artifact_key, session_dir, result.output_path)
                     else:
-                        result.error = f"Render failed: {render_result.stderr}"
-                        logger.error(result.error)
                         break
 
-                # Step 9: Review (if enabled)
+                # Step 9: Review (if enabled), overlapping any in-flight final render
                 should_refine = False
                 if self.reviewer_agent and iteration < max_iterations:
                     review_response = self._review_scene(
                         prompt,
                         concept_response.content,
-                        [builder_response, texture_response, hdr_response, render_response, animation_response],
+                        stage_responses,
                     )
                     result.agent_responses.append(review_response)
 
@@ -425,21 +341,33 @@ class WorkflowOrchestrator:
 
                     logger.info(
                         f"Review rating: {feedback.rating}/10, "
-                        f"Refine: {should_refine}"
+                        f"Refine: {should_refine}, "
+                        f"affected stages: {', '.join(feedback.affected_stages) or 'unknown'}"
                     )
 
+                if final_render is not None:
+                    if not self._finish_final_render(final_render, result):
+                        break
+                    self._store_artifacts(artifact_key, session_dir, result.output_path)
+
                 if not should_refine:
                     logger.info("Review satisfactory or max iterations reached")
                     break
 
-                # Reset agents for next iteration
-                self.concept_agent.reset()
-                self.builder_agent.reset()
-                if self.texture_agent is not None:
-                    self.texture_agent.reset()
-                self.render_agent.reset()
-                if self.animation_agent is not None:
-                    self.animation_agent.reset()
+                # Only regenerate the stages the review criticised (and the
+                # stages that consume their output); everything else is reused
+                previous_graph = graph
+                if getattr(self.config, "incremental_refinement", True):
+                    rerun_nodes = self._nodes_to_rerun(feedback.affected_stages)
+                else:
+                    rerun_nodes = None
+                feedback_note = self._format_feedback_note(feedback)
+
+                # Reset the agents that will run again
+                for node_name in sorted(rerun_nodes or graph.nodes):
+                    agent = self._agent_for_node(node_name)
+                    if agent is not None:
+                        agent.reset()
 
             result.success = result.output_path is not None
             result.iterations = iteration
@@ -454,6 +382,16 @@ class WorkflowOrchestrator:
                     "ai_model": self.config.ai_model,
                     "render_samples": self.config.render_samples,
                     "render_engine": self.config.render_engine,
+                    "parallel_agents": self.config.parallel_agents,
+                },
+                "node_timings": result.node_timings,
+                "refinement": {
+                    "incremental": getattr(self.config, "incremental_refinement", True),
+                    "iterations": result.iteration_stats,
+                    "agent_calls_saved": sum(
+                        stats["agent_calls_saved"] for stats in result.iteration_stats
+                    ),
+                    "time_saved": sum(stats["time_saved"] for stats in result.iteration_stats),
                 },
             }
             self.script_manager.save_metadata(metadata, session_dir)
@@ -469,6 +407,497 @@ class WorkflowOrchestrator:
 
         return result
 
+    def _run_agent_graph(
+        self,
+        prompt: str,
+        context_description: str,
+        selected_agents: List[str],
+        iteration: int,
+        session_dir: Path,
+        previous: Optional[GraphResult] = None,
+        rerun: Optional[set] = None,
+    ) -> GraphResult:
+        """
+        Run the concept and script-generating agents as a dependency graph.
+
+        Each node only waits for the outputs it consumes: HDR depends on the
+        concept alone, render on the concept and VoxelWeaver analysis, and
+        texture and animation on the builder script. Script stages return an
+        (AgentResponse, script path) tuple.
+
+        Args:
+            prompt: User's scene description
+            context_description: Description of uploaded context files
+            selected_agents: Agent IDs to run
+            iteration: Current refinement iteration
+            session_dir: Session directory path
+            previous: Result of the previous iteration, whose outputs are
+                reused for nodes not listed in rerun
+            rerun: Nodes to regenerate (None regenerates every node)
+
+        Returns:
+            GraphResult with each node's output and wall time
+        """
+
+        def run_concept(inputs: Dict[str, Any]) -> AgentResponse:
+            concept_response = self._generate_concept(prompt + context_description, iteration)
+
+            # Share concept insights with other agents
+            self.concept_agent.add_context(
+                ContextType.FEEDBACK,
+                f"Scene concept: {concept_response.content[:200]}...",
+                metadata={"iteration": iteration, "type": "concept"}
+            )
+
+            self.script_manager.save_concept(concept_response.content, session_dir)
+            return concept_response
+
+        def run_voxelweaver(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            # Process concept through VoxelWeaver for coherence
+            logger.info("Processing concept through VoxelWeaver...")
+            voxelweaver_data = self.voxelweaver.process_scene_concept(
+                concept=inputs["concept"].content,
+                prompt=prompt
+            )
+            logger.info(f"VoxelWeaver coherence score: {voxelweaver_data.get('coherence_score', 0):.2f}")
+
+            # Save VoxelWeaver analysis
+            import json
+            voxelweaver_path = session_dir / "voxelweaver_analysis.json"
+            with open(voxelweaver_path, 'w') as f:
+                json.dump(voxelweaver_data, f, indent=2, default=str)
+            return voxelweaver_data
+
+        def run_builder(inputs: Dict[str, Any]) -> tuple:
+            if "builder" not in selected_agents:
+                return self._skipped_response(AgentRole.BUILDER), None
+
+            # Enrich builder prompt with VoxelWeaver guidance
+            voxel_enriched_concept = self.voxelweaver.enrich_agent_prompt(
+                agent_role="builder",
+                base_prompt=inputs["concept"].content + context_description,
+                scene_data=inputs["voxelweaver"]
+            )
+            enhanced_concept = self._enhance_agent_prompts_with_context(
+                self.builder_agent, voxel_enriched_concept, ContextType.GEOMETRY
+            )
+            builder_response = self._generate_builder_script(enhanced_concept)
+
+            # Share builder insights
+            if builder_response.script:
+                self.builder_agent.add_context(
+                    ContextType.GEOMETRY,
+                    f"Created geometry: {self._extract_geometry_info(builder_response.script)}",
+                    metadata={"iteration": iteration, "script_length": len(builder_response.script)}
+                )
+            return builder_response, self._save_stage_script(
+                builder_response, f"01_builder_iter{iteration}", session_dir
+            )
+
+        def run_texture(inputs: Dict[str, Any]) -> tuple:
+            if "texture" not in selected_agents:
+                return self._skipped_response(AgentRole.TEXTURE), None
+
+            # Enrich texture prompt with VoxelWeaver material guidance
+            voxel_enriched_texture = self.voxelweaver.enrich_agent_prompt(
+                agent_role="texture",
+                base_prompt=inputs["concept"].content + context_description,
+                scene_data=inputs["voxelweaver"]
+            )
+            builder_response, _ = inputs["builder"]
+            texture_response = self._generate_texture_script(
+                voxel_enriched_texture, builder_response.script or ""
+            )
+            return texture_response, self._save_stage_script(
+                texture_response, f"02_texture_iter{iteration}", session_dir
+            )
+
+        def run_hdr(inputs: Dict[str, Any]) -> tuple:
+            if "hdr" not in selected_agents:
+                return self._skipped_response(AgentRole.HDR), None
+
+            hdr_response = self._generate_hdr_script(inputs["concept"].content + context_description)
+            return hdr_response, self._save_stage_script(
+                hdr_response, f"03_hdr_iter{iteration}", session_dir
+            )
+
+        def run_render(inputs: Dict[str, Any]) -> tuple:
+            if "render" not in selected_agents:
+                return self._skipped_response(AgentRole.RENDER), None
+
+            # Enrich render prompt with VoxelWeaver lighting guidance
+            voxel_enriched_render = self.voxelweaver.enrich_agent_prompt(
+                agent_role="render",
+                base_prompt=inputs["concept"].content + context_description,
+                scene_data=inputs["voxelweaver"]
+            )
+            render_response = self._generate_render_script(voxel_enriched_render)
+            return render_response, self._save_stage_script(
+                render_response, f"04_render_iter{iteration}", session_dir
+            )
+
+        def run_animation(inputs: Dict[str, Any]) -> tuple:
+            if "animation" not in selected_agents:
+                return self._skipped_response(AgentRole.ANIMATION), None
+
+            builder_response, _ = inputs["builder"]
+            animation_response = self._generate_animation_script(
+                inputs["concept"].content + context_description, builder_response.script or ""
+            )
+            return animation_response, self._save_stage_script(
+                animation_response, f"05_animation_iter{iteration}", session_dir
+            )
+
+        scheduler = self.performance_optimizer.create_scheduler(
+            parallel=self.config.parallel_agents
+        )
+        node_funcs = {
+            "concept": run_concept,
+            "voxelweaver": run_voxelweaver,
+            "builder": run_builder,
+            "texture": run_texture,
+            "hdr": run_hdr,
+            "render": run_render,
+            "animation": run_animation,
+        }
+        for name, depends_on in self.GRAPH_DEPENDENCIES.items():
+            func = node_funcs[name]
+            if previous is not None and rerun is not None and name not in rerun:
+                # Reuse last iteration's output (and saved script) unchanged
+                def func(inputs, value=previous.value(name)):
+                    return value
+            scheduler.add_node(name, func, depends_on)
+        return scheduler.run()
+
+    def _execute_and_render(
+        self,
+        combined_script: Path,
+        session_dir: Path,
+        iteration: int,
+        result: SceneResult,
+        iteration_stats: Dict[str, Any],
+    ) -> bool:
+        """
+        Build the scene in Blender, save scene.blend and render it.
+
+        Uses a single Blender process for all three steps unless
+        blender_single_pass is disabled, in which case the build/save and the
+        render run as separate invocations (useful when debugging either one).
+
+        Returns:
+            True on success; on failure result.error is set
+        """
+        blend_file = session_dir / "scene.blend"
+        output_image = session_dir / "renders" / f"render_iter{iteration}.png"
+
+        if getattr(self.config, "blender_single_pass", True):
+            self._emit_progress("blender_execution", "BlenderExecutor", "Building, saving and rendering the scene in Blender...")
+            on_progress = None
+            if getattr(self.config, "stream_render_progress", False):
+                def on_progress(line: str) -> None:
+                    self._emit_progress("rendering", "BlenderExecutor", line)
+
+            pass_result = self.blender_executor.execute_build_and_render(
+                combined_script,
+                blend_file,
+                output_image,
+                samples=self.config.render_samples,
+                engine=self.config.render_engine,
+                on_progress=on_progress,
+            )
+            iteration_stats["blender_runs"] = 1
+            result.render_time += pass_result.execution_time
+
+            if not pass_result.success:
+                result.error = f"Script execution or render failed: {pass_result.stderr}"
+                logger.error(result.error)
+                return False
+
+            result.output_path = output_image
+            logger.info(f"Render saved to: {output_image}")
+            return True
+
+        # Execute the combined script and save as .blend file
+        self._emit_progress("blender_execution", "BlenderExecutor", "Executing script in Blender and creating .blend file...")
+        exec_result = self.blender_executor.execute_script_and_save_blend(
+            combined_script, blend_file
+        )
+        iteration_stats["blender_runs"] = 1
+
+        if not exec_result.success:
+            result.error = f"Script execution failed: {exec_result.stderr}"
+            logger.error(result.error)
+            return False
+
+        # Render the scene (optional)
+        if blend_file.exists():
+            render_result = self.blender_executor.render_scene(
+                blend_file,
+                output_image,
+                samples=self.config.render_samples,
+                engine=self.config.render_engine,
+            )
+            iteration_stats["blender_runs"] += 1
+
+            result.render_time += render_result.execution_time
+
+            if render_result.success:
+                result.output_path = output_image
+                logger.info(f"Render saved to: {output_image}")
+            else:
+                result.error = f"Render failed: {render_result.stderr}"
+                logger.error(result.error)
+                return False
+
+        return True
+
+    def _artifact_key(self, combined_script: Path) -> Optional[ArtifactKey]:
+        """Get the artifact store key for a final build and render (None if disabled)."""
+        if self.artifact_store is None:
+            return None
+        return ArtifactKey(
+            script_hash=self.script_manager.get_content_hash(combined_script),
+            engine=self.config.render_engine,
+            samples=self.config.render_samples,
+        )
+
+    def _fetch_artifacts(
+        self,
+        artifact_key: Optional[ArtifactKey],
+        session_dir: Path,
+        iteration: int,
+        result: SceneResult,
+    ) -> bool:
+        """
+        Link a stored .blend file and render for an identical job into the session.
+
+        Returns:
+            True if the stored artifacts were reused
+        """
+        if artifact_key is None:
+            return False
+
+        blend_file = session_dir / "scene.blend"
+        output_image = session_dir / "renders" / f"render_iter{iteration}.png"
+        if self.artifact_store.fetch(artifact_key, blend_file, output_image):
+            self._emit_progress("blender_execution", "BlenderExecutor", "Reusing identical scene from a previous session...")
+            result.output_path = output_image
+            logger.info(f"Render reused from artifact store: {output_image}")
+            return True
+
+        # Blender must write new files rather than modify stored (hardlinked) ones in place
+        blend_file.unlink(missing_ok=True)
+        output_image.unlink(missing_ok=True)
+        return False
+
+    def _store_artifacts(
+        self,
+        artifact_key: Optional[ArtifactKey],
+        session_dir: Path,
+        output_image: Optional[Path],
+    ) -> None:
+        """Add a finished job's .blend file and render to the artifact store."""
+        if artifact_key is not None and output_image is not None:
+            self.artifact_store.store(artifact_key, session_dir / "scene.blend", output_image)
+
+    def _previews_enabled(self) -> bool:
+        """Check whether preview renders should be produced."""
+        return self.preview_callback is not None and getattr(self.config, "preview_render", True)
+
+    def _execute_with_preview(
+        self,
+        combined_script: Path,
+        session_dir: Path,
+        iteration: int,
+        result: SceneResult,
+        iteration_stats: Dict[str, Any],
+    ) -> Optional[Tuple[Future, Path]]:
+        """
+        Build the scene with a fast preview render, then start the final render.
+
+        One Blender pass builds the scene, saves scene.blend and renders a
+        small low-sample EEVEE image, which is handed to preview_callback as
+        soon as it exists. The full-quality render then runs in the background
+        and can be aborted with cancel_final_render() if the preview is rejected.
+
+        Returns:
+            (future resolving to the final render's BlenderScriptResult, final
+            image path), or None if the preview pass failed (result.error is set)
+        """
+        blend_file = session_dir / "scene.blend"
+        preview_image = session_dir / "previews" / f"preview_iter{iteration}.png"
+        output_image = session_dir / "renders" / f"render_iter{iteration}.png"
+
+        self._emit_progress("blender_execution", "BlenderExecutor", "Building the scene and rendering a preview...")
+        preview_result = self.blender_executor.execute_build_and_render(
+            combined_script,
+            blend_file,
+            preview_image,
+            samples=self.config.preview_samples,
+            engine="EEVEE",
+            resolution_percentage=self.config.preview_resolution_percentage,
+        )
+        iteration_stats["blender_runs"] = 1
+        result.render_time += preview_result.execution_time
+
+        if not preview_result.success:
+            result.error = f"Script execution or preview render failed: {preview_result.stderr}"
+            logger.error(result.error)
+            return None
+
+        # Create the cancel event first so the preview callback can reject
+        # the scene before the final render has started
+        cancel_event = threading.Event()
+        self._render_cancel = cancel_event
+        result.preview_path = preview_image
+        logger.info(f"Preview saved to: {preview_image}")
+        try:
+            self.preview_callback(preview_image, iteration)
+        except Exception as e:
+            logger.warning(f"Preview callback error: {e}")
+
+        self._emit_progress("rendering", "BlenderExecutor", "Rendering final image...")
+        future = self.performance_optimizer.parallel_processor.submit(
+            self.blender_executor.render_scene,
+            blend_file,
+            output_image,
+            samples=self.config.render_samples,
+            engine=self.config.render_engine,
+            cancel_event=cancel_event,
+        )
+        iteration_stats["blender_runs"] += 1
+        return future, output_image
+
+    def _finish_final_render(self, final_render: Tuple[Future, Path], result: SceneResult) -> bool:
+        """
+        Wait for a background final render and record its outcome.
+
+        Returns:
+            True on success; on failure or cancellation result.error is set
+        """
+        future, output_image = final_render
+        render_result = future.result()
+        cancel_event, self._render_cancel = self._render_cancel, None
+        result.render_time += render_result.execution_time
+
+        if cancel_event is not None and cancel_event.is_set():
+            result.render_cancelled = True
+            result.error = "Final render cancelled after the preview was rejected"
+            logger.info(result.error)
+            return False
+
+        if not render_result.success:
+            result.error = f"Render failed: {render_result.stderr}"
+            logger.error(result.error)
+            return False
+
+        result.output_path = output_image
+        logger.info(f"Render saved to: {output_image}")
+        return True
+
+    def cancel_final_render(self) -> bool:
+        """
+        Abort the in-flight final render, e.g. when the user rejects the preview.
+
+        Returns:
+            True if a final render was pending
+        """
+        cancel_event = self._render_cancel
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        logger.info("Final render cancellation requested")
+        return True
+
+    def _nodes_to_rerun(self, affected_stages: List[str]) -> set:
+        """
+        Get the graph nodes to regenerate for review feedback.
+
+        Args:
+            affected_stages: Stages the reviewer criticised (empty if unknown)
+
+        Returns:
+            The affected nodes plus every node that consumes their output
+        """
+        if not affected_stages:
+            return set(self.GRAPH_DEPENDENCIES)
+
+        rerun = set()
+        pending = [stage for stage in affected_stages if stage in self.GRAPH_DEPENDENCIES]
+        while pending:
+            node = pending.pop()
+            if node in rerun:
+                continue
+            rerun.add(node)
+            pending.extend(
+                name for name, depends_on in self.GRAPH_DEPENDENCIES.items()
+                if node in depends_on
+            )
+        return rerun
+
+    def _iteration_stats(
+        self,
+        iteration: int,
+        graph: GraphResult,
+        ran_nodes: set,
+        selected_agents: List[str],
+        node_costs: Dict[str, float],
+    ) -> Dict[str, Any]:
+        """Summarize which nodes an iteration regenerated and what reuse saved."""
+        agent_nodes = [
+            name for name in ("concept", *self.SCRIPT_STAGES)
+            if name == "concept" or name in selected_agents
+        ]
+        reused = [name for name in graph.nodes if name not in ran_nodes]
+        return {
+            "iteration": iteration,
+            "rerun": [name for name in graph.nodes if name in ran_nodes],
+            "reused": reused,
+            "agent_calls": sum(1 for name in agent_nodes if name in ran_nodes),
+            "agent_calls_saved": sum(1 for name in agent_nodes if name not in ran_nodes),
+            # Estimated from what the reused nodes cost when they last ran
+            "time_saved": sum(node_costs.get(name, 0.0) for name in reused),
+            "blender_runs": 0,
+            "artifacts_reused": False,
+        }
+
+    def _format_feedback_note(self, feedback: ReviewFeedback) -> str:
+        """Format review feedback for the prompts of regenerated stages."""
+        lines = [f"- {item}" for item in feedback.improvements]
+        if feedback.suggestions:
+            lines.append(feedback.suggestions)
+        if not lines:
+            return ""
+        return "\n\n**REVIEWER FEEDBACK TO ADDRESS:**\n" + "\n".join(lines)
+
+    def _agent_for_node(self, node_name: str) -> Optional[Any]:
+        """Get the agent behind a graph node (None for non-agent nodes)."""
+        return {
+            "concept": self.concept_agent,
+            "builder": self.builder_agent,
+            "texture": self.texture_agent,
+            "hdr": self.hdr_agent,
+            "render": self.render_agent,
+            "animation": self.animation_agent,
+        }.get(node_name)
+
+    def _skipped_response(self, role: AgentRole) -> AgentResponse:
+        """Create a placeholder response for an agent that was not selected."""
+        return AgentResponse(
+            content=f"{role.value.title()} agent skipped - not selected",
+            agent_role=role,
+            script="",
+            metadata={"skipped": True, "reason": "not_selected"}
+        )
+
+    def _save_stage_script(
+        self, response: AgentResponse, script_name: str, session_dir: Path
+    ) -> Optional[Path]:
+        """Save an agent's script if it produced one."""
+        if not response.script:
+            return None
+        return self.script_manager.save_script(response.script, script_name, session_dir)
+
     def _generate_concept(self, prompt: str, iteration: int) -> any:
         """Generate scene concept."""
         logger.info("Generating scene concept...")
@@ -718,6 +1147,7 @@ print(f"Saved: {blend_file}")
         # Check for rigging needs
         rigging_keywords = ['character', 'human', 'person', 'creature', 'animal', 'rig', 'armature', 'bone']
         if any(keyword in prompt_lower for keyword in rigging_keywords):
+            needs.extend([ContextType.GEOMETRY, ContextType.ANIMATION])
         
         # Check for compositing needs
         compositing_keywords = ['cinematic', 'film', 'movie', 'dramatic', 'atmospheric', 'effects', 'post-processing']
@@ -927,7 +1357,18 @@ print(f"Saved: {blend_file}")
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
-        return self.performance_optimizer.get_performance_stats()
+        stats = self.performance_optimizer.get_performance_stats()
+
+        from voxel.core.response_cache import get_response_cache
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            stats["response_cache"] = response_cache.get_stats()
+        if self.artifact_store is not None:
+            stats["artifact_store"] = self.artifact_store.get_stats()
+        voxelweaver_cache = self.voxelweaver.get_cache_stats()
+        if voxelweaver_cache is not None:
+            stats["voxelweaver_stage_cache"] = voxelweaver_cache
+        return stats
     
     def clear_performance_caches(self) -> None:
         """Clear all performance caches."""
@@ -6,6 +6,8 @@ from .script_validator import (
     BlenderScriptValidator,
     ValidationResult,
     ValidationIssue,
+    ScriptAnalysis,
+    analyze_script,
     validate_script_content,
     validate_script_file
 )
@@ -14,6 +16,8 @@ __all__ = [
     'BlenderScriptValidator',
     'ValidationResult', 
     'ValidationIssue',
+    'ScriptAnalysis',
+    'analyze_script',
     'validate_script_content',
     'validate_script_file'
 ]
@@ -4,14 +4,233 @@ Ensures generated Blender scripts are syntactically correct and ready to run.
 """
 
 import ast
+import hashlib
 import re
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any, Sequence, Set
+from dataclasses import dataclass, field, replace
 
 logger = logging.getLogger(__name__)
 
+# Attribute roots whose use requires the module to be imported
+_IMPORT_USAGE = {
+    'bpy.ops': 'bpy',
+    'bpy.data': 'bpy',
+    'bpy.context': 'bpy',
+    'mathutils': 'mathutils',
+    'bmesh': 'bmesh',
+}
+
+_IMPORT_HINTS = {
+    'bpy': "Consider adding 'import bpy' at the top of the script",
+    'mathutils': "Consider adding 'from mathutils import Vector, Euler, Matrix' for 3D math operations",
+    'bmesh': "Consider adding 'import bmesh' for mesh operations",
+}
+
+# Operator calls with mode/action arguments that changed between Blender versions
+_DEPRECATED_CALLS = {
+    'bpy.ops.object.mode_set': ('mode', {
+        'EDIT', 'OBJECT', 'POSE', 'SCULPT', 'VERTEX_PAINT', 'WEIGHT_PAINT', 'TEXTURE_PAINT', 'PARTICLE_EDIT'
+    }),
+    'bpy.ops.mesh.select_all': ('action', {'SELECT', 'DESELECT', 'INVERT'}),
+}
+
+# Collections indexed by name that raise KeyError when the name is missing
+_NAMED_COLLECTIONS = ('bpy.context.scene.objects', 'bpy.data.objects', 'bpy.data.materials')
+
+_CLEAR_OPERATORS = {'bpy.ops.object.select_all', 'bpy.ops.object.delete'}
+
+# Sort order of per-line issues, matching the order checks are reported in
+_ISSUE_ORDER = {
+    'bpy.ops.object.mode_set': 0,
+    'bpy.ops.mesh.select_all': 1,
+    'bpy.context.scene.objects': 2,
+    'bpy.data.objects': 3,
+    'bpy.data.materials': 4,
+    'active_object': 5,
+    'objects_new': 6,
+}
+
+# Expressions that evaluate to a Blender object
+_OBJECT_REFERENCES = {'bpy.context.active_object', 'bpy.context.object'}
+
+_OBJECT_ACCESS_PATTERN = re.compile(r'bpy\.data\.objects\[([\'"])([^\'\"]+)\1\]')
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Dotted name of a Name/Attribute chain such as ``bpy.data.objects``."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+@dataclass
+class ScriptAnalysis:
+    """
+    Facts about one script or script fragment, with line numbers relative to
+    its first line so fragments can be analysed once and combined anywhere.
+    """
+    line_count: int
+    imports: Set[str] = field(default_factory=set)
+    used_modules: Set[str] = field(default_factory=set)
+    # (line, order, column, message) for per-line API warnings
+    api_warnings: List[Tuple[int, int, int, str]] = field(default_factory=list)
+    world_volume_lines: Set[int] = field(default_factory=set)
+    loop_lines: Set[int] = field(default_factory=set)
+    operator_lines: Set[int] = field(default_factory=set)
+    new_object_lines: Set[int] = field(default_factory=set)
+    has_clear_operation: bool = False
+    has_scene_link: bool = False
+    has_try: bool = False
+    mentions_camera: bool = False
+    mentions_light: bool = False
+    # Top-level functions/classes and literal object names, with their first line
+    definitions: Dict[str, int] = field(default_factory=dict)
+    object_names: Dict[str, int] = field(default_factory=dict)
+
+
+class _ScriptVisitor(ast.NodeVisitor):
+    """Collects imports, Blender API usage and common issues in one pass."""
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.analysis = ScriptAnalysis(line_count=len(lines))
+        self._seen: Set[Tuple[int, int]] = set()
+        self._object_variables: Set[str] = set()
+
+    def _line(self, lineno: int) -> str:
+        return self.lines[lineno - 1] if 0 < lineno <= len(self.lines) else ''
+
+    def _warn_once(self, lineno: int, order: int, message: str) -> None:
+        if (lineno, order) not in self._seen:
+            self._seen.add((lineno, order))
+            self.analysis.api_warnings.append((lineno, order, 0, message))
+
+    def _is_object(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Name):
+            return node.id in self._object_variables
+        if isinstance(node, ast.Call):
+            return _dotted_name(node.func) == 'bpy.data.objects.new'
+        return _dotted_name(node) in _OBJECT_REFERENCES
+
+    def visit_Module(self, node: ast.Module) -> None:
+        for statement in node.body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.analysis.definitions.setdefault(statement.name, statement.lineno)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.analysis.imports.add(alias.name.split('.')[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module and not node.level:
+            self.analysis.imports.add(node.module.split('.')[0])
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if isinstance(target, ast.Name) and self._is_object(node.value):
+                self._object_variables.add(target.id)
+            elif (isinstance(target, ast.Attribute) and target.attr == 'name'
+                    and self._is_object(target.value)
+                    and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)):
+                self.analysis.object_names.setdefault(node.value.value, node.lineno)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        parent = _dotted_name(node.value)
+        if parent is not None:
+            dotted = f"{parent}.{node.attr}"
+            module = _IMPORT_USAGE.get(parent)
+            if module:
+                self.analysis.used_modules.add(module)
+            if parent == 'bpy.ops':
+                self.analysis.operator_lines.add(node.lineno)
+            if dotted in _CLEAR_OPERATORS:
+                self.analysis.has_clear_operation = True
+            if dotted == 'bpy.context.active_object' and 'if' not in self._line(node.lineno):
+                self._warn_once(
+                    node.lineno, _ISSUE_ORDER['active_object'],
+                    "Consider checking if active_object exists before using it"
+                )
+        if node.attr == 'volume' and (
+            (isinstance(node.value, ast.Name) and node.value.id == 'world')
+            or (isinstance(node.value, ast.Attribute) and node.value.attr == 'world')
+        ):
+            self.analysis.world_volume_lines.add(node.lineno)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        function = _dotted_name(node.func)
+        if function in _DEPRECATED_CALLS:
+            keyword, values = _DEPRECATED_CALLS[function]
+            if (not node.args and len(node.keywords) == 1 and node.keywords[0].arg == keyword
+                    and isinstance(node.keywords[0].value, ast.Constant)
+                    and node.keywords[0].value.value in values):
+                self._warn_once(
+                    node.lineno, _ISSUE_ORDER[function],
+                    f"Potential deprecated API usage: {self._line(node.lineno).strip()}"
+                )
+        elif function == 'bpy.data.objects.new':
+            self.analysis.new_object_lines.add(node.lineno)
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                self.analysis.object_names.setdefault(node.args[0].value, node.lineno)
+        elif function == 'bpy.context.scene.collection.objects.link':
+            self.analysis.has_scene_link = True
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        collection = _dotted_name(node.value)
+        if (collection in _NAMED_COLLECTIONS and isinstance(node.slice, ast.Constant)
+                and isinstance(node.slice.value, str)):
+            self.analysis.api_warnings.append((
+                node.lineno, _ISSUE_ORDER[collection], node.col_offset,
+                f"Direct object access by name '{node.slice.value}' may fail if object doesn't exist"
+            ))
+        self.generic_visit(node)
+
+    def visit_While(self, node: ast.While) -> None:
+        test = node.test
+        if isinstance(test, ast.Constant) and (test.value is True or (type(test.value) is int and test.value == 1)):
+            self.analysis.loop_lines.add(node.lineno)
+        self.generic_visit(node)
+
+    def visit_Try(self, node: ast.Try) -> None:
+        self.analysis.has_try = True
+        self.generic_visit(node)
+
+    visit_TryStar = visit_Try
+
+
+def analyze_script(script_content: str) -> ScriptAnalysis:
+    """
+    Analyse a script in a single AST pass.
+
+    Args:
+        script_content: Python source (must parse)
+
+    Returns:
+        ScriptAnalysis with line numbers relative to the script
+
+    Raises:
+        SyntaxError: If the script does not parse
+    """
+    tree = ast.parse(script_content)
+    visitor = _ScriptVisitor(script_content.split('\n'))
+    visitor.visit(tree)
+    content_lower = script_content.lower()
+    visitor.analysis.mentions_camera = 'camera' in content_lower
+    visitor.analysis.mentions_light = 'light' in content_lower
+    return visitor.analysis
+
 
 @dataclass
 class ValidationResult:
@@ -37,9 +256,22 @@ class ValidationIssue:
 class BlenderScriptValidator:
     """
     Validates and proofreads Blender Python scripts to ensure they're ready to run.
+
+    Scripts are parsed once and checked with a single AST pass. Results are
+    cached by content hash, so re-validating an unchanged script (a combined
+    script served on every download, say) is a dictionary lookup. Scripts
+    assembled from fragments can be validated with validate_fragments, which
+    caches the analysis of each fragment instead.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 128, fragment_cache_size: int = 1024):
+        """
+        Initialize the validator.
+
+        Args:
+            cache_size: Number of validation results to keep
+            fragment_cache_size: Number of fragment analyses to keep
+        """
         self.common_imports = [
             'bpy',
             'bmesh',
@@ -60,25 +292,13 @@ class BlenderScriptValidator:
             'bl_ui',
             'bl_operators'
         ]
-        
-        self.common_patterns = {
-            'missing_imports': [
-                r'bpy\.ops\.',
-                r'bpy\.data\.',
-                r'bpy\.context\.',
-                r'mathutils\.',
-                r'bmesh\.'
-            ],
-            'deprecated_api': [
-                r'bpy\.ops\.object\.mode_set\(mode=([\'"])(EDIT|OBJECT|POSE|SCULPT|VERTEX_PAINT|WEIGHT_PAINT|TEXTURE_PAINT|PARTICLE_EDIT)\1\)',
-                r'bpy\.ops\.mesh\.select_all\(action=([\'"])(SELECT|DESELECT|INVERT)\1\)'
-            ],
-            'potential_errors': [
-                r'bpy\.context\.scene\.objects\[([\'"])([^\'\"]+)\1\]',
-                r'bpy\.data\.objects\[([\'"])([^\'\"]+)\1\]',
-                r'bpy\.data\.materials\[([\'"])([^\'\"]+)\1\]'
-            ]
-        }
+
+        self.cache_size = cache_size
+        self.fragment_cache_size = fragment_cache_size
+        self._results: "OrderedDict[str, ValidationResult]" = OrderedDict()
+        self._analyses: "OrderedDict[str, ScriptAnalysis]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0, "fragment_hits": 0, "fragment_misses": 0}
 
     def validate_script(self, script_content: str) -> ValidationResult:
         """
@@ -92,44 +312,140 @@ class BlenderScriptValidator:
         """
         import time
         start_time = time.time()
-        
-        errors = []
-        warnings = []
-        fixes_applied = []
-        
-        # Step 1: Basic Python syntax validation
-        syntax_result = self._validate_syntax(script_content)
-        if not syntax_result.is_valid:
-            errors.extend(syntax_result.errors)
+
+        key = hashlib.sha256(script_content.encode('utf-8', 'surrogatepass')).hexdigest()
+        with self._cache_lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.cache_stats["hits"] += 1
+        if cached is not None:
+            logger.debug(f"Script validation cache hit ({key[:12]})")
+            return self._copy_result(cached)
+
+        result = self._validate_uncached(script_content)
+
+        with self._cache_lock:
+            self.cache_stats["misses"] += 1
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+
+        # Log performance metrics
+        validation_time = time.time() - start_time
+        logger.info(f"Script validation completed in {validation_time:.3f}s - Status: {'VALID' if result.is_valid else 'INVALID'}")
+
+        return self._copy_result(result)
+
+    def validate_fragments(self, fragments: Sequence[Tuple[str, str]]) -> ValidationResult:
+        """
+        Validate a script assembled from fragments joined by newlines.
+
+        Each fragment is analysed once and cached by its hash, so validating
+        a combined script only parses fragments that changed. The per-script
+        checks then run over the merged analyses and report the same issues,
+        with the same line numbers, as validating the joined script. Checks
+        across fragments add warnings for top-level functions or classes
+        defined again by a later fragment and for object names set by more
+        than one fragment.
+
+        Args:
+            fragments: (name, source) pairs in script order
+
+        Returns:
+            ValidationResult for the joined script
+        """
+        import time
+        start_time = time.time()
+
+        script_content = '\n'.join(text for _, text in fragments)
+        placed = []
+        offset = 0
+        for name, text in fragments:
+            analysis = self._analyze_fragment(text)
+            if analysis is None:
+                # Report the syntax error against the joined script
+                return self.validate_script(script_content)
+            placed.append((offset, name, analysis))
+            offset += analysis.line_count
+
+        errors, warnings = self._report([(offset, analysis) for offset, _, analysis in placed])
+        warnings.extend(self._check_fragment_conflicts(placed))
+        result = self._finish(script_content, errors, warnings)
+
+        validation_time = time.time() - start_time
+        logger.info(
+            f"Validated {len(fragments)} script fragments in {validation_time:.3f}s - "
+            f"Status: {'VALID' if result.is_valid else 'INVALID'}"
+        )
+        return result
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get validation cache statistics."""
+        with self._cache_lock:
+            return {**self.cache_stats, "size": len(self._results), "fragments": len(self._analyses)}
+
+    def clear_cache(self) -> None:
+        """Drop all cached validation results."""
+        with self._cache_lock:
+            self._results.clear()
+            self._analyses.clear()
+
+    @staticmethod
+    def _copy_result(result: ValidationResult) -> ValidationResult:
+        """Copy a result so callers cannot mutate the cached lists."""
+        return replace(
+            result,
+            errors=list(result.errors),
+            warnings=list(result.warnings),
+            fixes_applied=list(result.fixes_applied or []),
+        )
+
+    def _analyze_fragment(self, text: str) -> Optional[ScriptAnalysis]:
+        """Get the cached analysis of a fragment, or None if it does not parse."""
+        key = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        with self._cache_lock:
+            analysis = self._analyses.get(key)
+            if analysis is not None:
+                self._analyses.move_to_end(key)
+                self.cache_stats["fragment_hits"] += 1
+                return analysis
+
+        try:
+            analysis = analyze_script(text)
+        except Exception:
+            return None
+
+        with self._cache_lock:
+            self.cache_stats["fragment_misses"] += 1
+            self._analyses[key] = analysis
+            while len(self._analyses) > self.fragment_cache_size:
+                self._analyses.popitem(last=False)
+        return analysis
+
+    def _validate_uncached(self, script_content: str) -> ValidationResult:
+        """Run all checks on a script."""
+        # Step 1: Basic Python syntax validation, then collect imports, API
+        # usage and common issues in one pass
+        try:
+            analysis = analyze_script(script_content)
+        except Exception:
             return ValidationResult(
                 is_valid=False,
-                errors=errors,
-                warnings=warnings,
-                fixes_applied=fixes_applied
+                errors=self._validate_syntax(script_content).errors,
+                warnings=[],
+                fixes_applied=[]
             )
-        
-        # Step 2: Check for missing imports
-        import_result = self._check_imports(script_content)
-        if import_result.errors:
-            errors.extend(import_result.errors)
-        if import_result.warnings:
-            warnings.extend(import_result.warnings)
-        
-        # Step 3: Check Blender API usage
-        blender_result = self._check_blender_api(script_content)
-        if blender_result.errors:
-            errors.extend(blender_result.errors)
-        if blender_result.warnings:
-            warnings.extend(blender_result.warnings)
-        
-        # Step 4: Check for common issues
-        common_result = self._check_common_issues(script_content)
-        if common_result.errors:
-            errors.extend(common_result.errors)
-        if common_result.warnings:
-            warnings.extend(common_result.warnings)
-        
-        # Step 5: Auto-fix common issues if possible
+
+        # Step 2: Report issues
+        errors, warnings = self._report([(0, analysis)])
+
+        # Step 3: Auto-fix common issues if possible
+        return self._finish(script_content, errors, warnings)
+
+    def _finish(self, script_content: str, errors: List[str], warnings: List[str]) -> ValidationResult:
+        """Apply automatic fixes when there are only warnings and build the result."""
+        fixes_applied = []
         fixed_script = script_content
         if warnings and not errors:
             fixed_script, fixes = self._auto_fix_issues(script_content)
@@ -137,10 +453,6 @@ class BlenderScriptValidator:
                 fixes_applied.extend(fixes)
                 logger.info(f"Applied {len(fixes)} automatic fixes to script")
         
-        # Log performance metrics
-        validation_time = time.time() - start_time
-        logger.info(f"Script validation completed in {validation_time:.3f}s - Status: {'VALID' if len(errors) == 0 else 'INVALID'}")
-        
         return ValidationResult(
             is_valid=len(errors) == 0,
             errors=errors,
@@ -161,116 +473,113 @@ class BlenderScriptValidator:
             error_msg = f"Parse error: {str(e)}"
             return ValidationResult(is_valid=False, errors=[error_msg], warnings=[])
 
-    def _check_imports(self, script_content: str) -> ValidationResult:
-        """Check for missing imports."""
+    def _report(self, analyses: Sequence[Tuple[int, ScriptAnalysis]]) -> Tuple[List[str], List[str]]:
+        """
+        Turn analyses placed at line offsets into error and warning messages.
+
+        Args:
+            analyses: (line offset, analysis) pairs
+
+        Returns:
+            (errors, warnings)
+        """
         errors = []
         warnings = []
-        
-        lines = script_content.split('\n')
-        
-        # Find existing imports
-        existing_imports = set()
-        for line in lines:
-            if line.strip().startswith(('import ', 'from ')):
-                # Extract module name
-                match = re.match(r'(?:import|from)\s+([a-zA-Z_][a-zA-Z0-9_]*)', line.strip())
-                if match:
-                    existing_imports.add(match.group(1))
-        
-        # Check for missing imports based on usage
-        for pattern in self.common_patterns['missing_imports']:
-            matches = re.findall(pattern, script_content)
-            if matches:
-                module = pattern.split('.')[0]
-                if module not in existing_imports and module in self.blender_modules:
-                    if module == 'bpy':
-                        warnings.append(f"Consider adding 'import bpy' at the top of the script")
-                    elif module == 'mathutils':
-                        warnings.append(f"Consider adding 'from mathutils import Vector, Euler, Matrix' for 3D math operations")
-                    elif module == 'bmesh':
-                        warnings.append(f"Consider adding 'import bmesh' for mesh operations")
-        
-        return ValidationResult(is_valid=True, errors=errors, warnings=warnings)
+        for result in (
+            self._check_imports(analyses),
+            self._check_blender_api(analyses),
+            self._check_common_issues(analyses),
+        ):
+            errors.extend(result.errors)
+            warnings.extend(result.warnings)
+        return errors, warnings
 
-    def _check_blender_api(self, script_content: str) -> ValidationResult:
+    def _check_imports(self, analyses: Sequence[Tuple[int, ScriptAnalysis]]) -> ValidationResult:
+        """Check for missing imports."""
+        imports = set().union(*(analysis.imports for _, analysis in analyses))
+        used_modules = set().union(*(analysis.used_modules for _, analysis in analyses))
+        warnings = [
+            hint for module, hint in _IMPORT_HINTS.items()
+            if module in used_modules
+            and module not in imports
+            and module in self.blender_modules
+        ]
+        return ValidationResult(is_valid=True, errors=[], warnings=warnings)
+
+    def _check_blender_api(self, analyses: Sequence[Tuple[int, ScriptAnalysis]]) -> ValidationResult:
         """Check for Blender API usage issues."""
-        errors = []
-        warnings = []
-        
-        lines = script_content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for deprecated API usage
-            for pattern in self.common_patterns['deprecated_api']:
-                if re.search(pattern, line):
-                    warnings.append(f"Line {i}: Potential deprecated API usage: {line.strip()}")
-            
-            # Check for potential object access errors
-            for pattern in self.common_patterns['potential_errors']:
-                matches = re.findall(pattern, line)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        obj_name = match[1] if len(match) > 1 else match[0]
-                        warnings.append(f"Line {i}: Direct object access by name '{obj_name}' may fail if object doesn't exist")
-            
-            # Check for common Blender mistakes
-            if 'bpy.context.active_object' in line and 'if' not in line:
-                warnings.append(f"Line {i}: Consider checking if active_object exists before using it")
-            
-            if 'bpy.data.objects.new(' in line and 'bpy.context.scene.collection.objects.link(' not in script_content:
-                warnings.append(f"Line {i}: Objects created with bpy.data.objects.new() should be linked to scene")
-            
-            # Check for invalid world.volume access
-            if 'world.volume' in line:
-                errors.append(f"Line {i}: Invalid access to `world.volume` - this attribute does not exist in Blender's World object. Use world shader nodes instead for volumetric effects.")
-        
+        has_scene_link = any(analysis.has_scene_link for _, analysis in analyses)
+        issues = []
+        volume_lines = []
+        for offset, analysis in analyses:
+            issues.extend(
+                (offset + line, order, column, message)
+                for line, order, column, message in analysis.api_warnings
+            )
+            if not has_scene_link:
+                issues.extend(
+                    (offset + line, _ISSUE_ORDER['objects_new'], 0,
+                     "Objects created with bpy.data.objects.new() should be linked to scene")
+                    for line in analysis.new_object_lines
+                )
+            volume_lines.extend(offset + line for line in analysis.world_volume_lines)
+        warnings = [f"Line {line}: {message}" for line, _, _, message in sorted(issues)]
+
+        # Check for invalid world.volume access
+        errors = [
+            f"Line {line}: Invalid access to `world.volume` - this attribute does not exist in Blender's World object. Use world shader nodes instead for volumetric effects."
+            for line in sorted(volume_lines)
+        ]
         return ValidationResult(is_valid=len(errors) == 0, errors=errors, warnings=warnings)
 
-    def _check_common_issues(self, script_content: str) -> ValidationResult:
+    def _check_common_issues(self, analyses: Sequence[Tuple[int, ScriptAnalysis]]) -> ValidationResult:
         """Check for common scripting issues."""
-        errors = []
+        # Check for potential infinite loops or performance issues
+        loop_lines = sorted(offset + line for offset, analysis in analyses for line in analysis.loop_lines)
+        errors = [f"Line {line}: Potential infinite loop detected" for line in loop_lines]
+
+        # Check for missing error handling
         warnings = []
-        
-        lines = script_content.split('\n')
-        
-        # Check for common issues
-        has_clear_operation = False
-        has_camera_setup = False
-        has_lighting_setup = False
-        
-        for i, line in enumerate(lines, 1):
-            line_lower = line.lower().strip()
-            
-            # Check for clear scene operation
-            if 'bpy.ops.object.select_all' in line or 'bpy.ops.object.delete' in line:
-                has_clear_operation = True
-            
-            # Check for camera setup
-            if 'bpy.ops.object.camera_add' in line or 'camera' in line_lower:
-                has_camera_setup = True
-            
-            # Check for lighting setup
-            if 'bpy.ops.object.light_add' in line or 'light' in line_lower:
-                has_lighting_setup = True
-            
-            # Check for potential infinite loops or performance issues
-            if 'while True:' in line or 'while 1:' in line:
-                errors.append(f"Line {i}: Potential infinite loop detected")
-            
-            # Check for missing error handling
-            if 'bpy.ops.' in line and 'try:' not in script_content:
-                warnings.append(f"Line {i}: Consider adding error handling for Blender operations")
-        
-        # Add suggestions for scene setup
-        if not has_clear_operation:
+        if not any(analysis.has_try for _, analysis in analyses):
+            operator_lines = sorted(
+                offset + line for offset, analysis in analyses for line in analysis.operator_lines
+            )
+            warnings.extend(
+                f"Line {line}: Consider adding error handling for Blender operations"
+                for line in operator_lines
+            )
+
+        # Add suggestions for scene setup (comments count for camera and lighting)
+        if not any(analysis.has_clear_operation for _, analysis in analyses):
             warnings.append("Consider adding scene clearing operations at the beginning")
-        if not has_camera_setup:
+        if not any(analysis.mentions_camera for _, analysis in analyses):
             warnings.append("Consider adding a camera for rendering")
-        if not has_lighting_setup:
+        if not any(analysis.mentions_light for _, analysis in analyses):
             warnings.append("Consider adding lighting to the scene")
         
         return ValidationResult(is_valid=True, errors=errors, warnings=warnings)
 
+    def _check_fragment_conflicts(self, placed: Sequence[Tuple[int, str, ScriptAnalysis]]) -> List[str]:
+        """Check for definitions and object names shared by different fragments."""
+        warnings = []
+        definitions: Dict[str, Tuple[int, str, int]] = {}
+        object_names: Dict[str, Tuple[int, str, int]] = {}
+        for index, (offset, fragment, analysis) in enumerate(placed):
+            for name, line in analysis.definitions.items():
+                first = definitions.setdefault(name, (index, fragment, offset + line))
+                if first[0] != index:
+                    warnings.append(
+                        f"Line {offset + line}: '{name}' redefines the definition from {first[1]} (line {first[2]})"
+                    )
+            for name, line in analysis.object_names.items():
+                first = object_names.setdefault(name, (index, fragment, offset + line))
+                if first[0] != index:
+                    warnings.append(
+                        f"Line {offset + line}: Object name '{name}' is also used by {first[1]} "
+                        f"(line {first[2]}); Blender will rename one of them"
+                    )
+        return warnings
+
     def _auto_fix_issues(self, script_content: str) -> Tuple[str, List[str]]:
         """Automatically fix common issues in the script."""
         fixed_script = script_content
@@ -310,7 +619,7 @@ class BlenderScriptValidator:
             # Add existence check before object access
             if 'bpy.data.objects[' in line and 'if' not in line:
                 # Extract object name
-                match = re.search(r'bpy\.data\.objects\[([\'"])([^\'\"]+)\1\]', line)
+                match = _OBJECT_ACCESS_PATTERN.search(line)
                 if match:
                     obj_name = match.group(2)
                     fixed_lines.append(f"    if '{obj_name}' in bpy.data.objects:")
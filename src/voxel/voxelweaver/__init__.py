@@ -7,7 +7,9 @@ from .voxelweaver_core import VoxelWeaverCore, VoxelWeaverConfig
 from .search_scraper import ReferenceSearcher, ExternalReference
 from .proportion_analyzer import ProportionAnalyzer, ProportionCheck
 from .geometry_handler import GeometryHandler, GeometryType, ComplexityLevel, GeometryHint
-from .context_alignment import ContextAligner, BoundingBox, AlignedObject, PlacementStrategy
+from .context_alignment import (
+    ContextAligner, BoundingBox, AlignedObject, PlacementStrategy, SpatialHashGrid
+)
 from .lighting_engine import LightingEngine, LightConfig, LightingStyle, TimeOfDay
 from .texture_mapper import TextureMapper, MaterialSuggestion, MaterialType
 from .scene_validator import SceneValidator, ValidationLevel, ValidationIssue, IssueLevel
@@ -38,6 +40,7 @@ __all__ = [
     "BoundingBox",
     "AlignedObject",
     "PlacementStrategy",
+    "SpatialHashGrid",
 
     # Lighting
     "LightingEngine",
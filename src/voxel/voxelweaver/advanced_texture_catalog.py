@@ -1,16 +1,26 @@
 """
 Advanced Texture Catalog - Comprehensive texture mapping system.
 Provides intricate texture generation with multiple map types for realistic materials.
+Presets are registered as factories and only built when first accessed.
 """
 
 import logging
 import random
 import math
-from typing import Dict, List, Any, Optional, Tuple, Union
+import threading
+from collections import defaultdict
+from collections.abc import MutableMapping
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 
+from .material_codegen import (
+    BSDF_INPUTS, CODE_PREAMBLE, CodeTemplate, TemplateCache,
+    bsdf_input_lines, bsdf_values, escape
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -108,22 +118,206 @@ class MaterialPreset:
     complexity_score: float  # 0.0 to 1.0
 
 
+@dataclass
+class PresetSpec:
+    """Lightweight registration record for a lazily built preset."""
+    name: str
+    category: str  # MaterialCategory value
+    environment_adaptation: Dict[str, float]
+    complexity_score: float
+    tags: Tuple[str, ...]
+    factory: Optional[Callable[[], MaterialPreset]] = None
+
+
+def _category_key(category: Union[MaterialCategory, str]) -> str:
+    """Normalize a category to its string value for index lookups."""
+    return category.value if isinstance(category, MaterialCategory) else str(category)
+
+
+class PresetRegistry(MutableMapping):
+    """
+    Mapping of preset names to MaterialPresets that builds each preset on
+    first access.
+
+    Registration only records a PresetSpec and updates the inverted indexes
+    by category, environment and tag, so lookups never build or scan
+    presets they do not return. Assigning a ready-made MaterialPreset
+    registers and indexes it like any other entry.
+    """
+
+    # Adaptation above which a preset counts as optimized for an environment
+    ENVIRONMENT_THRESHOLD = 0.8
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._specs: Dict[str, PresetSpec] = {}
+        self._built: Dict[str, MaterialPreset] = {}
+        self._by_category: Dict[str, List[str]] = defaultdict(list)
+        self._by_environment: Dict[str, List[str]] = defaultdict(list)
+        self._by_tag: Dict[str, List[str]] = defaultdict(list)
+        self._lock = threading.RLock()
+        # Bumped on every change so derived data (e.g. score matrices) can be rebuilt
+        self.version = 0
+
+    def register(
+        self,
+        name: str,
+        category: Union[MaterialCategory, str],
+        environment_adaptation: Dict[str, float],
+        complexity_score: float,
+        factory: Optional[Callable[[], MaterialPreset]],
+        tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Register a preset without building it.
+
+        Args:
+            name: Preset key
+            category: Material category of the built preset
+            environment_adaptation: Environment adaptation of the built preset
+            complexity_score: Complexity score of the built preset
+            factory: Zero-argument callable that builds the preset
+            tags: Extra search tags (the words of the name are always included)
+        """
+        all_tags = tuple(dict.fromkeys(
+            [part for part in name.lower().split("_") if part] + [t.lower() for t in tags]
+        ))
+        spec = PresetSpec(
+            name=name,
+            category=_category_key(category),
+            environment_adaptation=dict(environment_adaptation),
+            complexity_score=complexity_score,
+            tags=all_tags,
+            factory=factory
+        )
+        with self._lock:
+            if name in self._specs:
+                self._unindex(name)
+            self._specs[name] = spec
+            self._index(spec)
+            self.version += 1
+
+    def _index(self, spec: PresetSpec) -> None:
+        """Add a spec to the inverted indexes (caller holds the lock)."""
+        self._by_category[spec.category].append(spec.name)
+        for environment, adaptation in spec.environment_adaptation.items():
+            if adaptation > self.ENVIRONMENT_THRESHOLD:
+                self._by_environment[environment].append(spec.name)
+        for tag in spec.tags:
+            self._by_tag[tag].append(spec.name)
+
+    def _unindex(self, name: str) -> None:
+        """Remove a preset from the indexes and build cache (caller holds the lock)."""
+        spec = self._specs.pop(name)
+        self._built.pop(name, None)
+        self._by_category[spec.category].remove(name)
+        for environment, adaptation in spec.environment_adaptation.items():
+            if adaptation > self.ENVIRONMENT_THRESHOLD:
+                self._by_environment[environment].remove(name)
+        for tag in spec.tags:
+            self._by_tag[tag].remove(name)
+
+    def __getitem__(self, name: str) -> MaterialPreset:
+        preset = self._built.get(name)
+        if preset is not None:
+            return preset
+        with self._lock:
+            preset = self._built.get(name)
+            if preset is None:
+                preset = self._specs[name].factory()
+                self._built[name] = preset
+        return preset
+
+    def __setitem__(self, name: str, preset: MaterialPreset) -> None:
+        with self._lock:
+            self.register(name, preset.category, preset.environment_adaptation, preset.complexity_score, None)
+            self._built[name] = preset
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            self._unindex(name)
+            self.version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def names_by_category(self, category: Union[MaterialCategory, str]) -> List[str]:
+        """Get the names of presets in a category."""
+        return list(self._by_category.get(_category_key(category), ()))
+
+    def names_by_environment(self, environment: str) -> List[str]:
+        """Get the names of presets optimized for an environment."""
+        return list(self._by_environment.get(environment, ()))
+
+    def names_by_tag(self, tag: str) -> List[str]:
+        """Get the names of presets with a tag."""
+        return list(self._by_tag.get(tag.lower(), ()))
+
+    def specs(self) -> List[PresetSpec]:
+        """Get every preset's registration record, in registration order, without building any."""
+        with self._lock:
+            return list(self._specs.values())
+
+    def get_spec(self, name: str) -> Optional[PresetSpec]:
+        """Get a preset's registration record without building it."""
+        return self._specs.get(name)
+
+    def is_built(self, name: str) -> bool:
+        """Check whether a preset has been built."""
+        return name in self._built
+
+    @property
+    def built_count(self) -> int:
+        """Number of presets built so far."""
+        return len(self._built)
+
+
 class AdvancedTextureCatalog:
     """
     Advanced texture catalog system for intricate material generation.
     Provides comprehensive texture mapping with multiple map types.
     """
 
+    WOOD_ENVIRONMENT_ADAPTATION = {"indoor": 1.0, "outdoor": 0.8, "studio": 1.2, "night": 0.6}
+    STEEL_ENVIRONMENT_ADAPTATION = {"indoor": 1.0, "outdoor": 0.9, "studio": 1.1, "night": 0.7}
+    GLASS_ENVIRONMENT_ADAPTATION = {"indoor": 1.0, "outdoor": 0.8, "studio": 1.2, "night": 0.6}
+    NEON_ENVIRONMENT_ADAPTATION = {"indoor": 1.0, "outdoor": 1.2, "studio": 0.8, "night": 1.5}
+
+    # Registered with each preset so scoring can rank presets without building them
+    WOOD_COMPLEXITY = 0.7
+    STEEL_COMPLEXITY = 0.8
+    GLASS_COMPLEXITY = 0.9
+    NEON_COMPLEXITY = 0.6
+
     def __init__(self):
         """Initialize advanced texture catalog."""
-        self.material_presets = {}
+        self.material_presets = PresetRegistry()
         self.texture_generators = {}
         self.environment_adapters = {}
+        self._code_templates = TemplateCache()
         self._initialize_catalog()
         logger.info("AdvancedTextureCatalog initialized")
 
+    def _register_preset(
+        self,
+        name: str,
+        category: MaterialCategory,
+        environment_adaptation: Dict[str, float],
+        complexity_score: float,
+        factory: Callable[[], MaterialPreset],
+        tags: Iterable[str] = ()
+    ):
+        """Register a preset factory; the preset is built on first access."""
+        self.material_presets.register(name, category, environment_adaptation, complexity_score, factory, tags)
+
     def _initialize_catalog(self):
-        """Initialize the texture catalog with comprehensive presets."""
+        """Register the catalog's presets (none are built until accessed)."""
         
         # Organic Materials
         self._create_wood_materials()
@@ -158,10 +352,24 @@ class AdvancedTextureCatalog:
         self._create_led_materials()
         self._create_plasma_materials()
         
-        logger.info(f"Initialized {len(self.material_presets)} material presets")
+        logger.info(f"Registered {len(self.material_presets)} material presets")
 
     def _create_wood_materials(self):
-        """Create comprehensive wood material presets."""
+        """Register comprehensive wood material presets."""
+        self._register_preset(
+            "oak_wood",
+            MaterialCategory.ORGANIC,
+            self.WOOD_ENVIRONMENT_ADAPTATION,
+            self.WOOD_COMPLEXITY,
+            self._build_oak_wood,
+            tags=("wood", "oak", "furniture")
+        )
+        
+        # Add more wood variants
+        self._create_wood_variants()
+
+    def _build_oak_wood(self) -> MaterialPreset:
+        """Build the oak wood preset."""
         
         # Oak Wood
         oak_textures = {
@@ -275,7 +483,7 @@ class AdvancedTextureCatalog:
             )
         }
         
-        self.material_presets["oak_wood"] = MaterialPreset(
+        return MaterialPreset(
             name="Oak Wood",
             category=MaterialCategory.ORGANIC,
             description="Natural oak wood with visible grain and subtle color variation",
@@ -293,21 +501,13 @@ class AdvancedTextureCatalog:
             clearcoat_roughness=0.0,
             texture_maps=oak_textures,
             shader_nodes=["Principled BSDF", "Image Texture", "Normal Map", "Mapping"],
-            environment_adaptation={
-                "indoor": 1.0,
-                "outdoor": 0.8,
-                "studio": 1.2,
-                "night": 0.6
-            },
+            environment_adaptation=dict(self.WOOD_ENVIRONMENT_ADAPTATION),
             quality_level="high",
-            complexity_score=0.7
+            complexity_score=self.WOOD_COMPLEXITY
         )
-        
-        # Add more wood variants
-        self._create_wood_variants()
 
     def _create_wood_variants(self):
-        """Create variants of wood materials."""
+        """Register variants of wood materials."""
         
         wood_variants = [
             {
@@ -334,39 +534,56 @@ class AdvancedTextureCatalog:
         ]
         
         for variant in wood_variants:
-            # Create texture maps for each variant
-            textures = self._generate_wood_textures(variant)
-            
-            self.material_presets[variant["name"]] = MaterialPreset(
-                name=variant["name"].replace("_", " ").title(),
-                category=MaterialCategory.ORGANIC,
-                description=variant["description"],
-                base_color=variant["base_color"],
-                roughness=0.7,
-                metallic=0.0,
-                specular=0.5,
-                emission_strength=0.0,
-                transmission=0.0,
-                ior=1.5,
-                subsurface=0.1,
-                anisotropy=0.0,
-                sheen=0.0,
-                clearcoat=0.0,
-                clearcoat_roughness=0.0,
-                texture_maps=textures,
-                shader_nodes=["Principled BSDF", "Image Texture", "Normal Map", "Mapping"],
-                environment_adaptation={
-                    "indoor": 1.0,
-                    "outdoor": 0.8,
-                    "studio": 1.2,
-                    "night": 0.6
-                },
-                quality_level="high",
-                complexity_score=0.7
+            self._register_preset(
+                variant["name"],
+                MaterialCategory.ORGANIC,
+                self.WOOD_ENVIRONMENT_ADAPTATION,
+                self.WOOD_COMPLEXITY,
+                partial(self._build_wood_variant, variant),
+                tags=("wood", "furniture")
             )
 
+    def _build_wood_variant(self, variant: Dict) -> MaterialPreset:
+        """Build a wood variant preset."""
+        # Create texture maps for the variant
+        textures = self._generate_wood_textures(variant)
+        
+        return MaterialPreset(
+            name=variant["name"].replace("_", " ").title(),
+            category=MaterialCategory.ORGANIC,
+            description=variant["description"],
+            base_color=variant["base_color"],
+            roughness=0.7,
+            metallic=0.0,
+            specular=0.5,
+            emission_strength=0.0,
+            transmission=0.0,
+            ior=1.5,
+            subsurface=0.1,
+            anisotropy=0.0,
+            sheen=0.0,
+            clearcoat=0.0,
+            clearcoat_roughness=0.0,
+            texture_maps=textures,
+            shader_nodes=["Principled BSDF", "Image Texture", "Normal Map", "Mapping"],
+            environment_adaptation=dict(self.WOOD_ENVIRONMENT_ADAPTATION),
+            quality_level="high",
+            complexity_score=self.WOOD_COMPLEXITY
+        )
+
     def _create_steel_materials(self):
-        """Create comprehensive steel material presets."""
+        """Register comprehensive steel material presets."""
+        self._register_preset(
+            "stainless_steel",
+            MaterialCategory.METALLIC,
+            self.STEEL_ENVIRONMENT_ADAPTATION,
+            self.STEEL_COMPLEXITY,
+            self._build_stainless_steel,
+            tags=("steel", "metal", "polished")
+        )
+
+    def _build_stainless_steel(self) -> MaterialPreset:
+        """Build the stainless steel preset."""
         
         # Stainless Steel
         steel_textures = {
@@ -479,7 +696,7 @@ class AdvancedTextureCatalog:
             )
         }
         
-        self.material_presets["stainless_steel"] = MaterialPreset(
+        return MaterialPreset(
             name="Stainless Steel",
             category=MaterialCategory.METALLIC,
             description="Polished stainless steel with subtle scratches and wear",
@@ -497,18 +714,24 @@ class AdvancedTextureCatalog:
             clearcoat_roughness=0.0,
             texture_maps=steel_textures,
             shader_nodes=["Principled BSDF", "Image Texture", "Normal Map", "Mapping"],
-            environment_adaptation={
-                "indoor": 1.0,
-                "outdoor": 0.9,
-                "studio": 1.1,
-                "night": 0.7
-            },
+            environment_adaptation=dict(self.STEEL_ENVIRONMENT_ADAPTATION),
             quality_level="production",
-            complexity_score=0.8
+            complexity_score=self.STEEL_COMPLEXITY
         )
 
     def _create_glass_materials(self):
-        """Create comprehensive glass material presets."""
+        """Register comprehensive glass material presets."""
+        self._register_preset(
+            "clear_glass",
+            MaterialCategory.TRANSPARENT,
+            self.GLASS_ENVIRONMENT_ADAPTATION,
+            self.GLASS_COMPLEXITY,
+            self._build_clear_glass,
+            tags=("glass", "clear", "window")
+        )
+
+    def _build_clear_glass(self) -> MaterialPreset:
+        """Build the clear glass preset."""
         
         # Clear Glass
         glass_textures = {
@@ -620,7 +843,7 @@ class AdvancedTextureCatalog:
             )
         }
         
-        self.material_presets["clear_glass"] = MaterialPreset(
+        return MaterialPreset(
             name="Clear Glass",
             category=MaterialCategory.TRANSPARENT,
             description="Crystal clear glass with subtle surface imperfections",
@@ -638,18 +861,24 @@ class AdvancedTextureCatalog:
             clearcoat_roughness=0.0,
             texture_maps=glass_textures,
             shader_nodes=["Principled BSDF", "Image Texture", "Normal Map", "Mapping", "Transparent BSDF"],
-            environment_adaptation={
-                "indoor": 1.0,
-                "outdoor": 0.8,
-                "studio": 1.2,
-                "night": 0.6
-            },
+            environment_adaptation=dict(self.GLASS_ENVIRONMENT_ADAPTATION),
             quality_level="production",
-            complexity_score=0.9
+            complexity_score=self.GLASS_COMPLEXITY
         )
 
     def _create_neon_materials(self):
-        """Create emissive neon materials."""
+        """Register emissive neon materials."""
+        self._register_preset(
+            "neon_blue",
+            MaterialCategory.EMISSIVE,
+            self.NEON_ENVIRONMENT_ADAPTATION,
+            self.NEON_COMPLEXITY,
+            self._build_neon_blue,
+            tags=("neon", "blue", "glow", "sign")
+        )
+
+    def _build_neon_blue(self) -> MaterialPreset:
+        """Build the blue neon preset."""
         
         # Neon Blue
         neon_textures = {
@@ -735,7 +964,7 @@ class AdvancedTextureCatalog:
             )
         }
         
-        self.material_presets["neon_blue"] = MaterialPreset(
+        return MaterialPreset(
             name="Neon Blue",
             category=MaterialCategory.EMISSIVE,
             description="Bright blue neon with intense glow and subtle flicker",
@@ -753,14 +982,9 @@ class AdvancedTextureCatalog:
             clearcoat_roughness=0.0,
             texture_maps=neon_textures,
             shader_nodes=["Principled BSDF", "Emission", "Image Texture", "Mapping"],
-            environment_adaptation={
-                "indoor": 1.0,
-                "outdoor": 1.2,
-                "studio": 0.8,
-                "night": 1.5
-            },
+            environment_adaptation=dict(self.NEON_ENVIRONMENT_ADAPTATION),
             quality_level="high",
-            complexity_score=0.6
+            complexity_score=self.NEON_COMPLEXITY
         )
 
     def _generate_wood_textures(self, variant: Dict) -> Dict[TextureType, TextureMap]:
@@ -860,17 +1084,18 @@ class AdvancedTextureCatalog:
 
     def get_materials_by_category(self, category: MaterialCategory) -> List[MaterialPreset]:
         """Get all materials in a category."""
-        return [preset for preset in self.material_presets.values() 
-                if preset.category == category]
+        return [self.material_presets[name]
+                for name in self.material_presets.names_by_category(category)]
 
     def get_materials_by_environment(self, environment: str) -> List[MaterialPreset]:
         """Get materials optimized for a specific environment."""
-        optimized = []
-        for preset in self.material_presets.values():
-            if environment in preset.environment_adaptation:
-                if preset.environment_adaptation[environment] > 0.8:
-                    optimized.append(preset)
-        return optimized
+        return [self.material_presets[name]
+                for name in self.material_presets.names_by_environment(environment)]
+
+    def get_materials_by_tag(self, tag: str) -> List[MaterialPreset]:
+        """Get all materials carrying a search tag."""
+        return [self.material_presets[name]
+                for name in self.material_presets.names_by_tag(tag)]
 
     def generate_custom_material(
         self,
@@ -910,58 +1135,75 @@ class AdvancedTextureCatalog:
         return modified
 
     def generate_blender_material_code(self, preset: MaterialPreset) -> str:
-        """Generate Blender Python code for a material preset."""
-        
-        code_lines = [
-            "import bpy",
-            "import bmesh",
-            "from mathutils import Vector",
-            "",
-            f"# Create material: {preset.name}",
-            f"mat = bpy.data.materials.new(name='{preset.name}')",
+        """
+        Generate Blender Python code for a material preset.
+
+        The node graph is compiled into a template once per preset structure;
+        each call only binds the preset's values, and bound code is cached.
+        """
+        key = self._material_template_key(preset)
+        body = self._code_templates.render(
+            key, partial(self._compile_material_template, preset), self._material_values(preset)
+        )
+        return "\n".join(CODE_PREAMBLE + ["", f"# Create material: {preset.name}", body])
+
+    def _material_template_key(self, preset: MaterialPreset) -> Tuple:
+        """Structural key of a preset's material code (everything but its values)."""
+        return (
+            preset.name,
+            tuple((map_type, repr(texture_map)) for map_type, texture_map in preset.texture_maps.items()),
+            tuple(preset.shader_nodes)
+        )
+
+    def _material_values(self, preset: MaterialPreset) -> Dict[str, Any]:
+        """Values bound into a preset's material template."""
+        values = {"name": preset.name}
+        values.update(bsdf_values(preset))
+        values.update({
+            "category": preset.category.value,
+            "quality_level": preset.quality_level,
+            "complexity_score": preset.complexity_score
+        })
+        return values
+
+    def _compile_material_template(self, preset: MaterialPreset) -> CodeTemplate:
+        """Build the node-graph template for a preset's structure."""
+        body = [
+            "mat = bpy.data.materials.new(name=$name)",
             "mat.use_nodes = True",
             "",
             "# Get the Principled BSDF node",
             "bsdf = mat.node_tree.nodes['Principled BSDF']",
             "",
             "# Set base properties",
-            f"bsdf.inputs['Base Color'].default_value = {preset.base_color}",
-            f"bsdf.inputs['Roughness'].default_value = {preset.roughness}",
-            f"bsdf.inputs['Metallic'].default_value = {preset.metallic}",
-            f"bsdf.inputs['Specular'].default_value = {preset.specular}",
-            f"bsdf.inputs['Emission Strength'].default_value = {preset.emission_strength}",
-            f"bsdf.inputs['Transmission Weight'].default_value = {preset.transmission}",
-            f"bsdf.inputs['IOR'].default_value = {preset.ior}",
-            f"bsdf.inputs['Subsurface Weight'].default_value = {preset.subsurface}",
-            f"bsdf.inputs['Anisotropic'].default_value = {preset.anisotropy}",
-            f"bsdf.inputs['Sheen Weight'].default_value = {preset.sheen}",
-            f"bsdf.inputs['Clearcoat Weight'].default_value = {preset.clearcoat}",
-            f"bsdf.inputs['Clearcoat Roughness'].default_value = {preset.clearcoat_roughness}",
+            *bsdf_input_lines(),
             ""
         ]
         
         # Add texture map nodes
         for map_type, texture_map in preset.texture_maps.items():
             if texture_map.procedural:
-                code_lines.extend(self._generate_procedural_texture_code(map_type, texture_map))
+                lines = self._generate_procedural_texture_code(map_type, texture_map)
             else:
-                code_lines.extend(self._generate_image_texture_code(map_type, texture_map))
+                lines = self._generate_image_texture_code(map_type, texture_map)
+            body.extend(escape(line) for line in lines)
         
         # Add custom shader nodes
         for node in preset.shader_nodes:
             if node not in ["Principled BSDF", "Image Texture", "Normal Map", "Mapping"]:
-                code_lines.append(f"# Add {node} node")
-                code_lines.append(f"# {node}_node = mat.node_tree.nodes.new('{node}')")
+                body.append(escape(f"# Add {node} node"))
+                body.append(escape(f"# {node}_node = mat.node_tree.nodes.new('{node}')"))
         
-        code_lines.extend([
+        body.extend([
             "",
-            "print(f'✅ Material created: {preset.name}')",
-            "print(f'   Category: {preset.category.value}')",
-            "print(f'   Quality: {preset.quality_level}')",
-            "print(f'   Complexity: {preset.complexity_score:.2f}')"
+            "print(f'✅ Material created: {mat.name}')",
+            "print('   Category:', $category)",
+            "print('   Quality:', $quality_level)",
+            "print(f'   Complexity: {$complexity_score:.2f}')"
         ])
         
-        return "\n".join(code_lines)
+        return CodeTemplate(body, ["name", *(attribute for _, attribute in BSDF_INPUTS),
+                                   "category", "quality_level", "complexity_score"])
 
     def _generate_procedural_texture_code(self, map_type: TextureType, texture_map: TextureMap) -> List[str]:
         """Generate Blender code for procedural textures."""
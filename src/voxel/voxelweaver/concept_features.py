@@ -0,0 +1,239 @@
+"""
+Concept Features - Single-pass keyword analysis shared by VoxelWeaver components.
+Scans a concept once with an Aho-Corasick automaton over every registered
+keyword vocabulary and caches the result for all subsystems to consume.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r'\b[a-z]{3,}\b')
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton compiled to a DFA.
+
+    Every state's transition table already includes the transitions
+    inherited through its failure links, so matching costs one dict lookup
+    per character regardless of how many keywords are registered. Matches
+    have plain substring semantics, the same as ``keyword in text``.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile the automaton.
+
+        Args:
+            keywords: Keywords to match (case-sensitive; callers lowercase)
+        """
+        self.keywords = frozenset(k for k in keywords if k)
+        self._delta: List[Dict[str, int]] = [{}]
+        self._outputs: List[tuple] = [()]
+
+        # Trie of all keywords
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._delta[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._delta)
+                    self._delta.append({})
+                    self._outputs.append(())
+                    self._delta[state][ch] = nxt
+                state = nxt
+            self._outputs[state] = (keyword,)
+
+        # Breadth-first: resolve failure links and fold the failure state's
+        # transitions and outputs into each state. Failure states are
+        # shallower, so their tables are already complete when used.
+        fail = [0] * len(self._delta)
+        queue = list(self._delta[0].values())
+        for state in queue:
+            gotos = self._delta[state]
+            for ch, child in gotos.items():
+                queue.append(child)
+                fail[child] = self._delta[fail[state]].get(ch, 0) if state else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[fail[child]]
+            if state:
+                inherited = dict(self._delta[fail[state]])
+                inherited.update(gotos)
+                self._delta[state] = inherited
+
+    def first_positions(self, text: str) -> Dict[str, int]:
+        """
+        Find every keyword occurring in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Mapping of each found keyword to the index of its first occurrence
+        """
+        delta = self._delta
+        outputs = self._outputs
+        found: Dict[str, int] = {}
+        state = 0
+        for end, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for keyword in outputs[state]:
+                    if keyword not in found:
+                        found[keyword] = end - len(keyword) + 1
+        return found
+
+    @property
+    def state_count(self) -> int:
+        """Number of automaton states."""
+        return len(self._delta)
+
+
+class ConceptFeatures:
+    """
+    Keyword analysis of one concept, shared by every VoxelWeaver component.
+
+    Lookups for registered keywords are set/dict operations on the
+    precomputed matches; unregistered keywords fall back to a substring
+    check so results never depend on registration order.
+    """
+
+    def __init__(self, text: str, matches: Dict[str, int], vocabulary: frozenset):
+        """
+        Initialize the features.
+
+        Args:
+            text: Lowercased concept text
+            matches: First occurrence index of each registered keyword found
+            vocabulary: Keywords the automaton was built from
+        """
+        self.text = text
+        self.matches = matches
+        self._vocabulary = vocabulary
+        self._words: Optional[List[str]] = None
+
+    def has(self, keyword: str) -> bool:
+        """Check whether keyword occurs in the concept."""
+        if keyword in self._vocabulary:
+            return keyword in self.matches
+        return keyword in self.text
+
+    def has_any(self, keywords: Iterable[str]) -> bool:
+        """Check whether any of the keywords occurs in the concept."""
+        return any(self.has(keyword) for keyword in keywords)
+
+    def present(self, keywords: Iterable[str]) -> List[str]:
+        """Get the keywords that occur in the concept, in the given order."""
+        return [keyword for keyword in keywords if self.has(keyword)]
+
+    def position(self, keyword: str) -> int:
+        """Get the index of keyword's first occurrence (-1 if absent)."""
+        if keyword in self._vocabulary:
+            return self.matches.get(keyword, -1)
+        return self.text.find(keyword)
+
+    def context(self, keyword: str, window: int = 100) -> str:
+        """Get the text surrounding keyword's first occurrence."""
+        idx = self.position(keyword)
+        if idx == -1:
+            return ""
+        start = max(0, idx - window)
+        end = min(len(self.text), idx + len(keyword) + window)
+        return self.text[start:end]
+
+    @property
+    def words(self) -> List[str]:
+        """Lowercase words of three or more letters, in order."""
+        if self._words is None:
+            self._words = _WORD_PATTERN.findall(self.text)
+        return self._words
+
+
+class ConceptAnalyzer:
+    """
+    Builds and caches ConceptFeatures for concepts.
+
+    Components register their keyword vocabularies once; the automaton is
+    recompiled lazily when the vocabulary grows. Results are cached by
+    lowercased concept text, so every component processing the same concept
+    shares a single scan.
+    """
+
+    def __init__(self, cache_size: int = 128):
+        """
+        Initialize the analyzer.
+
+        Args:
+            cache_size: Number of analyzed concepts to keep
+        """
+        self.cache_size = cache_size
+        self._vocabulary: Set[str] = set()
+        self._automaton: Optional[KeywordAutomaton] = None
+        self._cache: "OrderedDict[str, ConceptFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.scans = 0
+
+    def register(self, keywords: Iterable[str]) -> None:
+        """Add keywords to the shared vocabulary."""
+        new = {k.lower() for k in keywords if k} - self._vocabulary
+        if not new:
+            return
+        with self._lock:
+            self._vocabulary |= new
+            self._automaton = None
+            self._cache.clear()
+
+    def analyze(self, concept: str) -> ConceptFeatures:
+        """
+        Get the features of a concept, scanning it at most once.
+
+        Args:
+            concept: Scene concept description (any case)
+
+        Returns:
+            Shared ConceptFeatures for the concept
+        """
+        text = concept.lower()
+        with self._lock:
+            features = self._cache.get(text)
+            if features is not None:
+                self._cache.move_to_end(text)
+                return features
+
+            if self._automaton is None:
+                self._automaton = KeywordAutomaton(self._vocabulary)
+                logger.debug(
+                    f"Compiled concept automaton: {len(self._vocabulary)} keywords, "
+                    f"{self._automaton.state_count} states"
+                )
+            automaton = self._automaton
+
+        features = ConceptFeatures(text, automaton.first_positions(text), automaton.keywords)
+
+        with self._lock:
+            self.scans += 1
+            self._cache[text] = features
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return features
+
+
+# Global concept analyzer instance
+_concept_analyzer: Optional[ConceptAnalyzer] = None
+
+
+def get_concept_analyzer() -> ConceptAnalyzer:
+    """Get the global concept analyzer instance."""
+    global _concept_analyzer
+    if _concept_analyzer is None:
+        _concept_analyzer = ConceptAnalyzer()
+    return _concept_analyzer
+
+
+def analyze_concept(concept: str) -> ConceptFeatures:
+    """Analyze a concept with the global concept analyzer."""
+    return get_concept_analyzer().analyze(concept)
@@ -5,12 +5,19 @@ Ensures objects are positioned coherently without overlaps.
 
 import logging
 import math
-from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+try:
+    from .spatial_batch import BoxArray, circular_positions, grid_positions, linear_positions
+except ImportError:
+    # NumPy is optional; the scalar code paths below are used without it
+    BoxArray = None
+
 
 class PlacementStrategy(str, Enum):
     """Strategies for object placement."""
@@ -64,6 +71,96 @@ class BoundingBox:
         )
 
 
+class SpatialHashGrid:
+    """
+    Uniform grid broad phase for bounding box overlap queries.
+
+    Each box is registered in every cell it touches, so a query only tests
+    boxes sharing a cell instead of every box in the scene. Boxes spanning
+    more than ``max_cells_per_box`` cells (floors, terrain, walls) are kept
+    in a separate list that every query includes.
+    """
+
+    def __init__(self, cell_size: float, max_cells_per_box: int = 64):
+        """
+        Initialize the grid.
+
+        Args:
+            cell_size: Edge length of a grid cell in meters
+            max_cells_per_box: Cell count above which a box is treated as oversized
+        """
+        self.cell_size = max(cell_size, 1e-3)
+        self.max_cells_per_box = max_cells_per_box
+        self._cells: Dict[Tuple[int, int, int], Set[int]] = defaultdict(set)
+        self._boxes: Dict[int, BoundingBox] = {}
+        self._box_cells: Dict[int, List[Tuple[int, int, int]]] = {}
+        self._oversized: Set[int] = set()
+
+    @classmethod
+    def for_boxes(cls, boxes: Iterable[BoundingBox]) -> 'SpatialHashGrid':
+        """Create a grid sized to the median largest extent of the given boxes."""
+        extents = sorted(max(b.width, b.depth, b.height) for b in boxes)
+        cell_size = extents[len(extents) // 2] if extents else 1.0
+        return cls(cell_size)
+
+    def _cell_range(self, bbox: BoundingBox) -> Tuple[range, range, range]:
+        """Get the cell index ranges a box covers on each axis."""
+        size = self.cell_size
+        return (
+            range(math.floor(bbox.min_x / size), math.floor(bbox.max_x / size) + 1),
+            range(math.floor(bbox.min_y / size), math.floor(bbox.max_y / size) + 1),
+            range(math.floor(bbox.min_z / size), math.floor(bbox.max_z / size) + 1),
+        )
+
+    def _is_oversized(self, ranges: Tuple[range, range, range]) -> bool:
+        return len(ranges[0]) * len(ranges[1]) * len(ranges[2]) > self.max_cells_per_box
+
+    def insert(self, key: int, bbox: BoundingBox) -> None:
+        """Register a box under an integer key."""
+        self._boxes[key] = bbox
+        ranges = self._cell_range(bbox)
+        if self._is_oversized(ranges):
+            self._oversized.add(key)
+            self._box_cells[key] = []
+            return
+
+        cells = [(x, y, z) for x in ranges[0] for y in ranges[1] for z in ranges[2]]
+        for cell in cells:
+            self._cells[cell].add(key)
+        self._box_cells[key] = cells
+
+    def remove(self, key: int) -> None:
+        """Unregister a box."""
+        for cell in self._box_cells.pop(key, []):
+            members = self._cells[cell]
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+        self._oversized.discard(key)
+        self._boxes.pop(key, None)
+
+    def update(self, key: int, bbox: BoundingBox) -> None:
+        """Move a registered box."""
+        self.remove(key)
+        self.insert(key, bbox)
+
+    def query(self, bbox: BoundingBox) -> Set[int]:
+        """Get the keys of boxes that may overlap bbox (a superset of true overlaps)."""
+        ranges = self._cell_range(bbox)
+        if self._is_oversized(ranges):
+            return set(self._boxes)
+
+        candidates = set(self._oversized)
+        cells = self._cells
+        for x in ranges[0]:
+            for y in ranges[1]:
+                for z in ranges[2]:
+                    members = cells.get((x, y, z))
+                    if members:
+                        candidates |= members
+        return candidates
+
+
 @dataclass
 class AlignedObject:
     """Object with aligned spatial position."""
@@ -82,14 +179,17 @@ class ContextAligner:
     Aligns objects spatially to prevent collisions and ensure coherent layout.
     """
 
-    def __init__(self, collision_tolerance: float = 0.01):
+    def __init__(self, collision_tolerance: float = 0.01, max_resolution_passes: int = 4):
         """
         Initialize context aligner.
 
         Args:
             collision_tolerance: Minimum gap between objects in meters
+            max_resolution_passes: Maximum collision resolution passes; passes
+                after the first only re-test objects moved by the previous one
         """
         self.collision_tolerance = collision_tolerance
+        self.max_resolution_passes = max(1, max_resolution_passes)
         logger.info(f"ContextAligner initialized (tolerance={collision_tolerance}m)")
 
     def align_objects(self, objects: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -178,14 +278,53 @@ class ContextAligner:
         objects: List[AlignedObject]
     ) -> List[Tuple[AlignedObject, AlignedObject]]:
         """Detect all collisions between objects."""
-        collisions = []
+        if BoxArray is not None:
+            boxes = BoxArray.from_boxes([obj.bounding_box for obj in objects])
+            first, second = boxes.overlapping_pairs(-self.collision_tolerance)
+            return [
+                (objects[i], objects[j])
+                for i, j in zip(first.tolist(), second.tolist(), strict=True)
+            ]
+
+        grid = self._build_grid(objects)
+        pairs = self._colliding_pairs(objects, grid, range(len(objects)))
+        return [(objects[i], objects[j]) for i, j in pairs]
+
+    def _build_grid(self, objects: List[AlignedObject]) -> SpatialHashGrid:
+        """Build a broad-phase grid over the objects, keyed by list index."""
+        grid = SpatialHashGrid.for_boxes(obj.bounding_box for obj in objects)
+        for i, obj in enumerate(objects):
+            grid.insert(i, obj.bounding_box)
+        return grid
 
-        for i, obj1 in enumerate(objects):
-            for obj2 in objects[i + 1:]:
-                if obj1.bounding_box.intersects(obj2.bounding_box, -self.collision_tolerance):
-                    collisions.append((obj1, obj2))
+    def _colliding_pairs(
+        self,
+        objects: List[AlignedObject],
+        grid: SpatialHashGrid,
+        indices: Iterable[int]
+    ) -> List[Tuple[int, int]]:
+        """
+        Find colliding index pairs involving any of the given objects.
 
-        return collisions
+        Args:
+            objects: All objects, indexed as in the grid
+            grid: Broad-phase grid over objects
+            indices: Objects to test against everything else
+
+        Returns:
+            Sorted (i, j) pairs with i < j
+        """
+        tolerance = -self.collision_tolerance
+        pairs = set()
+        for i in indices:
+            bbox = objects[i].bounding_box
+            for j in grid.query(bbox):
+                if j == i:
+                    continue
+                pair = (i, j) if i < j else (j, i)
+                if pair not in pairs and bbox.intersects(objects[j].bounding_box, tolerance):
+                    pairs.add(pair)
+        return sorted(pairs)
 
     def _resolve_collisions(
         self,
@@ -193,35 +332,85 @@ class ContextAligner:
         collisions: List[Tuple[AlignedObject, AlignedObject]]
     ) -> List[AlignedObject]:
         """Resolve collisions by adjusting object positions."""
-        # Sort collisions by severity (amount of overlap)
-        sorted_collisions = sorted(
-            collisions,
-            key=lambda c: self._calculate_overlap_volume(c[0], c[1]),
-            reverse=True
-        )
+        # Collisions reference the objects as detected; map them to list slots
+        # (by identity, since names are not guaranteed to be unique)
+        index = {id(obj): i for i, obj in enumerate(objects)}
+        pairs = [(index[id(obj1)], index[id(obj2)]) for obj1, obj2 in collisions]
+        grid = self._build_grid(objects)
+
+        for _ in range(self.max_resolution_passes):
+            if not pairs:
+                break
+
+            # Sort collisions by severity (amount of overlap)
+            pairs = self._sort_by_overlap(objects, pairs)
+
+            moved = set()
+            for idx1, idx2 in pairs:
+                current_obj1 = objects[idx1]
+                current_obj2 = objects[idx2]
+
+                # Check if still colliding
+                if not current_obj1.bounding_box.intersects(
+                    current_obj2.bounding_box,
+                    -self.collision_tolerance
+                ):
+                    continue  # Already resolved
+
+                # Move obj2 away from obj1
+                new_position = self._calculate_separation_position(current_obj1, current_obj2)
+                objects[idx2] = self._update_object_position(current_obj2, new_position, "collision_avoidance")
+                grid.update(idx2, objects[idx2].bounding_box)
+                moved.add(idx2)
+
+            # Only objects that moved can have gained new collisions
+            pairs = self._colliding_pairs(objects, grid, moved)
 
-        for obj1, obj2 in sorted_collisions:
-            # Find current objects in list (may have been moved)
-            idx1 = next(i for i, o in enumerate(objects) if o.name == obj1.name)
-            idx2 = next(i for i, o in enumerate(objects) if o.name == obj2.name)
+        return objects
 
-            current_obj1 = objects[idx1]
-            current_obj2 = objects[idx2]
+    def _sort_by_overlap(
+        self,
+        objects: List[AlignedObject],
+        pairs: List[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """Sort index pairs by overlap volume, largest first (stable for ties)."""
+        if BoxArray is None:
+            return sorted(
+                pairs,
+                key=lambda p: self._calculate_overlap_volume(objects[p[0]], objects[p[1]]),
+                reverse=True
+            )
 
-            # Check if still colliding
-            if not current_obj1.bounding_box.intersects(
-                current_obj2.bounding_box,
-                -self.collision_tolerance
-            ):
-                continue  # Already resolved
+        boxes = BoxArray.from_boxes([obj.bounding_box for obj in objects])
+        first, second = zip(*pairs, strict=True)
+        volumes = boxes.overlap_volume(list(first), list(second))
+        order = sorted(range(len(pairs)), key=volumes.__getitem__, reverse=True)
+        return [pairs[k] for k in order]
 
-            # Move obj2 away from obj1
-            new_position = self._calculate_separation_position(current_obj1, current_obj2)
+    def find_overlaps(self, objects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Find overlapping objects without moving anything.
 
-            # Update obj2
-            objects[idx2] = self._update_object_position(current_obj2, new_position, "collision_avoidance")
+        Batch entry point for validators: boxes are built in one pass and,
+        when NumPy is available, tested with a vectorized grid.
 
-        return objects
+        Args:
+            objects: Object definitions as accepted by align_objects
+
+        Returns:
+            Collision dictionaries (object names, overlap volume, severity)
+        """
+        if BoxArray is None:
+            aligned = [self._create_aligned_object(obj) for obj in objects]
+            return [self._collision_to_dict(c) for c in self._detect_collisions(aligned)]
+
+        boxes = BoxArray.from_objects(objects)
+        first, second = boxes.overlapping_pairs(-self.collision_tolerance)
+        volumes = boxes.overlap_volume(first, second)
+        return [
+            self._overlap_to_dict(boxes.names[i], boxes.names[j], volume)
+            for i, j, volume in zip(first.tolist(), second.tolist(), volumes.tolist(), strict=True)
+        ]
 
     def _calculate_overlap_volume(self, obj1: AlignedObject, obj2: AlignedObject) -> float:
         """Calculate approximate overlap volume between two objects."""
@@ -327,11 +516,13 @@ class ContextAligner:
     def _collision_to_dict(self, collision: Tuple[AlignedObject, AlignedObject]) -> Dict[str, Any]:
         """Convert collision pair to dictionary."""
         obj1, obj2 = collision
-        overlap = self._calculate_overlap_volume(obj1, obj2)
+        return self._overlap_to_dict(obj1.name, obj2.name, self._calculate_overlap_volume(obj1, obj2))
 
+    def _overlap_to_dict(self, name1: str, name2: str, overlap: float) -> Dict[str, Any]:
+        """Build the collision report entry for two named objects."""
         return {
-            "object_1": obj1.name,
-            "object_2": obj2.name,
+            "object_1": name1,
+            "object_2": name2,
             "overlap_volume": overlap,
             "severity": "high" if overlap > 1.0 else "medium" if overlap > 0.1 else "low"
         }
@@ -367,6 +558,9 @@ class ContextAligner:
 
     def _place_grid(self, objects: List[Dict[str, Any]], spacing: float) -> List[Dict[str, Any]]:
         """Place objects in grid pattern."""
+        if BoxArray is not None:
+            return self._assign_positions(objects, grid_positions(len(objects), spacing))
+
         grid_size = math.ceil(math.sqrt(len(objects)))
 
         for i, obj in enumerate(objects):
@@ -383,6 +577,9 @@ class ContextAligner:
 
     def _place_circular(self, objects: List[Dict[str, Any]], radius: float) -> List[Dict[str, Any]]:
         """Place objects in circular pattern."""
+        if BoxArray is not None:
+            return self._assign_positions(objects, circular_positions(len(objects), radius))
+
         count = len(objects)
         angle_step = 2 * math.pi / count
 
@@ -398,6 +595,9 @@ class ContextAligner:
 
     def _place_linear(self, objects: List[Dict[str, Any]], spacing: float) -> List[Dict[str, Any]]:
         """Place objects in line."""
+        if BoxArray is not None:
+            return self._assign_positions(objects, linear_positions(len(objects), spacing))
+
         total_width = (len(objects) - 1) * spacing
 
         for i, obj in enumerate(objects):
@@ -408,3 +608,10 @@ class ContextAligner:
             )
 
         return objects
+
+    def _assign_positions(self, objects: List[Dict[str, Any]], positions: Any) -> List[Dict[str, Any]]:
+        """Write an N x 3 array of positions back onto object dictionaries."""
+        for obj, position in zip(objects, positions.tolist(), strict=True):
+            obj["position"] = tuple(position)
+
+        return objects
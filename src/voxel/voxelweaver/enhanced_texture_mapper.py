@@ -12,8 +12,20 @@ from enum import Enum
 
 from .advanced_texture_catalog import (
     AdvancedTextureCatalog, MaterialPreset, MaterialCategory,
-    TextureType, TextureMap
+    TextureType
 )
+from .concept_features import analyze_concept, get_concept_analyzer
+from .material_codegen import (
+    BSDF_INPUTS, CODE_PREAMBLE, CodeTemplate, HelperScriptBuilder, TemplateCache,
+    bsdf_input_lines, bsdf_values, escape, slugify
+)
+from ..core.shared import shared_component
+
+try:
+    from .material_scoring import PresetMatrix, top_k_pairs
+except ImportError:
+    # NumPy is optional; presets are scored one at a time without it
+    PresetMatrix = None
 
 logger = logging.getLogger(__name__)
 
@@ -68,11 +80,66 @@ class EnhancedTextureMapper:
     Provides intricate texture mapping with comprehensive material catalogs.
     """
 
+    # Keywords identifying each object type (simple matching; in production, this would use NLP)
+    OBJECT_TYPE_KEYWORDS = {
+        "furniture": ["chair", "table", "sofa", "desk", "bed"],
+        "building": ["building", "house", "wall", "roof"],
+        "vehicle": ["car", "truck", "vehicle", "bike"],
+        "clothing": ["clothing", "shirt", "pants", "dress"],
+        "electronics": ["computer", "phone", "screen", "device"],
+        "nature": ["tree", "grass", "plant", "flower"],
+        "lighting": ["lamp", "light", "bulb", "neon"],
+    }
+
+    # Concept keywords that boost a material category's score
+    CATEGORY_CONCEPT_KEYWORDS = {
+        MaterialCategory.ORGANIC: ["wood", "natural", "organic"],
+        MaterialCategory.METALLIC: ["metal", "steel", "chrome"],
+        MaterialCategory.EMISSIVE: ["neon", "glow", "light", "bright"],
+    }
+
+    # Score bonus when the concept mentions a category's keywords
+    CATEGORY_CONCEPT_BONUS = {
+        MaterialCategory.ORGANIC: 0.2,
+        MaterialCategory.METALLIC: 0.2,
+        MaterialCategory.EMISSIVE: 0.3,
+    }
+
+    # Score bonus for material categories that suit an object type
+    OBJECT_CATEGORY_AFFINITY = {
+        "furniture": {MaterialCategory.ORGANIC: 0.3, MaterialCategory.MINERAL: 0.3},
+        "building": {MaterialCategory.ORGANIC: 0.3, MaterialCategory.MINERAL: 0.3},
+        "vehicle": {MaterialCategory.METALLIC: 0.3, MaterialCategory.PLASTIC: 0.3},
+        "electronics": {MaterialCategory.METALLIC: 0.3, MaterialCategory.PLASTIC: 0.3},
+        "lighting": {MaterialCategory.EMISSIVE: 0.5},
+    }
+
+    # Minimum preset complexity score per requested complexity
+    COMPLEXITY_THRESHOLDS = {
+        MaterialComplexity.SIMPLE: 0.3,
+        MaterialComplexity.MODERATE: 0.5,
+        MaterialComplexity.ADVANCED: 0.7,
+        MaterialComplexity.PRODUCTION: 0.8
+    }
+
+    # Suggestions returned and the score they must exceed
+    MAX_SUGGESTIONS = 10
+    MIN_SUGGESTION_SCORE = 0.5
+
     def __init__(self):
         """Initialize enhanced texture mapper."""
-        self.catalog = AdvancedTextureCatalog()
+        self.catalog = shared_component("texture_catalog", AdvancedTextureCatalog)
         self.environment_weights = self._initialize_environment_weights()
         self.object_material_mapping = self._initialize_object_mapping()
+        self._preset_matrix = None
+        self._preset_matrix_version = None
+        self._code_templates = TemplateCache()
+
+        analyzer = get_concept_analyzer()
+        for keywords in self.OBJECT_TYPE_KEYWORDS.values():
+            analyzer.register(keywords)
+        for keywords in self.CATEGORY_CONCEPT_KEYWORDS.values():
+            analyzer.register(keywords)
         logger.info("EnhancedTextureMapper initialized")
 
     def _initialize_environment_weights(self) -> Dict[EnvironmentType, Dict[MaterialCategory, float]]:
@@ -160,6 +227,9 @@ class EnhancedTextureMapper:
         
         # Get environment weights
         env_weights = self.environment_weights.get(environment, {})
+
+        if PresetMatrix is not None:
+            return self._suggest_materials_batch(concept, environment, complexity, object_types, env_weights)
         
         for obj_type in object_types:
             # Get relevant material categories for this object type
@@ -181,7 +251,7 @@ class EnhancedTextureMapper:
                     score = self._calculate_material_score(material, obj_type, environment, concept)
                     score *= weight  # Apply environment weight
                     
-                    if score > 0.5:  # Only include materials with decent scores
+                    if score > self.MIN_SUGGESTION_SCORE:  # Only include materials with decent scores
                         suggestion = self._create_material_suggestion(
                             obj_type, material, environment, complexity, score
                         )
@@ -189,41 +259,73 @@ class EnhancedTextureMapper:
         
         # Sort by quality score and return top suggestions
         suggestions.sort(key=lambda x: x.quality_score, reverse=True)
-        return suggestions[:10]  # Return top 10 suggestions
+        return suggestions[:self.MAX_SUGGESTIONS]
+
+    def _get_preset_matrix(self) -> 'PresetMatrix':
+        """Get the score matrix for the catalog, rebuilding it if the catalog changed."""
+        version = self.catalog.material_presets.version
+        if self._preset_matrix is None or self._preset_matrix_version != version:
+            self._preset_matrix = PresetMatrix(self.catalog.material_presets.specs())
+            self._preset_matrix_version = version
+        return self._preset_matrix
+
+    def _suggest_materials_batch(
+        self,
+        concept: str,
+        environment: EnvironmentType,
+        complexity: MaterialComplexity,
+        object_types: List[str],
+        env_weights: Dict[MaterialCategory, float]
+    ) -> List[MaterialSuggestion]:
+        """
+        Score every catalog preset for every object type at once.
+
+        Produces the same suggestions as the per-pair loop. Scores come from
+        registration metadata, so only the presets in the top-ranked pairs
+        are built and turned into MaterialSuggestions.
+        """
+        matrix = self._get_preset_matrix()
+        features = analyze_concept(concept)
+        concept_bonus = {
+            category: self.CATEGORY_CONCEPT_BONUS[category]
+            for category, keywords in self.CATEGORY_CONCEPT_KEYWORDS.items()
+            if features.has_any(keywords)
+        }
+        min_complexity = (
+            self.COMPLEXITY_THRESHOLDS.get(complexity, 0.5)
+            if complexity != MaterialComplexity.SIMPLE else float("-inf")
+        )
+
+        scores, rank = matrix.score(
+            [self.object_material_mapping.get(obj_type, [MaterialCategory.ORGANIC]) for obj_type in object_types],
+            [self.OBJECT_CATEGORY_AFFINITY.get(obj_type, {}) for obj_type in object_types],
+            concept_bonus,
+            env_weights,
+            environment.value,
+            min_complexity
+        )
+        best = top_k_pairs(scores, rank, self.MAX_SUGGESTIONS, self.MIN_SUGGESTION_SCORE)
+        return [
+            self._create_material_suggestion(
+                object_types[o], self.catalog.material_presets[matrix.names[p]], environment, complexity, score
+            )
+            for o, p, score in best
+        ]
 
     def _extract_object_types(self, concept: str) -> List[str]:
         """Extract object types from concept description."""
-        concept_lower = concept.lower()
-        object_types = []
-        
-        # Simple keyword matching (in production, this would use NLP)
-        if any(word in concept_lower for word in ["chair", "table", "sofa", "desk", "bed"]):
-            object_types.append("furniture")
-        if any(word in concept_lower for word in ["building", "house", "wall", "roof"]):
-            object_types.append("building")
-        if any(word in concept_lower for word in ["car", "truck", "vehicle", "bike"]):
-            object_types.append("vehicle")
-        if any(word in concept_lower for word in ["clothing", "shirt", "pants", "dress"]):
-            object_types.append("clothing")
-        if any(word in concept_lower for word in ["computer", "phone", "screen", "device"]):
-            object_types.append("electronics")
-        if any(word in concept_lower for word in ["tree", "grass", "plant", "flower"]):
-            object_types.append("nature")
-        if any(word in concept_lower for word in ["lamp", "light", "bulb", "neon"]):
-            object_types.append("lighting")
+        features = analyze_concept(concept)
+        object_types = [
+            object_type
+            for object_type, keywords in self.OBJECT_TYPE_KEYWORDS.items()
+            if features.has_any(keywords)
+        ]
         
         return object_types if object_types else ["furniture"]  # Default fallback
 
     def _matches_complexity(self, material: MaterialPreset, complexity: MaterialComplexity) -> bool:
         """Check if material matches complexity level."""
-        complexity_thresholds = {
-            MaterialComplexity.SIMPLE: 0.3,
-            MaterialComplexity.MODERATE: 0.5,
-            MaterialComplexity.ADVANCED: 0.7,
-            MaterialComplexity.PRODUCTION: 0.8
-        }
-        
-        threshold = complexity_thresholds.get(complexity, 0.5)
+        threshold = self.COMPLEXITY_THRESHOLDS.get(complexity, 0.5)
         return material.complexity_score >= threshold
 
     def _calculate_material_score(
@@ -244,21 +346,14 @@ class EnhancedTextureMapper:
         score += env_adaptation * 0.4
         
         # Object type relevance (simplified)
-        if object_type in ["furniture", "building"] and material.category in [MaterialCategory.ORGANIC, MaterialCategory.MINERAL]:
-            score += 0.3
-        elif object_type in ["vehicle", "electronics"] and material.category in [MaterialCategory.METALLIC, MaterialCategory.PLASTIC]:
-            score += 0.3
-        elif object_type in ["lighting"] and material.category == MaterialCategory.EMISSIVE:
-            score += 0.5
+        affinity = self.OBJECT_CATEGORY_AFFINITY.get(object_type, {}).get(material.category)
+        if affinity:
+            score += affinity
         
         # Concept relevance (simplified keyword matching)
-        concept_lower = concept.lower()
-        if material.category == MaterialCategory.ORGANIC and any(word in concept_lower for word in ["wood", "natural", "organic"]):
-            score += 0.2
-        elif material.category == MaterialCategory.METALLIC and any(word in concept_lower for word in ["metal", "steel", "chrome"]):
-            score += 0.2
-        elif material.category == MaterialCategory.EMISSIVE and any(word in concept_lower for word in ["neon", "glow", "light", "bright"]):
-            score += 0.3
+        keywords = self.CATEGORY_CONCEPT_KEYWORDS.get(material.category)
+        if keywords and analyze_concept(concept).has_any(keywords):
+            score += self.CATEGORY_CONCEPT_BONUS[material.category]
         
         return min(1.0, score)
 
@@ -406,21 +501,90 @@ class EnhancedTextureMapper:
         suggestion: MaterialSuggestion,
         object_name: str = "Object"
     ) -> str:
-        """Generate Blender Python code for material suggestion."""
-        
+        """
+        Generate Blender Python code for material suggestion.
+
+        The node graph is compiled once per preset and map set; each call
+        binds the suggestion's values, and bound code is cached.
+        """
+        key, template = self._material_template(suggestion)
+        body = self._code_templates.bind(key, template, self._material_values(suggestion, object_name))
+        return "\n".join(CODE_PREAMBLE + [""] + self._material_header(suggestion, object_name) + [body])
+
+    def generate_materials_script(
+        self,
+        assignments: List[Tuple[str, MaterialSuggestion]],
+        shared_helpers: bool = True
+    ) -> str:
+        """
+        Generate one script applying materials to several objects.
+
+        Args:
+            assignments: (object name, suggestion) pairs
+            shared_helpers: Emit one helper function per preset and map set
+                and a call per object, instead of repeating the node-building
+                code for every object
+
+        Returns:
+            Combined Blender Python script
+        """
+        if not shared_helpers:
+            sections = ["\n".join(CODE_PREAMBLE)]
+            for object_name, suggestion in assignments:
+                key, template = self._material_template(suggestion)
+                body = self._code_templates.bind(key, template, self._material_values(suggestion, object_name))
+                sections.append("\n".join(self._material_header(suggestion, object_name) + [body]))
+            return "\n\n".join(sections) + "\n"
+
+        builder = HelperScriptBuilder(CODE_PREAMBLE)
+        for object_name, suggestion in assignments:
+            key, template = self._material_template(suggestion)
+            builder.add(
+                key,
+                template,
+                self._material_values(suggestion, object_name),
+                slugify(suggestion.preset.name),
+                header=self._material_header(suggestion, object_name)
+            )
+        return builder.build()
+
+    def _material_template(self, suggestion: MaterialSuggestion) -> Tuple[Tuple, CodeTemplate]:
+        """Get the structural key and compiled template for a suggestion."""
         material = suggestion.preset
-        
-        code_lines = [
-            "import bpy",
-            "import bmesh",
-            "from mathutils import Vector",
-            "",
-            f"# Create material: {material.name}",
+        maps = tuple(
+            map_type for map_type in suggestion.required_maps
+            if map_type in material.texture_maps
+        )
+        key = (material.name, maps)
+        return key, self._code_templates.template(key, lambda: self._compile_material_template(maps))
+
+    def _material_header(self, suggestion: MaterialSuggestion, object_name: str) -> List[str]:
+        """Comment lines describing one material application."""
+        header = [
+            f"# Create material: {suggestion.preset.name}",
             f"# Object: {object_name}",
             f"# Environment: {suggestion.environment_adaptation:.2f} adaptation",
             f"# Complexity: {suggestion.complexity_level.value}",
-            "",
-            f"mat = bpy.data.materials.new(name='{material.name}')",
+        ]
+        if suggestion.custom_parameters:
+            header.append(f"# Custom parameters: {suggestion.custom_parameters}")
+        return header
+
+    def _material_values(self, suggestion: MaterialSuggestion, object_name: str) -> Dict[str, Any]:
+        """Values bound into a suggestion's material template."""
+        values = {"object_name": object_name, "material_name": suggestion.preset.name}
+        values.update(bsdf_values(suggestion.preset))
+        values.update({
+            "quality_score": suggestion.quality_score,
+            "cost_estimate": suggestion.cost_estimate,
+            "generation_time": suggestion.generation_time
+        })
+        return values
+
+    def _compile_material_template(self, maps: Tuple[TextureType, ...]) -> CodeTemplate:
+        """Build the node-graph template for a set of texture maps."""
+        body = [
+            "mat = bpy.data.materials.new(name=$material_name)",
             "mat.use_nodes = True",
             "",
             "# Clear default nodes",
@@ -440,62 +604,36 @@ class EnhancedTextureMapper:
         ]
         
         # Add texture nodes for required maps
-        for map_type in suggestion.required_maps:
-            if map_type in material.texture_maps:
-                texture_map = material.texture_maps[map_type]
-                code_lines.extend(self._generate_texture_node_code(map_type, texture_map, material))
+        for map_type in maps:
+            body.extend(escape(line) for line in self._generate_texture_node_code(map_type))
         
         # Set material properties
-        code_lines.extend([
+        body.extend([
             "",
             "# Set material properties",
-            f"bsdf.inputs['Base Color'].default_value = {material.base_color}",
-            f"bsdf.inputs['Roughness'].default_value = {material.roughness}",
-            f"bsdf.inputs['Metallic'].default_value = {material.metallic}",
-            f"bsdf.inputs['Specular'].default_value = {material.specular}",
-            f"bsdf.inputs['Emission Strength'].default_value = {material.emission_strength}",
-            f"bsdf.inputs['Transmission Weight'].default_value = {material.transmission}",
-            f"bsdf.inputs['IOR'].default_value = {material.ior}",
-            f"bsdf.inputs['Subsurface Weight'].default_value = {material.subsurface}",
-            f"bsdf.inputs['Anisotropic'].default_value = {material.anisotropy}",
-            f"bsdf.inputs['Sheen Weight'].default_value = {material.sheen}",
-            f"bsdf.inputs['Clearcoat Weight'].default_value = {material.clearcoat}",
-            f"bsdf.inputs['Clearcoat Roughness'].default_value = {material.clearcoat_roughness}",
-            ""
-        ])
-        
-        # Add custom parameters
-        if suggestion.custom_parameters:
-            code_lines.extend([
-                "# Custom parameters",
-                f"# {suggestion.custom_parameters}",
-                ""
-            ])
-        
-        # Add material assignment
-        code_lines.extend([
+            *bsdf_input_lines(),
+            "",
+            # Add material assignment
             "# Assign material to object",
-            f"if '{object_name}' in bpy.data.objects:",
-            f"    obj = bpy.data.objects['{object_name}']",
+            "if $object_name in bpy.data.objects:",
+            "    obj = bpy.data.objects[$object_name]",
             "    if obj.data.materials:",
             "        obj.data.materials[0] = mat",
             "    else:",
             "        obj.data.materials.append(mat)",
             "",
-            "print(f'✅ Material created: {material.name}')",
-            "print(f'   Quality Score: {suggestion.quality_score:.2f}')",
-            "print(f'   Cost Estimate: {suggestion.cost_estimate:.2f}')",
-            "print(f'   Generation Time: {suggestion.generation_time:.1f}s')"
+            "print(f'✅ Material created: {mat.name}')",
+            "print(f'   Quality Score: {$quality_score:.2f}')",
+            "print(f'   Cost Estimate: {$cost_estimate:.2f}')",
+            "print(f'   Generation Time: {$generation_time:.1f}s')"
         ])
         
-        return "\n".join(code_lines)
+        return CodeTemplate(body, [
+            "object_name", "material_name", *(attribute for _, attribute in BSDF_INPUTS),
+            "quality_score", "cost_estimate", "generation_time"
+        ])
 
-    def _generate_texture_node_code(
-        self,
-        map_type: TextureType,
-        texture_map: TextureMap,
-        material: MaterialPreset
-    ) -> List[str]:
+    def _generate_texture_node_code(self, map_type: TextureType) -> List[str]:
         """Generate Blender code for a specific texture map."""
         
         code_lines = []
@@ -595,7 +733,8 @@ class EnhancedTextureMapper:
             "average_complexity": sum(p.complexity_score for p in self.catalog.material_presets.values()) / len(self.catalog.material_presets),
             "production_ready_materials": len([p for p in self.catalog.material_presets.values() if p.quality_level == "production"]),
             "emissive_materials": len([p for p in self.catalog.material_presets.values() if p.category == MaterialCategory.EMISSIVE]),
-            "transparent_materials": len([p for p in self.catalog.material_presets.values() if p.category == MaterialCategory.TRANSPARENT])
+            "transparent_materials": len([p for p in self.catalog.material_presets.values() if p.category == MaterialCategory.TRANSPARENT]),
+            "code_templates": self._code_templates.get_stats()
         }
         
         return enhanced_stats
@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .concept_features import analyze_concept, get_concept_analyzer
+
 logger = logging.getLogger(__name__)
 
 
@@ -140,6 +142,13 @@ class GeometryHandler:
         """
         self.voxel_resolution = voxel_resolution
         self.use_procedural = use_procedural
+
+        # Known objects in match order: categorized objects, then primitives
+        self._object_vocabulary = list(dict.fromkeys(
+            [obj for category_data in self.GEOMETRY_APPROACHES.values() for obj in category_data["objects"]]
+            + list(self.PRIMITIVE_MAPPING.keys())
+        ))
+        get_concept_analyzer().register(self._object_vocabulary)
         logger.info(f"GeometryHandler initialized (voxel_res={voxel_resolution}m, procedural={use_procedural})")
 
     def analyze_requirements(
@@ -188,25 +197,14 @@ class GeometryHandler:
 
     def _extract_objects(self, concept: str) -> List[str]:
         """Extract object names from concept."""
-        concept_lower = concept.lower()
-        found = []
-
-        # Check all known objects
-        for category_data in self.GEOMETRY_APPROACHES.values():
-            for obj in category_data["objects"]:
-                if obj in concept_lower and obj not in found:
-                    found.append(obj)
+        features = analyze_concept(concept)
 
-        # Check primitives
-        for obj in self.PRIMITIVE_MAPPING.keys():
-            if obj in concept_lower and obj not in found:
-                found.append(obj)
+        # Check all known objects and primitives
+        found = features.present(self._object_vocabulary)
 
         # If nothing found, look for common nouns
         if not found:
-            import re
-            words = re.findall(r'\b[a-z]{3,}\b', concept_lower)
-            found = [w for w in words[:10] if w not in ['the', 'and', 'with']]
+            found = [w for w in features.words[:10] if w not in ['the', 'and', 'with']]
 
         return found
 
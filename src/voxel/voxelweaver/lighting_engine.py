@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from .concept_features import ConceptFeatures, analyze_concept, get_concept_analyzer
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,6 +102,30 @@ class LightingEngine:
         },
     }
 
+    # Concept keywords per environment, checked in order
+    ENVIRONMENT_KEYWORDS = {
+        "outdoor": ["outdoor", "forest", "field", "park", "street", "sky"],
+        "studio": ["studio", "photography", "product", "white background"],
+        "indoor": ["room", "indoor", "interior", "building", "house"],
+    }
+
+    # Time of day synonyms, checked in order after the TimeOfDay names
+    TIME_OF_DAY_SYNONYMS = {
+        TimeOfDay.DAWN.value: ["sunrise", "dawn", "early morning"],
+        TimeOfDay.SUNSET.value: ["sunset", "dusk", "evening"],
+        TimeOfDay.NIGHT.value: ["night", "dark", "midnight"],
+        TimeOfDay.NOON.value: ["noon", "midday"],
+    }
+
+    # Concept keywords per mood, checked in order
+    MOOD_KEYWORDS = {
+        "dramatic": ["dramatic", "intense", "dark", "moody"],
+        "soft": ["soft", "gentle", "calm", "peaceful"],
+        "bright": ["bright", "cheerful", "light", "airy"],
+        "warm": ["warm", "cozy", "inviting"],
+        "cool": ["cool", "clinical", "modern"],
+    }
+
     def __init__(self, style: str = "realistic"):
         """
         Initialize lighting engine.
@@ -108,6 +134,12 @@ class LightingEngine:
             style: Default lighting style
         """
         self.style = style
+
+        analyzer = get_concept_analyzer()
+        analyzer.register(time.value for time in TimeOfDay)
+        for table in (self.ENVIRONMENT_KEYWORDS, self.TIME_OF_DAY_SYNONYMS, self.MOOD_KEYWORDS):
+            for keywords in table.values():
+                analyzer.register(keywords)
         logger.info(f"LightingEngine initialized with style={style}")
 
     def configure_from_concept(self, concept: str) -> Dict[str, Any]:
@@ -122,16 +154,16 @@ class LightingEngine:
         """
         logger.info("Analyzing concept for lighting configuration...")
 
-        concept_lower = concept.lower()
+        features = analyze_concept(concept)
 
         # Detect environment type
-        environment = self._detect_environment(concept_lower)
+        environment = self._detect_environment(features)
 
         # Detect time of day
-        time_of_day = self._detect_time_of_day(concept_lower)
+        time_of_day = self._detect_time_of_day(features)
 
         # Detect mood
-        mood = self._detect_mood(concept_lower)
+        mood = self._detect_mood(features)
 
         # Select appropriate setup
         setup_name = self._select_setup(environment, time_of_day, mood)
@@ -157,49 +189,32 @@ class LightingEngine:
 
         return config
 
-    def _detect_environment(self, concept: str) -> str:
+    def _detect_environment(self, features: ConceptFeatures) -> str:
         """Detect whether scene is indoor, outdoor, or studio."""
-        if any(word in concept for word in ["outdoor", "forest", "field", "park", "street", "sky"]):
-            return "outdoor"
-        elif any(word in concept for word in ["studio", "photography", "product", "white background"]):
-            return "studio"
-        elif any(word in concept for word in ["room", "indoor", "interior", "building", "house"]):
-            return "indoor"
-        else:
-            return "neutral"
+        for environment, keywords in self.ENVIRONMENT_KEYWORDS.items():
+            if features.has_any(keywords):
+                return environment
+        return "neutral"
 
-    def _detect_time_of_day(self, concept: str) -> Optional[str]:
+    def _detect_time_of_day(self, features: ConceptFeatures) -> Optional[str]:
         """Detect time of day from concept."""
         for time in TimeOfDay:
-            if time.value in concept:
+            if features.has(time.value):
                 return time.value
 
         # Check synonyms
-        if any(word in concept for word in ["sunrise", "dawn", "early morning"]):
-            return TimeOfDay.DAWN.value
-        elif any(word in concept for word in ["sunset", "dusk", "evening"]):
-            return TimeOfDay.SUNSET.value
-        elif any(word in concept for word in ["night", "dark", "midnight"]):
-            return TimeOfDay.NIGHT.value
-        elif "noon" in concept or "midday" in concept:
-            return TimeOfDay.NOON.value
+        for time_of_day, keywords in self.TIME_OF_DAY_SYNONYMS.items():
+            if features.has_any(keywords):
+                return time_of_day
 
         return None
 
-    def _detect_mood(self, concept: str) -> str:
+    def _detect_mood(self, features: ConceptFeatures) -> str:
         """Detect mood/atmosphere from concept."""
-        if any(word in concept for word in ["dramatic", "intense", "dark", "moody"]):
-            return "dramatic"
-        elif any(word in concept for word in ["soft", "gentle", "calm", "peaceful"]):
-            return "soft"
-        elif any(word in concept for word in ["bright", "cheerful", "light", "airy"]):
-            return "bright"
-        elif any(word in concept for word in ["warm", "cozy", "inviting"]):
-            return "warm"
-        elif any(word in concept for word in ["cool", "clinical", "modern"]):
-            return "cool"
-        else:
-            return "neutral"
+        for mood, keywords in self.MOOD_KEYWORDS.items():
+            if features.has_any(keywords):
+                return mood
+        return "neutral"
 
     def _select_setup(self, environment: str, time_of_day: Optional[str], mood: str) -> str:
         """Select appropriate lighting setup."""
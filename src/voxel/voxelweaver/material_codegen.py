@@ -0,0 +1,264 @@
+"""
+Material Codegen - Compiled templates for Blender material code.
+Node-graph source is built once per material structure with $placeholders
+for its values; generating code for a material is then a substitution, and
+the result is cached by (template, values).
+"""
+
+import logging
+import re
+import string
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
+
+# Imports placed once at the top of generated material code
+CODE_PREAMBLE = ["import bpy", "import bmesh", "from mathutils import Vector"]
+
+# Principled BSDF inputs set from MaterialPreset attributes
+BSDF_INPUTS = [
+    ("Base Color", "base_color"),
+    ("Roughness", "roughness"),
+    ("Metallic", "metallic"),
+    ("Specular", "specular"),
+    ("Emission Strength", "emission_strength"),
+    ("Transmission Weight", "transmission"),
+    ("IOR", "ior"),
+    ("Subsurface Weight", "subsurface"),
+    ("Anisotropic", "anisotropy"),
+    ("Sheen Weight", "sheen"),
+    ("Clearcoat Weight", "clearcoat"),
+    ("Clearcoat Roughness", "clearcoat_roughness"),
+]
+
+
+def bsdf_input_lines() -> List[str]:
+    """Template lines setting every BSDF input from its placeholder."""
+    return [
+        f"bsdf.inputs['{input_name}'].default_value = ${attribute}"
+        for input_name, attribute in BSDF_INPUTS
+    ]
+
+
+def bsdf_values(preset: Any) -> Dict[str, Any]:
+    """Placeholder values for bsdf_input_lines from a MaterialPreset."""
+    return {attribute: getattr(preset, attribute) for _, attribute in BSDF_INPUTS}
+
+
+def escape(line: str) -> str:
+    """Escape literal text for inclusion in a template."""
+    return line.replace("$", "$$")
+
+
+def slugify(name: str) -> str:
+    """Turn a material name into a Python identifier fragment."""
+    return _SLUG_PATTERN.sub("_", name.lower()).strip("_") or "material"
+
+
+class CodeTemplate:
+    """
+    Blender Python source with ``$name`` placeholders for material values.
+
+    Placeholders stand for Python expressions: ``bind`` fills them with
+    literals for inline code, ``as_function`` turns them into parameters of
+    a helper function that objects sharing the template can call.
+    """
+
+    def __init__(self, body: Sequence[str], parameters: Sequence[str]):
+        """
+        Initialize the template.
+
+        Args:
+            body: Source lines using ``$parameter`` placeholders
+            parameters: Placeholder names, in helper-function argument order
+        """
+        self.source = "\n".join(body)
+        self.parameters = tuple(parameters)
+        self._template = string.Template(self.source)
+        unknown = set(self._template.get_identifiers()) - set(self.parameters)
+        if unknown:
+            raise ValueError(f"Template uses undeclared parameters: {sorted(unknown)}")
+
+    def bind(self, values: Mapping[str, Any]) -> str:
+        """
+        Substitute literal values for every placeholder.
+
+        Args:
+            values: Value for each parameter (rendered with repr)
+
+        Returns:
+            Executable source
+        """
+        return self._template.substitute({name: repr(values[name]) for name in self.parameters})
+
+    def as_function(self, function_name: str) -> str:
+        """Render the template as a helper function taking its parameters."""
+        body = self._template.substitute({name: name for name in self.parameters})
+        lines = [f"def {function_name}({', '.join(self.parameters)}):"]
+        lines.extend(f"    {line}" if line else "" for line in body.split("\n"))
+        return "\n".join(lines)
+
+    def call(self, function_name: str, values: Mapping[str, Any]) -> str:
+        """Render a call of the helper function with literal values."""
+        arguments = ", ".join(f"{name}={values[name]!r}" for name in self.parameters)
+        return f"{function_name}({arguments})"
+
+
+class TemplateCache:
+    """
+    Compiled templates plus an LRU of bound snippets.
+
+    Templates are compiled once per structural key and kept for the life of
+    the cache; bound snippets are keyed by (template key, values). Both are
+    safe to use from several threads.
+    """
+
+    def __init__(self, max_snippets: int = 512):
+        """
+        Initialize the cache.
+
+        Args:
+            max_snippets: Number of bound snippets to keep
+        """
+        self.max_snippets = max_snippets
+        self._templates: Dict[Hashable, CodeTemplate] = {}
+        self._snippets: "OrderedDict[Tuple[Hashable, Tuple], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"compiles": 0, "snippet_hits": 0, "snippet_misses": 0}
+
+    def template(self, key: Hashable, compile_template: Callable[[], CodeTemplate]) -> CodeTemplate:
+        """Get the template for a structural key, compiling it on first use."""
+        template = self._templates.get(key)
+        if template is None:
+            compiled = compile_template()
+            with self._lock:
+                template = self._templates.setdefault(key, compiled)
+                if template is compiled:
+                    self.stats["compiles"] += 1
+        return template
+
+    def render(
+        self,
+        key: Hashable,
+        compile_template: Callable[[], CodeTemplate],
+        values: Mapping[str, Any]
+    ) -> str:
+        """
+        Get bound source for a template and values.
+
+        Args:
+            key: Structural key of the template
+            compile_template: Builds the template on a template miss
+            values: Parameter values to bind
+
+        Returns:
+            Executable source
+        """
+        return self.bind(key, self.template(key, compile_template), values)
+
+    def bind(self, key: Hashable, template: CodeTemplate, values: Mapping[str, Any]) -> str:
+        """
+        Get bound source for a template the caller already compiled.
+
+        Args:
+            key: Structural key the template is cached under
+            template: Template from template(key, ...)
+            values: Parameter values to bind
+
+        Returns:
+            Executable source
+        """
+        snippet_key = (key, tuple(repr(values[name]) for name in template.parameters))
+        with self._lock:
+            snippet = self._snippets.get(snippet_key)
+            if snippet is not None:
+                self._snippets.move_to_end(snippet_key)
+                self.stats["snippet_hits"] += 1
+                return snippet
+
+        snippet = template.bind(values)
+        with self._lock:
+            self.stats["snippet_misses"] += 1
+            self._snippets[snippet_key] = snippet
+            while len(self._snippets) > self.max_snippets:
+                self._snippets.popitem(last=False)
+        return snippet
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["templates"] = len(self._templates)
+            stats["snippets"] = len(self._snippets)
+        return stats
+
+
+class HelperScriptBuilder:
+    """
+    Collects material code for a combined script, emitting one helper
+    function per template and one call per object.
+    """
+
+    def __init__(self, preamble: Sequence[str] = ()):
+        """
+        Initialize the builder.
+
+        Args:
+            preamble: Lines placed once at the top (imports)
+        """
+        self.preamble = list(preamble)
+        self._helpers: Dict[Hashable, str] = {}
+        self._definitions: List[str] = []
+        self._calls: List[str] = []
+
+    def add(
+        self,
+        key: Hashable,
+        template: CodeTemplate,
+        values: Mapping[str, Any],
+        helper_base: str,
+        header: Sequence[str] = ()
+    ) -> str:
+        """
+        Add one material application.
+
+        Args:
+            key: Structural key of the template
+            template: The compiled template
+            values: Parameter values for this application
+            helper_base: Readable base for the helper function name
+            header: Comment lines placed before the call
+
+        Returns:
+            Name of the helper function used
+        """
+        name = self._helpers.get(key)
+        if name is None:
+            name = f"build_{helper_base}_material"
+            taken = set(self._helpers.values())
+            suffix = 2
+            while name in taken:
+                name = f"build_{helper_base}_material_{suffix}"
+                suffix += 1
+            self._helpers[key] = name
+            self._definitions.extend([template.as_function(name), "", ""])
+
+        self._calls.extend(header)
+        self._calls.extend([template.call(name, values), ""])
+        return name
+
+    @property
+    def helper_count(self) -> int:
+        """Number of helper functions emitted."""
+        return len(self._helpers)
+
+    def build(self) -> str:
+        """Get the combined script."""
+        lines = list(self.preamble)
+        if lines:
+            lines.extend(["", ""])
+        return "\n".join(lines + self._definitions + self._calls).rstrip() + "\n"
@@ -0,0 +1,149 @@
+"""
+Material Scoring - Vectorized material suggestion scoring.
+Holds catalog preset attributes as arrays so every preset is scored for every
+object type in a single pass, followed by top-k selection. The arrays come
+from registration records, so scoring builds no presets.
+"""
+
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .advanced_texture_catalog import MaterialCategory, PresetSpec
+
+_CATEGORIES = list(MaterialCategory)
+_CATEGORY_INDEX = {category: i for i, category in enumerate(_CATEGORIES)}
+
+
+class PresetMatrix:
+    """
+    Struct-of-arrays view of catalog presets for batch scoring.
+
+    ``names`` holds the preset keys, ``category`` each preset's
+    MaterialCategory index and ``complexity`` its complexity score.
+    Environment adaptation columns are built on first use per environment.
+    """
+
+    def __init__(self, specs: Sequence[PresetSpec]):
+        """
+        Initialize the matrix.
+
+        Args:
+            specs: Registration records of the presets to score, in catalog order
+        """
+        self.specs = list(specs)
+        self.names = [spec.name for spec in self.specs]
+        self.category = np.array(
+            [_CATEGORY_INDEX[MaterialCategory(spec.category)] for spec in self.specs], dtype=np.intp
+        )
+        self.complexity = np.array([spec.complexity_score for spec in self.specs], dtype=np.float64)
+        self._adaptation: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def adaptation(self, environment: str) -> np.ndarray:
+        """Each preset's adaptation to an environment (0.5 when unspecified)."""
+        column = self._adaptation.get(environment)
+        if column is None:
+            column = np.array(
+                [spec.environment_adaptation.get(environment, 0.5) for spec in self.specs],
+                dtype=np.float64,
+            )
+            self._adaptation[environment] = column
+        return column
+
+    def score(
+        self,
+        object_categories: Sequence[Sequence[MaterialCategory]],
+        object_affinity: Sequence[Mapping[MaterialCategory, float]],
+        concept_bonus: Mapping[MaterialCategory, float],
+        category_weight: Mapping[MaterialCategory, float],
+        environment: str,
+        min_complexity: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every preset for every object.
+
+        Matches EnhancedTextureMapper._calculate_material_score followed by
+        the environment weight of the preset's category.
+
+        Args:
+            object_categories: Material categories considered per object, in
+                preference order
+            object_affinity: Score bonus per category for each object
+            concept_bonus: Score bonus per category from the concept text
+            category_weight: Environment weight per category (default 1.0)
+            environment: Environment name for preset adaptation
+            min_complexity: Minimum preset complexity score
+
+        Returns:
+            (scores, rank): O x P arrays; scores are NaN for presets outside
+            an object's categories or below the complexity threshold, and
+            rank is the position of the preset's category in the object's
+            preference order
+        """
+        count = len(object_categories)
+        width = len(_CATEGORIES)
+        affinity = np.zeros((count, width))
+        rank = np.full((count, width), width, dtype=np.intp)
+        for o, categories in enumerate(object_categories):
+            for position, category in enumerate(categories):
+                index = _CATEGORY_INDEX[category]
+                rank[o, index] = min(rank[o, index], position)
+            for category, bonus in object_affinity[o].items():
+                affinity[o, _CATEGORY_INDEX[category]] = bonus
+
+        bonus = np.array([concept_bonus.get(c, 0.0) for c in _CATEGORIES])
+        weight = np.array([category_weight.get(c, 1.0) for c in _CATEGORIES])
+
+        # Same operation order as the scalar scorer so results are identical
+        base = self.complexity * 0.3 + self.adaptation(environment) * 0.4
+        scores = base[None, :] + affinity[:, self.category] + bonus[self.category][None, :]
+        scores = np.minimum(scores, 1.0) * weight[self.category][None, :]
+
+        preset_rank = rank[:, self.category]
+        excluded = (preset_rank == width) | (self.complexity < min_complexity)[None, :]
+        scores[excluded] = np.nan
+        return scores, preset_rank
+
+
+def top_k_pairs(
+    scores: np.ndarray,
+    rank: np.ndarray,
+    k: int,
+    threshold: float,
+) -> List[Tuple[int, int, float]]:
+    """
+    Select the k best (object, preset) pairs scoring above threshold.
+
+    Ties are broken by object order, then category rank, then preset order,
+    which is the order the scalar path appends suggestions in before its
+    stable sort.
+
+    Args:
+        scores: O x P scores (NaN for excluded pairs)
+        rank: O x P category rank of each pair
+        k: Number of pairs to return
+        threshold: Exclusive minimum score
+
+    Returns:
+        (object index, preset index, score) tuples, best first
+    """
+    with np.errstate(invalid="ignore"):
+        objects, presets = np.nonzero(scores > threshold)
+    if len(objects) == 0 or k <= 0:
+        return []
+    values = scores[objects, presets]
+
+    # Keep only pairs that can make the top k (all ties at the cut included)
+    if len(values) > k:
+        cutoff = np.partition(values, len(values) - k)[len(values) - k]
+        keep = values >= cutoff
+        objects, presets, values = objects[keep], presets[keep], values[keep]
+
+    order = np.lexsort((presets, rank[objects, presets], objects, -values))[:k]
+    return [
+        (int(objects[i]), int(presets[i]), float(values[i]))
+        for i in order
+    ]
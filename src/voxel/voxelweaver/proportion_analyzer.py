@@ -8,8 +8,15 @@ import logging
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from .concept_features import analyze_concept, get_concept_analyzer
+
 logger = logging.getLogger(__name__)
 
+# Pattern to match dimensions (e.g., "1.2m tall", "0.5 meters wide")
+_DIMENSION_PATTERN = re.compile(
+    r'(\d+\.?\d*)\s*(m|meters?|cm|centimeters?|mm|millimeters?)\s*(tall|wide|high|deep|long)'
+)
+
 
 @dataclass
 class ProportionCheck:
@@ -95,6 +102,7 @@ class ProportionAnalyzer:
 
     def __init__(self):
         """Initialize the proportion analyzer."""
+        get_concept_analyzer().register(self.SCALE_REFERENCES.keys())
         logger.info("ProportionAnalyzer initialized")
 
     def analyze_concept(self, concept: str) -> Dict[str, Any]:
@@ -141,50 +149,36 @@ class ProportionAnalyzer:
         """Extract object names and any mentioned dimensions from concept."""
         objects = []
 
-        # Pattern to match dimensions (e.g., "1.2m tall", "0.5 meters wide")
-        dimension_pattern = r'(\d+\.?\d*)\s*(m|meters?|cm|centimeters?|mm|millimeters?)\s*(tall|wide|high|deep|long)'
-
         # Extract known object types
-        concept_lower = concept.lower()
-        for obj_name in self.SCALE_REFERENCES.keys():
-            if obj_name in concept_lower:
-                # Find context around this object
-                obj_context = self._get_object_context(concept_lower, obj_name)
-
-                # Look for dimensions in context
-                dimensions = {}
-                matches = re.finditer(dimension_pattern, obj_context)
-                for match in matches:
-                    value = float(match.group(1))
-                    unit = match.group(2)
-                    dimension_type = match.group(3)
-
-                    # Convert to meters
-                    if unit in ['cm', 'centimeter', 'centimeters']:
-                        value /= 100
-                    elif unit in ['mm', 'millimeter', 'millimeters']:
-                        value /= 1000
-
-                    dimensions[dimension_type] = value
-
-                objects.append({
-                    "name": obj_name,
-                    "mentioned_dimensions": dimensions,
-                    "context": obj_context
-                })
+        features = analyze_concept(concept)
+        for obj_name in features.present(self.SCALE_REFERENCES.keys()):
+            # Find context around this object
+            obj_context = features.context(obj_name)
+
+            # Look for dimensions in context
+            dimensions = {}
+            matches = _DIMENSION_PATTERN.finditer(obj_context)
+            for match in matches:
+                value = float(match.group(1))
+                unit = match.group(2)
+                dimension_type = match.group(3)
+
+                # Convert to meters
+                if unit in ['cm', 'centimeter', 'centimeters']:
+                    value /= 100
+                elif unit in ['mm', 'millimeter', 'millimeters']:
+                    value /= 1000
+
+                dimensions[dimension_type] = value
+
+            objects.append({
+                "name": obj_name,
+                "mentioned_dimensions": dimensions,
+                "context": obj_context
+            })
 
         return objects
 
-    def _get_object_context(self, text: str, object_name: str, window: int = 100) -> str:
-        """Get text context around an object mention."""
-        idx = text.find(object_name)
-        if idx == -1:
-            return ""
-
-        start = max(0, idx - window)
-        end = min(len(text), idx + len(object_name) + window)
-        return text[start:end]
-
     def _check_object_proportions(self, obj: Dict[str, Any], concept: str) -> ProportionCheck:
         """
         Check if object proportions are realistic.
@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from .context_alignment import ContextAligner
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +52,7 @@ class SceneValidator:
             validation_level: Level of validation strictness
         """
         self.validation_level = validation_level
+        self.aligner = ContextAligner()
         logger.info(f"SceneValidator initialized (level={validation_level.value})")
 
     def validate(self, scene_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -71,6 +74,7 @@ class SceneValidator:
         issues.extend(self._validate_materials(scene_data))
         issues.extend(self._validate_lighting(scene_data))
         issues.extend(self._validate_proportions(scene_data))
+        issues.extend(self._validate_spatial(scene_data))
         issues.extend(self._validate_coherence(scene_data))
         issues.extend(self._validate_technical(scene_data))
 
@@ -276,6 +280,42 @@ class SceneValidator:
 
         return issues
 
+    def _validate_spatial(self, scene_data: Dict[str, Any]) -> List[ValidationIssue]:
+        """Validate that placed objects do not overlap."""
+        issues = []
+
+        objects = [obj for obj in scene_data.get("objects", []) if isinstance(obj, dict) and "position" in obj]
+        if len(objects) < 2:
+            return issues
+
+        overlaps = self.aligner.find_overlaps(objects)
+        severe = [o for o in overlaps if o["severity"] == "high"]
+
+        if severe:
+            issues.append(ValidationIssue(
+                category="spatial",
+                level=IssueLevel.ERROR,
+                message=f"{len(severe)} severe object overlaps",
+                suggestion="Run spatial alignment to separate intersecting objects"
+            ))
+        elif overlaps:
+            issues.append(ValidationIssue(
+                category="spatial",
+                level=IssueLevel.WARNING,
+                message=f"{len(overlaps)} object overlaps",
+                suggestion="Run spatial alignment to separate intersecting objects"
+            ))
+
+        for overlap in sorted(overlaps, key=lambda o: o["overlap_volume"], reverse=True)[:5]:  # Top 5 overlaps
+            issues.append(ValidationIssue(
+                category="spatial",
+                level=IssueLevel.INFO,
+                message=f"{overlap['object_1']} overlaps {overlap['object_2']} ({overlap['overlap_volume']:.3f} m³)",
+                object_name=overlap["object_2"]
+            ))
+
+        return issues
+
     def _validate_coherence(self, scene_data: Dict[str, Any]) -> List[ValidationIssue]:
         """Validate overall scene coherence."""
         issues = []
@@ -3,12 +3,14 @@ Search and Scrape - External reference gathering for Blender scene generation.
 Scrapes open-source Blender projects, assets, and real-world data for training.
 """
 
-import re
 import logging
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
+from ..core.performance import PerformanceCache
+from .concept_features import analyze_concept, get_concept_analyzer
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +79,12 @@ class ReferenceSearcher:
         "wall": ["paint", "wallpaper", "concrete", "brick"],
     }
 
+    # Common 3D objects
+    COMMON_OBJECTS = [
+        "cube", "sphere", "cylinder", "cone", "plane",
+        "torus", "suzanne", "icosphere", "light", "camera"
+    ]
+
     # Known Blender resource sources (simulated - in production would use API)
     SEARCH_SOURCES = [
         "GitHub:awesome-blender",
@@ -88,17 +96,23 @@ class ReferenceSearcher:
         "Dimensions.com",  # Real-world dimensions
     ]
 
-    def __init__(self, max_results: int = 50, enabled: bool = True):
+    def __init__(self, max_results: int = 50, enabled: bool = True, cache_size: int = 512):
         """
         Initialize the reference searcher.
 
         Args:
             max_results: Maximum number of references to fetch
             enabled: Whether search is enabled
+            cache_size: Object searches kept (LRU); words come from user
+                concepts, so the cache must be bounded
         """
         self.max_results = max_results
         self.enabled = enabled
-        self._cache: Dict[str, List[ExternalReference]] = {}
+        self._cache = PerformanceCache(max_size=cache_size, default_ttl=None)
+        self._object_vocabulary = list(dict.fromkeys(
+            list(self.DIMENSION_DATABASE.keys()) + self.COMMON_OBJECTS
+        ))
+        get_concept_analyzer().register(self._object_vocabulary)
 
         logger.info(f"ReferenceSearcher initialized (enabled={enabled}, max={max_results})")
 
@@ -141,30 +155,19 @@ class ReferenceSearcher:
     def _extract_objects(self, concept: str) -> List[str]:
         """Extract object names from concept description."""
         # Simple keyword extraction (in production, use NLP)
-        concept_lower = concept.lower()
-
-        found_objects = []
-
-        # Check dimension database keys
-        for obj_name in self.DIMENSION_DATABASE.keys():
-            if obj_name in concept_lower:
-                found_objects.append(obj_name)
-
-        # Common 3D objects
-        common_objects = [
-            "cube", "sphere", "cylinder", "cone", "plane",
-            "torus", "suzanne", "icosphere", "light", "camera"
-        ]
+        features = analyze_concept(concept)
 
-        for obj in common_objects:
-            if obj in concept_lower and obj not in found_objects:
-                found_objects.append(obj)
+        # Dimension database keys, then common 3D objects
+        found_objects = features.present(self._object_vocabulary)
 
         # Extract words that might be objects (nouns)
-        words = re.findall(r'\b[a-z]{3,}\b', concept_lower)
-        for word in words:
-            if word not in found_objects and word not in ["the", "and", "with", "for", "scene"]:
+        seen = set(found_objects)
+        for word in features.words:
+            if len(found_objects) >= 20:
+                break
+            if word not in seen and word not in ["the", "and", "with", "for", "scene"]:
                 found_objects.append(word)
+                seen.add(word)
 
         return found_objects[:20]  # Limit to 20 objects
 
@@ -179,8 +182,9 @@ class ReferenceSearcher:
             List of references found
         """
         # Check cache first
-        if object_name in self._cache:
-            return self._cache[object_name]
+        cached = self._cache.get_sync(object_name)
+        if cached is not None:
+            return cached
 
         references = []
 
@@ -235,7 +239,7 @@ class ReferenceSearcher:
         references.append(blendswap_ref)
 
         # Cache results
-        self._cache[object_name] = references
+        self._cache.set_sync(object_name, references)
 
         return references
 
@@ -0,0 +1,303 @@
+"""
+Spatial Batch - Vectorized bounding box operations.
+Stores many boxes as one N x 6 array so intersection, overlap and placement
+math runs over whole scenes at once instead of one object at a time.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .context_alignment import BoundingBox
+
+# Column order matches the BoundingBox fields
+MIN_X, MAX_X, MIN_Y, MAX_Y, MIN_Z, MAX_Z = range(6)
+_MINS = [MIN_X, MIN_Y, MIN_Z]
+_MAXS = [MAX_X, MAX_Y, MAX_Z]
+
+
+class BoxArray:
+    """
+    Struct-of-arrays collection of axis-aligned bounding boxes.
+
+    ``bounds`` is an N x 6 float array with columns
+    (min_x, max_x, min_y, max_y, min_z, max_z). Pairwise methods take two
+    equal-length index arrays and return one value per pair.
+    """
+
+    def __init__(self, bounds: np.ndarray, names: Optional[List[str]] = None):
+        """
+        Initialize the array.
+
+        Args:
+            bounds: N x 6 box bounds
+            names: Optional object name per box
+        """
+        self.bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 6)
+        self.names = names
+
+    @classmethod
+    def from_boxes(cls, boxes: Sequence['BoundingBox'], names: Optional[List[str]] = None) -> 'BoxArray':
+        """Build from BoundingBox instances."""
+        bounds = np.array(
+            [(b.min_x, b.max_x, b.min_y, b.max_y, b.min_z, b.max_z) for b in boxes],
+            dtype=np.float64,
+        )
+        return cls(bounds, names)
+
+    @classmethod
+    def from_centers(cls, centers: np.ndarray, sizes: np.ndarray, names: Optional[List[str]] = None) -> 'BoxArray':
+        """
+        Build from box centers and sizes.
+
+        Args:
+            centers: N x 3 (x, y, z) centers
+            sizes: N x 3 (width, depth, height) extents
+            names: Optional object name per box
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        half = np.asarray(sizes, dtype=np.float64).reshape(-1, 3) / 2
+        bounds = np.empty((len(centers), 6))
+        bounds[:, _MINS] = centers - half
+        bounds[:, _MAXS] = centers + half
+        return cls(bounds, names)
+
+    @classmethod
+    def from_objects(cls, objects: Sequence[Dict[str, Any]]) -> 'BoxArray':
+        """
+        Build from object definitions as accepted by ContextAligner.align_objects.
+
+        Missing positions, scales and dimensions use the same defaults as
+        ContextAligner.
+        """
+        count = len(objects)
+        centers = np.zeros((count, 3))
+        sizes = np.ones((count, 3))
+        names = []
+        for i, obj in enumerate(objects):
+            names.append(obj.get("name", "unnamed"))
+            centers[i] = obj.get("position", (0.0, 0.0, 0.0))
+            scale = obj.get("scale", (1.0, 1.0, 1.0))
+            dimensions = obj.get("dimensions", {})
+            sizes[i] = (
+                dimensions.get("width", 1.0) * scale[0],
+                dimensions.get("depth", 1.0) * scale[1],
+                dimensions.get("height", 1.0) * scale[2],
+            )
+        return cls.from_centers(centers, sizes, names)
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """N x 3 box centers."""
+        return (self.bounds[:, _MINS] + self.bounds[:, _MAXS]) / 2
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """N x 3 box extents (width, depth, height)."""
+        return self.bounds[:, _MAXS] - self.bounds[:, _MINS]
+
+    def to_boxes(self) -> List['BoundingBox']:
+        """Convert back to BoundingBox instances."""
+        from .context_alignment import BoundingBox
+
+        return [BoundingBox(*row) for row in self.bounds.tolist()]
+
+    def translated(self, offsets: np.ndarray) -> 'BoxArray':
+        """Get a copy with every box moved by its N x 3 (or broadcastable) offset."""
+        offsets = np.asarray(offsets, dtype=np.float64)
+        bounds = self.bounds.copy()
+        bounds[:, _MINS] += offsets
+        bounds[:, _MAXS] += offsets
+        return BoxArray(bounds, self.names)
+
+    def intersects(self, i: np.ndarray, j: np.ndarray, tolerance: float = 0.0) -> np.ndarray:
+        """Vectorized BoundingBox.intersects for box pairs (i[k], j[k])."""
+        a = self.bounds[i]
+        b = self.bounds[j]
+        return np.all(
+            (a[:, _MAXS] + tolerance >= b[:, _MINS]) & (a[:, _MINS] - tolerance <= b[:, _MAXS]),
+            axis=1,
+        )
+
+    def overlap_volume(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Intersection volume of box pairs (i[k], j[k])."""
+        a = self.bounds[i]
+        b = self.bounds[j]
+        overlap = np.minimum(a[:, _MAXS], b[:, _MAXS]) - np.maximum(a[:, _MINS], b[:, _MINS])
+        return np.prod(np.clip(overlap, 0.0, None), axis=1)
+
+    def separation_positions(self, i: np.ndarray, j: np.ndarray, tolerance: float = 0.0) -> np.ndarray:
+        """
+        Positions that move box j[k] clear of box i[k] in the horizontal plane.
+
+        Matches ContextAligner._calculate_separation_position: j is pushed
+        along the center-to-center direction (+x if the centers coincide) and
+        keeps its height.
+
+        Returns:
+            K x 3 new centers for the j boxes
+        """
+        centers = self.centers
+        sizes = self.sizes
+        c1 = centers[i]
+        c2 = centers[j]
+
+        direction = c2 - c1
+        distance = np.linalg.norm(direction, axis=1)
+        coincident = distance < 0.001
+        direction[coincident] = (1.0, 0.0, 0.0)
+        distance[coincident] = 1.0
+        direction /= distance[:, None]
+
+        # Average of the combined half-widths and half-depths
+        required = (
+            (sizes[i, 0] + sizes[j, 0]) / 2 + (sizes[i, 1] + sizes[j, 1]) / 2
+        ) / 2 + tolerance
+
+        positions = c1 + direction * required[:, None]
+        positions[:, 2] = c2[:, 2]
+        return positions
+
+    def overlapping_pairs(
+        self,
+        tolerance: float = 0.0,
+        max_cells_per_box: int = 64,
+        chunk_size: int = 1 << 20,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find every intersecting pair with a uniform-grid broad phase.
+
+        Vectorized form of SpatialHashGrid: cells are as large as the median
+        box, each box is registered in every cell it touches and only boxes
+        sharing a cell are tested, so the work follows local density rather
+        than how many boxes share a row or column. A pair is only tested in
+        the first cell both boxes touch. Boxes spanning more than
+        max_cells_per_box cells are tested against every box.
+
+        Args:
+            tolerance: Same meaning as in BoundingBox.intersects
+            max_cells_per_box: Cell count above which a box is treated as oversized
+            chunk_size: Maximum candidate pairs materialized at once
+
+        Returns:
+            (i, j) index arrays with i < j, sorted by i then j
+        """
+        empty = np.empty(0, dtype=np.intp)
+        count = len(self.bounds)
+        if count < 2:
+            return empty, empty
+
+        bounds = self.bounds
+        if tolerance > 0:
+            # Boxes within tolerance of each other must share a cell
+            bounds = bounds.copy()
+            bounds[:, _MINS] -= tolerance / 2
+            bounds[:, _MAXS] += tolerance / 2
+
+        extents = np.sort((bounds[:, _MAXS] - bounds[:, _MINS]).max(axis=1))
+        cell_size = max(float(extents[count // 2]), 1e-3)
+        low = np.floor(bounds[:, _MINS] / cell_size).astype(np.int64)
+        spans = np.floor(bounds[:, _MAXS] / cell_size).astype(np.int64) - low + 1
+        oversized = np.prod(spans.astype(np.float64), axis=1) > max_cells_per_box
+
+        found_i: List[np.ndarray] = []
+        found_j: List[np.ndarray] = []
+
+        def test(a: np.ndarray, b: np.ndarray) -> None:
+            hit = self.intersects(a, b, tolerance)
+            found_i.append(a[hit])
+            found_j.append(b[hit])
+
+        # One (box, cell) entry per cell a regular box touches
+        regular = np.flatnonzero(~oversized)
+        cells_per_box = np.prod(spans[regular], axis=1)
+        box, local = _expand_runs(cells_per_box)
+        box = regular[box]
+        span_y, span_z = spans[box, 1], spans[box, 2]
+        cells = low[box] + np.stack(
+            [local // (span_y * span_z), (local // span_z) % span_y, local % span_z], axis=1
+        )
+
+        # Group entries by cell; each entry pairs with the later entries of its cell
+        order = np.lexsort((cells[:, 2], cells[:, 1], cells[:, 0]))
+        box, cells = box[order], cells[order]
+        group = np.concatenate(([0], np.cumsum(np.any(cells[1:] != cells[:-1], axis=1))))
+        partners = np.searchsorted(group, group, side="right") - np.arange(1, len(group) + 1)
+
+        for first, offsets in _expand_runs_chunked(partners, chunk_size):
+            second = first + 1 + offsets
+            a, b = box[first], box[second]
+            first_shared = np.all(cells[first] == np.maximum(low[a], low[b]), axis=1)
+            test(a[first_shared], b[first_shared])
+
+        # Oversized boxes against everything, each oversized pair once
+        indices = np.arange(count)
+        for o in np.flatnonzero(oversized).tolist():
+            others = indices[(~oversized | (indices > o)) & (indices != o)]
+            for start in range(0, len(others), chunk_size):
+                chunk = others[start:start + chunk_size]
+                test(np.full(len(chunk), o), chunk)
+
+        a = np.concatenate(found_i) if found_i else empty
+        b = np.concatenate(found_j) if found_j else empty
+        i = np.minimum(a, b)
+        j = np.maximum(a, b)
+        keys = np.lexsort((j, i))
+        return i[keys], j[keys]
+
+
+def _expand_runs(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Expand run lengths into (row, offset) pairs with offsets 0..counts[row]-1."""
+    counts = np.asarray(counts, dtype=np.intp)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, offsets
+
+
+def _expand_runs_chunked(counts: np.ndarray, chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """_expand_runs in pieces of about chunk_size pairs (a longer single run stays whole)."""
+    counts = np.asarray(counts, dtype=np.intp)
+    totals = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        done = totals[start - 1] if start else 0
+        stop = max(int(np.searchsorted(totals, done + chunk_size, side="right")), start + 1)
+        rows, offsets = _expand_runs(counts[start:stop])
+        if len(rows):
+            yield rows + start, offsets
+        start = stop
+
+
+def grid_positions(count: int, spacing: float) -> np.ndarray:
+    """Centers for count objects in a square grid (see ContextAligner._place_grid)."""
+    positions = np.zeros((count, 3))
+    if count == 0:
+        return positions
+    grid_size = int(np.ceil(np.sqrt(count)))
+    index = np.arange(count)
+    offset = (grid_size * spacing) / 2
+    positions[:, 0] = (index % grid_size) * spacing - offset
+    positions[:, 1] = (index // grid_size) * spacing - offset
+    return positions
+
+
+def circular_positions(count: int, radius: float) -> np.ndarray:
+    """Centers for count objects evenly spaced on a circle."""
+    positions = np.zeros((count, 3))
+    if count == 0:
+        return positions
+    angles = np.arange(count) * (2 * np.pi / count)
+    positions[:, 0] = radius * np.cos(angles)
+    positions[:, 1] = radius * np.sin(angles)
+    return positions
+
+
+def linear_positions(count: int, spacing: float) -> np.ndarray:
+    """Centers for count objects on a line along x, centered on the origin."""
+    positions = np.zeros((count, 3))
+    positions[:, 0] = np.arange(count) * spacing - (count - 1) * spacing / 2
+    return positions
@@ -0,0 +1,137 @@
+"""
+Stage Cache - Memoization of VoxelWeaver pipeline stages.
+Stage outputs are keyed by a hash of their inputs and kept in an in-process
+LRU, optionally backed by pickle files on disk so they survive restarts.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.performance import PerformanceCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when a stage's output format or logic changes to invalidate old entries
+STAGE_CACHE_VERSION = 1
+
+
+def make_stage_key(stage: str, **inputs: Any) -> str:
+    """
+    Build a content hash over a stage's name and inputs.
+
+    Args:
+        stage: Pipeline stage name
+        **inputs: Everything that determines the stage output
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    key_data = {"version": STAGE_CACHE_VERSION, "stage": stage, "inputs": inputs}
+    key_string = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """
+    Two-level cache for VoxelWeaver stage outputs.
+
+    Values are deep-copied on the way in and out so callers can mutate what
+    they receive. Disk entries are pickled so a disk hit returns the same
+    types as the computation (tuples stay tuples); they are written
+    atomically (temp file + rename) and unreadable entries are treated as
+    misses. Only point disk_dir at a directory this process trusts.
+    """
+
+    def __init__(self, max_entries: int = 128, disk_dir: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept in memory
+            disk_dir: Directory for the on-disk store (None keeps memory only)
+        """
+        self.memory = PerformanceCache(max_size=max_entries, default_ttl=None)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _disk_path(self, stage: str, key: str) -> Path:
+        return self.disk_dir / stage / f"{key}.pkl"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """
+        Look up a stage output.
+
+        Args:
+            stage: Pipeline stage name
+            key: Key from make_stage_key
+
+        Returns:
+            A copy of the cached output, or None on a miss
+        """
+        value = self.memory.get_sync(key)
+        if value is not None:
+            self._count("memory_hits")
+            return copy.deepcopy(value)
+
+        if self.disk_dir:
+            try:
+                value = pickle.loads(self._disk_path(stage, key).read_bytes())
+            except FileNotFoundError:
+                value = None
+            except (OSError, EOFError, ImportError, AttributeError, pickle.UnpicklingError) as e:
+                logger.warning(f"Ignoring unreadable stage cache entry {stage}/{key[:12]}: {e}")
+                value = None
+            if value is not None:
+                self.memory.set_sync(key, value)
+                self._count("disk_hits")
+                return copy.deepcopy(value)
+
+        self._count("misses")
+        return None
+
+    def set(self, stage: str, key: str, value: Any) -> None:
+        """
+        Store a stage output.
+
+        Args:
+            stage: Pipeline stage name
+            key: Key from make_stage_key
+            value: Picklable stage output
+        """
+        self.memory.set_sync(key, copy.deepcopy(value))
+
+        if self.disk_dir:
+            path = self._disk_path(stage, key)
+            tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, AttributeError, pickle.PicklingError) as e:
+                tmp_path.unlink(missing_ok=True)
+                logger.warning(f"Could not persist stage cache entry {stage}/{key[:12]}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (lookups - stats["misses"]) / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        stats["disk_dir"] = str(self.disk_dir) if self.disk_dir else None
+        return stats
@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from .concept_features import analyze_concept, get_concept_analyzer
+
 logger = logging.getLogger(__name__)
 
 
@@ -195,8 +197,31 @@ class TextureMapper:
         "fabric": ["fabric", "cloth"],
     }
 
+    # Color keywords
+    COLOR_MAP = {
+        "red": (0.8, 0.1, 0.1),
+        "blue": (0.1, 0.3, 0.8),
+        "green": (0.2, 0.8, 0.2),
+        "yellow": (0.9, 0.9, 0.1),
+        "orange": (1.0, 0.6, 0.0),
+        "purple": (0.7, 0.2, 0.8),
+        "pink": (1.0, 0.7, 0.8),
+        "white": (0.95, 0.95, 0.95),
+        "black": (0.05, 0.05, 0.05),
+        "gray": (0.5, 0.5, 0.5),
+        "brown": (0.4, 0.25, 0.15),
+        "amber": (1.0, 0.75, 0.0),
+        "sage": (0.6, 0.7, 0.5),
+        "pastel": (0.9, 0.8, 0.85),
+    }
+
     def __init__(self):
         """Initialize texture mapper."""
+        self._object_vocabulary = list(dict.fromkeys(
+            list(self.OBJECT_TO_MATERIAL.keys()) + list(self.MATERIAL_PRESETS.keys())
+        ))
+        get_concept_analyzer().register(self._object_vocabulary)
+        get_concept_analyzer().register(self.COLOR_MAP.keys())
         logger.info("TextureMapper initialized")
 
     def suggest_materials(
@@ -242,19 +267,8 @@ class TextureMapper:
 
     def _extract_objects(self, concept: str) -> List[str]:
         """Extract object names from concept."""
-        concept_lower = concept.lower()
-        found = []
-
-        for obj_type in self.OBJECT_TO_MATERIAL.keys():
-            if obj_type in concept_lower and obj_type not in found:
-                found.append(obj_type)
-
-        # Also check for material keywords
-        for material in self.MATERIAL_PRESETS.keys():
-            if material in concept_lower and material not in found:
-                found.append(material)
-
-        return found
+        # Object types first, then material keywords
+        return analyze_concept(concept).present(self._object_vocabulary)
 
     def _suggest_for_object(
         self,
@@ -309,29 +323,11 @@ class TextureMapper:
         obj_name: str
     ) -> tuple:
         """Adjust base color based on concept description."""
-        concept_lower = concept.lower()
-
-        # Color keywords
-        color_map = {
-            "red": (0.8, 0.1, 0.1),
-            "blue": (0.1, 0.3, 0.8),
-            "green": (0.2, 0.8, 0.2),
-            "yellow": (0.9, 0.9, 0.1),
-            "orange": (1.0, 0.6, 0.0),
-            "purple": (0.7, 0.2, 0.8),
-            "pink": (1.0, 0.7, 0.8),
-            "white": (0.95, 0.95, 0.95),
-            "black": (0.05, 0.05, 0.05),
-            "gray": (0.5, 0.5, 0.5),
-            "brown": (0.4, 0.25, 0.15),
-            "amber": (1.0, 0.75, 0.0),
-            "sage": (0.6, 0.7, 0.5),
-            "pastel": (0.9, 0.8, 0.85),
-        }
+        features = analyze_concept(concept)
 
         # Check if color is mentioned near object name
-        for color_name, color_value in color_map.items():
-            if color_name in concept_lower:
+        for color_name, color_value in self.COLOR_MAP.items():
+            if features.has(color_name):
                 # If color is mentioned in proximity to object
                 return color_value
 
@@ -4,9 +4,10 @@ Integrates all subsystems for coherent, production-ready Blender scene creation.
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass
 import logging
+import time
 
 from .search_scraper import ReferenceSearcher
 from .proportion_analyzer import ProportionAnalyzer
@@ -15,6 +16,8 @@ from .context_alignment import ContextAligner
 from .lighting_engine import LightingEngine
 from .texture_mapper import TextureMapper
 from .scene_validator import SceneValidator
+from .concept_features import analyze_concept
+from .stage_cache import StageCache, make_stage_key
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,8 @@ class VoxelWeaverConfig:
     max_references: int = 50  # Max external references to fetch
     collision_tolerance: float = 0.01  # Meters
     output_formats: List[str] = None  # ['blend', 'glb', 'fbx']
+    stage_cache_size: int = 128  # Memoized stage outputs kept in memory (0 disables)
+    stage_cache_dir: Optional[Path] = None  # On-disk stage cache (None for memory only)
 
     def __post_init__(self):
         if self.output_formats is None:
@@ -62,6 +67,10 @@ class VoxelWeaverCore:
         self.lighting_engine = LightingEngine(style=config.style)
         self.texture_mapper = TextureMapper()
         self.scene_validator = SceneValidator()
+        self.stage_cache = (
+            StageCache(config.stage_cache_size, config.stage_cache_dir)
+            if config.stage_cache_size > 0 else None
+        )
 
         logger.info(f"VoxelWeaver initialized with style={config.style}, resolution={config.voxel_resolution}")
 
@@ -85,40 +94,77 @@ class VoxelWeaverCore:
             'lighting_config': {},
             'texture_suggestions': {},
             'validation_results': {},
-            'coherence_score': 0.0
+            'coherence_score': 0.0,
+            'stage_timings': {},
+            'cached_stages': []
         }
 
         try:
+            # Scan the concept once; every subsystem below reuses these features
+            features = analyze_concept(concept)
+            logger.info(f"Matched {len(features.matches)} known keywords in concept")
+
             # Step 1: Search for external references
+            references_key = make_stage_key(
+                'references', concept=concept, prompt=prompt,
+                enabled=self.config.search_references, max_references=self.config.max_references
+            )
             if self.config.search_references:
                 logger.info("Searching external Blender repositories...")
-                result['references'] = self.reference_searcher.search_concept(concept, prompt)
+                result['references'] = self._run_stage(
+                    'references', references_key, result,
+                    lambda: self.reference_searcher.search_concept(concept, prompt)
+                )
                 logger.info(f"Found {len(result['references'])} external references")
 
             # Step 2: Analyze proportions for realism
             logger.info("Analyzing real-world proportions...")
-            result['proportions'] = self.proportion_analyzer.analyze_concept(concept)
+            proportions_key = make_stage_key('proportions', concept=concept)
+            result['proportions'] = self._run_stage(
+                'proportions', proportions_key, result,
+                lambda: self.proportion_analyzer.analyze_concept(concept)
+            )
 
             # Step 3: Generate geometry guidance
             logger.info("Generating geometry guidance...")
-            result['geometry_hints'] = self.geometry_handler.analyze_requirements(
-                concept, result['proportions']
+            result['geometry_hints'] = self._run_stage(
+                'geometry_hints',
+                make_stage_key(
+                    'geometry_hints', concept=concept, proportions=proportions_key,
+                    voxel_resolution=self.config.voxel_resolution,
+                    use_procedural=self.config.use_procedural
+                ),
+                result,
+                lambda: self.geometry_handler.analyze_requirements(concept, result['proportions'])
             )
 
             # Step 4: Configure lighting
             logger.info("Configuring lighting...")
-            result['lighting_config'] = self.lighting_engine.configure_from_concept(concept)
+            result['lighting_config'] = self._run_stage(
+                'lighting_config',
+                make_stage_key('lighting_config', concept=concept, style=self.config.style),
+                result,
+                lambda: self.lighting_engine.configure_from_concept(concept)
+            )
 
             # Step 5: Suggest textures based on references
             logger.info("Generating texture suggestions...")
-            result['texture_suggestions'] = self.texture_mapper.suggest_materials(
-                concept, result['references']
+            result['texture_suggestions'] = self._run_stage(
+                'texture_suggestions',
+                make_stage_key('texture_suggestions', concept=concept, references=references_key),
+                result,
+                lambda: self.texture_mapper.suggest_materials(concept, result['references'])
             )
 
             # Step 6: Calculate coherence score
             result['coherence_score'] = self._calculate_coherence(result)
 
-            logger.info(f"VoxelWeaver processing complete. Coherence: {result['coherence_score']:.2f}")
+            slowest = max(result['stage_timings'], key=result['stage_timings'].get)
+            logger.info(
+                f"VoxelWeaver processing complete. Coherence: {result['coherence_score']:.2f}, "
+                f"slowest stage: {slowest} ({result['stage_timings'][slowest]:.3f}s), "
+                f"cached: {result['cached_stages'] or 'none'}"
+            )
 
         except Exception as e:
             logger.error(f"VoxelWeaver processing error: {e}", exc_info=True)
@@ -126,6 +172,36 @@ class VoxelWeaverCore:
 
         return result
 
+    def _run_stage(self, stage: str, key: str, result: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """
+        Run one pipeline stage, reusing a memoized output when its inputs are unchanged.
+
+        Args:
+            stage: Stage name (also the result field it fills)
+            key: Hash of the stage inputs from make_stage_key
+            result: Result being assembled; receives the stage timing and cache status
+            compute: Produces the stage output on a cache miss
+
+        Returns:
+            Stage output
+        """
+        start = time.perf_counter()
+        value = self.stage_cache.get(stage, key) if self.stage_cache else None
+
+        if value is None:
+            value = compute()
+            if self.stage_cache:
+                self.stage_cache.set(stage, key, value)
+        else:
+            result['cached_stages'].append(stage)
+
+        result['stage_timings'][stage] = time.perf_counter() - start
+        return value
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get stage cache statistics (None when memoization is disabled)."""
+        return self.stage_cache.get_stats() if self.stage_cache else None
+
     def validate_generated_scene(self, scene_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate a generated scene for quality and coherence.
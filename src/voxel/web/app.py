@@ -12,6 +12,7 @@ from werkzeug.utils import secure_filename
 
 from voxel import Voxel, Config
 from voxel.core.models import AgentRole
+from voxel.core.shared import shared_component
 from voxel.web.context_handler import ContextHandler
 from voxel.web.session_manager import SessionManager
 from voxel.validation import BlenderScriptValidator
@@ -19,6 +20,12 @@ from voxel.validation import BlenderScriptValidator
 logger = logging.getLogger(__name__)
 
 
+def _preview_iteration(path: Path) -> int:
+    """Iteration number of a preview_iter{N}.png file (-1 for other names)."""
+    suffix = path.stem.rpartition('iter')[2]
+    return int(suffix) if suffix.isdigit() else -1
+
+
 def create_app(config: Optional[Config] = None) -> Flask:
     """
     Create and configure the Flask application.
@@ -63,7 +70,7 @@ def create_app(config: Optional[Config] = None) -> Flask:
     # Initialize managers
     context_handler = ContextHandler(app.config['UPLOAD_FOLDER'])
     session_manager = SessionManager(output_dir=config.output_dir)
-    script_validator = BlenderScriptValidator()
+    script_validator = shared_component("script_validator", BlenderScriptValidator)
 
     # Store in app context
     app.voxel_config = config
@@ -71,6 +78,7 @@ def create_app(config: Optional[Config] = None) -> Flask:
     app.session_manager = session_manager
     app.script_validator = script_validator
     app.socketio = socketio
+    app.active_generations = {}  # session_id -> running Voxel instance
 
     # Allowed file extensions
     ALLOWED_EXTENSIONS = {
@@ -403,6 +411,15 @@ def create_app(config: Optional[Config] = None) -> Flask:
             emit('joined_session', {'session_id': session_id})
         return True
 
+    @socketio.on('reject_preview')
+    def handle_reject_preview(data):
+        """Cancel the final render of a session whose preview was rejected."""
+        session_id = data.get('session_id')
+        voxel = app.active_generations.get(session_id)
+        cancelled = voxel.cancel_render() if voxel is not None else False
+        emit('render_cancelled', {'session_id': session_id, 'cancelled': cancelled})
+        return True
+
     @socketio.on('test_connection')
     def handle_test_connection():
         """Test SocketIO connection."""
@@ -462,6 +479,18 @@ def create_app(config: Optional[Config] = None) -> Flask:
                             mimetype='image/png'
                         )
 
+            elif file_type == 'preview':
+                # Send the requested (or latest) preview render for inline display
+                previews_dir = session_dir / 'previews'
+                iteration = request.args.get('iteration', type=int)
+                if iteration is not None:
+                    previews = [previews_dir / f'preview_iter{iteration}.png']
+                else:
+                    # Order by iteration number: as text, preview_iter9 sorts after preview_iter10
+                    previews = sorted(previews_dir.glob('*.png'), key=_preview_iteration) if previews_dir.exists() else []
+                if previews and previews[-1].exists():
+                    return send_file(previews[-1], mimetype='image/png')
+
             elif file_type == 'scripts':
                 # Send only the complete compiled script (not individual agent scripts)
                 scripts_dir = session_dir / 'scripts'
@@ -604,6 +633,17 @@ def run_generation(app, session_id: str, prompt: str, selected_agents: List[str]
             # Set progress callback
             voxel.set_progress_callback(on_progress)
 
+            # Push fast previews while the final render runs
+            def on_preview(preview_path: Path, iteration: int):
+                app.socketio.emit('preview', {
+                    'session_id': session_id,
+                    'iteration': iteration,
+                    'url': f"/api/download/{session_id}/preview?iteration={iteration}"
+                }, room=session_id)
+
+            voxel.set_preview_callback(on_preview)
+            app.active_generations[session_id] = voxel
+
             # Generate scene
             result = voxel.create_scene(
                 prompt=prompt,
@@ -619,7 +659,8 @@ def run_generation(app, session_id: str, prompt: str, selected_agents: List[str]
                 'success': result.success,
                 'output_path': str(result.output_path) if result.output_path else None,
                 'iterations': result.iterations,
-                'render_time': result.render_time
+                'render_time': result.render_time,
+                'render_cancelled': result.render_cancelled
             }, room=session_id)
 
         except Exception as e:
@@ -631,3 +672,6 @@ def run_generation(app, session_id: str, prompt: str, selected_agents: List[str]
                 'session_id': session_id,
                 'error': str(e)
             }, room=session_id)
+
+        finally:
+            app.active_generations.pop(session_id, None)
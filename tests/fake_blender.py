@@ -0,0 +1,70 @@
+"""
+Stand-in for the Blender binary used to test the worker pool.
+
+Run as ``python fake_blender.py --background --python SCRIPT -- ARGS``; it
+installs a minimal ``bpy`` module and runs SCRIPT the way Blender would.
+"""
+
+import runpy
+import sys
+import types
+from pathlib import Path
+
+
+def _make_bpy() -> types.ModuleType:
+    """Build a fake bpy module that records what jobs did."""
+    bpy = types.ModuleType("bpy")
+    bpy.fake_state = {"resets": 0, "opened": None, "objects": []}
+
+    def read_factory_settings(use_empty=False):
+        bpy.fake_state["resets"] += 1
+        bpy.fake_state["opened"] = None
+        bpy.fake_state["objects"] = []
+
+    def open_mainfile(filepath):
+        bpy.fake_state["opened"] = filepath
+        bpy.fake_state["objects"] = Path(filepath).read_text().splitlines()
+
+    def save_as_mainfile(filepath, check_existing=True):
+        Path(filepath).write_text("\n".join(bpy.fake_state["objects"]))
+
+    def render(write_still=False):
+        Path(bpy.context.scene.render.filepath).write_bytes(b"\x89PNG fake")
+
+    wm = types.SimpleNamespace(
+        read_factory_settings=read_factory_settings,
+        open_mainfile=open_mainfile,
+        save_as_mainfile=save_as_mainfile,
+    )
+    bpy.ops = types.SimpleNamespace(wm=wm, render=types.SimpleNamespace(render=render))
+
+    scene_render = types.SimpleNamespace(
+        filepath="", engine="CYCLES", image_settings=types.SimpleNamespace(file_format="PNG")
+    )
+    scene = types.SimpleNamespace(
+        render=scene_render,
+        cycles=types.SimpleNamespace(samples=128),
+        eevee=types.SimpleNamespace(taa_render_samples=64),
+    )
+    bpy.context = types.SimpleNamespace(scene=scene)
+    return bpy
+
+
+def main() -> None:
+    """Emulate ``blender --background [file.blend] --python SCRIPT``."""
+    args = sys.argv[1:]
+    bpy = _make_bpy()
+    sys.modules["bpy"] = bpy
+
+    cli_args = args[:args.index("--")] if "--" in args else args
+    for arg in cli_args:
+        if arg.endswith(".blend"):
+            bpy.ops.wm.open_mainfile(arg)
+
+    script = cli_args[cli_args.index("--python") + 1]
+    sys.argv = [sys.executable] + args
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -75,3 +75,52 @@ def test_agent_reset(agent_config):
 
     agent.reset()
     assert len(agent.conversation_history) == 0
+
+
+class _FakeTextStream:
+    """Async context manager mimicking anthropic's MessageStream."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def get_final_message(self):
+        return Mock(usage=Mock(input_tokens=12, output_tokens=3))
+
+
+@patch('anthropic.AsyncAnthropic')
+def test_agent_stream_response(mock_async_anthropic, agent_config, monkeypatch):
+    """Test streaming response generation through the async client."""
+    import asyncio
+    from voxel.core.rate_limiter import TokenRateLimiter
+
+    limiter = TokenRateLimiter()
+    monkeypatch.setattr("voxel.core.rate_limiter._rate_limiter", limiter)
+
+    mock_client = Mock()
+    mock_client.messages.stream.return_value = _FakeTextStream(["Test ", "stream"])
+    mock_async_anthropic.return_value = mock_client
+
+    agent = ConceptAgent(agent_config)
+    deltas = []
+
+    response = asyncio.run(
+        agent.agenerate_response("Create a simple scene", on_delta=deltas.append)
+    )
+
+    assert deltas == ["Test ", "stream"]
+    assert response.content == "Test stream"
+    assert response.metadata["time_to_first_token"] <= response.metadata["generation_time"]
+    assert len(agent.conversation_history) == 2
+    assert response.metadata["usage"] == {"input_tokens": 12, "output_tokens": 3}
+    assert limiter.agent_usage["concept"]["output_tokens"] == 3
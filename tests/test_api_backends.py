@@ -0,0 +1,139 @@
+"""Interface tests run against every API database backend.
+
+SQLite always runs. PostgreSQL runs when asyncpg is installed and
+VOXEL_TEST_POSTGRES_DSN points at a server; each test then gets a
+throwaway schema that is dropped afterwards.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("email_validator")
+
+from src.api.database import AsyncDatabaseManager, create_database  # noqa: E402
+
+POSTGRES_DSN = os.getenv("VOXEL_TEST_POSTGRES_DSN")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def run_backend(request, tmp_path):
+    """Run an async scenario against a fresh database on each backend."""
+    if request.param == "sqlite":
+        def run(scenario):
+            async def main():
+                db = create_database(f"sqlite:///{tmp_path / 'voxel.db'}")
+                try:
+                    return await scenario(db)
+                finally:
+                    await db.close()
+            return asyncio.run(main())
+        return run
+
+    asyncpg = pytest.importorskip("asyncpg")
+    if not POSTGRES_DSN:
+        pytest.skip("VOXEL_TEST_POSTGRES_DSN not set")
+
+    def run(scenario):
+        async def main():
+            schema = f"voxel_test_{uuid.uuid4().hex[:12]}"
+            admin = await asyncpg.connect(POSTGRES_DSN)
+            await admin.execute(f"CREATE SCHEMA {schema}")
+            db = create_database(POSTGRES_DSN, server_settings={"search_path": schema})
+            try:
+                return await scenario(db)
+            finally:
+                await db.close()
+                await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+                await admin.close()
+        return asyncio.run(main())
+    return run
+
+
+async def _seed(db):
+    assert await db.create_user("user_0", "u0@example.com", "user0", "hash")
+    for p in range(5):
+        await db.create_project(f"proj_{p}", "user_0", f"Scene {p}", ["texture_synth"], {"mode": "automatic"})
+        await db.add_generated_asset(f"asset_{p}", f"proj_{p}", "render", f"render_{p}.png", "/tmp/x.png", 10)
+
+
+def test_users(run_backend):
+    """Test that users can be created once and looked up by every key."""
+    async def scenario(db):
+        await _seed(db)
+        assert not await db.create_user("user_1", "u0@example.com", "other", "hash")
+        await db.update_user_stats("user_0", generations=2, downloads=1)
+        user = await db.get_user_by_username("user0")
+        assert (user["user_id"], user["total_generations"], user["total_downloads"]) == ("user_0", 2, 1)
+        assert await db.verify_credentials("u0@example.com", "hash") == await db.get_user_by_id("user_0")
+        assert await db.verify_credentials("u0@example.com", "wrong") is None
+
+    run_backend(scenario)
+
+
+def test_projects_stages_and_pages(run_backend):
+    """Test the project lifecycle, stage tracking and keyset pages."""
+    async def scenario(db):
+        await _seed(db)
+        await db.add_generation_stage("proj_4", "build", "processing")
+        await db.update_generation_stage("proj_4", "build", "completed", 1.0, "done")
+        await db.update_project_status("proj_4", "completed", progress=1.0)
+        await db.flush()
+
+        project = await db.get_project("proj_4")
+        assert project.status == "completed" and project.completed_at is not None
+        assert [(s.stage, s.status, s.message) for s in project.stages] == [("build", "completed", "done")]
+        assert [a.name for a in project.assets] == ["render_4.png"]
+        assert project.agents_used == ["texture_synth"]
+
+        first, cursor = await db.list_projects_page("user_0", limit=3)
+        second, end = await db.list_projects_page("user_0", limit=3, cursor=cursor)
+        assert [p.project_id for p in first + second] == [f"proj_{p}" for p in range(4, -1, -1)]
+        assert end is None
+        assert first[0].thumbnail_url == "/api/projects/proj_4/assets/render_4.png"
+        assert await db.count_projects("user_0", status="completed") == 1
+
+        assert await db.delete_project("proj_4")
+        assert await db.get_project("proj_4") is None
+        stats = await db.get_user_statistics("user_0")
+        assert (stats["total_projects"], stats["completed_projects"]) == (4, 0)
+
+    run_backend(scenario)
+
+
+def test_context_files_and_assets(run_backend):
+    """Test context file and asset metadata round trips."""
+    async def scenario(db):
+        await _seed(db)
+        assert await db.save_context_file("file_0", "proj_0", "texture_synth", "ref.png", "/tmp/ref.png", "image", 5)
+        assert (await db.get_context_file("file_0"))["filename"] == "ref.png"
+        assert [f["file_id"] for f in await db.list_context_files("proj_0")] == ["file_0"]
+        assert (await db.get_asset("proj_1", "render_1.png"))["asset_id"] == "asset_1"
+        await db.add_generated_asset("asset_s", "proj_1", "scene", "scene.blend", "/tmp/s.blend", 10, etag='"abc"')
+        assert (await db.get_asset("proj_1", "scene.blend"))["etag"] == '"abc"'
+        assert [a.etag for a in (await db.get_project("proj_1")).assets] == [None, '"abc"']
+        assert await db.get_asset("proj_1", "missing.png") is None
+
+    run_backend(scenario)
+
+
+def test_create_database_selects_backend(tmp_path, monkeypatch):
+    """Test that the database URL picks the backend."""
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "env.db"))
+    db = create_database()
+    assert isinstance(db, AsyncDatabaseManager)
+    assert db.manager.db_path == str(tmp_path / "env.db")
+    db.manager.close()
+
+    with pytest.raises(ValueError):
+        create_database("mysql://localhost/voxel")
+
+    try:
+        import asyncpg  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="asyncpg"):
+            create_database("postgresql://localhost/voxel")
+    else:
+        assert type(create_database("postgresql://localhost/voxel")).__name__ == "PostgresDatabaseManager"
@@ -0,0 +1,342 @@
+"""Tests for the API database layer."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+import pytest
+
+pytest.importorskip("email_validator")
+
+from src.api.database import AsyncDatabaseManager, DatabaseManager  # noqa: E402
+
+
+class _ConnectPerQuery(DatabaseManager):
+    """The previous behaviour: a new connection for every read."""
+
+    @contextmanager
+    def _connection(self):
+        conn = self.pool._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def _seed(db, users=2, projects=30, assets=3):
+    for u in range(users):
+        db.create_user(f"user_{u}", f"u{u}@example.com", f"user{u}", "hash")
+        for p in range(projects):
+            project_id = f"proj_{u}_{p}"
+            db.create_project(project_id, f"user_{u}", f"Scene {p}", ["prompt_interpreter", "texture_synth"], {"mode": "automatic"})
+            db.add_generation_stage(project_id, "concept", "completed", 1.0)
+            for a in range(assets):
+                db.add_generated_asset(
+                    f"asset_{u}_{p}_{a}", project_id, "render" if a else "scene",
+                    f"file_{a}.png", f"/tmp/file_{a}.png", 100,
+                )
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Database manager over a temporary SQLite file."""
+    manager = DatabaseManager(str(tmp_path / "voxel.db"), pool_size=3)
+    yield manager
+    manager.close()
+
+
+def test_connections_are_pooled_in_wal_mode(db):
+    """Test that queries reuse a bounded set of WAL-mode connections."""
+    _seed(db, users=1, projects=5)
+    for _ in range(50):
+        db.get_project("proj_0_1")
+        db.list_projects("user_0")
+
+    stats = db.pool.get_stats()
+    assert stats["connections_opened"] == 1
+    assert stats["acquired"] > 100
+    with db.pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_failed_transactions_roll_back(db):
+    """Test that a failed write rolls back and the connection stays usable."""
+    assert db.create_user("user_a", "a@example.com", "a", "hash")
+    assert not db.create_user("user_b", "a@example.com", "b", "hash")
+
+    with pytest.raises(sqlite3.OperationalError):
+        with db.pool.transaction() as conn:
+            conn.execute("UPDATE users SET username = 'renamed' WHERE user_id = 'user_a'")
+            conn.execute("SELECT * FROM missing_table")
+
+    assert db.get_user_by_id("user_a")["username"] == "a"
+    assert db.get_user_by_id("user_b") is None
+
+
+def test_pool_waits_for_a_free_connection(db):
+    """Test that callers beyond the pool size wait instead of opening more connections."""
+    held = [db.pool.acquire() for _ in range(db.pool.size)]
+    released = threading.Timer(0.05, lambda: [db.pool.release(conn) for conn in held])
+    released.start()
+
+    assert db.get_user_by_id("nobody") is None
+    released.join()
+    stats = db.pool.get_stats()
+    assert stats["open"] == db.pool.size
+    assert stats["waited"] == 1
+
+
+def test_async_facade_keeps_event_loop_responsive(db):
+    """Test that concurrent async queries run off the event loop."""
+    _seed(db, users=1, projects=10)
+    async_db = AsyncDatabaseManager(db)
+
+    async def run():
+        gaps = []
+
+        async def heartbeat(stop):
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        stop = asyncio.Event()
+        beat = asyncio.create_task(heartbeat(stop))
+        results = await asyncio.gather(*(
+            async_db.get_project(f"proj_0_{i % 10}") for i in range(200)
+        ))
+        stop.set()
+        await beat
+        await async_db.close()
+        return results, gaps
+
+    results, gaps = asyncio.run(run())
+    assert [r.project_id for r in results[:10]] == [f"proj_0_{i}" for i in range(10)]
+    assert len(gaps) > 1
+    assert async_db.get_project.__doc__ == DatabaseManager.get_project.__doc__
+
+
+def _trace_statements(db):
+    """Record every statement the (single) pooled connection runs."""
+    statements = []
+    with db.pool.connection() as conn:
+        conn.set_trace_callback(statements.append)
+    return statements
+
+
+def test_get_project_is_a_single_query(db):
+    """Test that a project with its agents, assets and stages loads in one statement."""
+    _seed(db, users=1, projects=2)
+    db.add_generation_stage("proj_0_1", "render", "processing", 0.5, "rendering")
+    db.flush()
+    statements = _trace_statements(db)
+
+    project = db.get_project("proj_0_1")
+
+    assert len(statements) == 1
+    assert project.agents_used == ["prompt_interpreter", "texture_synth"]
+    assert [a.asset_id for a in project.assets] == [f"asset_0_1_{a}" for a in range(3)]
+    assert [(s.stage, s.stage_number, s.total_stages) for s in project.stages] == [
+        ("concept", 1, 2), ("render", 2, 2),
+    ]
+    assert project.settings == {"mode": "automatic"}
+    assert db.get_project("missing") is None
+
+
+def test_project_pages_follow_cursors(db):
+    """Test that keyset pages cover every project once, with counts and thumbnails."""
+    _seed(db, users=1, projects=7)
+    db.create_project("proj_0_empty", "user_0", "Nothing yet", [], {})
+    db.update_project_status("proj_0_3", "completed")
+    statements = _trace_statements(db)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = db.list_projects_page("user_0", limit=3, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert len(statements) == 3
+    assert [p.project_id for p in seen] == ["proj_0_empty"] + [f"proj_0_{p}" for p in range(6, -1, -1)]
+    assert (seen[0].asset_count, seen[0].thumbnail_url) == (0, None)
+    assert seen[1].asset_count == 3
+    assert seen[1].thumbnail_url == "/api/projects/proj_0_6/assets/file_1.png"
+
+    completed, cursor = db.list_projects_page("user_0", status="completed")
+    assert [p.project_id for p in completed] == ["proj_0_3"]
+    assert cursor is None
+
+    with pytest.raises(ValueError):
+        db.list_projects("user_0", cursor="not-a-cursor")
+
+
+@pytest.mark.slow
+def test_concurrent_read_load_benchmark(tmp_path):
+    """Benchmark concurrent get_project/list_projects against a connection per query."""
+    db = DatabaseManager(str(tmp_path / "voxel.db"), pool_size=4)
+    _seed(db, users=4, projects=50)
+    requests = [
+        ("get_project", (f"proj_{i % 4}_{i % 50}",)) if i % 2 else ("list_projects", (f"user_{i % 4}",))
+        for i in range(2000)
+    ]
+
+    async def load(manager):
+        start = time.perf_counter()
+        await asyncio.gather(*(getattr(manager, name)(*args) for name, args in requests))
+        return time.perf_counter() - start
+
+    pooled = asyncio.run(load(AsyncDatabaseManager(db)))
+    unpooled = asyncio.run(load(AsyncDatabaseManager(_ConnectPerQuery(db.db_path, pool_size=4))))
+
+    print(f"\n2000 concurrent reads: pooled {pooled * 1000:.0f}ms, connection per query {unpooled * 1000:.0f}ms")
+    db.close()
+    assert pooled < unpooled
+
+
+def _stage_rows(db, project_id):
+    with db.pool.connection() as conn:
+        return [
+            (row["stage_name"], row["status"], row["progress"], row["message"], row["completed_at"] is not None)
+            for row in conn.execute(
+                "SELECT * FROM generation_stages WHERE project_id = ? ORDER BY stage_id", (project_id,)
+            )
+        ]
+
+
+def _emit_generation(db, project_id, stages=("interpret", "build", "render"), steps=10):
+    db.update_project_status(project_id, "processing")
+    for stage in stages:
+        db.add_generation_stage(project_id, stage, "processing")
+        for step in range(1, steps + 1):
+            db.update_generation_stage(project_id, stage, "processing", step / steps, f"step {step}")
+            db.update_project_status(project_id, "processing", progress=step / steps, current_stage=stage)
+        db.update_generation_stage(project_id, stage, "completed", 1.0)
+
+
+def test_write_behind_coalesces_updates_into_one_transaction(tmp_path):
+    """Test that a generation's updates land in one commit with the same rows as direct writes."""
+    buffered = DatabaseManager(str(tmp_path / "buffered.db"), write_behind_interval=60)
+    direct = DatabaseManager(str(tmp_path / "direct.db"), write_behind_interval=None)
+    for db in (buffered, direct):
+        _seed(db, users=1, projects=1, assets=0)
+        _emit_generation(db, "proj_0_0")
+    buffered.flush()
+    statements = _trace_statements(buffered)
+
+    buffered.update_project_status("proj_0_0", "processing", progress=0.5)
+    buffered.update_generation_stage("proj_0_0", "concept", "failed", 0.5, "retrying")
+    buffered.update_generation_stage("proj_0_0", "concept", "completed", 1.0)
+    buffered.update_project_status("proj_0_0", "completed", progress=1.0)
+
+    assert statements[0] == "BEGIN IMMEDIATE" and statements[-1] == "COMMIT"
+    assert len(statements) == 4  # one UPDATE per project and per stage
+    assert buffered.write_buffer.get_stats()["flushes"] == 2
+
+    direct.update_generation_stage("proj_0_0", "concept", "failed", 0.5, "retrying")
+    direct.update_generation_stage("proj_0_0", "concept", "completed", 1.0)
+    direct.update_project_status("proj_0_0", "completed", progress=1.0)
+    assert _stage_rows(buffered, "proj_0_0") == _stage_rows(direct, "proj_0_0")
+    assert _stage_rows(buffered, "proj_0_0")[0] == ("concept", "completed", 1.0, "retrying", True)
+    project = buffered.get_project("proj_0_0")
+    assert (project.status, project.completed_at is not None) == ("completed", True)
+    buffered.close()
+    direct.close()
+
+
+def test_write_behind_flushes_on_interval_reads_and_close(tmp_path):
+    """Test that buffered updates are written in the background, before reads and on close."""
+    path = str(tmp_path / "voxel.db")
+    db = DatabaseManager(path, write_behind_interval=0.05)
+    _seed(db, users=1, projects=2, assets=0)
+    db.flush()
+
+    db.add_generation_stage("proj_0_0", "build", "processing")
+    assert [s.stage for s in db.get_project("proj_0_0").stages] == ["concept", "build"]
+
+    db.update_project_status("proj_0_1", "processing", progress=0.25)
+    deadline = time.monotonic() + 5
+    while db.write_buffer.has_pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not db.write_buffer.has_pending()
+
+    db.update_project_status("proj_0_1", "processing", progress=0.75)
+    db.close()
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute("SELECT progress FROM projects WHERE project_id = 'proj_0_1'").fetchone() == (0.75,)
+
+
+def test_write_behind_keeps_batch_when_flush_fails(tmp_path):
+    """Test that a failed flush keeps its writes, ordered before updates made meanwhile."""
+    buffered = DatabaseManager(str(tmp_path / "buffered.db"), write_behind_interval=60)
+    direct = DatabaseManager(str(tmp_path / "direct.db"), write_behind_interval=None)
+    for db in (buffered, direct):
+        _seed(db, users=1, projects=1, assets=0)
+    buffered.flush()
+
+    def later_updates(db):
+        db.update_generation_stage("proj_0_0", "build", "completed", 1.0, "built")
+        db.update_project_status("proj_0_0", "processing", progress=0.5)
+        db.add_generation_stage("proj_0_0", "render", "processing")
+
+    @contextmanager
+    def failing_transaction():
+        with buffered.pool.transaction() as conn:
+            yield conn
+            later_updates(buffered)  # arrive while the batch is in flight
+            raise sqlite3.OperationalError("database is locked")
+
+    for db in (buffered, direct):
+        db.update_project_status("proj_0_0", "processing", progress=0.25, current_stage="build")
+        db.add_generation_stage("proj_0_0", "build", "processing")
+    buffered.write_buffer._transaction = failing_transaction
+    with pytest.raises(sqlite3.OperationalError):
+        buffered.flush()
+    later_updates(direct)
+
+    assert buffered.write_buffer.has_pending("proj_0_0")
+    assert buffered.write_buffer.get_stats()["failed_flushes"] == 1
+    buffered.write_buffer._transaction = buffered.pool.transaction
+    assert buffered.get_project("proj_0_0").status == "processing"
+    assert _stage_rows(buffered, "proj_0_0") == _stage_rows(direct, "proj_0_0")
+    assert [s[0] for s in _stage_rows(buffered, "proj_0_0")] == ["concept", "build", "render"]
+    buffered.close()
+    direct.close()
+
+
+def test_write_behind_reads_wait_for_in_flight_flush(tmp_path):
+    """Test that a read overlapping a flush sees the writes being flushed."""
+    db = DatabaseManager(str(tmp_path / "voxel.db"), write_behind_interval=60)
+    _seed(db, users=1, projects=1, assets=0)
+    db.flush()
+    started, release = threading.Event(), threading.Event()
+
+    @contextmanager
+    def slow_transaction():
+        with db.pool.transaction() as conn:
+            started.set()
+            release.wait(5)
+            yield conn
+
+    db.write_buffer._transaction = slow_transaction
+    db.update_project_status("proj_0_0", "processing")
+    flusher = threading.Thread(target=db.flush)
+    flusher.start()
+    assert started.wait(5)
+
+    statuses = []
+    reader = threading.Thread(target=lambda: statuses.append(db.get_project("proj_0_0").status))
+    reader.start()
+    reader.join(0.1)
+    assert reader.is_alive()  # waiting for the in-flight batch
+
+    release.set()
+    flusher.join()
+    reader.join()
+    assert statuses == ["processing"]
+    db.close()
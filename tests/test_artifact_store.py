@@ -0,0 +1,62 @@
+"""Tests for the Blender artifact store."""
+
+from src.voxel.blender.artifact_store import ArtifactKey, ArtifactStore
+
+
+def _make_job(directory, blend="blend", image=b"png"):
+    directory.mkdir(parents=True, exist_ok=True)
+    blend_file = directory / "scene.blend"
+    image_file = directory / "render.png"
+    blend_file.write_text(blend)
+    image_file.write_bytes(image)
+    return blend_file, image_file
+
+
+def test_identical_job_reused_via_hardlink(tmp_path):
+    """Test that a stored job is linked into a new session."""
+    store = ArtifactStore(tmp_path / "store")
+    key = ArtifactKey("abc", "CYCLES", 128)
+    blend_file, image_file = _make_job(tmp_path / "session1")
+
+    target_blend = tmp_path / "session2" / "scene.blend"
+    target_image = tmp_path / "session2" / "renders" / "render_iter1.png"
+    assert store.fetch(key, target_blend, target_image) is False
+
+    store.store(key, blend_file, image_file)
+    assert store.fetch(key, target_blend, target_image) is True
+
+    assert target_blend.read_text() == "blend"
+    assert target_image.stat().st_ino == image_file.stat().st_ino
+
+    stats = store.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["stores"] == 1
+    assert stats["bytes_reused"] == len("blend") + len(b"png")
+
+
+def test_render_settings_are_part_of_key(tmp_path):
+    """Test that different engines, samples or resolutions do not share artifacts."""
+    store = ArtifactStore(tmp_path / "store")
+    store.store(ArtifactKey("abc", "CYCLES", 128), *_make_job(tmp_path / "job"))
+
+    for key in (
+        ArtifactKey("abc", "EEVEE", 128),
+        ArtifactKey("abc", "CYCLES", 64),
+        ArtifactKey("abc", "CYCLES", 128, resolution_percentage=50),
+        ArtifactKey("def", "CYCLES", 128),
+    ):
+        assert store.fetch(key, tmp_path / "out.blend", tmp_path / "out.png") is False
+
+
+def test_store_keeps_first_entry(tmp_path):
+    """Test that storing an existing key leaves the original artifacts."""
+    store = ArtifactStore(tmp_path / "store")
+    key = ArtifactKey("abc", "CYCLES", 128)
+    store.store(key, *_make_job(tmp_path / "first", blend="first"))
+    store.store(key, *_make_job(tmp_path / "second", blend="second"))
+
+    assert store.fetch(key, tmp_path / "out.blend", tmp_path / "out.png")
+    assert (tmp_path / "out.blend").read_text() == "first"
+    assert store.get_stats()["stores"] == 1
+    assert not list((tmp_path / "store").glob(".tmp-*"))
@@ -71,3 +71,103 @@ def test_execute_script_failure(mock_run, mock_exists, mock_config):
 
     assert result.success is False
     assert "Error in script" in result.stderr
+
+
+@pytest.fixture
+def fake_blender_config(tmp_path):
+    """Create a config whose Blender binary is the fake Blender stand-in."""
+    import sys
+
+    fake_blender = Path(__file__).with_name("fake_blender.py")
+    launcher = tmp_path / "blender"
+    launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{fake_blender}" "$@"\n')
+    launcher.chmod(0o755)
+
+    config = Mock(spec=Config)
+    config.blender_path = launcher
+    return config
+
+
+def _build_script(tmp_path: Path) -> Path:
+    script = tmp_path / "scene.py"
+    script.write_text(
+        "import bpy\n"
+        "bpy.fake_state['objects'].append('Cube')\n"
+        "print('Fra:1 Mem:10M | Sample 1/4')\n"
+    )
+    return script
+
+
+def test_build_and_render_single_pass_streams_progress(fake_blender_config, tmp_path):
+    """Test that one Blender process builds, saves and renders the scene."""
+    executor = BlenderExecutor(fake_blender_config)
+    blend_file = tmp_path / "scene.blend"
+    output_image = tmp_path / "renders" / "render.png"
+    progress = []
+
+    result = executor.execute_build_and_render(
+        _build_script(tmp_path), blend_file, output_image, samples=4, on_progress=progress.append
+    )
+
+    assert result.success is True
+    assert blend_file.read_text() == "Cube"
+    assert output_image.exists()
+    assert progress[0] == "Fra:1 Mem:10M | Sample 1/4"
+    assert any(line.startswith("Render complete") for line in progress)
+    assert not list(tmp_path.glob("temp_pass_*"))
+
+
+def test_build_and_render_single_pass_in_worker_pool(fake_blender_config, tmp_path):
+    """Test that the single-pass mode runs as one job in the warm worker pool."""
+    fake_blender_config.blender_worker_pool = True
+    fake_blender_config.blender_pool_size = 1
+    fake_blender_config.blender_worker_max_jobs = 5
+    executor = BlenderExecutor(fake_blender_config)
+    blend_file = tmp_path / "scene.blend"
+    output_image = tmp_path / "render.png"
+
+    try:
+        result = executor.execute_build_and_render(
+            _build_script(tmp_path), blend_file, output_image
+        )
+        stats = executor.get_pool_stats()
+    finally:
+        executor.shutdown()
+
+    assert result.success is True
+    assert blend_file.exists() and output_image.exists()
+    assert stats["jobs"] == 1
+
+
+def test_build_and_render_reports_missing_render(fake_blender_config, tmp_path):
+    """Test that a script error fails the single-pass run."""
+    executor = BlenderExecutor(fake_blender_config)
+    script = tmp_path / "broken.py"
+    script.write_text("raise RuntimeError('bad scene')\n")
+
+    result = executor.execute_build_and_render(
+        script, tmp_path / "scene.blend", tmp_path / "render.png"
+    )
+
+    assert result.success is False
+    assert "bad scene" in result.stderr
+
+
+def test_cancel_event_kills_blender_process(fake_blender_config):
+    """Test that setting the cancel event stops a running Blender process."""
+    import sys
+    import threading
+    import time
+
+    executor = BlenderExecutor(fake_blender_config)
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+
+    start = time.monotonic()
+    returncode, _, stderr = executor._run_process(
+        [sys.executable, "-c", "import time; time.sleep(30)"], None, 60, cancel_event=cancel_event
+    )
+
+    assert returncode is None
+    assert "cancelled" in stderr
+    assert time.monotonic() - start < 5
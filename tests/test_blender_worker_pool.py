@@ -0,0 +1,138 @@
+"""Tests for the warm Blender worker pool."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from src.voxel.blender.worker_pool import BlenderWorkerPool
+
+FAKE_BLENDER = [sys.executable, str(Path(__file__).with_name("fake_blender.py"))]
+
+
+@pytest.fixture
+def pool():
+    """Create a pool backed by the fake Blender binary."""
+    pool = BlenderWorkerPool(FAKE_BLENDER, size=1, max_jobs_per_worker=3, startup_timeout=20)
+    yield pool
+    pool.shutdown()
+
+
+def _script(tmp_path: Path, name: str, body: str) -> Path:
+    path = tmp_path / f"{name}.py"
+    path.write_text(body)
+    return path
+
+
+def test_worker_is_reused_and_reset(pool, tmp_path):
+    """Test that consecutive jobs share a process and start from a clean scene."""
+    script = _script(
+        tmp_path,
+        "probe",
+        "import bpy, os\n"
+        "bpy.fake_state['objects'].append('Cube')\n"
+        "print(os.getpid(), len(bpy.fake_state['objects']), bpy.fake_state['resets'])\n",
+    )
+
+    first = pool.run_job(script)
+    second = pool.run_job(script)
+
+    assert first.success and second.success
+    pid1, count1, resets1 = first.stdout.split()
+    pid2, count2, resets2 = second.stdout.split()
+    assert pid1 == pid2
+    assert count1 == count2 == "1"
+    assert int(resets2) == int(resets1) + 1
+    assert pool.get_stats()["workers_started"] == 1
+
+
+def test_worker_recycled_after_max_jobs(pool, tmp_path):
+    """Test that workers are replaced after max_jobs_per_worker jobs."""
+    script = _script(tmp_path, "pid", "import os\nprint(os.getpid())\n")
+
+    pids = [pool.run_job(script).stdout.strip() for _ in range(4)]
+
+    assert len(set(pids[:3])) == 1
+    assert pids[3] != pids[0]
+    assert pool.get_stats()["workers_recycled"] == 1
+
+
+def test_script_error_reported(pool, tmp_path):
+    """Test that exceptions in a script fail the job but keep the worker."""
+    bad = _script(tmp_path, "bad", "raise ValueError('broken geometry')\n")
+    good = _script(tmp_path, "good", "print('ok')\n")
+
+    result = pool.run_job(bad)
+    assert result.success is False
+    assert "broken geometry" in result.stderr
+
+    assert pool.run_job(good).success is True
+    assert pool.get_stats()["workers_started"] == 1
+
+
+def test_crashed_worker_replaced(pool, tmp_path):
+    """Test that a worker that dies mid-job is replaced for the next job."""
+    crash = _script(tmp_path, "crash", "import os\nos._exit(1)\n")
+    good = _script(tmp_path, "good", "print('ok')\n")
+
+    assert pool.run_job(crash).success is False
+    assert pool.run_job(good).success is True
+
+    stats = pool.get_stats()
+    assert stats["workers_crashed"] == 1
+    assert stats["workers_started"] == 2
+
+
+def test_timeout_kills_worker(pool, tmp_path):
+    """Test that a hung job times out and its worker is replaced."""
+    hang = _script(tmp_path, "hang", "import time\ntime.sleep(30)\n")
+
+    result = pool.run_job(hang, timeout=0.5)
+
+    assert result.success is False
+    assert "timed out" in result.stderr
+    assert pool.get_stats()["live_workers"] == 0
+
+
+def test_save_and_render_jobs(pool, tmp_path):
+    """Test saving a .blend and rendering it in later jobs."""
+    build = _script(tmp_path, "build", "import bpy\nbpy.fake_state['objects'].append('Cube')\n")
+    blend_file = tmp_path / "scene.blend"
+    output = tmp_path / "render.png"
+    render = _script(
+        tmp_path,
+        "render",
+        "import bpy\n"
+        f"bpy.context.scene.render.filepath = {str(output)!r}\n"
+        "bpy.ops.render.render(write_still=True)\n"
+        "print(bpy.fake_state['objects'])\n",
+    )
+
+    assert pool.run_job(build, save_as=blend_file).success
+    assert blend_file.read_text() == "Cube"
+
+    result = pool.run_job(render, open_blend=blend_file)
+    assert result.success
+    assert output.exists()
+    assert "Cube" in result.stdout
+
+
+def test_missing_blend_output_is_failure(pool, tmp_path):
+    """Test that save jobs fail if no .blend file was written."""
+    script = _script(tmp_path, "noop", "pass\n")
+    blend_file = tmp_path / "missing" / "scene.blend"
+
+    result = pool.run_job(script, save_as=blend_file)
+
+    assert result.success is False
+
+
+def test_startup_failure_reported(tmp_path):
+    """Test that a Blender binary that never connects yields a failed result."""
+    pool = BlenderWorkerPool([sys.executable, "-c", "pass"], startup_timeout=2)
+    script = _script(tmp_path, "noop", "pass\n")
+
+    result = pool.run_job(script)
+
+    assert result.success is False
+    assert "did not connect" in result.stderr
+    pool.shutdown()
@@ -0,0 +1,64 @@
+"""Tests for the shared concept keyword analysis."""
+
+import random
+
+from src.voxel.voxelweaver.concept_features import ConceptAnalyzer, KeywordAutomaton
+from src.voxel.voxelweaver.lighting_engine import LightingEngine
+from src.voxel.voxelweaver.voxelweaver_core import VoxelWeaverConfig, VoxelWeaverCore
+
+CONCEPT = (
+    "A cozy reading room at sunset: a wooden chair beside a small table with a red lamp, "
+    "a bookshelf, and a sleeping cat. The chair is 1.1m tall. Warm, inviting light."
+)
+
+
+def test_automaton_matches_substring_semantics():
+    """Test that matches and first positions agree with str.find for overlapping keywords."""
+    rng = random.Random(5)
+    for _ in range(200):
+        keywords = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(12)}
+        text = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 80)))
+
+        found = KeywordAutomaton(keywords).first_positions(text)
+
+        assert found == {k: text.find(k) for k in keywords if k in text}
+
+
+def test_unregistered_keywords_fall_back_to_substring():
+    """Test that features answer correctly for keywords outside the vocabulary."""
+    analyzer = ConceptAnalyzer()
+    analyzer.register(["chair"])
+    features = analyzer.analyze("A Chair by the Window")
+
+    assert features.has("chair") and features.has("window")
+    assert not features.has("table")
+    assert features.present(["table", "window", "chair"]) == ["window", "chair"]
+    assert features.position("window") == features.text.find("window")
+
+
+def test_process_scene_concept_scans_once(monkeypatch):
+    """Test that all VoxelWeaver components share a single concept scan."""
+    analyzer = ConceptAnalyzer()
+    monkeypatch.setattr("voxel.voxelweaver.concept_features._concept_analyzer", analyzer)
+    monkeypatch.setattr("src.voxel.voxelweaver.concept_features._concept_analyzer", analyzer)
+    core = VoxelWeaverCore(VoxelWeaverConfig())
+
+    result = core.process_scene_concept(CONCEPT, "cozy reading room")
+
+    assert analyzer.scans == 1
+    assert result["lighting_config"]["time_of_day"] == "sunset"
+    assert result["lighting_config"]["mood"] == "bright"
+    checks = {c["object_name"]: c for c in result["proportions"]["proportion_checks"]}
+    assert checks["chair"]["estimated_size"]["height"] == 1.1
+    assert {"chair", "table"} <= set(core.geometry_handler._extract_objects(CONCEPT))
+
+
+def test_lighting_keyword_priority():
+    """Test that environment and mood keywords keep their original precedence."""
+    engine = LightingEngine()
+
+    config = engine.configure_from_concept("A dark forest studio shoot at midnight")
+
+    assert config["environment"] == "outdoor"
+    assert config["time_of_day"] == "night"
+    assert config["mood"] == "dramatic"
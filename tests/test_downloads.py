@@ -0,0 +1,159 @@
+"""Tests for streaming downloads with range and conditional requests."""
+
+import asyncio
+import os
+
+import pytest
+
+from src.api.downloads import FileDownload, compute_etag, parse_range
+from src.api.storage import StorageManager
+
+CONTENT = bytes(range(256)) * 4096  # 1 MiB
+
+
+@pytest.fixture
+def download(tmp_path):
+    """A 1 MiB .blend file ready to serve."""
+    path = tmp_path / "scene.blend"
+    path.write_bytes(CONTENT)
+    return FileDownload.from_path(path, filename="scene.blend")
+
+
+def test_parse_range():
+    """Test single byte ranges, suffixes, and ranges to ignore or reject."""
+    assert parse_range("bytes=0-99", 1000) == (0, 100)
+    assert parse_range("bytes=900-", 1000) == (900, 100)
+    assert parse_range("bytes=-100", 1000) == (900, 100)
+    assert parse_range("bytes=990-2000", 1000) == (990, 10)
+    assert parse_range("bytes=0-1,5-9", 1000) is None
+    assert parse_range("bytes=5-1", 1000) is None
+    assert parse_range("items=0-1", 1000) is None
+    assert parse_range("bytes=a-b", 1000) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=1000-", 1000)
+    with pytest.raises(ValueError):
+        parse_range("bytes=-0", 1000)
+
+
+def test_full_and_partial_plans(download):
+    """Test 200 and 206 responses with validators and content ranges."""
+    full = download.plan("GET", {})
+    assert (full.status, full.offset, full.length) == (200, 0, len(CONTENT))
+    assert full.headers["etag"] == compute_etag(download.path)
+    assert full.headers["content-type"] == "application/x-blender"
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-disposition"] == 'attachment; filename="scene.blend"'
+
+    partial = download.plan("GET", {"range": "bytes=1000-"})
+    assert (partial.status, partial.offset, partial.length) == (206, 1000, len(CONTENT) - 1000)
+    assert partial.headers["content-range"] == f"bytes 1000-{len(CONTENT) - 1}/{len(CONTENT)}"
+
+    assert download.plan("HEAD", {"range": "bytes=0-9"}).status == 200
+    unsatisfiable = download.plan("GET", {"range": f"bytes={len(CONTENT)}-"})
+    assert unsatisfiable.status == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_conditional_requests(download):
+    """Test If-None-Match, If-Modified-Since and If-Range."""
+    etag = download.etag
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        plan = download.plan("GET", {"if-none-match": header})
+        assert (plan.status, plan.length) == (304, 0)
+        assert plan.headers["etag"] == etag
+    assert download.plan("GET", {"if-none-match": '"other"'}).status == 200
+
+    assert download.plan("GET", {"if-modified-since": download.last_modified}).status == 304
+    assert download.plan("GET", {"if-modified-since": "Thu, 01 Jan 1970 00:00:00 GMT"}).status == 200
+    # If-None-Match takes precedence over If-Modified-Since
+    assert download.plan("GET", {"if-none-match": '"other"', "if-modified-since": download.last_modified}).status == 200
+
+    resume = {"range": "bytes=100-", "if-range": etag}
+    assert download.plan("GET", resume).status == 206
+    assert download.plan("GET", {**resume, "if-range": f"W/{etag}"}).status == 200
+    assert download.plan("GET", {**resume, "if-range": '"stale"'}).status == 200
+    assert download.plan("GET", {**resume, "if-range": download.last_modified}).status == 206
+
+
+def test_storage_records_etags_when_files_are_written(tmp_path, monkeypatch):
+    """Test that written files carry ETags that later downloads reuse without rehashing."""
+    storage = StorageManager(str(tmp_path / "storage"))
+    metadata = storage.save_project_output("proj_1", "scene.blend", CONTENT, asset_type="scene")
+    assert metadata["etag"] == compute_etag(metadata["file_path"])
+
+    hashed = []
+    monkeypatch.setattr("src.api.storage.compute_etag", lambda path: hashed.append(path) or '"fresh"')
+    download = storage.get_download(metadata["file_path"])
+    assert download.etag == metadata["etag"]
+    assert hashed == []
+
+    # Another process only knows the ETag recorded in the database
+    replica = StorageManager(str(tmp_path / "storage"))
+    assert replica.get_etag(metadata["file_path"], metadata["etag"], "2999-01-01T00:00:00") == metadata["etag"]
+    stale = StorageManager(str(tmp_path / "storage"))
+    assert stale.get_etag(metadata["file_path"], metadata["etag"], "2000-01-01T00:00:00") == '"fresh"'
+    assert len(hashed) == 1
+
+    with open(metadata["file_path"], "ab") as f:
+        f.write(b"more")
+    assert storage.get_etag(metadata["file_path"]) == '"fresh"'
+    assert storage.get_download(str(tmp_path / "missing.blend")) is None
+
+
+def _serve(download, headers=(), extensions=None, method="GET"):
+    """Run a FileDownloadResponse as an ASGI app and collect what it sends."""
+    from src.api.responses import FileDownloadResponse
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "asgi": {"spec_version": "2.4"},
+        "extensions": extensions or {},
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message = {**message, "file": os.fstat(message["file"].fileno()).st_size}
+        messages.append(message)
+
+    asyncio.run(FileDownloadResponse(download)(scope, receive, send))
+    start, body = messages[0], messages[1:]
+    return start["status"], dict((k.decode(), v.decode()) for k, v in start["headers"]), body
+
+
+def test_response_streams_ranges_in_chunks(download):
+    """Test that the fallback transfer streams only the requested bytes."""
+    pytest.importorskip("starlette")
+
+    status, headers, body = _serve(download, [("range", "bytes=100-300099")])
+    assert status == 206
+    assert headers["content-length"] == "300000"
+    assert len(body) == 2  # 256 KiB chunks
+    assert b"".join(m["body"] for m in body) == CONTENT[100:300100]
+    assert [m["more_body"] for m in body] == [True, False]
+
+    status, _, body = _serve(download, [("if-none-match", download.etag)])
+    assert status == 304
+    assert body == [{"type": "http.response.body", "body": b"", "more_body": False}]
+
+    status, headers, body = _serve(download, method="HEAD")
+    assert (status, headers["content-length"], body[0]["body"]) == (200, str(len(CONTENT)), b"")
+
+
+def test_response_uses_server_sendfile(download):
+    """Test that servers offering zero-copy send get the file and span to sendfile."""
+    pytest.importorskip("starlette")
+
+    status, _, body = _serve(download, [("range", "bytes=-10")], {"http.response.zerocopysend": {}})
+    assert status == 206
+    assert body == [{
+        "type": "http.response.zerocopysend", "file": len(CONTENT), "offset": len(CONTENT) - 10, "count": 10,
+    }]
+
+    _, _, body = _serve(download, extensions={"http.response.pathsend": {}})
+    assert body == [{"type": "http.response.pathsend", "path": str(download.path)}]
@@ -0,0 +1,111 @@
+"""Tests for compiled, cached material code generation."""
+
+import ast
+
+import pytest
+from src.voxel.voxelweaver.advanced_texture_catalog import AdvancedTextureCatalog
+from src.voxel.voxelweaver.enhanced_texture_mapper import (
+    EnhancedTextureMapper,
+    EnvironmentType,
+)
+from src.voxel.voxelweaver.material_codegen import CodeTemplate, TemplateCache
+
+
+@pytest.fixture
+def mapper():
+    """Mapper over a private catalog so cache stats start at zero."""
+    mapper = EnhancedTextureMapper()
+    mapper.catalog = AdvancedTextureCatalog()
+    return mapper
+
+
+def _suggestions(mapper):
+    return mapper.suggest_materials_advanced(
+        "a wooden chair and a neon lamp in a chrome room", EnvironmentType.NIGHT
+    )
+
+
+def test_template_binding_and_helpers():
+    """Test that placeholders bind to literals and become helper parameters."""
+    template = CodeTemplate(["x = $value", "print('cost: $$5', $value)"], ["value"])
+
+    assert template.bind({"value": (1.0, 0.5)}) == "x = (1.0, 0.5)\nprint('cost: $5', (1.0, 0.5))"
+    assert template.as_function("build") == "def build(value):\n    x = value\n    print('cost: $5', value)"
+    assert template.call("build", {"value": "a'b"}) == "build(value=\"a'b\")"
+
+    with pytest.raises(ValueError):
+        CodeTemplate(["x = $missing"], ["value"])
+
+
+def test_templates_compile_once_and_snippets_are_cached():
+    """Test that a template compiles once and repeated values hit the snippet cache."""
+    cache = TemplateCache(max_snippets=2)
+    compiles = []
+
+    def compile_template():
+        compiles.append(1)
+        return CodeTemplate(["x = $value"], ["value"])
+
+    assert cache.render("t", compile_template, {"value": 1}) == "x = 1"
+    assert cache.render("t", compile_template, {"value": 1}) == "x = 1"
+    assert cache.render("t", compile_template, {"value": 2}) == "x = 2"
+    cache.render("t", compile_template, {"value": 3})
+    assert cache.bind("t", cache.template("t", compile_template), {"value": 3}) == "x = 3"
+
+    stats = cache.get_stats()
+    assert len(compiles) == 1
+    assert stats["snippet_hits"] == 2
+    assert stats["snippet_misses"] == 3
+    assert stats["snippets"] == 2
+
+
+def test_catalog_code_is_cached_per_preset():
+    """Test that catalog code is valid Python and reuses the compiled template."""
+    catalog = AdvancedTextureCatalog()
+    oak = catalog.get_material_preset("oak_wood")
+
+    first = catalog.generate_blender_material_code(oak)
+    second = catalog.generate_blender_material_code(oak)
+    ast.parse(first)
+    assert first == second
+    assert "name='Oak Wood'" in first
+
+    oak.roughness = 0.25
+    third = catalog.generate_blender_material_code(oak)
+    assert "bsdf.inputs['Roughness'].default_value = 0.25" in third
+
+    stats = catalog._code_templates.get_stats()
+    assert stats["compiles"] == 1
+    assert stats["snippet_hits"] == 1
+
+
+def test_mapper_code_matches_between_inline_and_helper_scripts(mapper):
+    """Test that inline and helper scripts are valid and set the same values."""
+    suggestions = _suggestions(mapper)
+    inline = mapper.generate_material_blend_code(suggestions[0], "Chair")
+    ast.parse(inline)
+    assert "obj = bpy.data.objects['Chair']" in inline
+
+    assignments = [("Chair", suggestions[0]), ("Table", suggestions[0]), ("Lamp", suggestions[1])]
+    shared = mapper.generate_materials_script(assignments)
+    separate = mapper.generate_materials_script(assignments, shared_helpers=False)
+    ast.parse(shared)
+    ast.parse(separate)
+
+    helpers = [line for line in shared.splitlines() if line.startswith("def build_")]
+    assert len(helpers) == len({s.material_name for _, s in assignments})
+    for object_name, _ in assignments:
+        assert f"object_name={object_name!r}" in shared
+        assert f"obj = bpy.data.objects[{object_name!r}]" in separate
+    assert separate.count("import bpy") == 1
+    assert mapper.get_catalog_statistics()["code_templates"]["compiles"] == len(helpers)
+
+
+def test_custom_parameters_with_dollar_signs(mapper):
+    """Test that literal '$' in preset parameters survives templating."""
+    suggestion = _suggestions(mapper)[0]
+    suggestion.custom_parameters = {"label": "$price"}
+
+    code = mapper.generate_material_blend_code(suggestion, "Chair")
+    ast.parse(code)
+    assert "'label': '$price'" in code
@@ -0,0 +1,115 @@
+"""Tests for batch-scored material suggestions."""
+
+import random
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.voxel.voxelweaver.advanced_texture_catalog import (  # noqa: E402
+    AdvancedTextureCatalog,
+    MaterialCategory,
+)
+from src.voxel.voxelweaver.enhanced_texture_mapper import (  # noqa: E402
+    EnhancedTextureMapper,
+    EnvironmentType,
+    MaterialComplexity,
+)
+
+CONCEPTS = [
+    "A cozy wooden cabin with a desk lamp and an old chair",
+    "Chrome sports car under neon lights in a rainy street",
+    "Minimal studio with a metal table and a glowing computer screen",
+    "A quiet garden with a tree, flowers and a stone wall",
+]
+
+
+def _grow_catalog(catalog, count, seed=7):
+    """Add count randomized copies of the built-in presets."""
+    rng = random.Random(seed)
+    bases = list(catalog.material_presets)
+    environments = ["indoor", "outdoor", "studio", "night"]
+    for i in range(count):
+        base = bases[i % len(bases)]
+        preset = catalog.generate_custom_material(base, {
+            "complexity_score": round(rng.uniform(0.2, 1.0), 2),
+        })
+        preset.category = rng.choice(list(MaterialCategory))
+        preset.environment_adaptation = {env: round(rng.uniform(0.3, 1.6), 1) for env in environments}
+        catalog.material_presets[f"generated_{i}"] = preset
+
+
+def _suggest_both(mapper, monkeypatch, *args, **kwargs):
+    batch = mapper.suggest_materials_advanced(*args, **kwargs)
+    with monkeypatch.context() as m:
+        m.setattr("src.voxel.voxelweaver.enhanced_texture_mapper.PresetMatrix", None)
+        scalar = mapper.suggest_materials_advanced(*args, **kwargs)
+    return batch, scalar
+
+
+@pytest.mark.parametrize("environment", list(EnvironmentType)[:5])
+@pytest.mark.parametrize("complexity", list(MaterialComplexity))
+def test_batch_scoring_matches_scalar(environment, complexity, monkeypatch):
+    """Test that batch scoring returns exactly the per-pair loop's suggestions."""
+    mapper = EnhancedTextureMapper()
+    mapper.catalog = AdvancedTextureCatalog()
+    _grow_catalog(mapper.catalog, 200)
+
+    for concept in CONCEPTS:
+        batch, scalar = _suggest_both(mapper, monkeypatch, concept, environment, complexity)
+        assert batch == scalar
+
+
+def test_explicit_object_types_and_catalog_changes(monkeypatch):
+    """Test explicit (unknown) object types and that catalog changes rebuild the matrix."""
+    mapper = EnhancedTextureMapper()
+    mapper.catalog = AdvancedTextureCatalog()
+
+    batch, scalar = _suggest_both(
+        mapper, monkeypatch, CONCEPTS[1], EnvironmentType.NIGHT,
+        object_types=["lighting", "vehicle", "spaceship"]
+    )
+    assert batch == scalar
+    assert batch[0].material_name == "Neon Blue"
+
+    _grow_catalog(mapper.catalog, 50, seed=11)
+    batch, scalar = _suggest_both(mapper, monkeypatch, CONCEPTS[1], EnvironmentType.NIGHT)
+    assert batch == scalar
+    assert len(mapper._get_preset_matrix()) == len(mapper.catalog.material_presets)
+
+
+def test_scoring_only_builds_suggested_presets():
+    """Test that scoring reads registration metadata and builds only the suggested presets."""
+    mapper = EnhancedTextureMapper()
+    mapper.catalog = AdvancedTextureCatalog()
+
+    suggestions = mapper.suggest_materials_advanced("a neon lamp")
+
+    registry = mapper.catalog.material_presets
+    assert suggestions[0].material_name == "Neon Blue"
+    assert registry.built_count == len({s.material_name for s in suggestions}) < len(registry)
+    assert not registry.is_built("oak_wood")
+
+
+@pytest.mark.slow
+def test_batch_scoring_scales_with_catalog_size(monkeypatch):
+    """Benchmark suggestion time for a catalog grown to thousands of presets."""
+    mapper = EnhancedTextureMapper()
+    mapper.catalog = AdvancedTextureCatalog()
+    _grow_catalog(mapper.catalog, 5000)
+    concept = CONCEPTS[2]
+    mapper.suggest_materials_advanced(concept)  # build the matrix
+
+    start = time.perf_counter()
+    batch = mapper.suggest_materials_advanced(concept)
+    batch_time = time.perf_counter() - start
+
+    monkeypatch.setattr("src.voxel.voxelweaver.enhanced_texture_mapper.PresetMatrix", None)
+    start = time.perf_counter()
+    scalar = mapper.suggest_materials_advanced(concept)
+    scalar_time = time.perf_counter() - start
+
+    print(f"\n5k presets: batch {batch_time * 1000:.1f}ms, scalar {scalar_time * 1000:.1f}ms")
+    assert batch == scalar
+    assert batch_time < scalar_time
@@ -0,0 +1,110 @@
+"""Tests for the LRU performance cache."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from src.voxel.core.performance import PerformanceCache, PerformanceOptimizer
+
+
+def test_lru_eviction_order():
+    """Test that the least recently used entry is evicted first."""
+    cache = PerformanceCache(max_size=3)
+    for key in ("a", "b", "c"):
+        cache.set_sync(key, key.upper())
+
+    # Touch "a" so "b" becomes the least recently used entry
+    assert cache.get_sync("a") == "A"
+    cache.set_sync("d", "D")
+
+    assert cache.get_sync("b") is None
+    assert cache.keys() == ["c", "a", "d"]
+    assert cache.get_cache_stats()["evictions"] == 1
+
+
+def test_lazy_ttl_expiry():
+    """Test that expired entries are dropped when read."""
+    cache = PerformanceCache(max_size=10, default_ttl=60)
+    cache.set_sync("short", 1, ttl=0)
+    cache.set_sync("long", 2)
+
+    assert cache.get_sync("short") is None
+    assert cache.get_sync("long") == 2
+
+    stats = cache.get_cache_stats()
+    assert stats["expirations"] == 1
+    assert stats["size"] == 1
+    assert stats["cache_hits"] == 1 and stats["cache_misses"] == 1
+
+
+def test_async_api_matches_sync():
+    """Test that the async wrappers share state with the sync API."""
+    cache = PerformanceCache(max_size=10)
+
+    async def main():
+        await cache.set("k", "v")
+        return await cache.get("k")
+
+    assert asyncio.run(main()) == "v"
+    assert cache.get_sync("k") == "v"
+
+
+def test_sharded_cache_is_thread_safe():
+    """Test concurrent writers against a sharded cache stay within max_size."""
+    cache = PerformanceCache(max_size=4096)
+    assert cache.get_cache_stats()["shards"] > 1
+
+    def writer(offset):
+        for i in range(5000):
+            cache.set_sync(f"{offset}-{i}", i)
+            cache.get_sync(f"{offset}-{i // 2}")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) <= 4096
+
+
+def test_script_cache_is_bounded():
+    """Test that the optimizer's script cache uses the LRU cache."""
+    optimizer = PerformanceOptimizer(max_workers=1, script_cache_size=2)
+    try:
+        optimizer.cache_script("one", "print(1)")
+        optimizer.cache_script("two", "print(2)")
+        optimizer.cache_script("three", "print(3)")
+
+        assert optimizer.get_cached_script("one") is None
+        assert optimizer.get_cached_script("three") == "print(3)"
+        assert optimizer.get_performance_stats()["script_cache"]["size"] == 2
+
+        optimizer.clear_all_caches()
+        assert optimizer.get_cached_script("three") is None
+    finally:
+        optimizer.shutdown()
+
+
+def _time_per_op(cache: PerformanceCache, entries: int, ops: int = 20000) -> float:
+    """Fill a cache past capacity, then time mixed get/set operations."""
+    for i in range(entries):
+        cache.set_sync(f"key-{i}", i)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        cache.get_sync(f"key-{(i * 7919) % entries}")
+        cache.set_sync(f"new-{i}", i)
+    return (time.perf_counter() - start) / ops
+
+
+@pytest.mark.slow
+def test_get_set_constant_time_benchmark():
+    """Benchmark: per-operation cost at 100k entries stays close to 1k entries."""
+    small = _time_per_op(PerformanceCache(max_size=1000), 1000)
+    large = _time_per_op(PerformanceCache(max_size=100_000), 100_000)
+
+    print(f"\nget+set per op: 1k entries {small * 1e6:.2f}us, 100k entries {large * 1e6:.2f}us")
+    # A linear scan would be ~100x slower; allow generous noise for cache effects
+    assert large < small * 5
@@ -0,0 +1,94 @@
+"""Tests for the token-bucket rate limiter."""
+
+import asyncio
+import time
+
+from src.voxel.core.rate_limiter import RateLimits, TokenBucket, TokenRateLimiter
+
+
+def test_token_bucket_refills_continuously():
+    """Test that a bucket refills proportionally to elapsed time."""
+    bucket = TokenBucket(600, period_seconds=60)
+    now = bucket.updated
+
+    bucket.consume(600, now)
+    assert bucket.wait_time(100, now) == 10.0
+    assert bucket.wait_time(100, now + 10) == 0.0
+
+
+def test_separate_input_output_and_request_budgets():
+    """Test that each budget is enforced independently."""
+    limiter = TokenRateLimiter(
+        tokens_per_minute_limit=1000, requests_per_minute=2, input_tokens_per_minute=5000
+    )
+
+    first, wait = limiter.try_acquire("anthropic", "claude", 100, 1000)
+    assert first is not None and wait == 0.0
+
+    # Output budget is exhausted
+    second, wait = limiter.try_acquire("anthropic", "claude", 100, 500)
+    assert second is None and wait > 0
+
+    # Real usage was far below the reservation, so the difference is refunded
+    limiter.record_usage(first, 100, 200)
+    second, _ = limiter.try_acquire("anthropic", "claude", 100, 500)
+    assert second is not None
+
+    # Request budget is now exhausted even though tokens remain
+    third, wait = limiter.try_acquire("anthropic", "claude", 10, 10)
+    assert third is None and wait > 0
+
+
+def test_models_and_providers_have_own_buckets():
+    """Test per-model buckets and shared per-provider buckets."""
+    limiter = TokenRateLimiter(
+        tokens_per_minute_limit=1000,
+        provider_limits={"openai": RateLimits(10, 100000, 1500)},
+    )
+
+    assert limiter.try_acquire("anthropic", "sonnet", 10, 1000)[0] is not None
+    assert limiter.try_acquire("anthropic", "haiku", 10, 1000)[0] is not None
+
+    assert limiter.try_acquire("openai", "gpt-4o", 10, 1000)[0] is not None
+    # Model bucket has room but the shared provider bucket does not
+    assert limiter.try_acquire("openai", "gpt-4o-mini", 10, 1000)[0] is None
+
+
+def test_no_delay_between_calls_with_budget():
+    """Test that back-to-back calls by one agent are not delayed."""
+    limiter = TokenRateLimiter(tokens_per_minute_limit=100000)
+
+    start = time.monotonic()
+    for _ in range(5):
+        reservation = limiter.acquire_blocking("anthropic", "claude", 100, 1000, "builder")
+        limiter.record_usage(reservation, 90, 800)
+
+    assert time.monotonic() - start < 0.5
+    assert limiter.agent_usage["builder"] == {
+        "requests": 5, "input_tokens": 450, "output_tokens": 4000
+    }
+
+
+def test_async_acquire_awaits_refill():
+    """Test that async acquire waits for capacity without blocking other tasks."""
+    limiter = TokenRateLimiter(tokens_per_minute_limit=600)
+    limiter.try_acquire("anthropic", "claude", 1, 600)
+    ticks = []
+
+    async def ticker():
+        for _ in range(3):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        # Needs 1 output token: 0.1s of refill at 10 tokens per second
+        acquire = limiter.acquire("anthropic", "claude", 1, 1)
+        reservation, _ = await asyncio.gather(acquire, ticker())
+        return reservation
+
+    start = time.monotonic()
+    reservation = asyncio.run(main())
+
+    assert reservation is not None
+    assert 0.05 < time.monotonic() - start < 1.0
+    assert len(ticks) == 3
@@ -0,0 +1,115 @@
+"""Tests for the persistent LLM response cache."""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from src.voxel.agents import ConceptAgent
+from src.voxel.core.agent import AgentConfig
+from src.voxel.core.response_cache import ResponseCache, make_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache in a temporary directory."""
+    cache = ResponseCache(tmp_path / "responses.db", max_bytes=1000)
+    yield cache
+    cache.close()
+
+
+def _key(message: str, **overrides) -> str:
+    params = dict(
+        provider="anthropic",
+        model="claude",
+        agent_role="concept",
+        system_prompt="You are a concept artist.",
+        messages=[{"role": "user", "content": message}],
+        temperature=0.7,
+        max_tokens=4096,
+    )
+    params.update(overrides)
+    return make_cache_key(**params)
+
+
+def test_cache_key_is_deterministic_and_normalized():
+    """Test that keys ignore whitespace differences but not parameters."""
+    assert _key("a red  cube\n") == _key("a red cube")
+    assert _key("a red cube") != _key("a blue cube")
+    assert _key("a red cube") != _key("a red cube", temperature=0.2)
+    assert _key("a red cube") != _key("a red cube", model="gpt-4o")
+
+
+def test_hit_and_miss_tracking(cache):
+    """Test hits, misses and savings counters."""
+    assert cache.get("k") is None
+
+    cache.set("k", "response text", "concept", "claude", usage={"input_tokens": 5, "output_tokens": 7})
+    hit = cache.get("k")
+
+    assert hit["response"] == "response text"
+    assert hit["usage"]["output_tokens"] == 7
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["tokens_saved"] == 7
+    assert stats["bytes_saved"] == len("response text")
+    assert stats["entries_by_role"] == {"concept": 1}
+
+
+def test_ttl_expiry(cache):
+    """Test that expired entries are treated as misses and removed."""
+    cache.set("old", "stale", "concept", "claude", ttl=-1)
+
+    assert cache.get("old") is None
+    assert cache.get_stats()["entries"] == 0
+    assert cache.get_stats()["total_bytes"] == 0
+
+
+def test_lru_eviction_respects_byte_cap(cache):
+    """Test that least recently used entries are evicted past max_bytes."""
+    for name in ("a", "b", "c"):
+        cache.set(name, "x" * 400, "builder", "claude")
+        time.sleep(0.01)
+        if name == "b":
+            # Touch "a" so "b" becomes the least recently used entry
+            cache.get("a")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.get_stats()["total_bytes"] == 800
+
+
+def test_purge(cache):
+    """Test purging expired and all entries."""
+    cache.set("live", "1", "concept", "claude")
+    cache.set("dead", "2", "concept", "claude", ttl=-1)
+
+    assert cache.purge(expired_only=True) == 1
+    assert cache.purge() == 1
+    assert cache.get_stats()["total_bytes"] == 0
+
+
+@patch('anthropic.Anthropic')
+def test_agent_uses_cached_response(mock_anthropic, tmp_path, monkeypatch):
+    """Test that an identical request is served from the cache without an API call."""
+    response_cache = ResponseCache(tmp_path / "responses.db")
+    monkeypatch.setattr("voxel.core.response_cache._response_cache", response_cache)
+
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.content = [Mock(text="A cozy cabin")]
+    mock_response.usage = Mock(input_tokens=10, output_tokens=4)
+    mock_client.messages.create.return_value = mock_response
+    mock_anthropic.return_value = mock_client
+
+    config = AgentConfig(provider="anthropic", model="claude-3-5-sonnet-20241022", api_key="test_key")
+
+    first = ConceptAgent(config).generate_response("Create a  cabin")
+    second = ConceptAgent(config).generate_response("Create a cabin")
+
+    assert first.content == second.content == "A cozy cabin"
+    assert mock_client.messages.create.call_count == 1
+    assert second.metadata["cached"] is True
+    assert response_cache.get_stats()["tokens_saved"] == 4
+    response_cache.close()
@@ -0,0 +1,97 @@
+"""Tests for the dependency-graph scheduler."""
+
+import time
+
+import pytest
+from src.voxel.core.performance import ParallelProcessor
+from src.voxel.core.scheduler import DependencyScheduler
+
+
+@pytest.fixture
+def processor():
+    """Create a parallel processor for the scheduler."""
+    processor = ParallelProcessor(max_workers=4)
+    yield processor
+    processor.shutdown()
+
+
+def _sleeper(value, delay=0.2):
+    def run(inputs):
+        time.sleep(delay)
+        return value
+    return run
+
+
+def test_independent_nodes_run_concurrently(processor):
+    """Test that nodes without mutual dependencies overlap."""
+    scheduler = DependencyScheduler(processor)
+    scheduler.add_node("concept", _sleeper("concept"))
+    scheduler.add_node("hdr", _sleeper("hdr"), ("concept",))
+    scheduler.add_node("render", _sleeper("render"), ("concept",))
+    scheduler.add_node("builder", _sleeper("builder"), ("concept",))
+
+    result = scheduler.run()
+
+    # Critical path is two nodes deep, sequential sum would be four
+    assert result.wall_time < 0.6
+    assert set(result.node_timings()) == {"concept", "hdr", "render", "builder"}
+    assert all(t >= 0.2 for t in result.node_timings().values())
+
+
+def test_nodes_receive_dependency_outputs(processor):
+    """Test that each node sees its dependencies' results."""
+    scheduler = DependencyScheduler(processor)
+    scheduler.add_node("concept", lambda inputs: "a cafe")
+    scheduler.add_node("builder", lambda inputs: f"build {inputs['concept']}", ("concept",))
+    scheduler.add_node(
+        "texture",
+        lambda inputs: sorted(inputs),
+        ("concept", "builder"),
+    )
+
+    result = scheduler.run()
+
+    assert result.value("builder") == "build a cafe"
+    assert result.value("texture") == ["builder", "concept"]
+
+
+def test_sequential_mode_matches_parallel(processor):
+    """Test that sequential mode runs in dependency order."""
+    order = []
+    scheduler = DependencyScheduler(processor, parallel=False)
+    scheduler.add_node("render", lambda inputs: order.append("render"), ("concept",))
+    scheduler.add_node("concept", lambda inputs: order.append("concept"))
+
+    scheduler.run()
+
+    assert order == ["concept", "render"]
+
+
+def test_failure_stops_dependents(processor):
+    """Test that a failing node raises and its dependents never run."""
+    ran = []
+
+    def fail(inputs):
+        raise RuntimeError("API error")
+
+    scheduler = DependencyScheduler(processor)
+    scheduler.add_node("concept", fail)
+    scheduler.add_node("builder", lambda inputs: ran.append("builder"), ("concept",))
+
+    with pytest.raises(RuntimeError, match="API error"):
+        scheduler.run()
+    assert ran == []
+
+
+def test_invalid_graphs_rejected(processor):
+    """Test that unknown dependencies and cycles are rejected."""
+    scheduler = DependencyScheduler(processor)
+    scheduler.add_node("builder", lambda inputs: None, ("concept",))
+    with pytest.raises(ValueError, match="unknown node"):
+        scheduler.run()
+
+    scheduler = DependencyScheduler(processor)
+    scheduler.add_node("a", lambda inputs: None, ("b",))
+    scheduler.add_node("b", lambda inputs: None, ("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        scheduler.run()
@@ -5,6 +5,7 @@ from pathlib import Path
 import tempfile
 import shutil
 from src.voxel.blender.script_manager import ScriptManager
+from src.voxel.validation import BlenderScriptValidator
 
 
 @pytest.fixture
@@ -71,6 +72,44 @@ def test_combine_scripts(temp_output_dir):
     assert "Script 2" in content
 
 
+def test_combined_script_content_hash(temp_output_dir):
+    """Test that identical combined scripts share a hash across sessions."""
+    manager = ScriptManager(temp_output_dir)
+    hashes = []
+    for session_name, body in (("a", "x = 1"), ("b", "x = 1"), ("c", "x = 2")):
+        session_dir = manager.create_session_dir(session_name)
+        script = manager.save_script(body, f"builder_{session_name}", session_dir)
+        combined = manager.combine_scripts([script], "combined", session_dir)
+        assert "# Content hash: " in combined.read_text()
+        hashes.append(manager.get_content_hash(combined))
+
+    assert hashes[0] == hashes[1]
+    assert hashes[0] != hashes[2]
+    assert manager.compute_content_hash(combined.read_text()) == hashes[2]
+
+
+def test_combine_scripts_validates_only_changed_fragments(temp_output_dir):
+    """Test that re-combining after one script changes only analyses that script."""
+    manager = ScriptManager(temp_output_dir)
+    manager.validator = BlenderScriptValidator()
+    session_dir = manager.create_session_dir("test_session")
+    scripts = [
+        manager.save_script(f"bpy.ops.mesh.primitive_cube_add()\nbpy.context.active_object.name = 'Cube{i}'", f"script{i}", session_dir)
+        for i in range(4)
+    ]
+
+    manager.combine_scripts(scripts, "combined", session_dir)
+    first = manager.validator.get_cache_stats()
+
+    manager.save_script("bpy.ops.mesh.primitive_cube_add()\nbpy.context.active_object.name = 'Cube0'", "script3", session_dir)
+    combined = manager.combine_scripts(scripts, "combined", session_dir)
+    second = manager.validator.get_cache_stats()
+
+    # The changed script and the timestamped header are the only new fragments
+    assert second["fragment_misses"] - first["fragment_misses"] == 2
+    assert "Cube0" in combined.read_text()
+
+
 def test_save_concept(temp_output_dir):
     """Test saving scene concept."""
     manager = ScriptManager(temp_output_dir)
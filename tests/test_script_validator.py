@@ -0,0 +1,112 @@
+"""Tests for Blender script validation."""
+
+from src.voxel.validation import BlenderScriptValidator
+
+SCRIPT = """import bpy
+bpy.ops.object.mode_set(mode='EDIT')
+cube = bpy.data.objects['Cube']
+# bpy.data.objects['Commented'] is not code
+obj = bpy.context.active_object
+mesh = bpy.data.objects.new('Mesh', None)
+world = bpy.context.scene.world
+world.volume = 1
+while True:
+    break
+"""
+
+
+def test_single_pass_reports_issues_in_line_order():
+    """Test that API usage and common issues are reported per line, in order."""
+    result = BlenderScriptValidator().validate_script(SCRIPT)
+
+    assert not result.is_valid
+    assert result.errors == [
+        "Line 8: Invalid access to `world.volume` - this attribute does not exist in Blender's World object. "
+        "Use world shader nodes instead for volumetric effects.",
+        "Line 9: Potential infinite loop detected",
+    ]
+    assert result.warnings == [
+        "Line 2: Potential deprecated API usage: bpy.ops.object.mode_set(mode='EDIT')",
+        "Line 3: Direct object access by name 'Cube' may fail if object doesn't exist",
+        "Line 5: Consider checking if active_object exists before using it",
+        "Line 6: Objects created with bpy.data.objects.new() should be linked to scene",
+        "Line 2: Consider adding error handling for Blender operations",
+        "Consider adding scene clearing operations at the beginning",
+        "Consider adding a camera for rendering",
+        "Consider adding lighting to the scene",
+    ]
+
+
+def test_missing_imports_and_auto_fix():
+    """Test that module usage without an import is reported and fixed."""
+    script = "v = mathutils.Vector((0, 0, 0))\nbpy.ops.object.camera_add()\nbpy.ops.object.light_add()\n"
+    result = BlenderScriptValidator().validate_script(script)
+
+    assert result.is_valid
+    assert result.warnings[:2] == [
+        "Consider adding 'import bpy' at the top of the script",
+        "Consider adding 'from mathutils import Vector, Euler, Matrix' for 3D math operations",
+    ]
+    assert result.fixed_script.startswith("import bpy\n")
+
+
+def test_results_are_cached_by_content():
+    """Test that re-validating a script is a cache hit returning an independent copy."""
+    validator = BlenderScriptValidator(cache_size=1)
+
+    first = validator.validate_script(SCRIPT)
+    first.errors.clear()
+    second = validator.validate_script(SCRIPT)
+    assert len(second.errors) == 2
+    stats = validator.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    validator.validate_script("import bpy\n")
+    validator.validate_script(SCRIPT)
+    assert validator.get_cache_stats()["misses"] == 3
+
+
+def test_syntax_errors_are_reported():
+    """Test that unparsable scripts fail validation with the syntax error."""
+    result = BlenderScriptValidator().validate_script("def broken(:\n")
+
+    assert not result.is_valid
+    assert result.errors[0].startswith("Syntax error at line 1")
+
+
+def test_fragments_match_whole_script_validation():
+    """Test that validating fragments reports what validating the joined script does."""
+    lines = SCRIPT.split("\n")
+    fragments = [("header", "\n".join(lines[:2])), ("a", "\n".join(lines[2:6])), ("b", "\n".join(lines[6:]))]
+    validator = BlenderScriptValidator()
+
+    combined = validator.validate_fragments(fragments)
+    assert combined == validator.validate_script(SCRIPT)
+
+    validator.validate_fragments(fragments[:2] + [("b", "x = 1")])
+    stats = validator.get_cache_stats()
+    assert stats["fragment_misses"] == 4
+    assert stats["fragment_hits"] == 2
+
+
+def test_fragment_syntax_errors_use_combined_line_numbers():
+    """Test that a broken fragment reports its error against the joined script."""
+    result = BlenderScriptValidator().validate_fragments([("a", "import bpy\nx = 1"), ("b", "def broken(:")])
+
+    assert not result.is_valid
+    assert result.errors[0].startswith("Syntax error at line 3")
+
+
+def test_cross_fragment_conflicts():
+    """Test warnings for definitions and object names repeated across fragments."""
+    first = "def setup():\n    pass\nobj = bpy.context.active_object\nobj.name = 'Hero'\n"
+    second = "def setup():\n    pass\nbpy.data.objects.new('Hero', None)\nmat = bpy.data.materials.new('Hero')\n"
+    result = BlenderScriptValidator().validate_fragments([("builder.py", first), ("render.py", second)])
+
+    assert "Line 6: 'setup' redefines the definition from builder.py (line 1)" in result.warnings
+    assert ("Line 8: Object name 'Hero' is also used by builder.py (line 4); "
+            "Blender will rename one of them") in result.warnings
+    assert len([w for w in result.warnings if "Hero" in w]) == 1
+
+    single = BlenderScriptValidator().validate_fragments([("builder.py", first + second)])
+    assert not [w for w in single.warnings if "redefines" in w or "also used by" in w]
@@ -0,0 +1,121 @@
+"""Tests for the process-wide shared component registry."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from src.voxel.agents.concept import ConceptAgent
+from src.voxel.agents.render import RenderAgent
+from src.voxel.core.agent import AgentConfig
+from src.voxel.core.config import Config
+from src.voxel.core.shared import SharedRegistry
+from src.voxel.orchestrator.workflow import WorkflowOrchestrator
+from src.voxel.voxelweaver.search_scraper import ReferenceSearcher
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Install a fresh global registry for both import paths."""
+    registry = SharedRegistry()
+    monkeypatch.setattr("voxel.core.shared._shared_registry", registry)
+    monkeypatch.setattr("src.voxel.core.shared._shared_registry", registry)
+    return registry
+
+
+def _config(tmp_path):
+    return Config(
+        anthropic_api_key="test_key",
+        output_dir=tmp_path,
+        enable_response_cache=False,
+        blender_path=Path(sys.executable),
+        blender_worker_pool=False,
+    )
+
+
+def test_concurrent_requests_build_once():
+    """Test that racing first requests for a key share a single build."""
+    registry = SharedRegistry()
+    builds = []
+
+    def factory():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get_or_create("catalog", factory)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert len({id(r) for r in results}) == 1
+    assert registry.get_stats()["builds"] == 1
+    assert registry.get_stats()["hits"] == 7
+
+
+@patch('anthropic.Anthropic')
+def test_agents_share_api_clients_per_key(mock_anthropic, registry):
+    """Test that agents reuse one API client per provider and key."""
+    mock_anthropic.side_effect = lambda api_key: object()
+    config = AgentConfig(provider="anthropic", api_key="key-a")
+
+    concept = ConceptAgent(config)
+    render = RenderAgent(config)
+    other = ConceptAgent(AgentConfig(provider="anthropic", api_key="key-b"))
+
+    assert concept.client is render.client
+    assert other.client is not concept.client
+    assert mock_anthropic.call_count == 2
+    assert all("key-a" not in repr(key) for key in registry.keys())
+
+
+def test_orchestrators_share_heavyweight_components(registry, tmp_path):
+    """Test that per-request orchestrators get fresh agents over shared components."""
+    first = WorkflowOrchestrator(_config(tmp_path))
+    second = WorkflowOrchestrator(_config(tmp_path))
+
+    assert second.concept_agent is not first.concept_agent
+    assert second.shared_context is not first.shared_context
+    assert second.concept_agent.client is first.concept_agent.client
+    assert second.voxelweaver is first.voxelweaver
+    assert second.script_manager.validator is first.script_manager.validator
+    assert (second.performance_optimizer.parallel_processor
+            is first.performance_optimizer.parallel_processor)
+
+    first.shutdown_performance_optimizer()
+    assert not second.performance_optimizer.parallel_processor.executor._shutdown
+
+
+def test_shared_reference_cache_is_bounded():
+    """Test that reference searches for new words do not grow a shared core without limit."""
+    searcher = ReferenceSearcher(cache_size=8)
+    for i in range(50):
+        searcher.search_concept(f"a gizmo{i} beside a table", "prompt")
+
+    assert len(searcher._cache) <= 8
+    assert searcher._search_object("table") is searcher._search_object("table")
+
+
+@pytest.mark.slow
+def test_per_request_setup_benchmark(registry, tmp_path):
+    """Benchmark orchestrator setup with a cold and a warm registry."""
+    start = time.perf_counter()
+    WorkflowOrchestrator(_config(tmp_path))
+    cold = time.perf_counter() - start
+
+    runs = 10
+    start = time.perf_counter()
+    for _ in range(runs):
+        WorkflowOrchestrator(_config(tmp_path))
+    warm = (time.perf_counter() - start) / runs
+
+    print(f"\nper-request setup: cold {cold * 1000:.1f}ms, warm {warm * 1000:.2f}ms")
+    assert warm < cold / 5
@@ -0,0 +1,103 @@
+"""Tests for the vectorized bounding box engine."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.voxel.voxelweaver.context_alignment import ContextAligner  # noqa: E402
+from src.voxel.voxelweaver.spatial_batch import BoxArray  # noqa: E402
+
+
+@pytest.fixture
+def scene():
+    """Random overlapping props as aligned objects plus their BoxArray."""
+    rng = random.Random(3)
+    aligner = ContextAligner()
+    data = [
+        {
+            "name": f"prop_{i}",
+            "position": (rng.uniform(0, 15), rng.uniform(0, 15), rng.uniform(0, 2)),
+            "dimensions": {"width": rng.uniform(0.2, 2), "height": rng.uniform(0.2, 2), "depth": rng.uniform(0.2, 2)},
+            "scale": (1.0, rng.uniform(0.5, 2), 1.0),
+        }
+        for i in range(200)
+    ]
+    objects = [aligner._create_aligned_object(d) for d in data]
+    return aligner, data, objects, BoxArray.from_objects(data)
+
+
+def test_from_objects_matches_scalar_boxes(scene):
+    """Test that batch construction reproduces ContextAligner's bounding boxes."""
+    _, _, objects, boxes = scene
+    expected = BoxArray.from_boxes([obj.bounding_box for obj in objects])
+
+    np.testing.assert_allclose(boxes.bounds, expected.bounds)
+    assert boxes.to_boxes()[0] == pytest.approx(objects[0].bounding_box)
+
+
+def test_pairwise_ops_match_scalar(scene):
+    """Test intersection, overlap volume and separation against the scalar methods."""
+    aligner, _, objects, boxes = scene
+    i = np.repeat(np.arange(20), 20)
+    j = np.tile(np.arange(20), 20)
+    tolerance = -aligner.collision_tolerance
+
+    hits = boxes.intersects(i, j, tolerance)
+    volumes = boxes.overlap_volume(i, j)
+    positions = boxes.separation_positions(i, j, aligner.collision_tolerance)
+
+    for k, (a, b) in enumerate(zip(i.tolist(), j.tolist(), strict=True)):
+        obj_a, obj_b = objects[a], objects[b]
+        assert hits[k] == obj_a.bounding_box.intersects(obj_b.bounding_box, tolerance)
+        assert volumes[k] == pytest.approx(aligner._calculate_overlap_volume(obj_a, obj_b))
+        assert positions[k] == pytest.approx(aligner._calculate_separation_position(obj_a, obj_b))
+
+
+def test_grid_pairs_match_brute_force(scene):
+    """Test that the grid broad phase finds exactly the brute-force pairs, sorted."""
+    aligner, _, objects, boxes = scene
+    tolerance = -aligner.collision_tolerance
+    expected = [
+        (a, b)
+        for a in range(len(objects))
+        for b in range(a + 1, len(objects))
+        if objects[a].bounding_box.intersects(objects[b].bounding_box, tolerance)
+    ]
+
+    first, second = boxes.overlapping_pairs(tolerance)
+
+    assert list(zip(first.tolist(), second.tolist(), strict=True)) == expected
+    assert len(expected) > 0
+
+
+@pytest.mark.parametrize("tolerance", [-0.01, 0.0, 0.5])
+def test_grid_pairs_edge_cases(tolerance):
+    """Test oversized, coincident, touching and same-column boxes in small chunks."""
+    rng = np.random.default_rng(5)
+    centers = np.round(rng.uniform(0, 20, (300, 3)))
+    centers[:100, 0] = 0.0  # one column sharing an x range
+    sizes = rng.uniform(0.5, 1.5, (300, 3))
+    sizes[:3] = 40.0  # floors spanning the whole scene
+    boxes = BoxArray.from_centers(centers, sizes)
+    i, j = np.triu_indices(len(boxes), 1)
+    hit = boxes.intersects(i, j, tolerance)
+
+    first, second = boxes.overlapping_pairs(tolerance, chunk_size=97)
+
+    np.testing.assert_array_equal(first, i[hit])
+    np.testing.assert_array_equal(second, j[hit])
+
+
+@pytest.mark.parametrize("method", ["_place_grid", "_place_circular", "_place_linear"])
+def test_vectorized_placement_matches_scalar(method, monkeypatch):
+    """Test that vectorized pattern placement matches the scalar formulas."""
+    aligner = ContextAligner()
+    vectorized = getattr(aligner, method)([{} for _ in range(7)], 1.5)
+
+    monkeypatch.setattr("src.voxel.voxelweaver.context_alignment.BoxArray", None)
+    scalar = getattr(aligner, method)([{} for _ in range(7)], 1.5)
+
+    for v, s in zip(vectorized, scalar, strict=True):
+        assert v["position"] == pytest.approx(s["position"])
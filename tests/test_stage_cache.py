@@ -0,0 +1,79 @@
+"""Tests for memoized VoxelWeaver pipeline stages."""
+
+from src.voxel.voxelweaver.stage_cache import StageCache
+from src.voxel.voxelweaver.voxelweaver_core import VoxelWeaverConfig, VoxelWeaverCore
+
+CONCEPT = "A sunlit kitchen with a wooden table, two chairs and a glass bottle by the window."
+STAGES = ["references", "proportions", "geometry_hints", "lighting_config", "texture_suggestions"]
+
+
+def _strip(result):
+    return {k: v for k, v in result.items() if k not in ("stage_timings", "cached_stages")}
+
+
+def test_unchanged_concept_reuses_every_stage():
+    """Test that a repeated concept is served from the cache with per-stage timings."""
+    core = VoxelWeaverCore(VoxelWeaverConfig())
+
+    first = core.process_scene_concept(CONCEPT, "kitchen")
+    second = core.process_scene_concept(CONCEPT, "kitchen")
+
+    assert first["cached_stages"] == []
+    assert second["cached_stages"] == STAGES
+    assert list(second["stage_timings"]) == STAGES
+    assert _strip(second) == _strip(first)
+    assert core.get_cache_stats()["memory_hits"] == len(STAGES)
+
+
+def test_changed_input_reruns_only_dependent_stages(tmp_path):
+    """Test that a style change only recomputes lighting and a prompt change only search-derived stages."""
+    original = VoxelWeaverCore(VoxelWeaverConfig(stage_cache_dir=tmp_path)).process_scene_concept(CONCEPT, "kitchen")
+
+    # A core with another style shares the stage outputs persisted on disk
+    core = VoxelWeaverCore(VoxelWeaverConfig(style="stylized", stage_cache_dir=tmp_path))
+    restyled = core.process_scene_concept(CONCEPT, "kitchen")
+    reprompted = core.process_scene_concept(CONCEPT, "a different prompt")
+
+    assert restyled["cached_stages"] == ["references", "proportions", "geometry_hints", "texture_suggestions"]
+    assert restyled["lighting_config"] != original["lighting_config"]
+    assert restyled["lighting_config"]["style"] == "stylized"
+    assert reprompted["cached_stages"] == ["proportions", "geometry_hints", "lighting_config"]
+
+
+def test_cached_outputs_are_isolated_from_callers():
+    """Test that mutating a returned stage output does not corrupt the cache."""
+    core = VoxelWeaverCore(VoxelWeaverConfig())
+    first = core.process_scene_concept(CONCEPT, "kitchen")
+    first["lighting_config"]["mood"] = "tampered"
+
+    second = core.process_scene_concept(CONCEPT, "kitchen")
+
+    assert second["lighting_config"]["mood"] != "tampered"
+
+
+def test_disk_store_survives_new_instances(tmp_path):
+    """Test that stage outputs persisted on disk are reused by a fresh core."""
+    config = VoxelWeaverConfig(stage_cache_dir=tmp_path)
+    computed = VoxelWeaverCore(config).process_scene_concept(CONCEPT, "kitchen")
+
+    fresh = VoxelWeaverCore(config)
+    result = fresh.process_scene_concept(CONCEPT, "kitchen")
+
+    assert result["cached_stages"] == STAGES
+    assert _strip(result) == _strip(computed)
+    assert fresh.get_cache_stats()["disk_hits"] == len(STAGES)
+    assert (tmp_path / "lighting_config").is_dir()
+
+
+def test_disk_entries_round_trip_exactly(tmp_path):
+    """Test that a disk hit returns the same types and values that were stored."""
+    value = {"color": (1.0, 0.9, 0.8), "tags": {"wood", "glass"}, "objects": [("table", 2)], "scale": None}
+    StageCache(disk_dir=tmp_path).set("lighting_config", "key", value)
+
+    loaded = StageCache(disk_dir=tmp_path).get("lighting_config", "key")
+
+    assert loaded == value
+    assert isinstance(loaded["color"], tuple) and isinstance(loaded["objects"][0], tuple)
+
+    (tmp_path / "lighting_config" / "key.pkl").write_bytes(b"not a pickle")
+    assert StageCache(disk_dir=tmp_path).get("lighting_config", "key") is None
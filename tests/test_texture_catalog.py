@@ -0,0 +1,75 @@
+"""Tests for the lazily built, indexed AdvancedTextureCatalog."""
+
+from src.voxel.voxelweaver.advanced_texture_catalog import (
+    AdvancedTextureCatalog,
+    MaterialCategory,
+    MaterialPreset,
+)
+
+
+def test_construction_builds_no_presets():
+    """Test that constructing the catalog only registers presets."""
+    catalog = AdvancedTextureCatalog()
+
+    assert len(catalog.material_presets) == 7
+    assert catalog.material_presets.built_count == 0
+    assert "oak_wood" in catalog.material_presets
+    assert catalog.material_presets.built_count == 0
+
+
+def test_presets_are_built_once_on_access():
+    """Test that a preset is built on first access and cached."""
+    catalog = AdvancedTextureCatalog()
+
+    first = catalog.get_material_preset("oak_wood")
+    assert first.name == "Oak Wood"
+    assert catalog.material_presets.is_built("oak_wood")
+    assert catalog.material_presets.built_count == 1
+    assert catalog.get_material_preset("oak_wood") is first
+    assert catalog.get_material_preset("missing") is None
+
+
+def test_indexed_lookups_match_linear_scans():
+    """Test that index lookups return what scanning every preset would."""
+    catalog = AdvancedTextureCatalog()
+    presets = list(catalog.material_presets.values())
+
+    for category in MaterialCategory:
+        expected = [p for p in presets if p.category == category]
+        assert catalog.get_materials_by_category(category) == expected
+        assert catalog.get_materials_by_category(category.value) == expected
+
+    for environment in ("indoor", "outdoor", "studio", "night", "space"):
+        expected = [p for p in presets if p.environment_adaptation.get(environment, 0) > 0.8]
+        assert catalog.get_materials_by_environment(environment) == expected
+
+    assert [p.name for p in catalog.get_materials_by_tag("wood")] == [
+        "Oak Wood", "Mahogany Wood", "Pine Wood", "Walnut Wood"
+    ]
+    assert [p.name for p in catalog.get_materials_by_tag("Glow")] == ["Neon Blue"]
+
+
+def test_category_lookup_only_builds_matching_presets():
+    """Test that a category lookup leaves other presets unbuilt."""
+    catalog = AdvancedTextureCatalog()
+
+    metals = catalog.get_materials_by_category(MaterialCategory.METALLIC)
+
+    assert [p.name for p in metals] == ["Stainless Steel"]
+    assert catalog.material_presets.built_count == 1
+
+
+def test_assigned_presets_are_indexed():
+    """Test that assigned presets are indexed and deletions unindexed."""
+    catalog = AdvancedTextureCatalog()
+    steel = catalog.get_material_preset("stainless_steel")
+    custom = catalog.generate_custom_material("stainless_steel", {"roughness": 0.05})
+    assert isinstance(custom, MaterialPreset)
+
+    catalog.material_presets["mirror_steel"] = custom
+    assert catalog.get_materials_by_category(MaterialCategory.METALLIC) == [steel, custom]
+    assert custom in catalog.get_materials_by_tag("mirror")
+
+    del catalog.material_presets["mirror_steel"]
+    assert catalog.get_materials_by_category(MaterialCategory.METALLIC) == [steel]
+    assert catalog.get_materials_by_tag("mirror") == []
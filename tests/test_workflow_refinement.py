@@ -0,0 +1,197 @@
+"""Tests for incremental refinement in the workflow orchestrator."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from src.voxel.agents.reviewer import ReviewerAgent, classify_feedback_stages
+from src.voxel.core.agent import AgentConfig
+from src.voxel.core.config import Config
+from src.voxel.core.models import AgentResponse, AgentRole, BlenderScriptResult
+from src.voxel.orchestrator.workflow import WorkflowOrchestrator
+
+REVIEW = """## Review
+
+**Rating:** 6
+
+**Areas for Improvement:**
+- Lighting: the key light is too harsh, soften it and raise the camera
+
+**Recommendations:**
+Use a softer area light.
+
+**Affected Stages:** render
+
+**Should Refine:** YES
+"""
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    """Create an orchestrator whose agents and Blender executor are stubbed."""
+    config = Config(
+        anthropic_api_key="test_key",
+        output_dir=tmp_path,
+        max_iterations=2,
+        enable_response_cache=False,
+        blender_path=Path(sys.executable),
+        blender_worker_pool=False,
+    )
+    orchestrator = WorkflowOrchestrator(config)
+    orchestrator.voxelweaver = Mock()
+    orchestrator.voxelweaver.process_scene_concept.return_value = {"coherence_score": 1.0}
+    orchestrator.voxelweaver.enrich_agent_prompt.side_effect = lambda **kw: kw["base_prompt"]
+
+    orchestrator._generate_concept = Mock(
+        return_value=AgentResponse(agent_role=AgentRole.CONCEPT, content="A cabin")
+    )
+    for role in (AgentRole.BUILDER, AgentRole.TEXTURE, AgentRole.HDR, AgentRole.RENDER, AgentRole.ANIMATION):
+        setattr(orchestrator, f"_generate_{role.value}_script", Mock(
+            side_effect=lambda *args, role=role: AgentResponse(
+                agent_role=role, content=role.value, script=f"# {role.value}\n"
+            )
+        ))
+    orchestrator.reviewer_agent.generate_response = Mock(
+        return_value=orchestrator.reviewer_agent._parse_response(REVIEW)
+    )
+
+    def execute(script, blend_file):
+        blend_file.write_text("blend")
+        return BlenderScriptResult(success=True, stdout="", stderr="")
+
+    def render(blend_file, output_image, **kwargs):
+        return BlenderScriptResult(success=True, stdout="", stderr="")
+
+    orchestrator.blender_executor.execute_script_and_save_blend = Mock(side_effect=execute)
+    orchestrator.blender_executor.render_scene = Mock(side_effect=render)
+    orchestrator.blender_executor.execute_build_and_render = Mock(
+        side_effect=lambda script, blend_file, output_image, **kwargs: execute(script, blend_file)
+    )
+    yield orchestrator
+    orchestrator.shutdown_performance_optimizer()
+
+
+def test_feedback_mapped_to_stages():
+    """Test explicit and keyword-based stage attribution."""
+    reviewer = ReviewerAgent(AgentConfig(provider="anthropic", model="m", api_key="k"))
+    feedback = reviewer._parse_response(REVIEW).metadata["feedback"]
+    assert feedback["affected_stages"] == ["render"]
+
+    assert classify_feedback_stages("Materials look flat and the sky is too dark") == [
+        "texture", "hdr"
+    ]
+
+
+def test_rerun_includes_dependent_stages(orchestrator):
+    """Test that regenerating a stage also regenerates its consumers."""
+    assert orchestrator._nodes_to_rerun(["hdr"]) == {"hdr"}
+    assert orchestrator._nodes_to_rerun(["builder"]) == {"builder", "texture", "animation"}
+    assert orchestrator._nodes_to_rerun([]) == set(orchestrator.GRAPH_DEPENDENCIES)
+
+
+def test_lighting_refinement_reruns_only_render(orchestrator):
+    """Test that a lighting review costs one agent call and one Blender build."""
+    result = orchestrator.execute_workflow("a cozy cabin", selected_agents=None)
+
+    assert result.success
+    assert result.iterations == 2
+    assert orchestrator._generate_render_script.call_count == 2
+    assert orchestrator._generate_concept.call_count == 1
+    for name in ("builder", "texture", "hdr", "animation"):
+        assert getattr(orchestrator, f"_generate_{name}_script").call_count == 1
+
+    # The regenerated render stage sees the reviewer's feedback
+    render_message = orchestrator._generate_render_script.call_args.args[0]
+    assert "key light is too harsh" in render_message
+
+    second = result.iteration_stats[1]
+    assert second["rerun"] == ["render"]
+    assert second["agent_calls"] == 1
+    assert second["agent_calls_saved"] == 5
+    assert second["blender_runs"] == 1
+
+    metadata = json.loads((result.session_dir / "metadata.json").read_text())
+    assert metadata["refinement"]["agent_calls_saved"] == 5
+
+
+def test_two_step_blender_mode(orchestrator):
+    """Test that disabling single-pass mode builds and renders separately."""
+    orchestrator.config.blender_single_pass = False
+    orchestrator.config.max_iterations = 1
+
+    result = orchestrator.execute_workflow("a cozy cabin")
+
+    assert result.success
+    assert result.iteration_stats[0]["blender_runs"] == 2
+    orchestrator.blender_executor.execute_build_and_render.assert_not_called()
+
+
+def _stub_preview_pass(orchestrator):
+    """Make the single-pass stub write the preview image as well as the .blend file."""
+    def build_and_render(script, blend_file, output_image, **kwargs):
+        blend_file.write_text("blend")
+        output_image.parent.mkdir(parents=True, exist_ok=True)
+        output_image.write_bytes(b"preview")
+        return BlenderScriptResult(success=True, stdout="", stderr="")
+
+    orchestrator.blender_executor.execute_build_and_render = Mock(side_effect=build_and_render)
+
+
+def test_preview_sent_before_final_render(orchestrator):
+    """Test that a low-sample EEVEE preview reaches the client before the final render."""
+    orchestrator.config.max_iterations = 1
+    _stub_preview_pass(orchestrator)
+    events = []
+    orchestrator.preview_callback = lambda path, iteration: events.append(("preview", path, iteration))
+    orchestrator.blender_executor.render_scene = Mock(
+        side_effect=lambda *args, **kwargs: events.append(("final", kwargs["engine"]))
+        or BlenderScriptResult(success=True)
+    )
+
+    result = orchestrator.execute_workflow("a cozy cabin")
+
+    assert result.success
+    assert [event[0] for event in events] == ["preview", "final"]
+    assert result.preview_path == events[0][1] and result.preview_path.exists()
+    assert result.output_path.name == "render_iter1.png"
+    pass_kwargs = orchestrator.blender_executor.execute_build_and_render.call_args.kwargs
+    assert pass_kwargs["engine"] == "EEVEE"
+    assert pass_kwargs["samples"] == orchestrator.config.preview_samples
+
+
+def test_rejected_preview_cancels_final_render(orchestrator):
+    """Test that rejecting the preview aborts the final render."""
+    _stub_preview_pass(orchestrator)
+    orchestrator.preview_callback = lambda path, iteration: orchestrator.cancel_final_render()
+
+    def render(blend_file, output_image, **kwargs):
+        assert kwargs["cancel_event"].is_set()
+        return BlenderScriptResult(success=False, stderr="Render cancelled")
+
+    orchestrator.blender_executor.render_scene = Mock(side_effect=render)
+
+    result = orchestrator.execute_workflow("a cozy cabin")
+
+    assert result.success is False
+    assert result.render_cancelled is True
+    assert result.iterations == 1
+    assert result.preview_path is not None
+
+
+def test_identical_session_reuses_stored_artifacts(orchestrator):
+    """Test that a byte-identical job in a new session skips Blender."""
+    orchestrator.config.max_iterations = 1
+    orchestrator.config.preview_render = False
+    _stub_preview_pass(orchestrator)
+
+    first = orchestrator.execute_workflow("a cozy cabin", session_name="first")
+    second = orchestrator.execute_workflow("a cozy cabin", session_name="second")
+
+    assert first.success and second.success
+    assert orchestrator.blender_executor.execute_build_and_render.call_count == 1
+    assert second.iteration_stats[0]["artifacts_reused"] is True
+    assert second.iteration_stats[0]["blender_runs"] == 0
+    assert (second.session_dir / "scene.blend").read_text() == "blend"
+    assert orchestrator.get_performance_stats()["artifact_store"]["hits"] == 1